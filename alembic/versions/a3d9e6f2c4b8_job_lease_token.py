@@ -0,0 +1,33 @@
+"""Fencing token for company_research_jobs leases
+
+Adds company_research_jobs.lease_token, incremented on every claim (and on
+lease recovery or retry). Workers renew locked_at on a heartbeat only while
+they still hold the current token, and every commit they make checks it, so a
+worker whose lease expired cannot write after the job was reclaimed.
+
+Revision ID: a3d9e6f2c4b8
+Revises: f1c8a3e5b7d2
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a3d9e6f2c4b8"
+down_revision: Union[str, None] = "f1c8a3e5b7d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "company_research_jobs",
+        sa.Column("lease_token", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("company_research_jobs", "lease_token")
@@ -0,0 +1,50 @@
+"""Source change stamps for incremental re-processing
+
+Revision ID: a7c1e9d2b4f0
+Revises: f2a1c3d4e5f6
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c1e9d2b4f0"
+down_revision: Union[str, None] = "f2a1c3d4e5f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE IF NOT EXISTS source_documents_change_seq")
+    # Existing rows get a content stamp and no stage stamps, so each stage consumes
+    # them once (its own already_extracted/already_processed checks still apply).
+    op.add_column(
+        "source_documents",
+        sa.Column(
+            "content_seq",
+            sa.BigInteger(),
+            nullable=True,
+            server_default=sa.text("nextval('source_documents_change_seq')"),
+        ),
+    )
+    op.add_column("source_documents", sa.Column("extracted_seq", sa.BigInteger(), nullable=True))
+    op.add_column("source_documents", sa.Column("classified_seq", sa.BigInteger(), nullable=True))
+    op.add_column("source_documents", sa.Column("processed_seq", sa.BigInteger(), nullable=True))
+    op.create_index(
+        "ix_source_documents_run_content_seq",
+        "source_documents",
+        ["tenant_id", "company_research_run_id", "content_seq"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_source_documents_run_content_seq", table_name="source_documents")
+    op.drop_column("source_documents", "processed_seq")
+    op.drop_column("source_documents", "classified_seq")
+    op.drop_column("source_documents", "extracted_seq")
+    op.drop_column("source_documents", "content_seq")
+    op.execute("DROP SEQUENCE IF EXISTS source_documents_change_seq")
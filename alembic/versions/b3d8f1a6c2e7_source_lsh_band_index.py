@@ -0,0 +1,29 @@
+"""GIN index on source LSH band keys for near-duplicate lookup
+
+Revision ID: b3d8f1a6c2e7
+Revises: a7c1e9d2b4f0
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3d8f1a6c2e7"
+down_revision: Union[str, None] = "a7c1e9d2b4f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Band keys are written to meta.extraction.lsh_bands by extract_sources
+    # (extractor 5.3.0); classify_sources looks candidates up with ?|.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_source_documents_lsh_bands "
+        "ON source_documents USING gin ((meta -> 'extraction' -> 'lsh_bands'))"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_source_documents_lsh_bands")
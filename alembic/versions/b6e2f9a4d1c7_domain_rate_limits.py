@@ -0,0 +1,49 @@
+"""Learned per-domain fetch rate limits
+
+Adds domain_rate_limits: the adaptive fetch controller's concurrency window,
+request spacing, latency estimates and throttle history per tenant and domain,
+so a new worker process starts each domain from what earlier runs learned.
+
+Revision ID: b6e2f9a4d1c7
+Revises: a3d9e6f2c4b8
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b6e2f9a4d1c7"
+down_revision: Union[str, None] = "a3d9e6f2c4b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "domain_rate_limits",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("domain", sa.String(length=255), nullable=False),
+        sa.Column("concurrency_limit", sa.Float(), server_default=sa.text("1"), nullable=False),
+        sa.Column("delay_ms", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("latency_ewma_ms", sa.Float(), nullable=True),
+        sa.Column("latency_floor_ms", sa.Float(), nullable=True),
+        sa.Column("throttle_count", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("last_status_code", sa.Integer(), nullable=True),
+        sa.Column("last_throttled_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("cooldown_until", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("tenant_id", "domain", name="uq_domain_rate_limits"),
+    )
+    op.create_index("ix_domain_rate_limits_tenant_id", "domain_rate_limits", ["tenant_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_domain_rate_limits_tenant_id", table_name="domain_rate_limits")
+    op.drop_table("domain_rate_limits")
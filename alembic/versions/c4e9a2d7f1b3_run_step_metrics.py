@@ -0,0 +1,29 @@
+"""Per-step execution telemetry on company research run steps
+
+Revision ID: c4e9a2d7f1b3
+Revises: b3d8f1a6c2e7
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e9a2d7f1b3"
+down_revision: Union[str, None] = "b3d8f1a6c2e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "company_research_run_steps",
+        sa.Column("metrics_json", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("company_research_run_steps", "metrics_json")
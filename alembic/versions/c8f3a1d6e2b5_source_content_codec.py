@@ -0,0 +1,133 @@
+"""Compressed source payloads
+
+Adds source_documents.content_codec and content_text_packed. Payloads of a row
+with a codec are stored compressed (content_bytes in place, the text as UTF-8
+in content_text_packed, content_text NULL); NULL keeps the raw layout. Existing
+rows are backfilled in batches with zstd (gzip when ``zstandard`` is not
+installed); rows whose payloads are all below MIN_BYTES stay raw. The codec
+logic is frozen here rather than imported from the app, so later changes to the
+model or codec module do not change what this revision writes. The compressed
+columns use EXTERNAL storage so Postgres does not try to compress them again.
+
+Revision ID: c8f3a1d6e2b5
+Revises: b6e2f9a4d1c7
+Create Date: 2026-10-18
+"""
+
+import zlib
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+try:
+    import zstandard
+except ImportError:  # optional dependency; the backfill falls back to gzip
+    zstandard = None
+
+# revision identifiers, used by Alembic.
+revision: str = "c8f3a1d6e2b5"
+down_revision: Union[str, None] = "b6e2f9a4d1c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+# Defaults of SOURCE_CONTENT_COMPRESS_MIN_BYTES / SOURCE_CONTENT_CODEC and the codec levels at this revision.
+MIN_BYTES = 1024
+ZSTD_LEVEL = 3
+GZIP_LEVEL = 6
+
+UPDATE_PAYLOADS = sa.text(
+    "UPDATE source_documents SET content_bytes = :content_bytes, content_text = :content_text, "
+    "content_text_packed = :content_text_packed, content_codec = :content_codec WHERE id = :id"
+).bindparams(
+    sa.bindparam("content_bytes", type_=sa.LargeBinary),
+    sa.bindparam("content_text_packed", type_=sa.LargeBinary),
+)
+
+
+def _batches(bind, where: str, columns: str):
+    """Rows matching ``where`` in id order, BATCH_SIZE at a time (keyset pagination)."""
+    last_id = None
+    while True:
+        after = "" if last_id is None else "AND id > :last_id"
+        params = {"limit": BATCH_SIZE} if last_id is None else {"limit": BATCH_SIZE, "last_id": last_id}
+        rows = bind.execute(
+            sa.text(f"SELECT id, {columns} FROM source_documents WHERE {where} {after} ORDER BY id LIMIT :limit"),
+            params,
+        ).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    # Same bytes as gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0).
+    encoder = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return encoder.compress(data) + encoder.flush()
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("content_codec_unavailable:zstd (install zstandard)")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    if codec == "gzip":
+        return zlib.decompress(data, wbits=31)
+    raise ValueError(f"unknown_content_codec:{codec}")
+
+
+def _packed(data: Optional[bytes], text_value: Optional[str], codec: str) -> Optional[dict]:
+    """Column values for a compressed row, or None when the row stays raw."""
+    encoded_text = text_value.encode("utf-8") if text_value is not None else None
+    if max(len(data or b""), len(encoded_text or b"")) < MIN_BYTES:
+        return None
+    return {
+        "content_bytes": _compress(data, codec) if data is not None else None,
+        "content_text": None,
+        "content_text_packed": _compress(encoded_text, codec) if encoded_text is not None else None,
+        "content_codec": codec,
+    }
+
+
+def upgrade() -> None:
+    op.add_column("source_documents", sa.Column("content_text_packed", sa.LargeBinary(), nullable=True))
+    op.add_column("source_documents", sa.Column("content_codec", sa.String(16), nullable=True))
+    op.execute("ALTER TABLE source_documents ALTER COLUMN content_bytes SET STORAGE EXTERNAL")
+    op.execute("ALTER TABLE source_documents ALTER COLUMN content_text_packed SET STORAGE EXTERNAL")
+
+    bind = op.get_bind()
+    codec = "zstd" if zstandard is not None else "gzip"
+    where = "content_codec IS NULL AND (content_bytes IS NOT NULL OR content_text IS NOT NULL)"
+    for rows in _batches(bind, where, "content_bytes, content_text"):
+        updates = []
+        for source_id, data, text_value in rows:
+            values = _packed(bytes(data) if data is not None else None, text_value, codec)
+            if values is not None:
+                updates.append({"id": source_id, **values})
+        if updates:
+            bind.execute(UPDATE_PAYLOADS, updates)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for rows in _batches(bind, "content_codec IS NOT NULL", "content_bytes, content_text_packed, content_codec"):
+        updates = []
+        for source_id, data, packed, codec in rows:
+            updates.append(
+                {
+                    "id": source_id,
+                    "content_bytes": _decompress(bytes(data), codec) if data is not None else None,
+                    "content_text": _decompress(bytes(packed), codec).decode("utf-8") if packed is not None else None,
+                    "content_text_packed": None,
+                    "content_codec": None,
+                }
+            )
+        bind.execute(UPDATE_PAYLOADS, updates)
+
+    op.execute("ALTER TABLE source_documents ALTER COLUMN content_bytes SET STORAGE EXTENDED")
+    op.drop_column("source_documents", "content_codec")
+    op.drop_column("source_documents", "content_text_packed")
@@ -0,0 +1,43 @@
+"""Company prospect name match keys
+
+Adds company_prospects.name_match_keys, the fuzzy-match blocking keys of
+name_raw (see app/utils/company_name_match.py), with a GIN index so candidate
+duplicates are found with ?| instead of scanning a run's or tenant's
+prospects. Existing rows start with no keys; the derivation lives in the app
+and changes with it, so they are filled by
+scripts/maintenance/backfill_prospect_name_match_keys.py rather than here.
+
+Revision ID: d4a7c2e9f1b3
+Revises: c8f3a1d6e2b5
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "d4a7c2e9f1b3"
+down_revision: Union[str, None] = "c8f3a1d6e2b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "company_prospects",
+        sa.Column("name_match_keys", postgresql.JSONB(), nullable=False, server_default="[]"),
+    )
+    op.create_index(
+        "ix_company_prospects_name_match_keys",
+        "company_prospects",
+        ["name_match_keys"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_company_prospects_name_match_keys", table_name="company_prospects")
+    op.drop_column("company_prospects", "name_match_keys")
@@ -0,0 +1,130 @@
+"""Partition research_events by month with a run timeline index
+
+Rebuilds research_events as a RANGE (created_at) partitioned table with one
+partition per month (research_events_pYYYYMM) from the oldest stored event to
+three months ahead, plus research_events_default. The primary key becomes
+(id, created_at) because the partition key must be part of it. Per-column
+indexes are replaced by ix_research_events_run_timeline
+(tenant_id, company_research_run_id, created_at DESC).
+
+Later months are created by app/workers/research_event_retention_worker.py.
+
+Revision ID: d5f1a8c3e2b9
+Revises: c4e9a2d7f1b3
+Create Date: 2026-10-18
+"""
+
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "d5f1a8c3e2b9"
+down_revision: Union[str, None] = "c4e9a2d7f1b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+COLUMNS = (
+    "id, tenant_id, company_research_run_id, event_type, status, "
+    "input_json, output_json, error_message, created_at, updated_at"
+)
+LEGACY_INDEXES = (
+    "ix_research_events_run_id",
+    "ix_research_events_type",
+    "ix_research_events_status",
+    "ix_research_events_created",
+    "ix_research_events_company_research_run_id",
+    "ix_research_events_event_type",
+    "ix_research_events_tenant_id",
+)
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + (month.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _bound(month: date) -> str:
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc).isoformat()
+
+
+def upgrade() -> None:
+    for name in LEGACY_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute("ALTER TABLE research_events RENAME TO research_events_unpartitioned")
+    op.execute("ALTER TABLE research_events_unpartitioned DROP CONSTRAINT IF EXISTS research_events_pkey")
+
+    op.execute(
+        """
+        CREATE TABLE research_events (
+            id UUID NOT NULL,
+            tenant_id UUID NOT NULL,
+            company_research_run_id UUID NOT NULL
+                REFERENCES company_research_runs (id) ON DELETE CASCADE,
+            event_type VARCHAR(50) NOT NULL,
+            status VARCHAR(50) NOT NULL,
+            input_json JSONB,
+            output_json JSONB,
+            error_message TEXT,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+
+    oldest = op.get_bind().execute(sa.text("SELECT min(created_at) FROM research_events_unpartitioned")).scalar()
+    now = datetime.now(timezone.utc)
+    month = date((oldest or now).year, (oldest or now).month, 1)
+    last = _add_months(date(now.year, now.month, 1), MONTHS_AHEAD)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE research_events_p{month.year:04d}{month.month:02d} PARTITION OF research_events "
+            f"FOR VALUES FROM ('{_bound(month)}') TO ('{_bound(_add_months(month, 1))}')"
+        )
+        month = _add_months(month, 1)
+    op.execute("CREATE TABLE research_events_default PARTITION OF research_events DEFAULT")
+
+    op.execute(f"INSERT INTO research_events ({COLUMNS}) SELECT {COLUMNS} FROM research_events_unpartitioned")
+    op.execute("DROP TABLE research_events_unpartitioned")
+
+    op.execute(
+        "CREATE INDEX ix_research_events_run_timeline "
+        "ON research_events (tenant_id, company_research_run_id, created_at DESC)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE research_events RENAME TO research_events_partitioned")
+    op.execute("DROP INDEX IF EXISTS ix_research_events_run_timeline")
+    op.create_table(
+        "research_events",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("company_research_run_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("event_type", sa.String(length=50), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("input_json", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("output_json", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["company_research_run_id"], ["company_research_runs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id", name="research_events_pkey_unpartitioned"),
+    )
+    # ids are only unique per (id, created_at) while partitioned; keep the first copy of a duplicate.
+    op.execute(
+        f"INSERT INTO research_events ({COLUMNS}) "
+        f"SELECT DISTINCT ON (id) {COLUMNS} FROM research_events_partitioned ORDER BY id, created_at"
+    )
+    op.execute("DROP TABLE research_events_partitioned CASCADE")
+    op.execute("ALTER TABLE research_events RENAME CONSTRAINT research_events_pkey_unpartitioned TO research_events_pkey")
+    op.create_index("ix_research_events_run_id", "research_events", ["company_research_run_id"])
+    op.create_index("ix_research_events_type", "research_events", ["event_type"])
+    op.create_index("ix_research_events_status", "research_events", ["status"])
+    op.create_index("ix_research_events_created", "research_events", ["created_at"])
+    op.create_index("ix_research_events_tenant_id", "research_events", ["tenant_id"])
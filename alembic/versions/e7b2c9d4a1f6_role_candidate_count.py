@@ -0,0 +1,70 @@
+"""Maintain role.candidate_count from candidate_assignment
+
+Adds role.candidate_count, backfills it, and keeps it current with the
+role_candidate_count trigger on candidate_assignment (insert, delete and
+role_id changes), so the dashboard no longer counts assignments with a
+join + GROUP BY on every page view.
+
+Revision ID: e7b2c9d4a1f6
+Revises: d5f1a8c3e2b9
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b2c9d4a1f6"
+down_revision: Union[str, None] = "d5f1a8c3e2b9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "role",
+        sa.Column("candidate_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION role_candidate_count_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                UPDATE role SET candidate_count = candidate_count - 1 WHERE id = OLD.role_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE role SET candidate_count = candidate_count + 1 WHERE id = NEW.role_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER role_candidate_count
+        AFTER INSERT OR DELETE OR UPDATE OF role_id ON candidate_assignment
+        FOR EACH ROW
+        EXECUTE FUNCTION role_candidate_count_sync()
+        """
+    )
+    # ADD COLUMN holds role exclusively until commit, and assignment writes need
+    # a key-share lock on their role row, so none can land between the
+    # trigger and this count.
+    op.execute(
+        """
+        UPDATE role SET candidate_count = counts.n
+        FROM (
+            SELECT role_id, count(*) AS n FROM candidate_assignment GROUP BY role_id
+        ) AS counts
+        WHERE role.id = counts.role_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS role_candidate_count ON candidate_assignment")
+    op.execute("DROP FUNCTION IF EXISTS role_candidate_count_sync()")
+    op.drop_column("role", "candidate_count")
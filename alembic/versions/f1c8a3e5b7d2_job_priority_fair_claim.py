@@ -0,0 +1,53 @@
+"""Priority classes and fair-share claim columns on company_research_jobs
+
+Adds company_research_jobs.priority (0 interactive, 1 batch, 2 maintenance)
+and claimed_at (last claim time), plus the indexes claim_next_job uses to
+rank tenants and pick each tenant's next job. Existing run jobs become
+interactive; every other job type stays batch.
+
+Revision ID: f1c8a3e5b7d2
+Revises: e7b2c9d4a1f6
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "f1c8a3e5b7d2"
+down_revision: Union[str, None] = "e7b2c9d4a1f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "company_research_jobs",
+        sa.Column("priority", sa.SmallInteger(), nullable=False, server_default=sa.text("1")),
+    )
+    op.add_column(
+        "company_research_jobs",
+        sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute("UPDATE company_research_jobs SET priority = 0 WHERE job_type = 'company_research_run'")
+    op.execute("UPDATE company_research_jobs SET claimed_at = locked_at WHERE locked_at IS NOT NULL")
+    op.create_index(
+        "ix_company_research_jobs_claimable",
+        "company_research_jobs",
+        ["tenant_id", "priority", "created_at"],
+        postgresql_where=sa.text("status IN ('queued','failed','running')"),
+    )
+    op.create_index(
+        "ix_company_research_jobs_tenant_claimed",
+        "company_research_jobs",
+        ["tenant_id", "claimed_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_company_research_jobs_tenant_claimed", table_name="company_research_jobs")
+    op.drop_index("ix_company_research_jobs_claimable", table_name="company_research_jobs")
+    op.drop_column("company_research_jobs", "claimed_at")
+    op.drop_column("company_research_jobs", "priority")
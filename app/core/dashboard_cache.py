@@ -0,0 +1,169 @@
+"""
+Short-TTL, per-tenant cache of the UI dashboard panels.
+
+The dashboard reads four panels (active roles, candidates requiring action,
+tasks, BD opportunities) on every page view. The cache keeps the rendered panel
+rows per tenant for DASHBOARD_CACHE_TTL_SECONDS.
+
+Writes invalidate it through SQLAlchemy session events: after a flush the
+tenant ids of new, changed or deleted Role, CandidateAssignment, Task and
+BDOpportunity rows are remembered on the session, and dropped from the cache
+when that session commits. A per-tenant generation counter keeps a panel load
+that raced an invalidation from storing stale rows.
+
+Like the principal cache this is process-local: invalidation covers writes made
+through this process, the TTL bounds staleness for writes made elsewhere.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.bd_opportunity import BDOpportunity
+from app.models.candidate_assignment import CandidateAssignment
+from app.models.role import Role
+from app.models.task import Task
+
+
+DashboardPanels = Dict[str, Any]
+
+# Models whose writes change what the dashboard shows.
+INVALIDATING_MODELS = (Role, CandidateAssignment, Task, BDOpportunity)
+_PENDING_KEY = "dashboard_cache_tenants"
+
+
+class DashboardCache:
+    """TTL cache of dashboard panels keyed by tenant, with write invalidation and hit metrics."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1_000):
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entries = max(1, int(max_entries))
+        self._entries: Dict[str, Tuple[float, DashboardPanels]] = {}
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self.stale_puts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def generation(self, tenant_id) -> int:
+        """Read before loading panels and pass to put(), so a concurrent invalidation wins."""
+        with self._lock:
+            return self._generations.get(str(tenant_id), 0)
+
+    def get(self, tenant_id) -> Optional[DashboardPanels]:
+        if not self.enabled:
+            return None
+        key = str(tenant_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, panels = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.hits += 1
+            return panels
+
+    def put(self, tenant_id, panels: DashboardPanels, generation: int) -> bool:
+        """Store panels loaded at `generation`; skipped (False) if the tenant was invalidated since."""
+        if not self.enabled:
+            return False
+        key = str(tenant_id)
+        with self._lock:
+            if self._generations.get(key, 0) != generation:
+                self.stale_puts += 1
+                return False
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                self._evict_oldest()
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, panels)
+            return True
+
+    def invalidate_tenants(self, tenant_ids: Iterable) -> int:
+        """Drop the cached panels of each tenant. Returns the number of entries removed."""
+        removed = 0
+        with self._lock:
+            for tenant_id in tenant_ids:
+                key = str(tenant_id)
+                self._generations[key] = self._generations.get(key, 0) + 1
+                if self._entries.pop(key, None) is not None:
+                    removed += 1
+            self.invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "ttl_seconds": self.ttl_seconds,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+                "stale_puts": self.stale_puts,
+            }
+
+    def _evict_oldest(self) -> None:
+        # Entries share one TTL, so the earliest expiry is the oldest insert.
+        oldest_key = min(self._entries, key=lambda k: self._entries[k][0])
+        del self._entries[oldest_key]
+        self.evictions += 1
+
+
+dashboard_cache = DashboardCache(
+    ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS,
+    max_entries=settings.DASHBOARD_CACHE_MAX_ENTRIES,
+)
+
+
+def _written_tenants(session: Session) -> Set[UUID]:
+    tenants: Set[UUID] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, INVALIDATING_MODELS) and obj.tenant_id is not None:
+            tenants.add(obj.tenant_id)
+    return tenants
+
+
+@event.listens_for(Session, "after_flush")
+def _remember_written_tenants(session: Session, flush_context) -> None:
+    tenants = _written_tenants(session)
+    if tenants:
+        session.info.setdefault(_PENDING_KEY, set()).update(tenants)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tenants(session: Session) -> None:
+    tenants = session.info.pop(_PENDING_KEY, None)
+    if tenants:
+        dashboard_cache.invalidate_tenants(tenants)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_tenants(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
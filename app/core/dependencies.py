@@ -2,14 +2,15 @@
 FastAPI dependencies for the application.
 """
 
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 from uuid import UUID
 from fastapi import Header, HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import AsyncSessionLocal
+from app.db.session import AsyncSessionLocal, ReportingSessionLocal
 from app.core.jwt import decode_access_token
+from app.core.principal_cache import CachedPrincipal, principal_cache
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
 from app.errors import raise_app_error
@@ -27,6 +28,15 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_reporting_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for read-only export/report queries (reporting pool, replica if configured)."""
+    async with ReportingSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
 async def get_tenant_id(x_tenant_id: str = Header(None)) -> str:
     """
     Extract and validate tenant_id from header.
@@ -42,6 +52,18 @@ async def get_tenant_id(x_tenant_id: str = Header(None)) -> str:
     return x_tenant_id
 
 
+async def load_principal_user(db: AsyncSession, user_id: UUID, token_iat: Optional[int]) -> Optional[User]:
+    """The user behind a token: the cached principal when fresh, else the database row (then cached)."""
+    cached = principal_cache.get(user_id, token_iat)
+    if cached is not None:
+        return cached.to_user()
+
+    user = await UserRepository(db).get_by_id(user_id)
+    if user:
+        principal_cache.put(token_iat, CachedPrincipal.from_user(user))
+    return user
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
@@ -49,8 +71,9 @@ async def get_current_user(
     """
     Get the current authenticated user from JWT token.
     
-    Validates the JWT token, loads the user from database,
-    and ensures the user is active.
+    Validates the JWT token, loads the user (from the short-TTL principal
+    cache when possible, otherwise from the database), and ensures the user
+    is active. Cache hits return a transient User carrying the cached fields.
     
     Raises:
         401: If token is invalid or user not found
@@ -76,9 +99,15 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Load user from database
-    user_repository = UserRepository(db)
-    user = await user_repository.get_by_id(UUID(user_id_str))
+    try:
+        user_id = UUID(user_id_str)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user = await load_principal_user(db, user_id, payload.get("iat"))
     
     if not user:
         raise HTTPException(
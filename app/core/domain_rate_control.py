@@ -0,0 +1,276 @@
+"""
+Adaptive per-domain request rate control for the URL fetcher.
+
+Each domain gets a concurrency window and a minimum spacing between request
+starts, adjusted AIMD-style from the responses it sends back:
+
+- healthy response at normal latency: the window grows additively (about +1
+  per window's worth of successes, up to FETCH_RATE_MAX_CONCURRENCY) and the
+  spacing shrinks by FETCH_RATE_DELAY_STEP_MS down to the configured floor
+  (PER_DOMAIN_MIN_DELAY_MS)
+- slow response (latency above FETCH_RATE_LATENCY_FACTOR x the domain's
+  latency floor): no growth, spacing grows by one step
+- 429/503 or a transport error: the window halves and the spacing doubles (up
+  to FETCH_RATE_MAX_DELAY_MS); a Retry-After holds every new request to the
+  domain until it has passed (capped at FETCH_RATE_MAX_COOLDOWN_SECONDS)
+
+State is per process and shared by all tenants, like the limiters it
+replaces; CompanyExtractionService seeds a domain from its tenant's
+``domain_rate_limits`` row on first use and writes learned limits back, so the
+next run starts from what the last one learned.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, List, Optional
+
+from app.utils.time import utc_now
+
+OVERLOAD_STATUS_CODES = frozenset({429, 503})
+LATENCY_EWMA_ALPHA = 0.2
+# The latency floor follows the fastest recent responses but drifts up slowly, so a
+# domain that got permanently slower is not judged against a stale best case forever.
+LATENCY_FLOOR_DRIFT = 0.01
+
+
+@dataclass
+class DomainRateState:
+    limit: float
+    delay: float
+    in_flight: int = 0
+    next_start: float = 0.0
+    latency_ewma: Optional[float] = None
+    latency_floor: Optional[float] = None
+    throttle_count: int = 0
+    last_status_code: Optional[int] = None
+    last_throttled_at: Optional[datetime] = None
+    cooldown_until: Optional[datetime] = None
+    dirty: bool = False
+    throttled_unpersisted: bool = False
+    persisted_at: float = 0.0
+    waiters: Deque[asyncio.Future] = field(default_factory=deque)
+
+    @property
+    def window(self) -> int:
+        return max(1, int(self.limit))
+
+
+@dataclass
+class RequestSlot:
+    """One request's turn on a domain; the fetcher reports the response headers on it."""
+
+    domain: str
+    waited_ms: float = 0.0
+    started: float = field(default_factory=time.monotonic)
+    status_code: Optional[int] = None
+    retry_after: Optional[float] = None
+    latency: Optional[float] = None
+
+    def observe_response(self, status_code: int, retry_after: Optional[float] = None) -> None:
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.latency = time.monotonic() - self.started
+
+
+class DomainRateController:
+    """AIMD concurrency window and start spacing per domain (see module docstring)."""
+
+    def __init__(
+        self,
+        *,
+        initial_concurrency: int = 1,
+        max_concurrency: int = 8,
+        min_delay: float = 0.0,
+        max_delay: float = 30.0,
+        delay_step: float = 0.1,
+        latency_factor: float = 3.0,
+        max_cooldown: float = 120.0,
+        adaptive: bool = True,
+    ) -> None:
+        self.initial_concurrency = max(1, initial_concurrency)
+        self.max_concurrency = max(self.initial_concurrency, max_concurrency)
+        self.min_delay = max(0.0, min_delay)
+        self.max_delay = max(self.min_delay, max_delay)
+        self.delay_step = max(0.001, delay_step)
+        self.latency_factor = max(1.0, latency_factor)
+        self.max_cooldown = max(0.0, max_cooldown)
+        self.adaptive = adaptive
+        self._domains: Dict[str, DomainRateState] = {}
+
+    @staticmethod
+    def _key(domain: str) -> str:
+        return (domain or "unknown").lower()
+
+    def knows(self, domain: str) -> bool:
+        return self._key(domain) in self._domains
+
+    def state(self, domain: str) -> DomainRateState:
+        key = self._key(domain)
+        state = self._domains.get(key)
+        if state is None:
+            state = DomainRateState(limit=float(self.initial_concurrency), delay=self.min_delay)
+            self._domains[key] = state
+        return state
+
+    def seed(
+        self,
+        domain: str,
+        *,
+        concurrency_limit: float,
+        delay_ms: int,
+        latency_ewma_ms: Optional[float] = None,
+        latency_floor_ms: Optional[float] = None,
+        throttle_count: int = 0,
+        cooldown_until: Optional[datetime] = None,
+    ) -> None:
+        """Start a domain from persisted limits; a domain already live in this process is left alone."""
+        if self.knows(domain):
+            return
+        state = self.state(domain)
+        if self.adaptive:
+            state.limit = min(float(self.max_concurrency), max(1.0, float(concurrency_limit)))
+            state.delay = min(self.max_delay, max(self.min_delay, delay_ms / 1000.0))
+        state.latency_ewma = latency_ewma_ms / 1000.0 if latency_ewma_ms is not None else None
+        state.latency_floor = latency_floor_ms / 1000.0 if latency_floor_ms is not None else None
+        state.throttle_count = throttle_count
+        remaining = (cooldown_until - utc_now()).total_seconds() if cooldown_until else 0.0
+        if remaining > 0:
+            state.cooldown_until = cooldown_until
+            state.next_start = time.monotonic() + min(remaining, self.max_cooldown)
+
+    async def acquire(self, domain: str) -> float:
+        """Wait for a window slot and the domain's start spacing. Returns seconds waited."""
+        state = self.state(domain)
+        started = time.monotonic()
+        while state.in_flight >= state.window:
+            waiter = asyncio.get_running_loop().create_future()
+            state.waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                # Woken for a free slot but cancelled before taking it: pass the slot on.
+                if waiter.done() and not waiter.cancelled():
+                    self._wake(state)
+                raise
+            finally:
+                if waiter in state.waiters:
+                    state.waiters.remove(waiter)
+        state.in_flight += 1
+        try:
+            now = time.monotonic()
+            start_at = max(now, state.next_start)
+            state.next_start = start_at + state.delay
+            if start_at > now:
+                await asyncio.sleep(start_at - now)
+        except BaseException:
+            self.release(domain)
+            raise
+        return time.monotonic() - started
+
+    def release(self, domain: str) -> None:
+        state = self.state(domain)
+        state.in_flight = max(0, state.in_flight - 1)
+        self._wake(state)
+
+    @staticmethod
+    def _wake(state: DomainRateState) -> None:
+        free = state.window - state.in_flight
+        while free > 0 and state.waiters:
+            waiter = state.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def record(
+        self,
+        domain: str,
+        *,
+        status_code: Optional[int] = None,
+        latency: Optional[float] = None,
+        retry_after: Optional[float] = None,
+        error: bool = False,
+    ) -> None:
+        """Feed one request's outcome back into the domain's window and spacing."""
+        state = self.state(domain)
+        if status_code is not None:
+            state.last_status_code = status_code
+        overloaded = error or status_code in OVERLOAD_STATUS_CODES
+        if overloaded:
+            state.throttle_count += 1
+            state.last_throttled_at = utc_now()
+            if self.adaptive:
+                state.limit = max(1.0, state.limit / 2)
+                state.delay = min(self.max_delay, max(state.delay * 2, self.delay_step))
+            if retry_after:
+                cooldown = min(float(retry_after), self.max_cooldown)
+                state.next_start = max(state.next_start, time.monotonic() + cooldown)
+                state.cooldown_until = utc_now() + timedelta(seconds=cooldown)
+            state.dirty = True
+            state.throttled_unpersisted = True
+            return
+
+        if latency is None or latency < 0:
+            return
+        if state.latency_ewma is None:
+            state.latency_ewma = latency
+        else:
+            state.latency_ewma += LATENCY_EWMA_ALPHA * (latency - state.latency_ewma)
+        if state.latency_floor is None or latency < state.latency_floor:
+            state.latency_floor = latency
+        else:
+            state.latency_floor += LATENCY_FLOOR_DRIFT * (latency - state.latency_floor)
+        if not self.adaptive:
+            return
+
+        before = (state.window, state.delay)
+        if state.latency_ewma > state.latency_floor * self.latency_factor:
+            state.delay = min(self.max_delay, state.delay + self.delay_step)
+        else:
+            state.limit = min(float(self.max_concurrency), state.limit + 1.0 / state.limit)
+            state.delay = max(self.min_delay, state.delay - self.delay_step)
+        if (state.window, state.delay) != before:
+            state.dirty = True
+            self._wake(state)
+
+    def take_for_persist(self, domain: str, min_interval: float) -> Optional[Dict[str, Any]]:
+        """The domain's limits to write back, when changed and not written within ``min_interval``.
+
+        A throttle is written at once; routine growth at most every ``min_interval`` seconds.
+        """
+        state = self._domains.get(self._key(domain))
+        if state is None or not state.dirty:
+            return None
+        now = time.monotonic()
+        if now - state.persisted_at < min_interval and not state.throttled_unpersisted:
+            return None
+        state.dirty = False
+        state.throttled_unpersisted = False
+        state.persisted_at = now
+        return self._describe(state)
+
+    @staticmethod
+    def _describe(state: DomainRateState) -> Dict[str, Any]:
+        return {
+            "concurrency_limit": round(state.limit, 3),
+            "delay_ms": int(round(state.delay * 1000)),
+            "latency_ewma_ms": round(state.latency_ewma * 1000, 1) if state.latency_ewma is not None else None,
+            "latency_floor_ms": round(state.latency_floor * 1000, 1) if state.latency_floor is not None else None,
+            "throttle_count": state.throttle_count,
+            "last_status_code": state.last_status_code,
+            "last_throttled_at": state.last_throttled_at,
+            "cooldown_until": state.cooldown_until,
+        }
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Current limits of every domain this process has talked to."""
+        rows = []
+        for domain, state in sorted(self._domains.items()):
+            row = {"domain": domain, "window": state.window, "in_flight": state.in_flight}
+            row.update(self._describe(state))
+            rows.append(row)
+        return rows
@@ -23,13 +23,15 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         Encoded JWT token string
     """
     to_encode = data.copy()
+    issued_at = datetime.utcnow()
     
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = issued_at + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(hours=24)
+        expire = issued_at + timedelta(hours=24)
     
-    to_encode.update({"exp": expire})
+    # iat keys the principal cache, so each issued token gets its own entry
+    to_encode.update({"exp": expire, "iat": issued_at})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
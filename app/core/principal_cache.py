@@ -0,0 +1,165 @@
+"""
+Short-TTL cache of authenticated principals for API requests.
+
+`get_current_user` used to load the user row on every API call. The cache keeps
+the handful of fields that authorization needs (is_active, role, tenant_id plus
+the identity fields routes read) keyed by (user_id, token iat), so repeated
+requests with the same token skip the database round-trip.
+
+The cache is process-local. Invalidation covers writes made through this
+process (role change, deactivation); the TTL bounds staleness for writes made
+elsewhere.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.models.user import User
+
+
+PrincipalKey = Tuple[UUID, Optional[int]]
+
+
+@dataclass(frozen=True)
+class CachedPrincipal:
+    """Immutable snapshot of the user fields needed to authorize a request."""
+
+    id: UUID
+    tenant_id: UUID
+    email: str
+    full_name: str
+    role: str
+    is_active: bool
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user: User) -> "CachedPrincipal":
+        return cls(
+            id=user.id,
+            tenant_id=user.tenant_id,
+            email=user.email,
+            full_name=user.full_name,
+            role=user.role,
+            is_active=bool(user.is_active),
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+    def to_user(self) -> User:
+        """Build a transient (session-less) User carrying the cached fields."""
+        return User(
+            id=self.id,
+            tenant_id=self.tenant_id,
+            email=self.email,
+            full_name=self.full_name,
+            role=self.role,
+            is_active=self.is_active,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+        )
+
+
+class PrincipalCache:
+    """TTL cache of CachedPrincipal entries with per-user invalidation and hit metrics."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10_000):
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entries = max(1, int(max_entries))
+        self._entries: Dict[PrincipalKey, Tuple[float, CachedPrincipal]] = {}
+        self._keys_by_user: Dict[UUID, Set[PrincipalKey]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, user_id: UUID, iat: Optional[int]) -> Optional[CachedPrincipal]:
+        if not self.enabled:
+            return None
+        key = (user_id, iat)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, principal = entry
+            if expires_at <= now:
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.hits += 1
+            return principal
+
+    def put(self, iat: Optional[int], principal: CachedPrincipal) -> None:
+        if not self.enabled:
+            return
+        key = (principal.id, iat)
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                self._evict_oldest()
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, principal)
+            self._keys_by_user.setdefault(principal.id, set()).add(key)
+
+    def invalidate_user(self, user_id: UUID) -> int:
+        """Drop every cached token for a user. Returns the number of entries removed."""
+        with self._lock:
+            keys = self._keys_by_user.pop(user_id, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            if keys:
+                self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "ttl_seconds": self.ttl_seconds,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+    def _drop(self, key: PrincipalKey) -> None:
+        self._entries.pop(key, None)
+        user_keys = self._keys_by_user.get(key[0])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                self._keys_by_user.pop(key[0], None)
+
+    def _evict_oldest(self) -> None:
+        # Entries share one TTL, so the earliest expiry is the oldest insert.
+        oldest_key = min(self._entries, key=lambda k: self._entries[k][0])
+        self._drop(oldest_key)
+        self.evictions += 1
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,348 @@
+"""
+Opt-in sampling profiler for diagnosing slow API routes and worker steps.
+
+A ``ProfileSession`` samples the Python stack of the thread that started it
+(the event loop thread for API requests and worker steps) every
+``PROFILING_SAMPLE_INTERVAL_MS`` from a background thread, and records every
+SQL statement issued on instrumented engines (see ``instrument_engine``) while
+it is bound to the current task. ``write_profile`` stores three artifacts under
+``PROFILING_ROOT/<tenant_id>/``:
+
+- ``<profile_id>.speedscope.json``: sampled profile for https://www.speedscope.app
+- ``<profile_id>.collapsed.txt``: collapsed stacks (``root;...;leaf count``) for flamegraph tools
+- ``<profile_id>.timeline.json``: profile metadata and the SQL timeline
+
+Samples of the loop thread include whatever coroutine was running, so requests
+served concurrently with a profiled one show up in its stacks.
+
+Profiling is off unless ``PROFILING_ENABLED`` is set: the request middleware is
+only installed then, and the worker only profiles steps named on the command
+line. Otherwise the only cost is a context-variable lookup per SQL statement.
+"""
+
+import asyncio
+import json
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.jwt import decode_access_token
+from app.utils.time import utc_now
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_ARTIFACTS = {
+    "speedscope": (".speedscope.json", "application/json"),
+    "collapsed": (".collapsed.txt", "text/plain; charset=utf-8"),
+    "timeline": (".timeline.json", "application/json"),
+}
+PROFILE_ID_RE = re.compile(r"^[0-9]{8}T[0-9]{6}Z-[a-z0-9_.-]{1,64}-[0-9a-f]{8}$")
+MAX_STACK_DEPTH = 128
+MAX_SQL_EVENTS = 5000
+MAX_STATEMENT_CHARS = 500
+
+Frame = Tuple[str, str, int]
+
+_active_profile: ContextVar[Optional["ProfileSession"]] = ContextVar("active_profile", default=None)
+# One profile per process at a time: the sampler watches a whole thread, so two
+# overlapping profiles of the loop thread would just record each other.
+_profile_lock = threading.Lock()
+
+
+def new_profile_id(label: str) -> str:
+    slug = re.sub(r"[^a-z0-9_.-]+", "-", label.lower()).strip("-")[:64] or "profile"
+    return f"{utc_now().strftime('%Y%m%dT%H%M%SZ')}-{slug}-{secrets.token_hex(4)}"
+
+
+class ProfileSession:
+    """Stack samples and SQL timeline for one request or step; use ``start``/``stop``."""
+
+    def __init__(
+        self,
+        label: str,
+        tenant_id: str,
+        *,
+        interval_ms: Optional[float] = None,
+        max_seconds: Optional[float] = None,
+    ) -> None:
+        self.label = label
+        self.tenant_id = str(tenant_id)
+        self.profile_id = new_profile_id(label)
+        self.interval = (interval_ms or settings.PROFILING_SAMPLE_INTERVAL_MS) / 1000.0
+        self.max_seconds = max_seconds or settings.PROFILING_MAX_SECONDS
+        self.samples: Counter = Counter()
+        self.sql_events: List[Dict[str, Any]] = []
+        self.sql_dropped = 0
+        self.started_at = None
+        self.duration_ms = 0.0
+        self._start = 0.0
+        self._thread_id = 0
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._token = None
+
+    def start(self) -> "ProfileSession":
+        self.started_at = utc_now()
+        self._start = time.perf_counter()
+        self._thread_id = threading.get_ident()
+        self._token = _active_profile.set(self)
+        self._sampler = threading.Thread(target=self._sample_loop, name=f"profiler-{self.profile_id}", daemon=True)
+        self._sampler.start()
+        return self
+
+    def deactivate(self) -> None:
+        """Stop attributing SQL to this profile; call from the context that started it."""
+        if self._token is not None:
+            _active_profile.reset(self._token)
+            self._token = None
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        self.deactivate()
+        self.duration_ms = round((time.perf_counter() - self._start) * 1000, 3)
+
+    def _sample_loop(self) -> None:
+        deadline = self._start + self.max_seconds
+        while not self._stop.wait(self.interval) and time.perf_counter() < deadline:
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                return
+            stack: List[Frame] = []
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            del frame
+            stack.reverse()
+            self.samples[tuple(stack)] += 1
+
+    def record_sql(self, started: float, statement: str, rowcount: int) -> None:
+        if len(self.sql_events) >= MAX_SQL_EVENTS:
+            self.sql_dropped += 1
+            return
+        now = time.perf_counter()
+        self.sql_events.append(
+            {
+                "start_ms": round((started - self._start) * 1000, 3),
+                "duration_ms": round((now - started) * 1000, 3),
+                "rows": rowcount if isinstance(rowcount, int) and rowcount >= 0 else None,
+                "statement": " ".join(statement.split())[:MAX_STATEMENT_CHARS],
+            }
+        )
+
+    def collapsed(self) -> str:
+        lines = [
+            ";".join(f"{name} ({Path(filename).name}:{line})" for name, filename, line in stack) + f" {count}"
+            for stack, count in sorted(self.samples.items(), key=lambda item: -item[1])
+        ]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def speedscope(self) -> Dict[str, Any]:
+        frames: List[Dict[str, Any]] = []
+        index: Dict[Frame, int] = {}
+        samples: List[List[int]] = []
+        weights: List[float] = []
+        interval_ms = self.interval * 1000
+        for stack, count in self.samples.items():
+            row = []
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                row.append(index[frame])
+            samples.append(row)
+            weights.append(round(count * interval_ms, 3))
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.label,
+            "exporter": "ats-profiler",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": self.label,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": round(sum(weights), 3),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+    def timeline(self) -> Dict[str, Any]:
+        return {
+            "profile_id": self.profile_id,
+            "label": self.label,
+            "tenant_id": self.tenant_id,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "duration_ms": self.duration_ms,
+            "sample_interval_ms": self.interval * 1000,
+            "sample_count": sum(self.samples.values()),
+            "sql_count": len(self.sql_events) + self.sql_dropped,
+            "sql_ms": round(sum(e["duration_ms"] for e in self.sql_events), 3),
+            "sql_dropped": self.sql_dropped,
+            "sql": self.sql_events,
+        }
+
+
+def try_start_profile(label: str, tenant_id: str) -> Optional[ProfileSession]:
+    """Start a profile, or return None when another profile is already running."""
+    if not _profile_lock.acquire(blocking=False):
+        return None
+    try:
+        return ProfileSession(label, tenant_id).start()
+    except Exception:
+        _profile_lock.release()
+        raise
+
+
+async def finish_profile(profile: ProfileSession, root: Optional[str] = None) -> Path:
+    """Stop ``profile``, release the process slot and write its artifacts.
+
+    Joining the sampler and writing the files run in a worker thread so the
+    event loop keeps serving other requests meanwhile.
+    """
+    profile.deactivate()
+    try:
+        await asyncio.to_thread(profile.stop)
+    finally:
+        _profile_lock.release()
+    return await asyncio.to_thread(write_profile, profile, root)
+
+
+def _profile_dir(root: Optional[str], tenant_id: str) -> Path:
+    return Path(root or settings.PROFILING_ROOT) / str(tenant_id)
+
+
+def write_profile(profile: ProfileSession, root: Optional[str] = None) -> Path:
+    directory = _profile_dir(root, profile.tenant_id)
+    directory.mkdir(parents=True, exist_ok=True)
+    outputs = {
+        "speedscope": json.dumps(profile.speedscope()),
+        "collapsed": profile.collapsed(),
+        "timeline": json.dumps(profile.timeline(), indent=2),
+    }
+    for kind, text in outputs.items():
+        (directory / f"{profile.profile_id}{PROFILE_ARTIFACTS[kind][0]}").write_text(text, encoding="utf-8")
+    return directory / f"{profile.profile_id}{PROFILE_ARTIFACTS['timeline'][0]}"
+
+
+def profile_artifact_path(tenant_id: str, profile_id: str, kind: str, root: Optional[str] = None) -> Optional[Path]:
+    """Path of a stored artifact, or None for unknown ids/kinds (never escapes the tenant directory)."""
+    if kind not in PROFILE_ARTIFACTS or not PROFILE_ID_RE.match(profile_id):
+        return None
+    path = _profile_dir(root, tenant_id) / f"{profile_id}{PROFILE_ARTIFACTS[kind][0]}"
+    return path if path.is_file() else None
+
+
+def list_profiles(tenant_id: str, root: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+    """Newest-first profile summaries (timeline metadata without the SQL list)."""
+    directory = _profile_dir(root, tenant_id)
+    if not directory.is_dir():
+        return []
+    suffix = PROFILE_ARTIFACTS["timeline"][0]
+    summaries = []
+    for path in sorted(directory.glob(f"*{suffix}"), reverse=True)[:limit]:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        data.pop("sql", None)
+        summaries.append(data)
+    return summaries
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None and _active_profile.get() is not None:
+        context._profile_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    profile = _active_profile.get()
+    started = getattr(context, "_profile_started", None)
+    if profile is not None and started is not None:
+        profile.record_sql(started, statement, getattr(cursor, "rowcount", -1))
+
+
+def instrument_engine(sync_engine: Engine) -> None:
+    """Attach the SQL timeline listeners to an engine (idempotent)."""
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+async def _profile_tenant(headers: Iterable[Tuple[bytes, bytes]]) -> Optional[str]:
+    """Tenant id when the request asks to be profiled and its bearer token belongs to an active admin.
+
+    The role is taken from the principal lookup (cache, then database) the API
+    authorizes with, not from the token's claims.
+    """
+    values = dict(headers)
+    if values.get(PROFILE_HEADER.encode(), b"").strip().lower() not in (b"1", b"true", b"yes"):
+        return None
+    auth = values.get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = auth.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = decode_access_token(token.strip())
+    if not payload:
+        return None
+    try:
+        user_id = UUID(str(payload.get("user_id")))
+    except ValueError:
+        return None
+
+    from app.core.dependencies import load_principal_user  # local import to avoid cycle
+    from app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        user = await load_principal_user(session, user_id, payload.get("iat"))
+    if not user or not user.is_active or user.role != "admin":
+        return None
+    return str(user.tenant_id)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware: profile requests sent with ``X-Profile: 1`` by an admin.
+
+    Only installed when ``PROFILING_ENABLED`` is set. The response carries the
+    profile id in ``X-Profile-Id``; artifacts are retrieved from ``/internal/profiles``.
+    Requests arriving while another profile runs are served unprofiled.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        tenant_id = await _profile_tenant(scope.get("headers") or []) if scope["type"] == "http" else None
+        profile = try_start_profile(f"{scope['method']} {scope['path']}", tenant_id) if tenant_id else None
+        if profile is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_id(message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers") or [])
+                headers.append((PROFILE_ID_HEADER.lower().encode(), profile.profile_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            await finish_profile(profile)
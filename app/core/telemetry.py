@@ -0,0 +1,224 @@
+"""
+Per-step pipeline telemetry.
+
+A ``StepTelemetry`` is bound to the current task through a context variable for
+the duration of one run step. While it is active:
+
+- SQL statements on instrumented engines (see ``instrument_engine``) add to its
+  statement count, time and driver-reported rowcount
+- requests sent through ``TelemetryTransport`` (app/core/telemetry_http.py)
+  add to its HTTP count, bytes received and latency samples (time to response
+  headers)
+- ``record_domain_wait`` adds time spent waiting for a per-domain fetch slot
+
+``snapshot()`` returns a flat dict of numbers that is stored on the step
+(``CompanyResearchRunStep.metrics_json``). Nothing is recorded when no step is
+active, so API requests and scripts pay only a context-variable lookup.
+"""
+
+import math
+import time
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_current_step: ContextVar[Optional["StepTelemetry"]] = ContextVar("current_step_telemetry", default=None)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class StepTelemetry:
+    """Counters for one step; CPU time is process CPU (the worker runs one step at a time)."""
+
+    def __init__(self) -> None:
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.sql_rows = 0
+        self.http_count = 0
+        self.http_bytes = 0
+        self.http_errors = 0
+        self.http_latencies_ms: List[float] = []
+        self.domain_wait_ms = 0.0
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+        self._token = None
+
+    def start(self) -> "StepTelemetry":
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._token = _current_step.set(self)
+        return self
+
+    def stop(self) -> None:
+        if self._token is not None:
+            _current_step.reset(self._token)
+            self._token = None
+
+    def snapshot(self) -> dict:
+        latencies = sorted(self.http_latencies_ms)
+        return {
+            "wall_ms": round((time.perf_counter() - self._wall_start) * 1000, 3),
+            "cpu_ms": round((time.process_time() - self._cpu_start) * 1000, 3),
+            "sql_count": self.sql_count,
+            "sql_ms": round(self.sql_seconds * 1000, 3),
+            "sql_rows": self.sql_rows,
+            "http_count": self.http_count,
+            "http_errors": self.http_errors,
+            "http_bytes": self.http_bytes,
+            "http_latency_p50_ms": _percentile(latencies, 50),
+            "http_latency_p95_ms": _percentile(latencies, 95),
+            "http_latency_max_ms": latencies[-1] if latencies else None,
+            "domain_wait_ms": round(self.domain_wait_ms, 3),
+        }
+
+
+def start_step_telemetry() -> StepTelemetry:
+    return StepTelemetry().start()
+
+
+def current_step_telemetry() -> Optional[StepTelemetry]:
+    return _current_step.get()
+
+
+def record_domain_wait(waited_ms: float) -> None:
+    telemetry = _current_step.get()
+    if telemetry is not None and waited_ms > 0:
+        telemetry.domain_wait_ms += waited_ms
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None and _current_step.get() is not None:
+        context._telemetry_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    telemetry = _current_step.get()
+    started = getattr(context, "_telemetry_started", None)
+    if telemetry is None or started is None:
+        return
+    telemetry.sql_count += 1
+    telemetry.sql_seconds += time.perf_counter() - started
+    rowcount = getattr(cursor, "rowcount", -1)
+    if isinstance(rowcount, int) and rowcount > 0:
+        telemetry.sql_rows += rowcount
+
+
+def instrument_engine(sync_engine: Engine) -> None:
+    """Attach the SQL telemetry listeners to an engine (idempotent)."""
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def __getattr__(name: str):
+    # The httpx transport lives in telemetry_http so that importing this module
+    # (every process does, through app.db.session) does not import httpx.
+    if name == "TelemetryTransport":
+        from app.core.telemetry_http import TelemetryTransport
+
+        return TelemetryTransport
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Prometheus exposition of stored step metrics: (metric, metrics_json field, scale to base unit, help).
+STEP_METRIC_SUMS = [
+    ("research_step_wall_seconds", "wall_ms", 0.001, "Wall time spent in run steps."),
+    ("research_step_cpu_seconds", "cpu_ms", 0.001, "Process CPU time spent in run steps."),
+    ("research_step_sql_statements", "sql_count", 1, "SQL statements issued by run steps."),
+    ("research_step_sql_seconds", "sql_ms", 0.001, "Time spent executing SQL in run steps."),
+    ("research_step_sql_rows", "sql_rows", 1, "Rows reported by the driver for run step statements."),
+    ("research_step_http_requests", "http_count", 1, "HTTP requests sent by run steps."),
+    ("research_step_http_errors", "http_errors", 1, "HTTP requests that failed without a response."),
+    ("research_step_http_bytes", "http_bytes", 1, "HTTP response bytes received by run steps."),
+    (
+        "research_step_domain_wait_seconds",
+        "domain_wait_ms",
+        0.001,
+        "Time run steps waited for per-domain fetch slots.",
+    ),
+]
+STEP_METRIC_MAXES = [
+    ("research_step_http_latency_p95_seconds_max", "http_latency_p95_ms", 0.001, "Highest per-step p95 HTTP latency."),
+    ("research_step_wall_seconds_max", "wall_ms", 0.001, "Slowest single run step."),
+]
+
+
+def _label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_step_metrics(rows: List[dict]) -> str:
+    """Prometheus text format for rows from ``aggregate_step_metrics``.
+
+    Step metrics are rewritten on every attempt, so sums cover the latest
+    attempt of each step. Every series is a gauge: a retried step replaces its
+    earlier figures and a ``since`` window drops old steps, so values can fall.
+    """
+    lines: List[str] = [
+        "# HELP research_steps Run steps with recorded telemetry.",
+        "# TYPE research_steps gauge",
+    ]
+    labels = [f'step_key="{_label_value(r["step_key"])}",status="{_label_value(r["status"])}"' for r in rows]
+    lines += [f"research_steps{{{label}}} {row['steps']}" for label, row in zip(labels, rows)]
+    for prefix, specs in (("sum", STEP_METRIC_SUMS), ("max", STEP_METRIC_MAXES)):
+        for metric, field, scale, help_text in specs:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            for label, row in zip(labels, rows):
+                value = float(row.get(f"{prefix}_{field}") or 0.0) * scale
+                text = str(int(value)) if scale == 1 else repr(round(value, 6))
+                lines.append(f"{metric}{{{label}}} {text}")
+    return "\n".join(lines) + "\n"
+
+
+def render_job_queue_metrics(tenant_id: str, waits: List[dict], waiting: List[dict], priority_names: dict) -> str:
+    """Prometheus text format for rows from ``aggregate_job_queue_waits`` / ``aggregate_waiting_jobs``.
+
+    Queue wait runs from enqueue to the job's first start; jobs that have not
+    started yet are reported separately so a starved tenant still shows up.
+    """
+
+    def _labels(row: dict) -> str:
+        priority = priority_names.get(row["priority"], str(row["priority"]))
+        return (
+            f'tenant_id="{_label_value(tenant_id)}",job_type="{_label_value(row["job_type"])}",'
+            f'priority="{_label_value(priority)}"'
+        )
+
+    def _seconds(value) -> str:
+        return repr(round(float(value or 0.0), 6))
+
+    lines: List[str] = [
+        "# HELP research_job_queue_wait_seconds Time from enqueue to first start of started jobs.",
+        "# TYPE research_job_queue_wait_seconds summary",
+    ]
+    for row in waits:
+        label = _labels(row)
+        lines.append(f'research_job_queue_wait_seconds{{{label},quantile="0.5"}} {_seconds(row["wait_p50"])}')
+        lines.append(f'research_job_queue_wait_seconds{{{label},quantile="0.95"}} {_seconds(row["wait_p95"])}')
+        lines.append(f"research_job_queue_wait_seconds_sum{{{label}}} {_seconds(row['wait_sum'])}")
+        lines.append(f"research_job_queue_wait_seconds_count{{{label}}} {row['jobs']}")
+    lines += [
+        "# HELP research_job_queue_wait_seconds_max Longest queue wait of started jobs.",
+        "# TYPE research_job_queue_wait_seconds_max gauge",
+    ]
+    lines += [f"research_job_queue_wait_seconds_max{{{_labels(row)}}} {_seconds(row['wait_max'])}" for row in waits]
+    lines += [
+        "# HELP research_jobs_waiting Queued jobs that have not started yet.",
+        "# TYPE research_jobs_waiting gauge",
+    ]
+    lines += [f"research_jobs_waiting{{{_labels(row)}}} {row['jobs']}" for row in waiting]
+    lines += [
+        "# HELP research_job_oldest_waiting_seconds Age of the oldest job that has not started yet.",
+        "# TYPE research_job_oldest_waiting_seconds gauge",
+    ]
+    lines += [f"research_job_oldest_waiting_seconds{{{_labels(row)}}} {_seconds(row['oldest_wait'])}" for row in waiting]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,53 @@
+"""
+httpx transport that reports requests to the active step telemetry.
+
+Kept apart from app.core.telemetry so that processes which never fetch do not
+import httpx; ``app.core.telemetry.TelemetryTransport`` still resolves here.
+"""
+
+import time
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from app.core.telemetry import StepTelemetry, _current_step
+
+
+class _CountingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, telemetry: StepTelemetry) -> None:
+        self._stream = stream
+        self._telemetry = telemetry
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            self._telemetry.http_bytes += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+class TelemetryTransport(httpx.AsyncBaseTransport):
+    """httpx transport wrapper that reports requests to the active step telemetry."""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        telemetry = _current_step.get()
+        if telemetry is None:
+            return await self._transport.handle_async_request(request)
+
+        started = time.perf_counter()
+        telemetry.http_count += 1
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception:
+            telemetry.http_errors += 1
+            raise
+        telemetry.http_latencies_ms.append(round((time.perf_counter() - started) * 1000, 3))
+        response.stream = _CountingStream(response.stream, telemetry)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
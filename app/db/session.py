@@ -2,42 +2,263 @@
 Database session and engine configuration.
 
 This file sets up the async database connection using SQLAlchemy + asyncpg.
+
+Engines are built per workload profile so API requests, long-running workers
+and export/report queries do not share one pool:
+
+- "api": request/response traffic, short statement timeout
+- "worker": research workers and job runners, no statement timeout
+- "reporting": read-only export/report queries, optionally routed to a replica
+
+The default profile comes from settings.DB_ENGINE_PROFILE and can be switched by
+an entry point (e.g. the worker CLI) via configure_default_profile().
 """
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from typing import AsyncGenerator
+import threading
+import time
+from dataclasses import dataclass
+from typing import AsyncGenerator, Dict, Optional
 from contextlib import asynccontextmanager
 
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
 from app.core.config import settings
+from app.core import profiler, telemetry
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """Pool and connection settings for one workload."""
+
+    name: str
+    url: str
+    pool_size: int
+    max_overflow: int
+    pool_recycle: int
+    pool_pre_ping: bool
+    pool_timeout: int
+    statement_cache_size: int
+    statement_timeout_ms: int
+    application_name: str
+    read_only: bool = False
+
+
+def build_engine_profiles() -> Dict[str, EngineProfile]:
+    """Build the engine profiles from settings."""
+    common = {
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+    return {
+        "api": EngineProfile(
+            name="api",
+            url=settings.DATABASE_URL,
+            pool_size=settings.DB_API_POOL_SIZE,
+            max_overflow=settings.DB_API_MAX_OVERFLOW,
+            statement_timeout_ms=settings.DB_API_STATEMENT_TIMEOUT_MS,
+            application_name=f"{settings.DB_APPLICATION_NAME}:api",
+            **common,
+        ),
+        "worker": EngineProfile(
+            name="worker",
+            url=settings.DATABASE_URL,
+            pool_size=settings.DB_WORKER_POOL_SIZE,
+            max_overflow=settings.DB_WORKER_MAX_OVERFLOW,
+            statement_timeout_ms=settings.DB_WORKER_STATEMENT_TIMEOUT_MS,
+            application_name=f"{settings.DB_APPLICATION_NAME}:worker",
+            **common,
+        ),
+        "reporting": EngineProfile(
+            name="reporting",
+            url=settings.DATABASE_REPLICA_URL or settings.DATABASE_URL,
+            pool_size=settings.DB_REPORTING_POOL_SIZE,
+            max_overflow=settings.DB_REPORTING_MAX_OVERFLOW,
+            statement_timeout_ms=settings.DB_REPORTING_STATEMENT_TIMEOUT_MS,
+            application_name=f"{settings.DB_APPLICATION_NAME}:reporting",
+            read_only=True,
+            **common,
+        ),
+    }
+
+
+ENGINE_PROFILES: Dict[str, EngineProfile] = build_engine_profiles()
+
+
+class PoolWaitStats:
+    """Running totals of time spent waiting for a pooled connection."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.slow_checkouts = 0
+
+    def record(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_seconds += wait_seconds
+            if wait_seconds > self.max_wait_seconds:
+                self.max_wait_seconds = wait_seconds
+            if wait_seconds >= 0.1:
+                self.slow_checkouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            avg = self.total_wait_seconds / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "total_wait_ms": round(self.total_wait_seconds * 1000, 3),
+                "avg_wait_ms": round(avg * 1000, 3),
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+                "slow_checkouts_over_100ms": self.slow_checkouts,
+            }
+
+
+POOL_WAIT_STATS: Dict[str, PoolWaitStats] = {name: PoolWaitStats() for name in ENGINE_PROFILES}
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    profile_name = "api"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT_STATS[self.profile_name].record(time.perf_counter() - started)
+
+
+def _connect_args(profile: EngineProfile) -> dict:
+    if not profile.url.startswith("postgresql+asyncpg"):
+        return {}
+    server_settings = {"application_name": profile.application_name}
+    if profile.statement_timeout_ms > 0:
+        server_settings["statement_timeout"] = str(profile.statement_timeout_ms)
+    if profile.read_only:
+        server_settings["default_transaction_read_only"] = "on"
+    return {
+        "statement_cache_size": profile.statement_cache_size,
+        "server_settings": server_settings,
+    }
 
 
-# Create the async database engine
-# This is the connection to your PostgreSQL database
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,  # When DEBUG=True, prints SQL queries to console (helpful for learning)
-    future=True,
-)
+def _create_engine(profile: EngineProfile) -> AsyncEngine:
+    pool_class = type(f"TimedQueuePool_{profile.name}", (TimedQueuePool,), {"profile_name": profile.name})
+    engine = create_async_engine(
+        profile.url,
+        echo=settings.DEBUG,  # When DEBUG=True, prints SQL queries to console (helpful for learning)
+        future=True,
+        poolclass=pool_class,
+        pool_size=profile.pool_size,
+        max_overflow=profile.max_overflow,
+        pool_recycle=profile.pool_recycle,
+        pool_pre_ping=profile.pool_pre_ping,
+        pool_timeout=profile.pool_timeout,
+        connect_args=_connect_args(profile),
+    )
+    telemetry.instrument_engine(engine.sync_engine)
+    profiler.instrument_engine(engine.sync_engine)
+    return engine
+
+
+_engines: Dict[str, AsyncEngine] = {}
+_sessionmakers: Dict[str, async_sessionmaker] = {}
+_default_profile = settings.DB_ENGINE_PROFILE if settings.DB_ENGINE_PROFILE in ENGINE_PROFILES else "api"
+
+
+def get_engine(profile: Optional[str] = None) -> AsyncEngine:
+    """Return the engine for a profile (default profile when omitted), creating it on first use."""
+    name = profile or _default_profile
+    if name not in ENGINE_PROFILES:
+        raise ValueError(f"unknown_engine_profile:{name}")
+    if name not in _engines:
+        _engines[name] = _create_engine(ENGINE_PROFILES[name])
+    return _engines[name]
+
+
+def get_sessionmaker(profile: Optional[str] = None) -> async_sessionmaker:
+    """Return the session factory bound to a profile's engine."""
+    name = profile or _default_profile
+    if name not in _sessionmakers:
+        _sessionmakers[name] = async_sessionmaker(
+            get_engine(name),
+            class_=AsyncSession,
+            expire_on_commit=False,  # Keeps data accessible after commit
+        )
+    return _sessionmakers[name]
+
+
+def configure_default_profile(profile: str) -> None:
+    """Select the profile used by AsyncSessionLocal/get_db in this process (call at startup)."""
+    global _default_profile
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f"unknown_engine_profile:{profile}")
+    _default_profile = profile
+
+
+def get_default_profile() -> str:
+    return _default_profile
+
+
+def pool_metrics() -> Dict[str, dict]:
+    """Pool wait-time and occupancy per profile that has an engine in this process."""
+    metrics: Dict[str, dict] = {}
+    for name, eng in _engines.items():
+        pool = eng.sync_engine.pool
+        metrics[name] = {
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "wait": POOL_WAIT_STATS[name].snapshot(),
+        }
+    return metrics
+
+
+class _ProfileSessionFactory:
+    """Session factory that resolves its profile at call time.
+
+    Modules import AsyncSessionLocal once; resolving lazily lets an entry point
+    switch the default profile after those imports.
+    """
+
+    def __init__(self, profile: Optional[str] = None):
+        self.profile = profile
+
+    def __call__(self, **kwargs) -> AsyncSession:
+        return get_sessionmaker(self.profile)(**kwargs)
+
 
 # Create a session factory
 # Sessions are used to interact with the database (read, write, update, delete)
-async_session_maker = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,  # Keeps data accessible after commit
-)
+async_session_maker = _ProfileSessionFactory()
 
 # Alias for dependencies
 AsyncSessionLocal = async_session_maker
 
+# Read-only factory for export/report queries
+ReportingSessionLocal = _ProfileSessionFactory("reporting")
+
+
+def __getattr__(name: str):
+    # Backwards compatibility for scripts that import the module-level engine.
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(name)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Get a database session.
-    
+
     This is used by FastAPI to provide a database connection to your API endpoints.
     The session is automatically closed when the request is done.
-    
+
     Usage in a FastAPI endpoint:
         @app.get("/items")
         async def get_items(db: AsyncSession = Depends(get_db)):
@@ -56,9 +277,9 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
 
 @asynccontextmanager
-async def get_async_session_context() -> AsyncGenerator[AsyncSession, None]:
-    """Context manager helper for async DB sessions (used in tests/scripts)."""
-    async with async_session_maker() as session:
+async def get_async_session_context(profile: Optional[str] = None) -> AsyncGenerator[AsyncSession, None]:
+    """Context manager helper for async DB sessions (used in tests/scripts/workers)."""
+    async with get_sessionmaker(profile)() as session:
         try:
             yield session
             await session.commit()
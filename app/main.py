@@ -11,6 +11,7 @@ from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
+from app.core.profiler import ProfilingMiddleware
 from app.errors import AppError, app_error_handler
 from app.routers import (
     health,
@@ -32,6 +33,7 @@ from app.routers import (
     search,
     company_research,
     research_runs,
+    profiling,
 )
 
 # UI routes
@@ -82,6 +84,10 @@ app = FastAPI(
 
 app.add_exception_handler(AppError, app_error_handler)
 
+# Opt-in request profiling (X-Profile: 1 from an admin); not installed unless enabled
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
 
 # Include routers (API endpoints)
 app.include_router(health.router, tags=["Health"])
@@ -104,6 +110,7 @@ app.include_router(enrichment_assignments.router)
 app.include_router(search.router)
 app.include_router(company_research.router)
 app.include_router(research_runs.router)
+app.include_router(profiling.router, tags=["Internal"])
 
 # UI routes (session-based authentication)
 app.include_router(ui_auth.router)
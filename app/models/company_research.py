@@ -15,6 +15,7 @@ from sqlalchemy import (
     Text,
     Integer,
     Numeric,
+    Float,
     Boolean,
     DateTime,
     ForeignKey,
@@ -24,12 +25,18 @@ from sqlalchemy import (
     LargeBinary,
     func,
     BigInteger,
+    SmallInteger,
+    Sequence,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from sqlalchemy import UniqueConstraint
 
+from app.core.config import settings
 from app.models.base_model import TenantScopedModel
+from app.utils.company_name_match import name_match_keys
+from app.utils.content_codec import compress, decompress, resolve_codec
+from app.utils.time import utc_now
 
 if TYPE_CHECKING:
     from app.models.role import Role
@@ -225,6 +232,15 @@ class CompanyProspect(TenantScopedModel):
         nullable=False,
         index=True,
     )  # Canonical cleaned name for deduplication
+
+    # Fuzzy-match blocking keys of name_raw (see app/utils/company_name_match.py), kept in
+    # step with name_raw by _set_name_match_keys.
+    name_match_keys: Mapped[list] = mapped_column(
+        JSONB,
+        nullable=False,
+        default=list,
+        server_default="[]",
+    )
     
     website_url: Mapped[Optional[str]] = mapped_column(
         String(500),
@@ -420,6 +436,11 @@ class CompanyProspect(TenantScopedModel):
         back_populates="prospect",
         cascade="all, delete-orphan",
     )
+
+    @validates("name_raw")
+    def _set_name_match_keys(self, key: str, value: str) -> str:
+        self.name_match_keys = name_match_keys(value)
+        return value
     
     __table_args__ = (
         Index("ix_company_prospects_role_mandate_id", "role_mandate_id"),
@@ -432,6 +453,7 @@ class CompanyProspect(TenantScopedModel):
             "review_status",
         ),
         Index("ix_company_prospects_name_normalized", "name_normalized"),
+        Index("ix_company_prospects_name_match_keys", "name_match_keys", postgresql_using="gin"),
         Index("ix_company_prospects_relevance_score", "relevance_score"),
         Index("ix_company_prospects_manual_priority", "manual_priority"),
         Index("ix_company_prospects_is_pinned", "is_pinned"),
@@ -1102,6 +1124,10 @@ class CompanyProspectMetric(TenantScopedModel):
     )
 
 
+# Shared by the change stamps on ResearchSourceDocument (see content_seq).
+source_change_seq = Sequence("source_documents_change_seq", metadata=TenantScopedModel.metadata)
+
+
 class ResearchSourceDocument(TenantScopedModel):
     """
     Source document for company research.
@@ -1160,7 +1186,11 @@ class ResearchSourceDocument(TenantScopedModel):
 
     content_size: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
-    content_bytes: Mapped[Optional[bytes]] = mapped_column(
+    # Stored payloads (see app/utils/content_codec.py): raw when content_codec is NULL,
+    # otherwise compressed, with the text in content_text_packed. Read and write them
+    # through the content_bytes / content_text properties.
+    stored_content_bytes: Mapped[Optional[bytes]] = mapped_column(
+        "content_bytes",
         LargeBinary,
         nullable=True,
     )
@@ -1179,10 +1209,17 @@ class ResearchSourceDocument(TenantScopedModel):
     )
     
     # Content
-    content_text: Mapped[Optional[str]] = mapped_column(
+    stored_content_text: Mapped[Optional[str]] = mapped_column(
+        "content_text",
         Text,
         nullable=True,
-    )  # Extracted text content
+    )  # Extracted text content, when stored raw
+    packed_content_text: Mapped[Optional[bytes]] = mapped_column(
+        "content_text_packed",
+        LargeBinary,
+        nullable=True,
+    )  # Extracted text content, UTF-8 compressed with content_codec
+    content_codec: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
     
     content_hash: Mapped[Optional[str]] = mapped_column(
         String(64),
@@ -1247,18 +1284,108 @@ class ResearchSourceDocument(TenantScopedModel):
         DateTime(timezone=True),
         nullable=True,
     )
+
+    # Change stamps drawn from source_documents_change_seq. content_seq moves when
+    # fetched content changes; each pipeline stage stamps the rows it consumed, so
+    # a stage only selects rows whose upstream stamp is newer than its own.
+    content_seq: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        nullable=True,
+        server_default=source_change_seq.next_value(),
+    )
+    extracted_seq: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    classified_seq: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    processed_seq: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
     
     # Relationship
     research_run: Mapped["CompanyResearchRun"] = relationship(
         "CompanyResearchRun",
         back_populates="source_documents",
     )
-    
+
+    @property
+    def content_bytes(self) -> Optional[bytes]:
+        return self._unpack("stored_content_bytes", self.stored_content_bytes)
+
+    @content_bytes.setter
+    def content_bytes(self, value: Optional[bytes]) -> None:
+        self._pack_content(value, self.content_text, bytes_changed=True)
+
+    @property
+    def content_text(self) -> Optional[str]:
+        if self.content_codec is None:
+            return self.stored_content_text
+        data = self._unpack("packed_content_text", self.packed_content_text)
+        return data.decode("utf-8") if data is not None else None
+
+    @content_text.setter
+    def content_text(self, value: Optional[str]) -> None:
+        self._pack_content(self.content_bytes, value, bytes_changed=False)
+
+    def _unpack(self, column: str, stored: Optional[bytes]) -> Optional[bytes]:
+        """Decode a stored payload; the result is kept until the stored value changes."""
+        if stored is None or self.content_codec is None:
+            return stored
+        cache = self.__dict__.setdefault("_unpacked_content", {})
+        cached = cache.get(column)
+        if cached is not None and cached[0] is stored and cached[1] == self.content_codec:
+            return cached[2]
+        data = decompress(stored, self.content_codec)
+        cache[column] = (stored, self.content_codec, data)
+        return data
+
+    def _pack_content(self, data: Optional[bytes], text_value: Optional[str], *, bytes_changed: bool) -> None:
+        """Store both payloads under one codec; the unchanged one is only rewritten if the codec changes."""
+        values = self.packed_content_values(
+            data,
+            text_value,
+            skip="text" if bytes_changed else "bytes",
+            current_codec=self.content_codec,
+        )
+        for column, value in values.items():
+            setattr(self, column, value)
+
+    @staticmethod
+    def packed_content_values(
+        data: Optional[bytes],
+        text_value: Optional[str],
+        *,
+        skip: Optional[str] = None,
+        current_codec: Optional[str] = None,
+    ) -> dict:
+        """Stored column values for the given payloads (also used by bulk inserts and the backfill).
+
+        ``skip`` ("bytes" or "text") leaves that payload's columns out unless the codec
+        differs from ``current_codec``, so an unchanged payload is not recompressed.
+        """
+        encoded_text = text_value.encode("utf-8") if text_value is not None else None
+        codec = resolve_codec(settings.SOURCE_CONTENT_CODEC)
+        if max(len(data or b""), len(encoded_text or b"")) < settings.SOURCE_CONTENT_COMPRESS_MIN_BYTES:
+            codec = None
+        if codec != current_codec:
+            skip = None
+        values: dict = {"content_codec": codec}
+        if skip != "bytes":
+            values["stored_content_bytes"] = compress(data, codec) if data is not None else None
+        if skip != "text":
+            if codec is None:
+                values["stored_content_text"], values["packed_content_text"] = text_value, None
+            else:
+                packed = compress(encoded_text, codec) if encoded_text is not None else None
+                values["stored_content_text"], values["packed_content_text"] = None, packed
+        return values
+
     __table_args__ = (
         Index("ix_source_documents_run_id", "company_research_run_id"),
         Index("ix_source_documents_status", "status"),
         Index("ix_source_documents_hash", "content_hash"),
         Index("ix_source_documents_canonical_source_id", "canonical_source_id"),
+        Index("ix_source_documents_run_content_seq", "tenant_id", "company_research_run_id", "content_seq"),
+        Index(
+            "ix_source_documents_lsh_bands",
+            text("(meta -> 'extraction' -> 'lsh_bands')"),
+            postgresql_using="gin",
+        ),
         # Note: Unique constraint on (tenant_id, content_hash) would be beneficial but skipped due to existing duplicates
     )
 
@@ -1287,35 +1414,71 @@ class RobotsPolicyCache(TenantScopedModel):
     )
 
 
+class DomainRateLimit(TenantScopedModel):
+    """Learned fetch limits per tenant/domain (see app/core/domain_rate_control.py)."""
+
+    __tablename__ = "domain_rate_limits"
+
+    domain: Mapped[str] = mapped_column(String(255), nullable=False)
+    concurrency_limit: Mapped[float] = mapped_column(Float, nullable=False, server_default=text("1"))
+    delay_ms: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    latency_ewma_ms: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    latency_floor_ms: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    throttle_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    last_status_code: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_throttled_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    cooldown_until: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "domain", name="uq_domain_rate_limits"),
+    )
+
+
 class CompanyResearchEvent(TenantScopedModel):
     """
     Audit log for research processing events.
     
     Tracks all processing steps (fetch, extract, dedupe, enrich) with
     input/output data and error details for debugging and monitoring.
+
+    Range-partitioned by month on created_at (research_events_pYYYYMM plus a
+    default partition), so created_at is part of the primary key. Old months
+    are compacted and dropped by ResearchEventRetentionService.
     """
     
     __tablename__ = "research_events"
+
+    # Covered by ix_research_events_run_timeline (tenant_id leads it)
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=False,
+    )
+
+    # Partition key; set client-side so the full primary key is known on insert
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        default=utc_now,
+        server_default=func.now(),
+        nullable=False,
+    )
     
     # Foreign key to research run
     company_research_run_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("company_research_runs.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     
     # Event classification
     event_type: Mapped[str] = mapped_column(
         String(50),
         nullable=False,
-        index=True,
-    )  # enum: fetch|extract|dedupe|enrich
+    )  # enum: fetch|extract|dedupe|enrich|events_rollup
     
     status: Mapped[str] = mapped_column(
         String(50),
         nullable=False,
-        index=True,
     )  # enum: ok|failed
     
     # Event data
@@ -1341,10 +1504,14 @@ class CompanyResearchEvent(TenantScopedModel):
     )
     
     __table_args__ = (
-        Index("ix_research_events_run_id", "company_research_run_id"),
-        Index("ix_research_events_type", "event_type"),
-        Index("ix_research_events_status", "status"),
-        Index("ix_research_events_created", "created_at"),
+        # Run timeline: list_research_events_for_run filters tenant/run and sorts newest first
+        Index(
+            "ix_research_events_run_timeline",
+            "tenant_id",
+            "company_research_run_id",
+            text("created_at DESC"),
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
 
 
@@ -1375,6 +1542,14 @@ class CompanyResearchJob(TenantScopedModel):
         index=True,
     )  # queued|running|succeeded|failed|cancelled
 
+    # Claim order class: 0 interactive, 1 batch, 2 maintenance (JOB_PRIORITY_* in the repository).
+    priority: Mapped[int] = mapped_column(
+        SmallInteger,
+        nullable=False,
+        default=1,
+        server_default=text("1"),
+    )
+
     params_json: Mapped[Optional[dict]] = mapped_column(
         JSONB,
         nullable=True,
@@ -1425,6 +1600,20 @@ class CompanyResearchJob(TenantScopedModel):
         nullable=True,
     )
 
+    # Fencing token, incremented on every claim: only the holder of the current token may renew or commit.
+    lease_token: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default=text("0"),
+    )
+
+    # Last time a worker claimed this job; the tenant's latest claim drives fair-share ordering.
+    claimed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
     cancel_requested: Mapped[bool] = mapped_column(
         Boolean,
         nullable=False,
@@ -1454,6 +1643,14 @@ class CompanyResearchJob(TenantScopedModel):
     __table_args__ = (
         Index("ix_company_research_jobs_status_next_retry", "tenant_id", "status", "next_retry_at"),
         Index("ix_company_research_jobs_tenant_run", "tenant_id", "run_id"),
+        Index(
+            "ix_company_research_jobs_claimable",
+            "tenant_id",
+            "priority",
+            "created_at",
+            postgresql_where=text("status IN ('queued','failed','running')"),
+        ),
+        Index("ix_company_research_jobs_tenant_claimed", "tenant_id", "claimed_at"),
         Index(
             "uq_company_research_jobs_active",
             "tenant_id",
@@ -1522,6 +1719,8 @@ class CompanyResearchRunStep(TenantScopedModel):
     finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     input_json: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
     output_json: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    # Execution telemetry from app.core.telemetry (timings, SQL/HTTP counts, bytes).
+    metrics_json: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
     last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     research_run: Mapped["CompanyResearchRun"] = relationship(
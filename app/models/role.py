@@ -7,7 +7,7 @@ Represents a job opening/position that needs to be filled.
 import uuid
 from typing import Optional, List, TYPE_CHECKING
 
-from sqlalchemy import String, Text, ForeignKey, Index
+from sqlalchemy import Integer, String, Text, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -71,6 +71,15 @@ class Role(TenantScopedModel):
         nullable=True,
     )
     
+    # Number of candidate_assignment rows for this role. Maintained by the
+    # role_candidate_count trigger on candidate_assignment; never set it here.
+    candidate_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default=text("0"),
+    )
+    
     # Relationship to company
     company: Mapped["Company"] = relationship(
         "Company",
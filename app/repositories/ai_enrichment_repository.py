@@ -3,7 +3,7 @@ Repository for AIEnrichmentRecord database operations.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Iterable, Optional, Tuple
 from uuid import UUID
 
 from sqlalchemy import select, and_, desc
@@ -170,3 +170,66 @@ class AIEnrichmentRepository:
             .limit(1)
         )
         return result.scalar_one_or_none()
+
+    async def list_latest_for_providers(
+        self,
+        tenant_id: UUID,
+        providers: Iterable[str],
+        purpose: str,
+        target_ids: Iterable[UUID],
+        target_type: str,
+    ) -> Dict[Tuple[str, UUID], AIEnrichmentRecord]:
+        """Batched ``get_latest_for_provider``: newest enrichment per (provider, target_id)."""
+        providers = list(providers)
+        target_ids = list(target_ids)
+        if not providers or not target_ids:
+            return {}
+        result = await self.db.execute(
+            select(AIEnrichmentRecord)
+            .where(
+                and_(
+                    AIEnrichmentRecord.tenant_id == tenant_id,
+                    AIEnrichmentRecord.provider.in_(providers),
+                    AIEnrichmentRecord.purpose == purpose,
+                    AIEnrichmentRecord.target_id.in_(target_ids),
+                    AIEnrichmentRecord.target_type == target_type,
+                )
+            )
+            .distinct(AIEnrichmentRecord.provider, AIEnrichmentRecord.target_id)
+            .order_by(
+                AIEnrichmentRecord.provider,
+                AIEnrichmentRecord.target_id,
+                desc(AIEnrichmentRecord.created_at),
+            )
+        )
+        return {(record.provider, record.target_id): record for record in result.scalars().all()}
+
+    async def list_by_hashes(
+        self,
+        tenant_id: UUID,
+        purpose: str,
+        target_type: str,
+        keys: Iterable[Tuple[str, str, UUID]],
+    ) -> Dict[Tuple[str, str, UUID], AIEnrichmentRecord]:
+        """Batched ``get_by_hash`` for (provider, content_hash, target_id) idempotency keys."""
+        wanted = set(keys)
+        if not wanted:
+            return {}
+        result = await self.db.execute(
+            select(AIEnrichmentRecord).where(
+                and_(
+                    AIEnrichmentRecord.tenant_id == tenant_id,
+                    AIEnrichmentRecord.purpose == purpose,
+                    AIEnrichmentRecord.target_type == target_type,
+                    AIEnrichmentRecord.provider.in_({key[0] for key in wanted}),
+                    AIEnrichmentRecord.content_hash.in_({key[1] for key in wanted}),
+                    AIEnrichmentRecord.target_id.in_({key[2] for key in wanted}),
+                )
+            )
+        )
+        found: Dict[Tuple[str, str, UUID], AIEnrichmentRecord] = {}
+        for record in result.scalars().all():
+            key = (record.provider, record.content_hash, record.target_id)
+            if key in wanted:
+                found[key] = record
+        return found
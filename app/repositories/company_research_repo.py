@@ -4,21 +4,23 @@ Company Research repository - database operations.
 Handles CRUD operations for company discovery and agentic sourcing.
 """
 
-from typing import List, Optional
+import json
+from typing import AsyncIterator, Dict, List, Optional, Sequence
 from datetime import datetime, timedelta
 from uuid import UUID
 import uuid
 
-from sqlalchemy import select, func, desc, asc, and_, or_, text
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import select, update, func, desc, asc, and_, or_, text, case, literal, literal_column, true, tuple_
+from sqlalchemy.dialects.postgresql import JSONB, array as postgresql_array, insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
 from app.models.company_research import (
     CompanyResearchRun,
     CompanyProspect,
     CompanyProspectEvidence,
     CompanyProspectMetric,
+    CompanyMetric,
     ResearchSourceDocument,
     CompanyResearchEvent,
     CompanyResearchJob,
@@ -26,6 +28,7 @@ from app.models.company_research import (
     CompanyResearchRunStep,
     CompanyResearchExportPack,
     RobotsPolicyCache,
+    DomainRateLimit,
     ExecutiveProspect,
     ExecutiveProspectEvidence,
     ExecutiveMergeDecision,
@@ -37,6 +40,7 @@ from app.models.company_research import (
     CanonicalCompany,
     CanonicalCompanyDomain,
     CanonicalCompanyLink,
+    source_change_seq,
 )
 from app.models.ai_enrichment_record import AIEnrichmentRecord
 from app.schemas.company_research import (
@@ -51,8 +55,58 @@ from app.schemas.company_research import (
     SourceDocumentUpdate,
     ResearchEventCreate,
 )
+from app.utils.content_codec import decompress
 from app.utils.time import utc_now
 
+# NOTIFY channel for appended research events (see app/services/run_event_stream.py)
+RUN_EVENT_CHANNEL = "research_events"
+
+# Column order of the compact rows read by app/services/run_resolution_snapshot.py
+EXECUTIVE_ROW_COLUMNS = (
+    ExecutiveProspect.id,
+    ExecutiveProspect.company_research_run_id,
+    ExecutiveProspect.company_prospect_id,
+    ExecutiveProspect.name_raw,
+    ExecutiveProspect.name_normalized,
+    ExecutiveProspect.email,
+    ExecutiveProspect.linkedin_url,
+    ExecutiveProspect.source_document_id,
+    ExecutiveProspect.created_at,
+)
+COMPANY_ROW_COLUMNS = (
+    CompanyProspect.id,
+    CompanyProspect.company_research_run_id,
+    CompanyProspect.name_raw,
+    CompanyProspect.name_normalized,
+    CompanyProspect.website_url,
+    CompanyProspect.hq_country,
+    CompanyProspect.created_at,
+)
+# Rows per multi-row INSERT (stays well under the 32767 bind parameter limit)
+BULK_WRITE_BATCH = 1000
+
+# company_research_jobs.priority classes, claimed in this order.
+JOB_PRIORITY_INTERACTIVE = 0
+JOB_PRIORITY_BATCH = 1
+JOB_PRIORITY_MAINTENANCE = 2
+JOB_PRIORITY_CLASSES = {
+    JOB_PRIORITY_INTERACTIVE: "interactive",
+    JOB_PRIORITY_BATCH: "batch",
+    JOB_PRIORITY_MAINTENANCE: "maintenance",
+}
+
+
+def run_event_notification(event: CompanyResearchEvent) -> str:
+    """NOTIFY payload for an event; listeners re-read the rows, so only routing keys are sent."""
+    return json.dumps(
+        {
+            "tenant_id": str(event.tenant_id),
+            "run_id": str(event.company_research_run_id),
+            "event_id": str(event.id),
+            "event_type": event.event_type,
+        }
+    )
+
 
 class CompanyResearchRepository:
     """Repository for company research operations."""
@@ -473,6 +527,87 @@ class CompanyResearchRepository:
             )
         )
         return result.scalar() or 0
+
+    async def list_latest_company_metrics_for_prospects(
+        self,
+        tenant_id: str,
+        prospect_ids: List[UUID],
+    ) -> Dict[UUID, List[CompanyMetric]]:
+        """
+        Latest CompanyMetric per (prospect, metric_key) for many prospects in one query.
+
+        Uses DISTINCT ON so only the newest as_of_date row per key is returned,
+        considering only rows whose value_* column for their value_type is set:
+        a newer row without a value falls back to the newest older one that has
+        one. Ties on as_of_date go to the most recently created row.
+        """
+        if not prospect_ids:
+            return {}
+
+        has_value = or_(
+            and_(CompanyMetric.value_type == "number", CompanyMetric.value_number.isnot(None)),
+            and_(CompanyMetric.value_type == "text", CompanyMetric.value_text.isnot(None)),
+            and_(CompanyMetric.value_type == "bool", CompanyMetric.value_bool.isnot(None)),
+            # JSON null reads back as None, so it counts as missing too.
+            and_(CompanyMetric.value_type == "json", func.jsonb_typeof(CompanyMetric.value_json) != "null"),
+        )
+        result = await self.db.execute(
+            select(CompanyMetric)
+            .where(
+                CompanyMetric.tenant_id == tenant_id,
+                CompanyMetric.company_prospect_id.in_(prospect_ids),
+                has_value,
+            )
+            .distinct(CompanyMetric.company_prospect_id, CompanyMetric.metric_key)
+            .order_by(
+                CompanyMetric.company_prospect_id,
+                CompanyMetric.metric_key,
+                desc(CompanyMetric.as_of_date).nulls_last(),
+                desc(CompanyMetric.created_at),
+                CompanyMetric.id,
+            )
+        )
+        metrics_by_prospect: Dict[UUID, List[CompanyMetric]] = {}
+        for metric in result.scalars().all():
+            metrics_by_prospect.setdefault(metric.company_prospect_id, []).append(metric)
+        return metrics_by_prospect
+
+    async def summarize_evidence_for_prospects(
+        self,
+        tenant_id: str,
+        prospect_ids: List[UUID],
+    ) -> Dict[UUID, dict]:
+        """
+        Evidence count and manual-list membership (A/B) per prospect, aggregated in SQL.
+        """
+        if not prospect_ids:
+            return {}
+
+        is_list = CompanyProspectEvidence.source_type == "manual_list"
+        list_label = case(
+            (and_(is_list, func.strpos(CompanyProspectEvidence.source_name, "A") > 0), "A"),
+            (and_(is_list, func.strpos(CompanyProspectEvidence.source_name, "B") > 0), "B"),
+            else_=None,
+        )
+        result = await self.db.execute(
+            select(
+                CompanyProspectEvidence.company_prospect_id,
+                func.count(CompanyProspectEvidence.id).label("evidence_count"),
+                func.array_remove(func.array_agg(list_label.distinct()), None).label("list_sources"),
+            )
+            .where(
+                CompanyProspectEvidence.tenant_id == tenant_id,
+                CompanyProspectEvidence.company_prospect_id.in_(prospect_ids),
+            )
+            .group_by(CompanyProspectEvidence.company_prospect_id)
+        )
+        return {
+            row.company_prospect_id: {
+                "evidence_count": int(row.evidence_count or 0),
+                "list_sources": sorted(row.list_sources or []),
+            }
+            for row in result.all()
+        }
     
     # ========================================================================
     # Company Prospect Evidence Operations
@@ -609,6 +744,45 @@ class CompanyResearchRepository:
         )
         return result.scalar_one_or_none()
 
+    async def list_executive_prospects_by_ids(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        executive_ids: List[UUID],
+    ) -> List[ExecutiveProspect]:
+        """Load run executives (with company context) for a batch of ids in one query."""
+        ids = list({eid for eid in executive_ids if eid})
+        if not ids:
+            return []
+        result = await self.db.execute(
+            select(ExecutiveProspect)
+            .options(selectinload(ExecutiveProspect.company_prospect))
+            .where(
+                ExecutiveProspect.tenant_id == tenant_id,
+                ExecutiveProspect.company_research_run_id == run_id,
+                ExecutiveProspect.id.in_(ids),
+            )
+        )
+        return list(result.scalars().all())
+
+    async def list_executive_ids_in_run(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        executive_ids: List[UUID],
+    ) -> set[UUID]:
+        ids = list({eid for eid in executive_ids if eid})
+        if not ids:
+            return set()
+        result = await self.db.execute(
+            select(ExecutiveProspect.id).where(
+                ExecutiveProspect.tenant_id == tenant_id,
+                ExecutiveProspect.company_research_run_id == run_id,
+                ExecutiveProspect.id.in_(ids),
+            )
+        )
+        return set(result.scalars().all())
+
     async def list_executive_evidence_for_run(
         self,
         tenant_id: str,
@@ -767,53 +941,135 @@ class CompanyResearchRepository:
             return existing, False
         raise RuntimeError("merge_decision_upsert_failed")
 
-    async def list_executive_rank_inputs(
+    async def list_ranked_executives(
         self,
         tenant_id: str,
         run_id: UUID,
+        *,
+        verification_weights: Dict[str, float],
+        provenance_weights: Dict[str, float],
+        verification_order: Dict[str, int],
+        provenance_order: Dict[str, int],
         company_prospect_id: Optional[UUID] = None,
+        provenance: Optional[str] = None,
+        verification_status: Optional[str] = None,
+        q: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
     ) -> List[dict]:
-        """Fetch executives with company context and evidence pointers (distinct) for ranking."""
+        """Score and rank executives in SQL, returning only the requested page.
+
+        ``rank_position`` is ``ROW_NUMBER()`` over the filtered run ordered by
+        score with the stable tie-breakers; ``company_rank_position`` is the same
+        ordering partitioned by company prospect. Evidence pointers are distinct.
+        """
+
+        evidence = (
+            select(
+                ExecutiveProspectEvidence.executive_prospect_id.label("executive_prospect_id"),
+                func.array_agg(func.distinct(ExecutiveProspectEvidence.source_document_id))
+                .filter(ExecutiveProspectEvidence.source_document_id.isnot(None))
+                .label("source_document_ids"),
+                func.count(func.distinct(ExecutiveProspectEvidence.source_document_id)).label("evidence_count"),
+            )
+            .where(
+                ExecutiveProspectEvidence.tenant_id == tenant_id,
+                ExecutiveProspectEvidence.executive_prospect_id.in_(
+                    select(ExecutiveProspect.id).where(
+                        ExecutiveProspect.tenant_id == tenant_id,
+                        ExecutiveProspect.company_research_run_id == run_id,
+                    )
+                ),
+            )
+            .group_by(ExecutiveProspectEvidence.executive_prospect_id)
+            .subquery("exec_evidence")
+        )
+
+        provenance_value = func.lower(
+            func.trim(
+                func.coalesce(
+                    func.nullif(ExecutiveProspect.discovered_by, ""),
+                    func.nullif(ExecutiveProspect.source_label, ""),
+                    "",
+                )
+            )
+        )
+        verification_value = func.lower(
+            func.trim(
+                func.coalesce(
+                    func.nullif(ExecutiveProspect.verification_status, ""),
+                    func.nullif(CompanyProspect.verification_status, ""),
+                    "unverified",
+                )
+            )
+        )
+        display_name = func.coalesce(
+            func.nullif(ExecutiveProspect.name_normalized, ""),
+            func.nullif(ExecutiveProspect.name_raw, ""),
+            "",
+        )
 
-        evidence_ids = func.array_agg(func.distinct(ExecutiveProspectEvidence.source_document_id)).label(
-            "evidence_source_document_ids"
+        ver_weight = case(verification_weights, value=verification_value, else_=0.0)
+        prov_weight = case(provenance_weights, value=provenance_value, else_=0.0)
+        evidence_weight = func.least(func.coalesce(evidence.c.evidence_count, 0) * 10.0, 100.0)
+        rank_score = ver_weight + prov_weight + evidence_weight
+
+        ordering = (
+            desc(rank_score),
+            desc(case(verification_order, value=verification_value, else_=-1)),
+            desc(case(provenance_order, value=provenance_value, else_=-1)),
+            asc(ExecutiveProspect.id),
         )
+        rank_position = func.row_number().over(order_by=ordering).label("rank_position")
+        company_rank_position = func.row_number().over(
+            partition_by=ExecutiveProspect.company_prospect_id,
+            order_by=ordering,
+        ).label("company_rank_position")
 
         query = (
             select(
-                ExecutiveProspect,
-                CompanyProspect,
-                evidence_ids,
+                ExecutiveProspect.id.label("executive_id"),
+                ExecutiveProspect.company_prospect_id,
+                display_name.label("display_name"),
+                ExecutiveProspect.title,
+                provenance_value.label("provenance"),
+                verification_value.label("verification_status"),
+                ver_weight.label("verification_weight"),
+                prov_weight.label("provenance_weight"),
+                evidence_weight.label("evidence_weight"),
+                rank_score.label("rank_score"),
+                evidence.c.source_document_ids.label("evidence_source_document_ids"),
+                rank_position,
+                company_rank_position,
             )
             .join(CompanyProspect, CompanyProspect.id == ExecutiveProspect.company_prospect_id)
-            .outerjoin(ExecutiveProspectEvidence, ExecutiveProspectEvidence.executive_prospect_id == ExecutiveProspect.id)
+            .outerjoin(evidence, evidence.c.executive_prospect_id == ExecutiveProspect.id)
             .where(
                 ExecutiveProspect.tenant_id == tenant_id,
                 ExecutiveProspect.company_research_run_id == run_id,
                 CompanyProspect.tenant_id == tenant_id,
                 CompanyProspect.company_research_run_id == run_id,
             )
-            .group_by(ExecutiveProspect.id, CompanyProspect.id)
         )
 
         if company_prospect_id:
             query = query.where(ExecutiveProspect.company_prospect_id == company_prospect_id)
-
-        result = await self.db.execute(query)
-        rows = result.all()
-
-        payload: List[dict] = []
-        for exec_row, company_row, evidence_ids_val in rows:
-            evidence_ids_list = [eid for eid in (evidence_ids_val or []) if eid]
-            payload.append(
-                {
-                    "executive": exec_row,
-                    "company": company_row,
-                    "evidence_source_document_ids": evidence_ids_list,
-                }
+        if provenance:
+            query = query.where(provenance_value == provenance.lower())
+        if verification_status:
+            query = query.where(verification_value == verification_status.lower())
+        if q:
+            needle = q.lower()
+            query = query.where(
+                or_(
+                    func.strpos(func.lower(display_name), needle) > 0,
+                    func.strpos(func.lower(func.coalesce(ExecutiveProspect.title, "")), needle) > 0,
+                )
             )
 
-        return payload
+        query = query.order_by(rank_position).offset(offset).limit(limit)
+        result = await self.db.execute(query)
+        return [dict(row) for row in result.mappings().all()]
 
     async def list_merge_decisions_for_run(
         self,
@@ -985,6 +1241,94 @@ class CompanyResearchRepository:
         )
         return list(result.scalars().all())
 
+    async def list_source_bundle_descriptors(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+    ) -> List[dict]:
+        """Source metadata for evidence bundles, with payload lengths but without loading payloads.
+
+        Lengths are of the stored payloads, so compressed when ``content_codec`` is set.
+        """
+        result = await self.db.execute(
+            select(
+                ResearchSourceDocument.id,
+                ResearchSourceDocument.source_type,
+                ResearchSourceDocument.title,
+                ResearchSourceDocument.url,
+                ResearchSourceDocument.original_url,
+                ResearchSourceDocument.content_hash,
+                ResearchSourceDocument.http_status_code,
+                ResearchSourceDocument.status,
+                ResearchSourceDocument.mime_type,
+                ResearchSourceDocument.created_at,
+                ResearchSourceDocument.content_codec,
+                func.octet_length(ResearchSourceDocument.stored_content_bytes).label("bytes_length"),
+                func.coalesce(
+                    func.char_length(ResearchSourceDocument.stored_content_text),
+                    func.octet_length(ResearchSourceDocument.packed_content_text),
+                ).label("text_length"),
+            )
+            .where(
+                ResearchSourceDocument.tenant_id == tenant_id,
+                ResearchSourceDocument.company_research_run_id == run_id,
+            )
+            .order_by(ResearchSourceDocument.created_at.asc(), ResearchSourceDocument.id.asc())
+        )
+        return [dict(row) for row in result.mappings().all()]
+
+    async def stream_source_payload(
+        self,
+        tenant_id: str,
+        source_id: UUID,
+        *,
+        field: str,
+        chunk_size: int,
+        packed: bool = False,
+    ) -> AsyncIterator:
+        """Yield ``content_bytes`` in ``chunk_size``-byte slices, or ``content_text`` in character slices.
+
+        One query per source: the value is de-TOASTed once into a materialized
+        CTE and sliced there, and the slices come back through a server-side
+        cursor one row at a time. A query per slice would de-TOAST the whole
+        value again for every slice. With ``packed`` (rows with a ``content_codec``)
+        the compressed form is read instead, in byte slices, for the caller to
+        decode incrementally.
+        """
+        column, empty = {
+            ("content_bytes", False): (ResearchSourceDocument.stored_content_bytes, b""),
+            ("content_text", False): (ResearchSourceDocument.stored_content_text, ""),
+            ("content_bytes", True): (ResearchSourceDocument.stored_content_bytes, b""),
+            ("content_text", True): (ResearchSourceDocument.packed_content_text, b""),
+        }[(field, packed)]
+        # Concatenating an empty value makes the CTE hold a de-TOASTed copy rather than a TOAST pointer.
+        payload = (
+            select(column.op("||")(literal(empty, column.type)).label("value"))
+            .where(
+                ResearchSourceDocument.tenant_id == tenant_id,
+                ResearchSourceDocument.id == source_id,
+                column.isnot(None),
+            )
+            .cte("payload")
+            .prefix_with("MATERIALIZED")
+        )
+        starts = func.generate_series(1, func.length(payload.c.value), chunk_size).table_valued("start").lateral("g")
+        result = await self.db.stream(
+            select(starts.c.start, func.substring(payload.c.value, starts.c.start, chunk_size, type_=column.type))
+            .select_from(payload.join(starts, true()))
+            .execution_options(yield_per=1)
+        )
+        try:
+            expected = 1
+            # Rows arrive in generate_series order; no ORDER BY, so the server does not sort the whole payload.
+            async for start, piece in result:
+                if start != expected:
+                    raise RuntimeError(f"source_payload_out_of_order:{source_id}")
+                expected += chunk_size
+                yield piece
+        finally:
+            await result.close()
+
     async def find_source_by_hash(
         self,
         tenant_id: str,
@@ -1027,6 +1371,20 @@ class CompanyResearchRepository:
         await self.db.refresh(source)
         return source
     
+    @staticmethod
+    def _extractable_source_clause():
+        # URL sources must already be fetched; non-URL sources can be new or fetched.
+        return or_(
+            and_(
+                ResearchSourceDocument.source_type == 'url',
+                ResearchSourceDocument.status == 'fetched',
+            ),
+            and_(
+                ResearchSourceDocument.source_type != 'url',
+                ResearchSourceDocument.status.in_(['new', 'fetched']),
+            ),
+        )
+
     async def get_extractable_sources(
         self,
         tenant_id: str,
@@ -1041,15 +1399,159 @@ class CompanyResearchRepository:
             .where(
                 ResearchSourceDocument.tenant_id == tenant_id,
                 ResearchSourceDocument.company_research_run_id == run_id,
+                self._extractable_source_clause(),
+            )
+            .order_by(ResearchSourceDocument.created_at)
+        )
+        return list(result.scalars().all())
+
+    # ------------------------------------------------------------------
+    # Incremental stage selection (source change stamps)
+    #
+    # Each stage stamps the rows it consumed with a value from
+    # source_documents_change_seq drawn *after* reading them, so a row is pending
+    # for a stage exactly when its upstream stamp is newer than the stage's own.
+    # ------------------------------------------------------------------
+
+    async def next_source_change_seq(self) -> int:
+        """Draw a stamp from source_documents_change_seq."""
+        result = await self.db.execute(select(source_change_seq.next_value()))
+        return int(result.scalar_one())
+
+    async def stamp_sources_consumed(
+        self,
+        stamp_column: str,
+        stamp: int,
+        upstream_columns: Sequence[str],
+        read_values: Sequence[tuple],
+    ) -> int:
+        """Set ``stamp_column`` to ``stamp`` on sources whose upstream stamps still hold the values read.
+
+        ``read_values`` holds ``(id, *upstream values)`` as loaded by the
+        ``list_sources_pending_*`` query. The UPDATE is a compare-and-set on those
+        values: a row whose content or extraction moved on after it was read (a
+        concurrent fetch or revalidation) keeps its old stamp and stays pending.
+        Returns the number of rows stamped.
+        """
+        if not read_values:
+            return 0
+        upstream = [func.coalesce(getattr(ResearchSourceDocument, column), -1) for column in upstream_columns]
+        expected = [(row[0], *(-1 if value is None else value for value in row[1:])) for row in read_values]
+        result = await self.db.execute(
+            update(ResearchSourceDocument)
+            .where(tuple_(ResearchSourceDocument.id, *upstream).in_(expected))
+            .values({stamp_column: stamp})
+            .execution_options(synchronize_session="fetch")
+        )
+        return result.rowcount
+
+    async def list_sources_pending_extraction(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        extraction_version: str,
+    ) -> List[ResearchSourceDocument]:
+        """Extractable sources whose content changed since they were last extracted.
+
+        Rows extracted by an older extractor version are included too, so a
+        version bump still re-extracts the whole run.
+        """
+        extracted_version = ResearchSourceDocument.meta["extraction"]["version"].astext
+        result = await self.db.execute(
+            select(ResearchSourceDocument)
+            .where(
+                ResearchSourceDocument.tenant_id == tenant_id,
+                ResearchSourceDocument.company_research_run_id == run_id,
+                self._extractable_source_clause(),
                 or_(
-                    and_(
-                        ResearchSourceDocument.source_type == 'url',
-                        ResearchSourceDocument.status == 'fetched',
-                    ),
-                    and_(
-                        ResearchSourceDocument.source_type != 'url',
-                        ResearchSourceDocument.status.in_(['new', 'fetched']),
-                    ),
+                    ResearchSourceDocument.extracted_seq.is_(None),
+                    ResearchSourceDocument.extracted_seq < ResearchSourceDocument.content_seq,
+                    extracted_version.is_distinct_from(extraction_version),
+                ),
+            )
+            .order_by(ResearchSourceDocument.created_at)
+        )
+        return list(result.scalars().all())
+
+    async def list_sources_pending_classification(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+    ) -> List[ResearchSourceDocument]:
+        """Sources extracted since they were last classified."""
+        result = await self.db.execute(
+            select(ResearchSourceDocument)
+            .where(
+                ResearchSourceDocument.tenant_id == tenant_id,
+                ResearchSourceDocument.company_research_run_id == run_id,
+                ResearchSourceDocument.extracted_seq.is_not(None),
+                or_(
+                    ResearchSourceDocument.classified_seq.is_(None),
+                    ResearchSourceDocument.classified_seq < ResearchSourceDocument.extracted_seq,
+                ),
+            )
+            .order_by(ResearchSourceDocument.created_at.desc())
+        )
+        return list(result.scalars().all())
+
+    async def list_duplicate_candidates(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        signatures: List[str],
+        band_keys: Optional[List[str]] = None,
+        exclude_ids: Optional[List[UUID]] = None,
+    ) -> List[ResearchSourceDocument]:
+        """Sources in a run sharing a template signature or an LSH band key with the given ones.
+
+        Band keys are matched through the GIN index on meta.extraction.lsh_bands,
+        so near-duplicate candidates are found without scanning the run.
+        """
+        if not signatures and not band_keys:
+            return []
+        extraction = ResearchSourceDocument.meta["extraction"]
+        signature = func.coalesce(
+            extraction["signature_prefix_2k"].astext,
+            extraction["signature_exact"].astext,
+            extraction["text_hash"].astext,
+        )
+        matches = []
+        if signatures:
+            matches.append(signature.in_(signatures))
+        if band_keys:
+            # Literal path so the expression matches ix_source_documents_lsh_bands.
+            lsh_bands = literal_column("source_documents.meta -> 'extraction' -> 'lsh_bands'", type_=JSONB)
+            matches.append(lsh_bands.has_any(postgresql_array(band_keys)))
+        query = (
+            select(ResearchSourceDocument)
+            .where(
+                ResearchSourceDocument.tenant_id == tenant_id,
+                ResearchSourceDocument.company_research_run_id == run_id,
+                or_(*matches),
+            )
+            .order_by(ResearchSourceDocument.created_at.desc())
+        )
+        if exclude_ids:
+            query = query.where(ResearchSourceDocument.id.notin_(exclude_ids))
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def list_sources_pending_processing(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+    ) -> List[ResearchSourceDocument]:
+        """Extractable sources whose content or extraction changed since they were last processed."""
+        upstream_seq = func.greatest(ResearchSourceDocument.content_seq, ResearchSourceDocument.extracted_seq)
+        result = await self.db.execute(
+            select(ResearchSourceDocument)
+            .where(
+                ResearchSourceDocument.tenant_id == tenant_id,
+                ResearchSourceDocument.company_research_run_id == run_id,
+                self._extractable_source_clause(),
+                or_(
+                    ResearchSourceDocument.processed_seq.is_(None),
+                    ResearchSourceDocument.processed_seq < upstream_seq,
                 ),
             )
             .order_by(ResearchSourceDocument.created_at)
@@ -1066,8 +1568,9 @@ class CompanyResearchRepository:
     ) -> List[ResearchSourceDocument]:
         """Return URL sources ready for fetch attempts.
 
-        Includes fetched sources that explicitly request a conditional recheck via
-        meta.validators.pending_recheck. When ``force`` is true, backoff windows and
+        Includes fetched sources that still carry the legacy
+        meta.validators.pending_recheck flag; scheduled rechecks go through
+        list_sources_due_for_revalidation instead. When ``force`` is true, backoff windows and
         pending recheck flags are ignored so callers can intentionally re-pull all
         URL sources (useful for deterministic proofs).
         """
@@ -1083,42 +1586,82 @@ class CompanyResearchRepository:
             .order_by(ResearchSourceDocument.created_at)
         )
 
+        # Filter in SQL so already-fetched rows (and their content) are not loaded
+        # just to be discarded.
         if not force:
+            pending_recheck = ResearchSourceDocument.meta["validators"]["pending_recheck"].astext == "true"
             query = query.where(
                 or_(
                     ResearchSourceDocument.next_retry_at.is_(None),
                     ResearchSourceDocument.next_retry_at <= func.now(),
                 ),
+                or_(
+                    and_(
+                        ResearchSourceDocument.status != 'fetched',
+                        func.coalesce(ResearchSourceDocument.attempt_count, 0)
+                        < func.coalesce(ResearchSourceDocument.max_attempts, 0),
+                    ),
+                    and_(
+                        ResearchSourceDocument.status == 'fetched',
+                        pending_recheck,
+                    ),
+                ),
             )
 
-        result = await self.db.execute(query)
-
-        sources = list(result.scalars().all())
-        filtered: list[ResearchSourceDocument] = []
-
-        for source in sources:
-            attempts_exhausted = (source.attempt_count or 0) >= (source.max_attempts or 0)
-
-            if source.status != 'fetched':
-                if attempts_exhausted and not force:
-                    continue
-                filtered.append(source)
-                continue
-
-            meta = source.meta or {}
-            validators = (meta.get("validators") or {}) if isinstance(meta, dict) else {}
-            if validators.get("pending_recheck") or force:
-                filtered.append(source)
-
         if limit is not None:
             try:
                 limit_int = int(limit)
                 if limit_int >= 0:
-                    filtered = filtered[:limit_int]
+                    query = query.limit(limit_int)
             except (TypeError, ValueError):
                 pass
 
-        return filtered
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def list_sources_due_for_revalidation(
+        self,
+        now_iso: str,
+        *,
+        limit: int,
+        tenant_id: Optional[str] = None,
+        run_id: Optional[UUID] = None,
+    ) -> List[ResearchSourceDocument]:
+        """Return fetched URL sources whose meta.validators.next_check_at has passed.
+
+        ``now_iso`` must use the same fixed-width format as the stored check times
+        (see app.utils.http_cache.format_check_time) so the comparison can stay in SQL.
+        Sources fetched before scheduling existed (no next_check_at) are due
+        immediately. Rows are locked with SKIP LOCKED so concurrent schedulers
+        split the batch instead of double-fetching.
+        """
+        next_check_at = ResearchSourceDocument.meta["validators"]["next_check_at"].astext
+        query = (
+            select(ResearchSourceDocument)
+            .join(
+                CompanyResearchRun,
+                and_(
+                    CompanyResearchRun.id == ResearchSourceDocument.company_research_run_id,
+                    CompanyResearchRun.tenant_id == ResearchSourceDocument.tenant_id,
+                ),
+            )
+            .where(
+                ResearchSourceDocument.source_type == 'url',
+                ResearchSourceDocument.status == 'fetched',
+                CompanyResearchRun.status.notin_(["cancelled", "cancel_requested"]),
+                or_(next_check_at.is_(None), next_check_at <= now_iso),
+            )
+            .order_by(next_check_at.asc().nullsfirst(), ResearchSourceDocument.created_at)
+            .limit(limit)
+            .with_for_update(of=ResearchSourceDocument, skip_locked=True)
+        )
+        if tenant_id is not None:
+            query = query.where(ResearchSourceDocument.tenant_id == tenant_id)
+        if run_id is not None:
+            query = query.where(ResearchSourceDocument.company_research_run_id == run_id)
+
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
 
     # ========================================================================
     # Robots Policy Cache Operations
@@ -1182,6 +1725,32 @@ class CompanyResearchRepository:
         result = await self.db.execute(upsert_stmt)
         await self.db.flush()
         return result.scalar_one()
+
+    async def list_domain_rate_limits(
+        self,
+        tenant_id: str,
+        domains: Optional[Sequence[str]] = None,
+    ) -> List[DomainRateLimit]:
+        query = select(DomainRateLimit).where(DomainRateLimit.tenant_id == tenant_id)
+        if domains is not None:
+            query = query.where(DomainRateLimit.domain.in_([(d or "").lower() for d in domains]))
+        result = await self.db.execute(query.order_by(DomainRateLimit.domain))
+        return list(result.scalars().all())
+
+    async def upsert_domain_rate_limit(self, tenant_id: str, domain: str, limits: dict) -> None:
+        """Write learned limits (DomainRateController.take_for_persist) for one domain."""
+        insert_stmt = insert(DomainRateLimit).values(
+            id=uuid.uuid4(),
+            tenant_id=tenant_id,
+            domain=(domain or "").lower(),
+            **limits,
+        )
+        await self.db.execute(
+            insert_stmt.on_conflict_do_update(
+                constraint="uq_domain_rate_limits",
+                set_={**{key: insert_stmt.excluded[key] for key in limits}, "updated_at": func.now()},
+            )
+        )
     
     # ========================================================================
     # Research Event Operations
@@ -1199,6 +1768,11 @@ class CompanyResearchRepository:
             **data.model_dump(exclude={'tenant_id'}),
         )
         self.db.add(event)
+        await self.db.flush()
+        # Delivered to LISTENers on commit (see app/services/run_event_stream.py)
+        await self.db.execute(
+            select(func.pg_notify(RUN_EVENT_CHANNEL, run_event_notification(event)))
+        )
         await self.db.commit()
         await self.db.refresh(event)
         return event
@@ -1221,18 +1795,484 @@ class CompanyResearchRepository:
         )
         return list(result.scalars().all())
 
-    # ========================================================================
-    # Entity Resolution Operations
-    # ========================================================================
-
-    async def upsert_resolved_entity(
+    async def list_research_events_since(
         self,
         tenant_id: str,
         run_id: UUID,
-        entity_type: str,
-        canonical_entity_id: UUID,
-        match_keys: dict,
-        reason_codes: list,
+        created_from: datetime,
+        limit: int = 500,
+        after_id: Optional[UUID] = None,
+    ) -> List[CompanyResearchEvent]:
+        """Events created at or after ``created_from``, oldest first (run event stream catch-up).
+
+        With ``after_id`` the read continues a previous page: only events after
+        ``(created_from, after_id)`` in (created_at, id) order are returned.
+        """
+        position = (
+            CompanyResearchEvent.created_at >= created_from
+            if after_id is None
+            else tuple_(CompanyResearchEvent.created_at, CompanyResearchEvent.id) > tuple_(created_from, after_id)
+        )
+        result = await self.db.execute(
+            select(CompanyResearchEvent)
+            .where(
+                CompanyResearchEvent.tenant_id == tenant_id,
+                CompanyResearchEvent.company_research_run_id == run_id,
+                position,
+            )
+            .order_by(CompanyResearchEvent.created_at, CompanyResearchEvent.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    # ========================================================================
+    # Run Resolution Snapshot (compact rows for the Stage 6 resolvers)
+    # ========================================================================
+
+    def _executive_scope(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        emails: Sequence[str] = (),
+        linkedin_urls: Sequence[str] = (),
+        company_prospect_ids: Sequence[UUID] = (),
+    ):
+        """Run executives plus tenant executives sharing a run email, LinkedIn URL or company."""
+        clauses = [ExecutiveProspect.company_research_run_id == run_id]
+        if emails:
+            clauses.append(func.lower(ExecutiveProspect.email).in_(list(emails)))
+        if linkedin_urls:
+            clauses.append(func.lower(ExecutiveProspect.linkedin_url).in_(list(linkedin_urls)))
+        if company_prospect_ids:
+            clauses.append(ExecutiveProspect.company_prospect_id.in_(list(company_prospect_ids)))
+        return and_(ExecutiveProspect.tenant_id == tenant_id, or_(*clauses))
+
+    async def list_executive_rows(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        emails: Sequence[str] = (),
+        linkedin_urls: Sequence[str] = (),
+    ) -> List[tuple]:
+        """Executive tuples (EXECUTIVE_ROW_COLUMNS) for the run and its email/LinkedIn peers."""
+        result = await self.db.execute(
+            select(*EXECUTIVE_ROW_COLUMNS)
+            .where(self._executive_scope(tenant_id, run_id, emails, linkedin_urls))
+            .order_by(ExecutiveProspect.created_at.asc(), ExecutiveProspect.id.asc())
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def list_executive_evidence_pairs(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        emails: Sequence[str] = (),
+        linkedin_urls: Sequence[str] = (),
+    ) -> List[tuple]:
+        """(executive_prospect_id, source_document_id) for executives in the same scope."""
+        result = await self.db.execute(
+            select(
+                ExecutiveProspectEvidence.executive_prospect_id,
+                ExecutiveProspectEvidence.source_document_id,
+            )
+            .join(ExecutiveProspect, ExecutiveProspect.id == ExecutiveProspectEvidence.executive_prospect_id)
+            .where(
+                ExecutiveProspectEvidence.tenant_id == tenant_id,
+                ExecutiveProspectEvidence.source_document_id.is_not(None),
+                self._executive_scope(tenant_id, run_id, emails, linkedin_urls),
+            )
+            .order_by(ExecutiveProspectEvidence.created_at.asc())
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def list_company_rows_for_resolution(self, tenant_id: str) -> List[tuple]:
+        """Company tuples (COMPANY_ROW_COLUMNS) for tenant prospects with a website or a country."""
+        result = await self.db.execute(
+            select(*COMPANY_ROW_COLUMNS)
+            .where(
+                CompanyProspect.tenant_id == tenant_id,
+                or_(CompanyProspect.website_url.is_not(None), CompanyProspect.hq_country.is_not(None)),
+            )
+            .order_by(CompanyProspect.created_at.asc(), CompanyProspect.id.asc())
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def list_company_evidence_pairs_for_resolution(self, tenant_id: str, run_id: UUID) -> List[tuple]:
+        """(company_prospect_id, source_document_id) for prospects with a website and run prospects with a country."""
+        result = await self.db.execute(
+            select(CompanyProspectEvidence.company_prospect_id, CompanyProspectEvidence.source_document_id)
+            .join(CompanyProspect, CompanyProspect.id == CompanyProspectEvidence.company_prospect_id)
+            .where(
+                CompanyProspectEvidence.tenant_id == tenant_id,
+                CompanyProspect.tenant_id == tenant_id,
+                CompanyProspectEvidence.source_document_id.is_not(None),
+                or_(
+                    CompanyProspect.website_url.is_not(None),
+                    and_(
+                        CompanyProspect.company_research_run_id == run_id,
+                        CompanyProspect.hq_country.is_not(None),
+                    ),
+                ),
+            )
+            .order_by(CompanyProspectEvidence.created_at.asc())
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def list_company_prospects_by_name_keys(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        keys: Sequence[str],
+    ) -> List[CompanyProspect]:
+        """Run prospects (not already merged as duplicates) sharing any name match key, oldest first.
+
+        Matched through the GIN index on name_match_keys.
+        """
+        if not keys:
+            return []
+        result = await self.db.execute(
+            select(CompanyProspect)
+            .where(
+                CompanyProspect.tenant_id == tenant_id,
+                CompanyProspect.company_research_run_id == run_id,
+                CompanyProspect.status != "duplicate",
+                CompanyProspect.name_match_keys.has_any(postgresql_array(list(keys))),
+            )
+            .order_by(CompanyProspect.created_at.asc(), CompanyProspect.id.asc())
+        )
+        return list(result.scalars().all())
+
+    async def list_company_name_match_rows(self, tenant_id: str, run_id: UUID) -> List[tuple]:
+        """(id, name_raw, name_match_keys, is_pinned, created_at) for run prospects not merged as duplicates."""
+        result = await self.db.execute(
+            select(
+                CompanyProspect.id,
+                CompanyProspect.name_raw,
+                CompanyProspect.name_match_keys,
+                CompanyProspect.is_pinned,
+                CompanyProspect.created_at,
+            )
+            .where(
+                CompanyProspect.tenant_id == tenant_id,
+                CompanyProspect.company_research_run_id == run_id,
+                CompanyProspect.status != "duplicate",
+            )
+            .order_by(CompanyProspect.created_at.asc(), CompanyProspect.id.asc())
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def list_company_evidence_pairs(self, tenant_id: str, prospect_ids: Sequence[UUID]) -> List[tuple]:
+        """(company_prospect_id, source_document_id) for the given prospects."""
+        if not prospect_ids:
+            return []
+        result = await self.db.execute(
+            select(CompanyProspectEvidence.company_prospect_id, CompanyProspectEvidence.source_document_id)
+            .where(
+                CompanyProspectEvidence.tenant_id == tenant_id,
+                CompanyProspectEvidence.company_prospect_id.in_(list(prospect_ids)),
+                CompanyProspectEvidence.source_document_id.is_not(None),
+            )
+            .order_by(CompanyProspectEvidence.created_at.asc())
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def mark_company_prospects_duplicate(self, tenant_id: str, prospect_ids: Sequence[UUID]) -> int:
+        if not prospect_ids:
+            return 0
+        result = await self.db.execute(
+            update(CompanyProspect)
+            .where(
+                CompanyProspect.tenant_id == tenant_id,
+                CompanyProspect.id.in_(list(prospect_ids)),
+            )
+            .values(status="duplicate")
+        )
+        return result.rowcount or 0
+
+    async def list_resolution_hashes_for_run(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        entity_type: str,
+    ) -> tuple[set[str], set[tuple[UUID, UUID]]]:
+        """Existing resolved-entity hashes and (canonical, duplicate) merge link pairs for a run."""
+        resolved = await self.db.execute(
+            select(ResolvedEntity.resolution_hash).where(
+                ResolvedEntity.tenant_id == tenant_id,
+                ResolvedEntity.company_research_run_id == run_id,
+                ResolvedEntity.entity_type == entity_type,
+            )
+        )
+        links = await self.db.execute(
+            select(EntityMergeLink.canonical_entity_id, EntityMergeLink.duplicate_entity_id).where(
+                EntityMergeLink.tenant_id == tenant_id,
+                EntityMergeLink.company_research_run_id == run_id,
+                EntityMergeLink.entity_type == entity_type,
+            )
+        )
+        return set(resolved.scalars().all()), {tuple(row) for row in links.all()}
+
+    async def map_canonical_people_by_email(self, tenant_id: str, emails: Sequence[str]) -> Dict[str, UUID]:
+        if not emails:
+            return {}
+        result = await self.db.execute(
+            select(CanonicalPersonEmail.email_normalized, CanonicalPersonEmail.canonical_person_id).where(
+                CanonicalPersonEmail.tenant_id == tenant_id,
+                CanonicalPersonEmail.email_normalized.in_(list(emails)),
+            )
+        )
+        return {email: person_id for email, person_id in result.all()}
+
+    async def map_canonical_people_by_linkedin(self, tenant_id: str, linkedin_urls: Sequence[str]) -> Dict[str, UUID]:
+        if not linkedin_urls:
+            return {}
+        linkedin = func.lower(CanonicalPerson.primary_linkedin_url)
+        result = await self.db.execute(
+            select(linkedin, CanonicalPerson.id)
+            .where(CanonicalPerson.tenant_id == tenant_id, linkedin.in_(list(linkedin_urls)))
+            .order_by(CanonicalPerson.created_at.asc(), CanonicalPerson.id.asc())
+        )
+        mapping: Dict[str, UUID] = {}
+        for url, person_id in result.all():
+            mapping.setdefault(url, person_id)
+        return mapping
+
+    async def list_canonical_person_link_rows(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        emails: Sequence[str] = (),
+        linkedin_urls: Sequence[str] = (),
+        company_prospect_ids: Sequence[UUID] = (),
+    ) -> List[tuple]:
+        """(person_entity_id, canonical_person_id, company_prospect_id, name_normalized) for linked executives in scope."""
+        result = await self.db.execute(
+            select(
+                CanonicalPersonLink.person_entity_id,
+                CanonicalPersonLink.canonical_person_id,
+                ExecutiveProspect.company_prospect_id,
+                ExecutiveProspect.name_normalized,
+            )
+            .join(CanonicalPerson, CanonicalPerson.id == CanonicalPersonLink.canonical_person_id)
+            .join(ExecutiveProspect, ExecutiveProspect.id == CanonicalPersonLink.person_entity_id)
+            .where(
+                CanonicalPersonLink.tenant_id == tenant_id,
+                CanonicalPerson.tenant_id == tenant_id,
+                self._executive_scope(tenant_id, run_id, emails, linkedin_urls, company_prospect_ids),
+            )
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def map_canonical_companies_by_domain(self, tenant_id: str, domains: Sequence[str]) -> Dict[str, UUID]:
+        if not domains:
+            return {}
+        result = await self.db.execute(
+            select(CanonicalCompanyDomain.domain_normalized, CanonicalCompanyDomain.canonical_company_id).where(
+                CanonicalCompanyDomain.tenant_id == tenant_id,
+                CanonicalCompanyDomain.domain_normalized.in_(list(domains)),
+            )
+        )
+        return {domain: company_id for domain, company_id in result.all()}
+
+    async def map_canonical_companies_by_name_country(
+        self,
+        tenant_id: str,
+        names: Sequence[str],
+    ) -> Dict[tuple[str, str], UUID]:
+        """(lower(canonical_name), country_code) -> canonical company id for the given lower-cased names."""
+        if not names:
+            return {}
+        name = func.lower(CanonicalCompany.canonical_name)
+        result = await self.db.execute(
+            select(name, CanonicalCompany.country_code, CanonicalCompany.id)
+            .where(
+                CanonicalCompany.tenant_id == tenant_id,
+                CanonicalCompany.country_code.is_not(None),
+                name.in_(list(names)),
+            )
+            .order_by(CanonicalCompany.created_at.asc(), CanonicalCompany.id.asc())
+        )
+        mapping: Dict[tuple[str, str], UUID] = {}
+        for name_lower, country, company_id in result.all():
+            mapping.setdefault((name_lower, country), company_id)
+        return mapping
+
+    async def list_canonical_company_link_entity_ids(self, tenant_id: str) -> set[UUID]:
+        result = await self.db.execute(
+            select(CanonicalCompanyLink.company_entity_id).where(CanonicalCompanyLink.tenant_id == tenant_id)
+        )
+        return set(result.scalars().all())
+
+    async def _bulk_insert(
+        self,
+        model,
+        rows: List[dict],
+        *,
+        constraint: Optional[str] = None,
+        update_columns: Sequence[str] = (),
+        returning: Sequence = (),
+    ) -> List[tuple]:
+        """Multi-row INSERT (ON CONFLICT DO UPDATE when a constraint is given) in BULK_WRITE_BATCH chunks."""
+        returned: List[tuple] = []
+        for start in range(0, len(rows), BULK_WRITE_BATCH):
+            stmt = insert(model).values(rows[start:start + BULK_WRITE_BATCH])
+            if constraint:
+                stmt = stmt.on_conflict_do_update(
+                    constraint=constraint,
+                    set_={**{column: stmt.excluded[column] for column in update_columns}, "updated_at": func.now()},
+                )
+            if returning:
+                result = await self.db.execute(stmt.returning(*returning))
+                returned.extend(tuple(row) for row in result.all())
+            else:
+                await self.db.execute(stmt)
+        return returned
+
+    async def bulk_upsert_resolved_entities(self, rows: List[dict]) -> Dict[str, UUID]:
+        """Upsert resolved entities (unique resolution_hash per row); returns resolution_hash -> id."""
+        returned = await self._bulk_insert(
+            ResolvedEntity,
+            rows,
+            constraint="uq_resolved_entities_hash",
+            update_columns=("match_keys", "reason_codes", "evidence_source_document_ids"),
+            returning=(ResolvedEntity.resolution_hash, ResolvedEntity.id),
+        )
+        return dict(returned)
+
+    async def bulk_upsert_entity_merge_links(self, rows: List[dict]) -> None:
+        await self._bulk_insert(
+            EntityMergeLink,
+            rows,
+            constraint="uq_entity_merge_links_hash",
+            update_columns=("match_keys", "reason_codes", "evidence_source_document_ids", "resolved_entity_id"),
+        )
+
+    async def bulk_create_canonical_people(self, rows: List[dict]) -> None:
+        await self._bulk_insert(CanonicalPerson, rows)
+
+    async def bulk_upsert_canonical_person_emails(self, rows: List[dict]) -> None:
+        await self._bulk_insert(
+            CanonicalPersonEmail,
+            rows,
+            constraint="uq_canonical_person_emails_unique_email",
+            update_columns=("canonical_person_id",),
+        )
+
+    async def bulk_upsert_canonical_person_links(self, rows: List[dict]) -> None:
+        await self._bulk_insert(
+            CanonicalPersonLink,
+            rows,
+            constraint="uq_canonical_person_links_person",
+            update_columns=(
+                "canonical_person_id",
+                "match_rule",
+                "evidence_source_document_id",
+                "evidence_company_research_run_id",
+            ),
+        )
+
+    async def bulk_create_canonical_companies(self, rows: List[dict]) -> None:
+        await self._bulk_insert(CanonicalCompany, rows)
+
+    async def bulk_upsert_canonical_company_domains(self, rows: List[dict]) -> None:
+        await self._bulk_insert(
+            CanonicalCompanyDomain,
+            rows,
+            constraint="uq_canonical_company_domains_domain",
+            update_columns=("canonical_company_id",),
+        )
+
+    async def bulk_upsert_canonical_company_links(self, rows: List[dict]) -> None:
+        await self._bulk_insert(
+            CanonicalCompanyLink,
+            rows,
+            constraint="uq_canonical_company_links_entity",
+            update_columns=(
+                "canonical_company_id",
+                "match_rule",
+                "evidence_source_document_id",
+                "evidence_company_research_run_id",
+            ),
+        )
+
+    # ========================================================================
+    # Run-wide Company Enrichment (Stage 7.2)
+    # ========================================================================
+
+    async def list_run_enrichment_pairs(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        after: Optional[tuple[UUID, UUID]] = None,
+        limit: int = 200,
+    ) -> List[tuple[UUID, UUID]]:
+        """Distinct (canonical_company_id, source_document_id) for the run's linked prospects, keyset-paged."""
+        pair = (CanonicalCompanyLink.canonical_company_id, CompanyProspectEvidence.source_document_id)
+        query = (
+            select(*pair)
+            .distinct()
+            .select_from(CompanyProspect)
+            .join(
+                CanonicalCompanyLink,
+                and_(
+                    CanonicalCompanyLink.tenant_id == tenant_id,
+                    CanonicalCompanyLink.company_entity_id == CompanyProspect.id,
+                ),
+            )
+            .join(
+                CompanyProspectEvidence,
+                and_(
+                    CompanyProspectEvidence.tenant_id == tenant_id,
+                    CompanyProspectEvidence.company_prospect_id == CompanyProspect.id,
+                ),
+            )
+            .where(
+                CompanyProspect.tenant_id == tenant_id,
+                CompanyProspect.company_research_run_id == run_id,
+                CompanyProspectEvidence.source_document_id.is_not(None),
+            )
+        )
+        if after is not None:
+            query = query.where(tuple_(*pair) > tuple_(*after))
+        result = await self.db.execute(query.order_by(*pair).limit(limit))
+        return [tuple(row) for row in result.all()]
+
+    async def list_source_content_texts(self, tenant_id: str, source_ids: List[UUID]) -> Dict[UUID, str]:
+        """content_text by source id, loading only the text columns (decoded here when compressed)."""
+        if not source_ids:
+            return {}
+        result = await self.db.execute(
+            select(
+                ResearchSourceDocument.id,
+                ResearchSourceDocument.stored_content_text,
+                ResearchSourceDocument.packed_content_text,
+                ResearchSourceDocument.content_codec,
+            ).where(
+                ResearchSourceDocument.tenant_id == tenant_id,
+                ResearchSourceDocument.id.in_(source_ids),
+                or_(
+                    ResearchSourceDocument.stored_content_text.is_not(None),
+                    ResearchSourceDocument.packed_content_text.is_not(None),
+                ),
+            )
+        )
+        texts = {}
+        for source_id, stored, packed, codec in result.all():
+            texts[source_id] = decompress(packed, codec).decode("utf-8") if codec and packed is not None else stored
+        return texts
+
+    # ========================================================================
+    # Entity Resolution Operations
+    # ========================================================================
+
+    async def upsert_resolved_entity(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        entity_type: str,
+        canonical_entity_id: UUID,
+        match_keys: dict,
+        reason_codes: list,
         evidence_source_document_ids: list,
         resolution_hash: str,
     ) -> ResolvedEntity:
@@ -1742,6 +2782,28 @@ class CompanyResearchRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_active_job_by_params(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        job_type: str,
+        params_hash: str,
+    ) -> Optional[CompanyResearchJob]:
+        """Queued/running job with the same parameters (job types without a params_hash unique index)."""
+        result = await self.db.execute(
+            select(CompanyResearchJob)
+            .where(
+                CompanyResearchJob.tenant_id == tenant_id,
+                CompanyResearchJob.run_id == run_id,
+                CompanyResearchJob.job_type == job_type,
+                CompanyResearchJob.params_hash == params_hash,
+                CompanyResearchJob.status.in_(["queued", "running"]),
+            )
+            .order_by(CompanyResearchJob.created_at.desc())
+            .limit(1)
+        )
+        return result.scalars().first()
+
     async def enqueue_parametrized_job(
         self,
         tenant_id: str,
@@ -1750,6 +2812,7 @@ class CompanyResearchRepository:
         params_json: dict,
         params_hash: str,
         max_attempts: int = 3,
+        priority: int = JOB_PRIORITY_BATCH,
     ) -> CompanyResearchJob:
         stmt = (
             insert(CompanyResearchJob)
@@ -1759,6 +2822,7 @@ class CompanyResearchRepository:
                 run_id=run_id,
                 job_type=job_type,
                 status="queued",
+                priority=priority,
                 params_json=params_json,
                 params_hash=params_hash,
                 progress_json={},
@@ -1806,6 +2870,7 @@ class CompanyResearchRepository:
         run_id: UUID,
         job_type: str = "company_research_run",
         max_attempts: int = 10,
+        priority: int = JOB_PRIORITY_INTERACTIVE,
     ) -> CompanyResearchJob:
         stmt = (
             insert(CompanyResearchJob)
@@ -1815,6 +2880,7 @@ class CompanyResearchRepository:
                 run_id=run_id,
                 job_type=job_type,
                 status="queued",
+                priority=priority,
                 max_attempts=max_attempts,
             )
             .on_conflict_do_nothing(
@@ -1924,6 +2990,85 @@ class CompanyResearchRepository:
         )
         return list(result.scalars().all())
 
+    async def aggregate_step_metrics(
+        self,
+        tenant_id: str,
+        *,
+        sum_fields: List[str],
+        max_fields: List[str],
+        since: Optional[datetime] = None,
+    ) -> List[dict]:
+        """Sum/max numeric metrics_json fields across runs, grouped by step_key and status."""
+
+        def _field(name: str):
+            return func.coalesce(CompanyResearchRunStep.metrics_json[name].as_float(), 0.0)
+
+        columns = [
+            CompanyResearchRunStep.step_key.label("step_key"),
+            CompanyResearchRunStep.status.label("status"),
+            func.count().label("steps"),
+        ]
+        columns += [func.sum(_field(name)).label(f"sum_{name}") for name in sum_fields]
+        columns += [func.max(_field(name)).label(f"max_{name}") for name in max_fields]
+
+        query = (
+            select(*columns)
+            .where(
+                CompanyResearchRunStep.tenant_id == tenant_id,
+                CompanyResearchRunStep.metrics_json.is_not(None),
+            )
+            .group_by(CompanyResearchRunStep.step_key, CompanyResearchRunStep.status)
+            .order_by(CompanyResearchRunStep.step_key, CompanyResearchRunStep.status)
+        )
+        if since is not None:
+            query = query.where(CompanyResearchRunStep.finished_at >= since)
+        result = await self.db.execute(query)
+        return [dict(row) for row in result.mappings().all()]
+
+    async def aggregate_job_queue_waits(self, tenant_id: str, since: datetime) -> List[dict]:
+        """Queue wait (created_at to first start) of jobs started since ``since``, by job type and priority."""
+        wait = func.extract("epoch", CompanyResearchJob.started_at - CompanyResearchJob.created_at)
+        query = (
+            select(
+                CompanyResearchJob.job_type.label("job_type"),
+                CompanyResearchJob.priority.label("priority"),
+                func.count().label("jobs"),
+                func.sum(wait).label("wait_sum"),
+                func.percentile_cont(0.5).within_group(wait).label("wait_p50"),
+                func.percentile_cont(0.95).within_group(wait).label("wait_p95"),
+                func.max(wait).label("wait_max"),
+            )
+            .where(
+                CompanyResearchJob.tenant_id == tenant_id,
+                CompanyResearchJob.started_at.is_not(None),
+                CompanyResearchJob.started_at >= since,
+            )
+            .group_by(CompanyResearchJob.job_type, CompanyResearchJob.priority)
+            .order_by(CompanyResearchJob.job_type, CompanyResearchJob.priority)
+        )
+        result = await self.db.execute(query)
+        return [dict(row) for row in result.mappings().all()]
+
+    async def aggregate_waiting_jobs(self, tenant_id: str) -> List[dict]:
+        """Jobs that have never started, with the age of the oldest, by job type and priority."""
+        query = (
+            select(
+                CompanyResearchJob.job_type.label("job_type"),
+                CompanyResearchJob.priority.label("priority"),
+                func.count().label("jobs"),
+                func.extract("epoch", func.now() - func.min(CompanyResearchJob.created_at)).label("oldest_wait"),
+            )
+            .where(
+                CompanyResearchJob.tenant_id == tenant_id,
+                CompanyResearchJob.status == "queued",
+                CompanyResearchJob.started_at.is_(None),
+            )
+            .group_by(CompanyResearchJob.job_type, CompanyResearchJob.priority)
+            .order_by(CompanyResearchJob.job_type, CompanyResearchJob.priority)
+        )
+        result = await self.db.execute(query)
+        return [dict(row) for row in result.mappings().all()]
+
     async def upsert_steps(self, tenant_id: str, run_id: UUID, steps: List[dict]) -> List[CompanyResearchRunStep]:
         created_steps: List[CompanyResearchRunStep] = []
         for step in steps:
@@ -1955,6 +3100,37 @@ class CompanyResearchRepository:
         # Return current list
         return await self.list_steps(tenant_id, run_id)
 
+    async def reopen_steps(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        step_keys: List[str],
+    ) -> List[CompanyResearchRunStep]:
+        """Move succeeded steps back to pending so the next job re-runs them.
+
+        Pending/running/failed steps are left alone; they will run anyway.
+        """
+        result = await self.db.execute(
+            select(CompanyResearchRunStep)
+            .where(
+                CompanyResearchRunStep.tenant_id == tenant_id,
+                CompanyResearchRunStep.run_id == run_id,
+                CompanyResearchRunStep.step_key.in_(step_keys),
+                CompanyResearchRunStep.status == "succeeded",
+            )
+            .order_by(CompanyResearchRunStep.step_order)
+            .with_for_update()
+        )
+        steps = list(result.scalars().all())
+        for step in steps:
+            step.status = "pending"
+            step.attempt_count = 0
+            step.next_retry_at = None
+            step.finished_at = None
+            step.last_error = None
+        await self.db.flush()
+        return steps
+
     async def claim_next_step(self, tenant_id: str, run_id: UUID) -> Optional[CompanyResearchRunStep]:
         now = func.now()
         result = await self.db.execute(
@@ -1989,6 +3165,8 @@ class CompanyResearchRepository:
         self,
         step_id: UUID,
         output_json: Optional[dict] = None,
+        *,
+        metrics_json: Optional[dict] = None,
     ) -> Optional[CompanyResearchRunStep]:
         result = await self.db.execute(
             select(CompanyResearchRunStep).where(CompanyResearchRunStep.id == step_id).with_for_update()
@@ -2000,6 +3178,8 @@ class CompanyResearchRepository:
         step.finished_at = utc_now()
         if output_json is not None:
             step.output_json = output_json
+        if metrics_json is not None:
+            step.metrics_json = metrics_json
         await self.db.flush()
         await self.db.refresh(step)
         return step
@@ -2009,6 +3189,8 @@ class CompanyResearchRepository:
         step_id: UUID,
         last_error: str,
         backoff_seconds: int = 30,
+        *,
+        metrics_json: Optional[dict] = None,
     ) -> Optional[CompanyResearchRunStep]:
         result = await self.db.execute(
             select(CompanyResearchRunStep).where(CompanyResearchRunStep.id == step_id).with_for_update()
@@ -2020,6 +3202,8 @@ class CompanyResearchRepository:
         step.last_error = last_error
         step.finished_at = utc_now()
         step.next_retry_at = utc_now() + timedelta(seconds=backoff_seconds)
+        if metrics_json is not None:
+            step.metrics_json = metrics_json
         await self.db.flush()
         await self.db.refresh(step)
         return step
@@ -2038,6 +3222,20 @@ class CompanyResearchRepository:
         await self.db.refresh(step)
         return step
 
+    async def reopen_running_steps(self, tenant_id: str, run_id: UUID, reason: str = "lease_expired") -> int:
+        """Make steps left ``running`` by a worker that lost its job lease claimable again."""
+        result = await self.db.execute(
+            update(CompanyResearchRunStep)
+            .where(
+                CompanyResearchRunStep.tenant_id == tenant_id,
+                CompanyResearchRunStep.run_id == run_id,
+                CompanyResearchRunStep.status == "running",
+            )
+            .values(status="failed", last_error=reason, finished_at=utc_now(), next_retry_at=None)
+            .execution_options(synchronize_session="fetch")
+        )
+        return int(result.rowcount or 0)
+
     async def cancel_pending_steps(self, tenant_id: str, run_id: UUID, reason: Optional[str] = None) -> int:
         result = await self.db.execute(
             select(CompanyResearchRunStep).where(
@@ -2091,40 +3289,116 @@ class CompanyResearchRepository:
         await self.db.refresh(job)
         return job
 
+    def _claimable_job_conditions(self, stale_cutoff: datetime, job_type: Optional[str]) -> list:
+        conditions = [
+            CompanyResearchJob.status.in_(["queued", "failed", "running"]),
+            CompanyResearchJob.attempt_count < CompanyResearchJob.max_attempts,
+            or_(
+                CompanyResearchJob.next_retry_at.is_(None),
+                CompanyResearchJob.next_retry_at <= func.now(),
+            ),
+            or_(
+                CompanyResearchJob.status != "running",
+                CompanyResearchJob.locked_at.is_(None),
+                CompanyResearchJob.locked_at <= stale_cutoff,
+            ),
+        ]
+        if job_type:
+            conditions.append(CompanyResearchJob.job_type == job_type)
+        return conditions
+
+    async def list_claim_tenant_order(
+        self,
+        stale_cutoff: datetime,
+        job_type: Optional[str] = None,
+        *,
+        tenant_max_running: int = 0,
+        limit: int = 8,
+    ) -> List[UUID]:
+        """Tenants with claimable jobs, in the order claim_next_job serves them.
+
+        Best waiting priority class first; within a class the tenant served
+        longest ago (or never) first, so one tenant's backlog cannot starve the
+        others. Tenants already running ``tenant_max_running`` live jobs are left
+        out (0 = no cap). Read without locks; the job itself is locked later.
+        """
+        waiting = (
+            select(
+                CompanyResearchJob.tenant_id.label("tenant_id"),
+                func.min(CompanyResearchJob.priority).label("priority"),
+                func.min(CompanyResearchJob.created_at).label("oldest"),
+            )
+            .where(*self._claimable_job_conditions(stale_cutoff, job_type))
+            .group_by(CompanyResearchJob.tenant_id)
+            .subquery()
+        )
+        served = aliased(CompanyResearchJob)
+        last_served = (
+            select(func.max(served.claimed_at))
+            .where(served.tenant_id == waiting.c.tenant_id)
+            .scalar_subquery()
+        )
+        query = (
+            select(waiting.c.tenant_id)
+            .order_by(waiting.c.priority, last_served.asc().nulls_first(), waiting.c.oldest)
+            .limit(limit)
+        )
+        if tenant_max_running > 0:
+            running = aliased(CompanyResearchJob)
+            running_count = (
+                select(func.count())
+                .select_from(running)
+                .where(
+                    running.tenant_id == waiting.c.tenant_id,
+                    running.status == "running",
+                    running.locked_at > stale_cutoff,
+                )
+                .scalar_subquery()
+            )
+            query = query.where(running_count < tenant_max_running)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
     async def claim_next_job(
         self,
         worker_id: str,
         job_type: Optional[str] = None,
         *,
         stale_after_seconds: int = 1800,
+        tenant_max_running: int = 0,
+        tenant_candidates: int = 8,
     ) -> Optional[CompanyResearchJob]:
-        now = func.now()
-        stale_cutoff = utc_now() - timedelta(seconds=stale_after_seconds)
-        query = (
-            select(CompanyResearchJob)
-            .where(
-                CompanyResearchJob.status.in_(["queued", "failed", "running"]),
-                CompanyResearchJob.attempt_count < CompanyResearchJob.max_attempts,
-                or_(
-                    CompanyResearchJob.next_retry_at.is_(None),
-                    CompanyResearchJob.next_retry_at <= now,
-                ),
-                or_(
-                    CompanyResearchJob.status != "running",
-                    CompanyResearchJob.locked_at.is_(None),
-                    CompanyResearchJob.locked_at <= stale_cutoff,
-                ),
-            )
-            .order_by(CompanyResearchJob.created_at)
-            .limit(1)
-            .with_for_update(skip_locked=True)
-        )
+        """Lock the next job to run, tenant-fair and by priority class (see list_claim_tenant_order).
 
-        if job_type:
-            query = query.where(CompanyResearchJob.job_type == job_type)
-
-        result = await self.db.execute(query)
-        job = result.scalar_one_or_none()
+        The chosen tenant's best job is locked with SKIP LOCKED; when another
+        worker holds it, the next tenant in order is tried. A running job whose
+        lease (locked_at) is older than ``stale_after_seconds`` is reclaimed:
+        its steps left running are reopened, and the new claim's
+        ``lease_token`` fences the previous holder out.
+        """
+        stale_cutoff = utc_now() - timedelta(seconds=stale_after_seconds)
+        tenant_ids = await self.list_claim_tenant_order(
+            stale_cutoff,
+            job_type,
+            tenant_max_running=tenant_max_running,
+            limit=tenant_candidates,
+        )
+        job = None
+        for tenant_id in tenant_ids:
+            query = (
+                select(CompanyResearchJob)
+                .where(
+                    CompanyResearchJob.tenant_id == tenant_id,
+                    *self._claimable_job_conditions(stale_cutoff, job_type),
+                )
+                .order_by(CompanyResearchJob.priority, CompanyResearchJob.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            result = await self.db.execute(query)
+            job = result.scalar_one_or_none()
+            if job:
+                break
         if not job:
             return None
 
@@ -2136,9 +3410,13 @@ class CompanyResearchRepository:
             job.locked_by = None
             job.next_retry_at = utc_now()
             job.cancel_requested = False
+            if job.job_type == "company_research_run":
+                await self.reopen_running_steps(job.tenant_id, job.run_id)
 
         job.locked_by = worker_id
         job.locked_at = utc_now()
+        job.claimed_at = job.locked_at
+        job.lease_token = (job.lease_token or 0) + 1
         await self.db.flush()
         await self.db.refresh(job)
         return job
@@ -2164,6 +3442,35 @@ class CompanyResearchRepository:
         await self.db.refresh(job)
         return job
 
+    async def renew_job_lease(self, job_id: UUID, worker_id: str, lease_token: int) -> bool:
+        """Heartbeat: push locked_at forward while ``worker_id`` still holds ``lease_token``.
+
+        False means the lease is gone (reclaimed, recovered, retried or the job
+        finished) and the caller must stop working on the job.
+        """
+        result = await self.db.execute(
+            update(CompanyResearchJob)
+            .where(
+                CompanyResearchJob.id == job_id,
+                CompanyResearchJob.status == "running",
+                CompanyResearchJob.locked_by == worker_id,
+                CompanyResearchJob.lease_token == lease_token,
+            )
+            .values(locked_at=utc_now())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    async def update_job_progress(self, job_id: UUID, progress_json: dict) -> Optional[CompanyResearchJob]:
+        result = await self.db.execute(select(CompanyResearchJob).where(CompanyResearchJob.id == job_id))
+        job = result.scalar_one_or_none()
+        if not job:
+            return None
+        job.progress_json = progress_json
+        job.locked_at = utc_now()
+        await self.db.flush()
+        return job
+
     async def mark_job_succeeded(
         self,
         job_id: UUID,
@@ -2254,6 +3561,7 @@ class CompanyResearchRepository:
         job.status = "queued"
         job.locked_at = None
         job.locked_by = None
+        job.lease_token = (job.lease_token or 0) + 1
         job.cancel_requested = False
         job.next_retry_at = utc_now() + timedelta(seconds=backoff_seconds) if backoff_seconds > 0 else None
         job.finished_at = None
@@ -2305,6 +3613,9 @@ class CompanyResearchRepository:
             job.next_retry_at = utc_now()
             job.cancel_requested = False
             job.finished_at = None
+            job.lease_token = (job.lease_token or 0) + 1
+            if job.job_type == "company_research_run":
+                await self.reopen_running_steps(job.tenant_id, job.run_id)
             setattr(job, "_recovered_locked_at", prev_locked_at)
             setattr(job, "_recovered_locked_by", prev_locked_by)
 
@@ -3,7 +3,7 @@ Repository for enrichment assignment database operations.
 """
 
 import uuid
-from typing import List
+from typing import Iterable, List, Set, Tuple
 from uuid import UUID
 
 from sqlalchemy import select
@@ -14,6 +14,9 @@ from sqlalchemy.dialects.postgresql import insert
 from app.models.enrichment_assignment import EnrichmentAssignment
 from app.schemas.enrichment_assignment import EnrichmentAssignmentCreate
 
+# Rows per multi-row upsert (12 bind parameters each)
+BULK_UPSERT_BATCH = 1000
+
 
 class EnrichmentAssignmentRepository:
     """CRUD and idempotent upsert helpers for enrichment assignments."""
@@ -58,6 +61,44 @@ class EnrichmentAssignmentRepository:
         await self.db.flush()
         return record
 
+    async def bulk_upsert_assignments(self, rows: List[dict]) -> int:
+        """Multi-row upsert on the idempotency key (which includes content_hash)."""
+        for start in range(0, len(rows), BULK_UPSERT_BATCH):
+            base_insert = insert(EnrichmentAssignment).values(rows[start:start + BULK_UPSERT_BATCH])
+            stmt = base_insert.on_conflict_do_update(
+                constraint="uq_enrichment_assignment_idempotent",
+                set_={
+                    "value_json": base_insert.excluded.value_json,
+                    "value_normalized": base_insert.excluded.value_normalized,
+                    "confidence": base_insert.excluded.confidence,
+                    "derived_by": base_insert.excluded.derived_by,
+                    "input_scope_hash": base_insert.excluded.input_scope_hash,
+                    "updated_at": func.now(),
+                },
+            )
+            await self.db.execute(stmt)
+        return len(rows)
+
+    async def list_recorded_scope_hashes(
+        self,
+        tenant_id: str,
+        canonical_ids: Iterable[UUID],
+        scope_hashes: Iterable[str],
+    ) -> Set[Tuple[UUID, str]]:
+        """(target_canonical_id, input_scope_hash) already recorded for these companies and hashes."""
+        canonical_ids, scope_hashes = list(canonical_ids), list(scope_hashes)
+        if not canonical_ids or not scope_hashes:
+            return set()
+        result = await self.db.execute(
+            select(EnrichmentAssignment.target_canonical_id, EnrichmentAssignment.input_scope_hash).where(
+                EnrichmentAssignment.tenant_id == tenant_id,
+                EnrichmentAssignment.target_entity_type == "company",
+                EnrichmentAssignment.target_canonical_id.in_(canonical_ids),
+                EnrichmentAssignment.input_scope_hash.in_(scope_hashes),
+            )
+        )
+        return {tuple(row) for row in result.all()}
+
     async def list_for_target(
         self,
         tenant_id: str,
@@ -0,0 +1,201 @@
+"""
+Repository for research_events partition maintenance (DDL on the monthly partitions).
+
+Partition names are generated by ``partition_name`` and validated against
+``PARTITION_NAME_RE`` before being interpolated into DDL.
+"""
+
+import re
+from datetime import date, datetime, timezone
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+PARENT_TABLE = "research_events"
+DEFAULT_PARTITION = "research_events_default"
+ROLLUP_EVENT_TYPE = "events_rollup"
+# research_events_p202601 (raw) or research_events_p202601_r (compacted)
+PARTITION_NAME_RE = re.compile(r"^research_events_p(\d{4})(\d{2})(_r)?$")
+
+
+def month_start(value: datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + (month.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date, compacted: bool = False) -> str:
+    return f"{PARENT_TABLE}_p{month.year:04d}{month.month:02d}" + ("_r" if compacted else "")
+
+
+def parse_partition_name(name: str) -> Optional[Tuple[date, bool]]:
+    """(month, compacted) for a monthly partition name; None for the default or foreign tables."""
+    match = PARTITION_NAME_RE.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1), bool(match.group(3))
+
+
+def _bound(month: date) -> str:
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc).isoformat()
+
+
+def _checked(name: str) -> str:
+    if not PARTITION_NAME_RE.match(name):
+        raise ValueError(f"invalid research_events partition name: {name!r}")
+    return name
+
+
+class ResearchEventPartitionRepository:
+    """Lists, creates, compacts and drops research_events monthly partitions."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_partitions(self) -> List[str]:
+        result = await self.db.execute(
+            text(
+                """
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = :parent
+                ORDER BY child.relname
+                """
+            ),
+            {"parent": PARENT_TABLE},
+        )
+        return [row[0] for row in result.all()]
+
+    async def create_partition(self, month: date) -> None:
+        """Create the month's partition, moving in any of its rows the default partition holds.
+
+        Postgres refuses ``PARTITION OF`` while the default partition has rows in
+        the new range, so in that case the default is detached, the partition
+        created, the month's rows moved across and the default re-attached, all
+        in the caller's transaction.
+        """
+        name = _checked(partition_name(month))
+        lower, upper = _bound(month), _bound(add_months(month, 1))
+        create = text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+            f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        )
+        stranded = await self.db.execute(
+            text(
+                f"""
+                SELECT EXISTS (
+                    SELECT 1 FROM {DEFAULT_PARTITION}
+                    WHERE created_at >= CAST(:lower AS timestamptz)
+                      AND created_at < CAST(:upper AS timestamptz)
+                )
+                """
+            ),
+            {"lower": lower, "upper": upper},
+        )
+        if not stranded.scalar():
+            await self.db.execute(create)
+            return
+
+        await self.db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+        await self.db.execute(create)
+        await self.db.execute(
+            text(
+                f"""
+                WITH moved AS (
+                    DELETE FROM {DEFAULT_PARTITION}
+                    WHERE created_at >= CAST(:lower AS timestamptz)
+                      AND created_at < CAST(:upper AS timestamptz)
+                    RETURNING *
+                )
+                INSERT INTO {name} SELECT * FROM moved
+                """
+            ),
+            {"lower": lower, "upper": upper},
+        )
+        await self.db.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+
+    async def compact_partition(self, month: date, rollup_event_types: Sequence[str]) -> dict:
+        """Replace a raw monthly partition with a compacted copy.
+
+        The copy keeps every event whose type is not in ``rollup_event_types``
+        and gets one ``events_rollup`` row per run with per-type counts of the
+        dropped events (created at the run's last dropped event, so it sorts
+        into the run timeline where the raw events were). The raw partition is
+        detached and dropped and the copy attached for the same month.
+        """
+        raw = _checked(partition_name(month))
+        compacted = _checked(partition_name(month, compacted=True))
+        types = list(rollup_event_types)
+
+        await self.db.execute(text(f"CREATE TABLE {compacted} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)"))
+        kept = await self.db.execute(
+            text(f"INSERT INTO {compacted} SELECT * FROM {raw} WHERE NOT (event_type = ANY(:types))").bindparams(
+                bindparam("types", value=types)
+            )
+        )
+        summarized = await self.db.execute(
+            text(
+                f"""
+                INSERT INTO {compacted} (
+                    id, tenant_id, company_research_run_id, event_type, status,
+                    input_json, output_json, created_at, updated_at
+                )
+                SELECT
+                    md5(CAST(:partition AS text) || ':' || s.company_research_run_id::text)::uuid,
+                    s.tenant_id,
+                    s.company_research_run_id,
+                    CAST(:rollup_type AS varchar),
+                    'ok',
+                    jsonb_build_object(
+                        'partition', CAST(:partition AS text),
+                        'counts', jsonb_object_agg(s.event_type, s.n),
+                        'first_at', min(s.first_at),
+                        'last_at', max(s.last_at)
+                    ),
+                    jsonb_build_object('message', 'Compacted ' || sum(s.n) || ' high-volume events'),
+                    max(s.last_at),
+                    now()
+                FROM (
+                    SELECT tenant_id, company_research_run_id, event_type,
+                           count(*) AS n, min(created_at) AS first_at, max(created_at) AS last_at
+                    FROM {raw}
+                    WHERE event_type = ANY(:types)
+                    GROUP BY tenant_id, company_research_run_id, event_type
+                ) s
+                GROUP BY s.tenant_id, s.company_research_run_id
+                """
+            ).bindparams(bindparam("types", value=types)),
+            {"partition": raw, "rollup_type": ROLLUP_EVENT_TYPE},
+        )
+        dropped = await self.db.execute(
+            text(f"SELECT count(*) FROM {raw} WHERE event_type = ANY(:types)").bindparams(
+                bindparam("types", value=types)
+            )
+        )
+        dropped_count = int(dropped.scalar_one())
+
+        await self.db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {raw}"))
+        await self.db.execute(text(f"DROP TABLE {raw}"))
+        await self.db.execute(
+            text(
+                f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {compacted} "
+                f"FOR VALUES FROM ('{_bound(month)}') TO ('{_bound(add_months(month, 1))}')"
+            )
+        )
+        return {
+            "partition": raw,
+            "kept": kept.rowcount,
+            "rollup_rows": summarized.rowcount,
+            "compacted_events": dropped_count,
+        }
+
+    async def drop_partition(self, name: str) -> None:
+        name = _checked(name)
+        await self.db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        await self.db.execute(text(f"DROP TABLE {name}"))
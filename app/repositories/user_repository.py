@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
 from app.schemas.user import UserCreate
 from app.core.security import hash_password
+from app.core.principal_cache import principal_cache
 
 
 class UserRepository:
@@ -86,4 +87,6 @@ class UserRepository:
         
         await self.db.commit()
         await self.db.refresh(user)
+        # Role/activation changes must not be served from a stale cached principal
+        principal_cache.invalidate_user(user.id)
         return user
@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.dependencies import get_db, get_tenant_id, verify_user_tenant_access, require_role
+from app.core.principal_cache import principal_cache
 from app.schemas.user import LoginRequest, LoginResponse, UserCreate, UserRead, UserUpdate
 from app.services.auth_service import AuthService
 from app.repositories.user_repository import UserRepository
@@ -138,3 +139,15 @@ async def update_user(
     
     updated_user = await user_repository.update(user_id, user_data)
     return updated_user
+
+
+@router.get("/principal-cache/stats")
+async def get_principal_cache_stats(
+    current_user: User = Depends(require_role("admin"))
+):
+    """
+    Hit-ratio and size metrics for the authenticated principal cache.
+    
+    Only admin users can read cache metrics.
+    """
+    return principal_cache.stats()
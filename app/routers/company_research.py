@@ -11,27 +11,32 @@ import csv
 import hashlib
 import io
 import os
+from datetime import timedelta
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 
 from app.core.config import settings
-from app.core.dependencies import get_db, verify_user_tenant_access
+from app.core.dependencies import get_db, get_reporting_db, require_role, verify_user_tenant_access
+from app.db.session import ReportingSessionLocal
 from app.errors import raise_app_error
 from app.models.user import User
 from app.services.company_research_service import CompanyResearchService
 from app.services.discovery_provider import ExternalProviderConfigError
-from app.services.contact_enrichment_service import ContactEnrichmentService
+from app.services.run_event_stream import stream_run_events
+from app.services.contact_enrichment_service import ContactEnrichmentService, JOB_TYPE_EXEC_CONTACT_ENRICHMENT
+from app.utils.time import utc_now
 from app.schemas.company_research import (
     CompanyResearchRunCreate,
     CompanyResearchRunRead,
     CompanyResearchRunUpdate,
     CompanyResearchRunSummary,
     CompanyResearchJobRead,
+    DomainRateLimitRead,
     CompanyResearchRunPlanRead,
     CompanyResearchRunStepRead,
     CompanyProspectCreate,
@@ -59,6 +64,9 @@ from app.schemas.company_research import (
     SourceDocumentCreate,
     ResolvedEntityRead,
     EntityMergeLinkRead,
+    ProspectNameDuplicatesResponse,
+    ProspectNameMergeRequest,
+    ProspectNameMergeResponse,
     CanonicalPersonRead,
     CanonicalPersonListItem,
     CanonicalPersonLinkRead,
@@ -87,6 +95,7 @@ from app.schemas.executive_contact_enrichment import (
     BulkExecutiveContactEnrichmentRequest,
     BulkExecutiveContactEnrichmentResponse,
     BulkExecutiveContactEnrichmentResponseItem,
+    BulkExecutiveContactEnrichmentJobResponse,
 )
 from app.schemas.executive_discovery import ExecutiveDiscoveryPayload
 
@@ -378,6 +387,44 @@ async def list_research_run_steps(
     return [CompanyResearchRunStepRead.model_validate(s) for s in steps]
 
 
+@router.get("/metrics/steps", response_class=PlainTextResponse)
+async def get_step_metrics(
+    since_hours: Optional[int] = Query(None, ge=1, description="Only steps finished in the last N hours"),
+    current_user: User = Depends(verify_user_tenant_access),
+    db: AsyncSession = Depends(get_reporting_db),
+):
+    """Prometheus text metrics for run step telemetry, aggregated across the tenant's runs."""
+    service = CompanyResearchService(db)
+    since = utc_now() - timedelta(hours=since_hours) if since_hours else None
+    body = await service.render_step_metrics(current_user.tenant_id, since=since)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+
+@router.get("/metrics/jobs", response_class=PlainTextResponse)
+async def get_job_queue_metrics(
+    since_hours: Optional[int] = Query(
+        None, ge=1, description="Queue waits of jobs started in the last N hours (default JOB_QUEUE_METRICS_WINDOW_HOURS)"
+    ),
+    current_user: User = Depends(verify_user_tenant_access),
+    db: AsyncSession = Depends(get_reporting_db),
+):
+    """Prometheus text metrics for the tenant's job queue: wait p50/p95/max by job type and priority, plus backlog."""
+    service = CompanyResearchService(db)
+    since = utc_now() - timedelta(hours=since_hours or settings.JOB_QUEUE_METRICS_WINDOW_HOURS)
+    body = await service.render_job_queue_metrics(current_user.tenant_id, since=since)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+
+@router.get("/fetch/rate-limits", response_model=List[DomainRateLimitRead])
+async def list_fetch_rate_limits(
+    current_user: User = Depends(require_role("admin")),
+    db: AsyncSession = Depends(get_reporting_db),
+):
+    """Per-domain fetch limits (concurrency window, request spacing, throttles) learned by the workers."""
+    service = CompanyResearchService(db)
+    return await service.list_domain_rate_limits(current_user.tenant_id)
+
+
 @router.post("/runs/{run_id}/start", response_model=CompanyResearchJobRead)
 async def start_research_run(
     run_id: UUID,
@@ -473,7 +520,7 @@ async def get_company_research_job(
 
     service = CompanyResearchService(db)
     job = await service.get_job_for_tenant(current_user.tenant_id, job_id)
-    if not job or job.job_type != "acquire_extract_async":
+    if not job or job.job_type not in {"acquire_extract_async", JOB_TYPE_EXEC_CONTACT_ENRICHMENT}:
         raise_app_error(404, "JOB_NOT_FOUND", "Job not found", {"job_id": str(job_id)})
 
     return AcquireExtractJobStatusResponse(
@@ -1185,7 +1232,7 @@ async def export_executives_json(
     discovered_by: Optional[str] = Query(None, description="Filter by discovery provenance"),
     verification_status: Optional[str] = Query(None, description="Filter by company verification status"),
     current_user: User = Depends(verify_user_tenant_access),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_reporting_db),
 ):
     """Export executive prospects as JSON using stable ordering."""
 
@@ -1209,7 +1256,7 @@ async def export_executives_csv(
     discovered_by: Optional[str] = Query(None, description="Filter by discovery provenance"),
     verification_status: Optional[str] = Query(None, description="Filter by company verification status"),
     current_user: User = Depends(verify_user_tenant_access),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_reporting_db),
 ):
     """Export executive prospects as CSV with evidence pointers."""
 
@@ -1307,18 +1354,20 @@ async def bulk_enrich_executive_contacts(
     enrichment_service = ContactEnrichmentService(db)
     enrichment_request = ContactEnrichmentRequest(**payload.model_dump(exclude={"executive_ids"}))
 
+    known = await research_service.repo.list_executive_ids_in_run(current_user.tenant_id, run_id, payload.executive_ids)
+    if any(exec_id not in known for exec_id in payload.executive_ids):
+        raise HTTPException(status_code=404, detail="Executive prospect not found in run")
+
+    batch_results = await enrichment_service.enrich_executives(
+        tenant_id=str(current_user.tenant_id),
+        run_id=run_id,
+        executive_ids=payload.executive_ids,
+        request=enrichment_request,
+    )
+    await db.commit()
+
     items: List[BulkExecutiveContactEnrichmentResponseItem] = []
-    for exec_id in payload.executive_ids:
-        executive = await research_service.repo.get_executive_prospect(current_user.tenant_id, exec_id)
-        if not executive or executive.company_research_run_id != run_id:
-            raise HTTPException(status_code=404, detail="Executive prospect not found in run")
-
-        results = await enrichment_service.enrich_executive_contacts(
-            tenant_id=str(current_user.tenant_id),
-            executive_id=exec_id,
-            request=enrichment_request,
-            performed_by=current_user.email or current_user.username,
-        )
+    for exec_id, results in batch_results:
         if results is None:
             raise_app_error(
                 404,
@@ -1326,7 +1375,6 @@ async def bulk_enrich_executive_contacts(
                 "Executive prospect not found",
                 {"executive_id": str(exec_id)},
             )
-
         items.append(
             BulkExecutiveContactEnrichmentResponseItem(
                 executive_id=exec_id,
@@ -1337,6 +1385,60 @@ async def bulk_enrich_executive_contacts(
     return BulkExecutiveContactEnrichmentResponse(items=items)
 
 
+@router.post(
+    "/runs/{run_id}/executives/enrich_contacts:enqueue",
+    response_model=BulkExecutiveContactEnrichmentJobResponse,
+)
+async def enqueue_bulk_executive_contact_enrichment(
+    run_id: UUID,
+    payload: BulkExecutiveContactEnrichmentRequest,
+    current_user: User = Depends(verify_user_tenant_access),
+    db: AsyncSession = Depends(get_db),
+):
+    """Enqueue a durable bulk contact enrichment job; poll progress via GET /jobs/{job_id}."""
+
+    max_allowed = settings.BULK_ENRICH_JOB_MAX_EXECUTIVES
+    if len(payload.executive_ids) > max_allowed:
+        raise_app_error(
+            400,
+            "EXEC_ENRICH_LIMIT_EXCEEDED",
+            "Too many executive_ids supplied",
+            {"max_executive_ids": max_allowed, "provided": len(payload.executive_ids)},
+        )
+
+    service = CompanyResearchService(db)
+    try:
+        result = await service.enqueue_contact_enrichment_job(
+            tenant_id=current_user.tenant_id,
+            run_id=run_id,
+            executive_ids=payload.executive_ids,
+            request=ContactEnrichmentRequest(**payload.model_dump(exclude={"executive_ids"})),
+        )
+    except ValueError as exc:  # noqa: BLE001
+        if str(exc.args[0]) == "run_not_found":
+            raise_app_error(404, "RUN_NOT_FOUND", "Research run not found", {"run_id": str(run_id)})
+        if str(exc.args[0]) == "executives_not_in_run":
+            missing = exc.args[1]
+            raise_app_error(
+                404,
+                "EXEC_NOT_FOUND",
+                "Executive prospect not found in run",
+                {"executive_ids": [str(eid) for eid in missing[:20]], "missing_count": len(missing)},
+            )
+        raise
+
+    await db.commit()
+    job = result["job"]
+    return BulkExecutiveContactEnrichmentJobResponse(
+        job_id=job.id,
+        run_id=job.run_id,
+        status=job.status,
+        params_hash=result["params_hash"],
+        executive_count=result["executive_count"],
+        reused_reason=result.get("reused_reason"),
+    )
+
+
 @router.patch("/executives/{executive_id}/verification-status", response_model=ExecutiveProspectRead)
 async def update_executive_verification_status(
     executive_id: UUID,
@@ -1674,6 +1776,31 @@ async def list_research_events(
     return [ResearchEventRead.model_validate(e) for e in events]
 
 
+@router.get("/runs/{run_id}/events/stream")
+async def stream_research_events(
+    run_id: UUID,
+    request: Request,
+    last_event_id: Optional[str] = Query(None, description="Resume after this event (the Last-Event-ID header wins)"),
+    current_user: User = Depends(verify_user_tenant_access),
+    db: AsyncSession = Depends(get_db),
+):
+    """Server-sent events for a run: new events, step transitions and run end (Last-Event-ID resumes)."""
+    service = CompanyResearchService(db)
+    run = await service.get_research_run(current_user.tenant_id, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Research run not found")
+    stream = stream_run_events(
+        str(current_user.tenant_id),
+        run_id,
+        last_event_id=request.headers.get("last-event-id") or last_event_id,
+    )
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/runs/{run_id}/resolved-entities", response_model=List[ResolvedEntityRead])
 async def list_resolved_entities(
     run_id: UUID,
@@ -1716,6 +1843,50 @@ async def list_entity_merge_links(
     return [EntityMergeLinkRead.model_validate(l) for l in links]
 
 
+@router.get("/runs/{run_id}/prospects/probable-duplicates", response_model=ProspectNameDuplicatesResponse)
+async def list_probable_duplicate_prospects(
+    run_id: UUID,
+    threshold: Optional[float] = Query(None, ge=0.5, le=1.0, description="Minimum name similarity"),
+    current_user: User = Depends(verify_user_tenant_access),
+    db: AsyncSession = Depends(get_db),
+):
+    """Pairs of run prospects with similar names (fuzzy name match), best match first."""
+    service = CompanyResearchService(db)
+    run = await service.get_research_run(current_user.tenant_id, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Research run not found")
+
+    result = await service.list_probable_duplicate_prospects(
+        tenant_id=current_user.tenant_id,
+        run_id=run_id,
+        threshold=threshold,
+    )
+    return ProspectNameDuplicatesResponse.model_validate(result)
+
+
+@router.post("/runs/{run_id}/prospects/merge-duplicates", response_model=ProspectNameMergeResponse)
+async def merge_probable_duplicate_prospects(
+    run_id: UUID,
+    data: ProspectNameMergeRequest,
+    current_user: User = Depends(verify_user_tenant_access),
+    db: AsyncSession = Depends(get_db),
+):
+    """Mark run prospects whose names match above the threshold as duplicates of the oldest (pinned first)."""
+    service = CompanyResearchService(db)
+    run = await service.get_research_run(current_user.tenant_id, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Research run not found")
+
+    summary = await service.merge_probable_duplicate_prospects(
+        tenant_id=current_user.tenant_id,
+        run_id=run_id,
+        threshold=data.threshold,
+        dry_run=data.dry_run,
+    )
+    await db.commit()
+    return ProspectNameMergeResponse.model_validate(summary)
+
+
 @router.get("/canonical-people", response_model=List[CanonicalPersonListItem])
 async def list_canonical_people(
     limit: int = Query(50, ge=1, le=200),
@@ -2000,7 +2171,7 @@ async def export_ranked_prospects_json(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     current_user: User = Depends(verify_user_tenant_access),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_reporting_db),
 ):
     """Export ranked prospects as JSON with optional explainability filters."""
 
@@ -2042,7 +2213,7 @@ async def export_ranked_prospects_csv(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     current_user: User = Depends(verify_user_tenant_access),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_reporting_db),
 ):
     """Export ranked prospects as CSV with explainability rollup."""
 
@@ -2167,7 +2338,7 @@ async def export_ranked_executives_json(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     current_user: User = Depends(verify_user_tenant_access),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_reporting_db),
 ):
     """Export ranked executives as JSON with explainability."""
 
@@ -2196,7 +2367,7 @@ async def export_ranked_executives_csv(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     current_user: User = Depends(verify_user_tenant_access),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_reporting_db),
 ):
     """Export ranked executives as CSV with explainability rollup."""
 
@@ -2361,20 +2532,78 @@ async def download_export_pack(
     return StreamingResponse(io.BytesIO(data), media_type="application/zip", headers=headers)
 
 
+def _spooled_file_response(path, range_header: Optional[str], filename: str):
+    """Serve a spooled file, honouring a single ``bytes=`` Range so downloads can resume."""
+
+    total = path.stat().st_size
+    headers = {"Content-Disposition": f"attachment; filename={filename}", "Accept-Ranges": "bytes"}
+    start, end, status_code = 0, total - 1, 200
+    if range_header:
+        unit, _, spec = range_header.partition("=")
+        first, _, last = spec.partition("-")
+        try:
+            if unit.strip() != "bytes" or "," in spec:
+                raise ValueError("unsupported_range")
+            if first.strip():
+                start = int(first)
+                end = min(int(last), total - 1) if last.strip() else total - 1
+            else:
+                start = max(total - int(last), 0)
+        except ValueError:
+            start = end = -1
+        if start < 0 or start > end or start >= total:
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{total}", "Accept-Ranges": "bytes"})
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{total}"
+
+    length = end - start + 1
+    headers["Content-Length"] = str(length)
+
+    def _iter_file():
+        chunk_size = max(1, CompanyResearchService.EVIDENCE_BUNDLE_STREAM_CHUNK_BYTES)
+        remaining = length
+        with path.open("rb") as handle:
+            handle.seek(start)
+            while remaining > 0:
+                data = handle.read(min(chunk_size, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield data
+
+    return StreamingResponse(_iter_file(), status_code=status_code, media_type="application/zip", headers=headers)
+
+
 @router.get("/runs/{run_id}/evidence-bundle", response_class=StreamingResponse)
 async def download_evidence_bundle(
     run_id: UUID,
+    request: Request,
+    include_sources: bool = Query(False, description="Include raw source payloads under sources/"),
+    spool: bool = Query(False, description="Spool to disk and serve with Range support (implies include_sources)"),
     current_user: User = Depends(verify_user_tenant_access),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_reporting_db),
 ):
-    """Generate a deterministic evidence bundle for a research run."""
+    """Generate a deterministic evidence bundle for a research run.
+
+    The default bundle holds listings only and is built in memory. With
+    ``include_sources`` the zip, including every source payload, is streamed
+    entry by entry; with ``spool`` it is written to disk once per content
+    fingerprint and served with HTTP Range support for resumable downloads.
+    """
 
     service = CompanyResearchService(db)
+    filename = f"run_{run_id}_evidence_bundle.zip"
     try:
-        bundle_bytes, _manifest, _files = await service.build_evidence_bundle(
-            tenant_id=current_user.tenant_id,
-            run_id=run_id,
-        )
+        if spool:
+            path = await service.spool_evidence_bundle(current_user.tenant_id, run_id)
+            return _spooled_file_response(path, request.headers.get("range"), filename)
+        if include_sources:
+            prepared = await service.prepare_evidence_bundle_stream(current_user.tenant_id, run_id)
+        else:
+            bundle_bytes, _manifest, _files = await service.build_evidence_bundle(
+                tenant_id=current_user.tenant_id,
+                run_id=run_id,
+            )
     except ValueError as exc:  # noqa: BLE001
         if str(exc) == "research_run_not_found":
             raise_app_error(404, "RUN_NOT_FOUND", "Research run not found", {"run_id": str(run_id)})
@@ -2387,8 +2616,18 @@ async def download_evidence_bundle(
             )
         raise
 
-    filename = f"run_{run_id}_evidence_bundle.zip"
     headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    if include_sources:
+        tenant_id = current_user.tenant_id
+
+        async def _stream():
+            # The request-scoped session is closed before the body is sent.
+            async with ReportingSessionLocal() as stream_db:
+                stream_service = CompanyResearchService(stream_db)
+                async for data in stream_service.stream_evidence_bundle(tenant_id, run_id, prepared=prepared):
+                    yield data
+
+        return StreamingResponse(_stream(), media_type="application/zip", headers=headers)
     return StreamingResponse(io.BytesIO(bundle_bytes), media_type="application/zip", headers=headers)
 
 
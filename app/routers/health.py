@@ -9,7 +9,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_db, get_default_profile, pool_metrics
 
 router = APIRouter()
 
@@ -62,3 +62,13 @@ async def health_check(db: AsyncSession = Depends(get_db)):
         "alembic_current": alembic_current,
         "alembic_head": alembic_head,
     }
+
+
+@router.get("/health/db-pools")
+async def db_pool_health():
+    """Connection pool occupancy and checkout wait time per engine profile."""
+
+    return {
+        "default_profile": get_default_profile(),
+        "pools": pool_metrics(),
+    }
@@ -0,0 +1,41 @@
+"""
+Retrieval of stored sampling profiles (admin only).
+
+Profiles are captured by ``ProfilingMiddleware`` for API requests sent with
+``X-Profile: 1`` and by the worker's ``--profile-steps`` flag; see
+app/core/profiler.py.
+"""
+
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import FileResponse
+
+from app.core.dependencies import require_role
+from app.core.profiler import PROFILE_ARTIFACTS, list_profiles, profile_artifact_path
+from app.errors import raise_app_error
+from app.models.user import User
+
+router = APIRouter(prefix="/internal/profiles")
+
+
+@router.get("")
+async def get_profiles(
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(require_role("admin")),
+) -> List[Dict[str, Any]]:
+    """Newest-first profile summaries for the tenant."""
+    return list_profiles(str(current_user.tenant_id), limit=limit)
+
+
+@router.get("/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    format: str = Query("speedscope", pattern="^(speedscope|collapsed|timeline)$"),
+    current_user: User = Depends(require_role("admin")),
+):
+    """Download one profile artifact: speedscope JSON, collapsed stacks, or the SQL timeline."""
+    path = profile_artifact_path(str(current_user.tenant_id), profile_id, format)
+    if path is None:
+        raise_app_error(404, "PROFILE_NOT_FOUND", "Profile not found", {"profile_id": profile_id})
+    return FileResponse(path, media_type=PROFILE_ARTIFACTS[format][1], filename=path.name)
@@ -25,6 +25,7 @@ from app.schemas.executive_contact_enrichment import (
     BulkExecutiveContactEnrichmentRequest,
     BulkExecutiveContactEnrichmentResponse,
     BulkExecutiveContactEnrichmentResponseItem,
+    BulkExecutiveContactEnrichmentJobResponse,
 )
 
 __all__ = [
@@ -65,4 +66,5 @@ __all__ = [
     "BulkExecutiveContactEnrichmentRequest",
     "BulkExecutiveContactEnrichmentResponse",
     "BulkExecutiveContactEnrichmentResponseItem",
+    "BulkExecutiveContactEnrichmentJobResponse",
 ]
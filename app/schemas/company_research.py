@@ -84,6 +84,7 @@ class CompanyResearchRunStepRead(TenantScopedRead):
     finished_at: Optional[datetime] = None
     input_json: Optional[Dict[str, Any]] = None
     output_json: Optional[Dict[str, Any]] = None
+    metrics_json: Optional[Dict[str, Any]] = None
     last_error: Optional[str] = None
 
 
@@ -617,6 +618,7 @@ class ExecutiveRanking(BaseModel):
     verification_status: Optional[str] = None
     rank_score: float
     rank_position: int
+    company_rank_position: Optional[int] = None
     evidence_source_document_ids: List[UUID] = Field(default_factory=list)
     why_ranked: List[ExecutiveRankReason] = Field(default_factory=list)
 
@@ -1032,11 +1034,13 @@ class CompanyResearchJobRead(TenantScopedRead):
     run_id: UUID
     job_type: str
     status: str
+    priority: int = 1
     attempt_count: int
     max_attempts: int
     next_retry_at: Optional[datetime] = None
     locked_at: Optional[datetime] = None
     locked_by: Optional[str] = None
+    claimed_at: Optional[datetime] = None
     cancel_requested: bool
     last_error: Optional[str] = None
     params_hash: Optional[str] = None
@@ -1047,6 +1051,20 @@ class CompanyResearchJobRead(TenantScopedRead):
     finished_at: Optional[datetime] = None
 
 
+class DomainRateLimitRead(TenantScopedRead):
+    """Learned fetch limits for one domain (adaptive per-domain rate control)."""
+
+    domain: str
+    concurrency_limit: float
+    delay_ms: int
+    latency_ewma_ms: Optional[float] = None
+    latency_floor_ms: Optional[float] = None
+    throttle_count: int = 0
+    last_status_code: Optional[int] = None
+    last_throttled_at: Optional[datetime] = None
+    cooldown_until: Optional[datetime] = None
+
+
 # ============================================================================
 # Source Document Schemas
 # ============================================================================
@@ -1261,7 +1279,7 @@ class AcquireExtractJobStatusResponse(BaseModel):
 class AcquireExtractLeaseRecoveryRequest(BaseModel):
     """Request payload for lease recovery of acquire/extract jobs."""
 
-    stale_after_seconds: int = Field(default=1800, ge=60, le=86400)
+    stale_after_seconds: int = Field(default=60, ge=60, le=86400)
     limit: int = Field(default=50, ge=1, le=500)
 
 
@@ -1329,6 +1347,43 @@ class EntityMergeLinkRead(TenantScopedRead):
     resolution_hash: str
 
 
+class ProspectNameDuplicatePair(BaseModel):
+    """Two run prospects whose names probably refer to the same company."""
+
+    left_prospect_id: UUID
+    left_name: Optional[str] = None
+    right_prospect_id: UUID
+    right_name: Optional[str] = None
+    score: float
+    shared_keys: int
+
+
+class ProspectNameDuplicatesResponse(BaseModel):
+    """Probable duplicate prospects of a run, best match first."""
+
+    prospects_scanned: int
+    threshold: float
+    pairs: List[ProspectNameDuplicatePair]
+
+
+class ProspectNameMergeRequest(BaseModel):
+    """Auto-merge of fuzzy name duplicates; threshold defaults to PROSPECT_NAME_AUTO_MERGE_THRESHOLD."""
+
+    threshold: Optional[float] = Field(None, ge=0.5, le=1.0)
+    dry_run: bool = False
+
+
+class ProspectNameMergeResponse(BaseModel):
+    """Summary of a fuzzy name merge pass."""
+
+    entity_type: str
+    prospects_scanned: int
+    threshold: float
+    pairs_matched: int
+    groups_merged: int
+    duplicates_marked: int
+
+
 # ============================================================================
 # Canonical People Schemas (Stage 6.2)
 # ============================================================================
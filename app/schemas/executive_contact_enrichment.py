@@ -2,7 +2,7 @@
 Schemas for executive contact enrichment actions.
 """
 
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -26,3 +26,12 @@ class BulkExecutiveContactEnrichmentResponseItem(BaseModel):
 
 class BulkExecutiveContactEnrichmentResponse(BaseModel):
     items: List[BulkExecutiveContactEnrichmentResponseItem]
+
+
+class BulkExecutiveContactEnrichmentJobResponse(BaseModel):
+    job_id: UUID
+    run_id: UUID
+    status: str
+    params_hash: str
+    executive_count: int
+    reused_reason: Optional[str] = None
@@ -28,6 +28,7 @@ from app.models.company_research import (
     ResearchSourceDocument,
     CompanyProspectEvidence,
 )
+from app.services.company_name_dedupe_service import CompanyNameDedupeService
 
 
 def _normalize_company_name(name: str) -> str:
@@ -297,6 +298,10 @@ class AIProposalService:
             )
         )
         prospect = existing_query.scalar_one_or_none()
+        if not prospect:
+            prospect = await CompanyNameDedupeService(self.session).match_existing_prospect(
+                tenant_id, run_id, company_data.name
+            )
         
         if prospect:
             # Update existing prospect
@@ -1,13 +1,33 @@
+import asyncio
 import uuid
 from collections import defaultdict
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.company_research import CompanyProspect, CanonicalCompany
 from app.repositories.company_research_repo import CompanyResearchRepository
+from app.services.run_resolution_snapshot import CompanyRow, EvidenceMap, RunSnapshot, load_run_snapshot
+from app.utils.company_name_match import compact_name, match_tokens
+
+
+@dataclass
+class CanonicalCompanyState:
+    companies_by_domain: Dict[str, UUID]
+    # (lower(canonical_name), country_code) -> id
+    companies_by_name_country: Dict[Tuple[str, str], UUID]
+    link_entity_ids: Set[UUID]
+
+
+@dataclass
+class CanonicalCompanyPlan:
+    summary: dict = field(default_factory=dict)
+    companies: List[dict] = field(default_factory=list)
+    # domain_normalized -> row / company_entity_id -> row (last decision wins, as with row-by-row upserts)
+    domains: Dict[str, dict] = field(default_factory=dict)
+    links: Dict[UUID, dict] = field(default_factory=dict)
 
 
 class CanonicalCompanyService:
@@ -17,34 +37,68 @@ class CanonicalCompanyService:
         self.db = db
         self.repo = CompanyResearchRepository(db)
 
-    async def resolve_run_companies(self, tenant_id: str, run_id: UUID) -> dict:
-        driver_prospects = await self.repo.list_company_prospects_for_run_with_website(tenant_id, run_id)
-        driver_name_country = [p for p in await self.repo.list_company_prospects_with_country(tenant_id) if p.company_research_run_id == run_id and not p.website_url]
+    async def resolve_run_companies(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        snapshot: Optional[RunSnapshot] = None,
+    ) -> dict:
+        if snapshot is None:
+            snapshot = await load_run_snapshot(self.repo, tenant_id, run_id)
+        state = await self.load_state(snapshot)
+        plan = await asyncio.to_thread(self.plan, snapshot, state)
+        return await self.apply_plan(plan)
+
+    async def load_state(self, snapshot: RunSnapshot) -> CanonicalCompanyState:
+        """Canonical companies for the run's domains and names, and the tenant's linked prospect ids."""
+        tenant_id = snapshot.tenant_id
+        run_companies = snapshot.run_companies
+        domains = sorted({d for d in (self._normalize_domain(c.website_url) for c in run_companies) if d})
+        names = sorted(
+            {n for n in (self._normalize_name(c.name_normalized or c.name_raw) for c in run_companies) if n}
+        )
+        return CanonicalCompanyState(
+            companies_by_domain=await self.repo.map_canonical_companies_by_domain(tenant_id, domains),
+            companies_by_name_country=await self.repo.map_canonical_companies_by_name_country(tenant_id, names),
+            link_entity_ids=await self.repo.list_canonical_company_link_entity_ids(tenant_id),
+        )
+
+    def plan(self, snapshot: RunSnapshot, state: CanonicalCompanyState) -> CanonicalCompanyPlan:
+        """Decide canonical companies and links for the run's prospects (no I/O).
 
-        all_domain_prospects = await self.repo.list_company_prospects_with_website(tenant_id)
-        domain_map: Dict[str, List[CompanyProspect]] = defaultdict(list)
-        for prospect in all_domain_prospects:
-            norm = self._normalize_domain(prospect.website_url)
-            if norm:
-                domain_map[norm].append(prospect)
+        Canonical companies planned earlier in the pass are visible to later
+        domain and name + country lookups, as they were with per-row queries.
+        Name + country peers are grouped by match key, so "Bank Muscat SAOG" and
+        "BankMuscat" in the same country share one canonical company.
+        """
+        tenant_id = snapshot.tenant_id
+        run_companies = snapshot.run_companies
+        driver_prospects = [p for p in run_companies if p.website_url is not None]
+        driver_name_country = [p for p in run_companies if p.hq_country is not None and not p.website_url]
 
-        name_country_map: Dict[Tuple[str, str], List[CompanyProspect]] = defaultdict(list)
-        for prospect in await self.repo.list_company_prospects_with_country(tenant_id):
-            if prospect.website_url:
+        domain_map: Dict[str, List[CompanyRow]] = defaultdict(list)
+        # (name match key, country) -> prospects
+        name_country_map: Dict[Tuple[str, str], List[CompanyRow]] = defaultdict(list)
+        for prospect in snapshot.companies:
+            if prospect.website_url is not None:
+                norm = self._normalize_domain(prospect.website_url)
+                if norm:
+                    domain_map[norm].append(prospect)
+            if prospect.hq_country is None or prospect.website_url:
                 continue
-            name_norm = self._normalize_name(prospect.name_normalized or prospect.name_raw)
+            name_key = self._name_match_key(prospect)
             country = (prospect.hq_country or "").strip().upper()
-            if name_norm and country:
-                name_country_map[(name_norm, country)].append(prospect)
-
-        all_ids = [p.id for p in all_domain_prospects] + [p.id for p in driver_name_country]
-        evidence_rows = await self.repo.list_company_evidence_for_prospect_ids(tenant_id, list(set(all_ids)))
-        evidence_map = self._build_evidence_map(evidence_rows)
+            if name_key and country:
+                name_country_map[(name_key, country)].append(prospect)
 
-        existing_links = await self.repo.list_canonical_company_links(tenant_id)
-        existing_link_entity_ids: Set[UUID] = {l.company_entity_id for l in existing_links}
+        plan = CanonicalCompanyPlan()
+        companies_by_domain = dict(state.companies_by_domain)
+        companies_by_name_country = dict(state.companies_by_name_country)
+        companies_by_name_key: Dict[Tuple[str, str], UUID] = {}
+        existing_link_entity_ids: Set[UUID] = set(state.link_entity_ids)
 
-        summary = {
+        summary = plan.summary
+        summary.update({
             "companies_scanned": len(driver_prospects) + len(driver_name_country),
             "canonical_companies_created": 0,
             "canonical_companies_matched": 0,
@@ -54,7 +108,31 @@ class CanonicalCompanyService:
             "evidence_missing_skipped": 0,
             "warnings_multi_evidence": 0,
             "multi_evidence_deterministic_choice": 0,
-        }
+        })
+
+        def _create(canonical_name: Optional[str], primary_domain: Optional[str], country_code: Optional[str]) -> UUID:
+            company_id = uuid.uuid4()
+            plan.companies.append({
+                "id": company_id,
+                "tenant_id": tenant_id,
+                "canonical_name": canonical_name,
+                "primary_domain": primary_domain,
+                "country_code": country_code,
+            })
+            if canonical_name and country_code is not None:
+                companies_by_name_country.setdefault((canonical_name.lower(), country_code), company_id)
+            return company_id
+
+        def _link(canonical_company_id: UUID, prospect: CompanyRow, match_rule: str) -> None:
+            self._plan_link(
+                plan,
+                tenant_id=tenant_id,
+                canonical_company_id=canonical_company_id,
+                prospect=prospect,
+                match_rule=match_rule,
+                evidence_map=snapshot.company_evidence,
+                existing_link_entity_ids=existing_link_entity_ids,
+            )
 
         # Domain-first resolution
         for prospect in driver_prospects:
@@ -62,82 +140,64 @@ class CanonicalCompanyService:
             if not domain_norm:
                 continue
 
-            canonical = await self.repo.get_canonical_company_by_domain(tenant_id, domain_norm)
-            if canonical:
+            canonical_id = companies_by_domain.get(domain_norm)
+            if canonical_id:
                 summary["canonical_companies_matched"] += 1
             else:
-                canonical = await self.repo.create_canonical_company(
-                    tenant_id=tenant_id,
-                    canonical_name=self._normalize_name(prospect.name_normalized or prospect.name_raw),
-                    primary_domain=domain_norm,
-                    country_code=prospect.hq_country,
+                canonical_id = _create(
+                    self._normalize_name(prospect.name_normalized or prospect.name_raw),
+                    domain_norm,
+                    prospect.hq_country,
                 )
                 summary["canonical_companies_created"] += 1
 
-            await self.repo.upsert_canonical_company_domain(tenant_id, canonical.id, domain_norm)
-            await self._link_prospect(
-                tenant_id=tenant_id,
-                canonical_company_id=canonical.id,
-                prospect=prospect,
-                match_rule="domain",
-                evidence_map=evidence_map,
-                existing_link_entity_ids=existing_link_entity_ids,
-                summary=summary,
-            )
-
+            companies_by_domain[domain_norm] = canonical_id
+            plan.domains[domain_norm] = {
+                "id": uuid.uuid4(),
+                "tenant_id": tenant_id,
+                "canonical_company_id": canonical_id,
+                "domain_normalized": domain_norm,
+            }
+            _link(canonical_id, prospect, "domain")
             for peer in domain_map.get(domain_norm, []):
-                await self._link_prospect(
-                    tenant_id=tenant_id,
-                    canonical_company_id=canonical.id,
-                    prospect=peer,
-                    match_rule="domain",
-                    evidence_map=evidence_map,
-                    existing_link_entity_ids=existing_link_entity_ids,
-                    summary=summary,
-                )
+                _link(canonical_id, peer, "domain")
 
         # Name + country resolution (only when country exists and no domain)
         for prospect in driver_name_country:
             name_norm = self._normalize_name(prospect.name_normalized or prospect.name_raw)
+            name_key = self._name_match_key(prospect)
             country = (prospect.hq_country or "").strip().upper()
-            if not name_norm or not country:
+            if not name_norm or not name_key or not country:
                 continue
 
-            canonical = await self.repo.get_canonical_company_by_name_country(
-                tenant_id=tenant_id,
-                name_normalized=name_norm,
-                country_code=country,
+            peers = name_country_map.get((name_key, country), [])
+            canonical_id = companies_by_name_key.get((name_key, country)) or companies_by_name_country.get(
+                (name_norm, country)
             )
-            if canonical:
+            for peer in peers:
+                if canonical_id:
+                    break
+                peer_name = self._normalize_name(peer.name_normalized or peer.name_raw)
+                canonical_id = companies_by_name_country.get((peer_name, country))
+            if canonical_id:
                 summary["canonical_companies_matched"] += 1
             else:
-                canonical = await self.repo.create_canonical_company(
-                    tenant_id=tenant_id,
-                    canonical_name=name_norm,
-                    primary_domain=None,
-                    country_code=country,
-                )
+                canonical_id = _create(name_norm, None, country)
                 summary["canonical_companies_created"] += 1
+            companies_by_name_key[(name_key, country)] = canonical_id
 
-            for peer in name_country_map.get((name_norm, country), []):
-                await self._link_prospect(
-                    tenant_id=tenant_id,
-                    canonical_company_id=canonical.id,
-                    prospect=peer,
-                    match_rule="name_country",
-                    evidence_map=evidence_map,
-                    existing_link_entity_ids=existing_link_entity_ids,
-                    summary=summary,
-                )
+            for peer in peers:
+                _link(canonical_id, peer, "name_country")
 
-        return summary
+        return plan
 
-    def _build_evidence_map(self, rows) -> Dict[UUID, List[UUID]]:
-        evidence_map: Dict[UUID, List[UUID]] = defaultdict(list)
-        for row in rows:
-            if row.source_document_id:
-                evidence_map[row.company_prospect_id].append(row.source_document_id)
-        return evidence_map
+    async def apply_plan(self, plan: CanonicalCompanyPlan) -> dict:
+        """Write a plan with one multi-row statement per table."""
+        await self.repo.bulk_create_canonical_companies(plan.companies)
+        await self.repo.bulk_upsert_canonical_company_domains(list(plan.domains.values()))
+        await self.repo.bulk_upsert_canonical_company_links(list(plan.links.values()))
+        await self.db.flush()
+        return plan.summary
 
     def _select_evidence_id(self, evidence_ids: List[UUID]) -> tuple[Optional[UUID], bool]:
         if not evidence_ids:
@@ -168,17 +228,21 @@ class CanonicalCompanyService:
         norm = " ".join(str(name).strip().split())
         return norm.lower() if norm else None
 
-    async def _link_prospect(
+    def _name_match_key(self, prospect: CompanyRow) -> Optional[str]:
+        return compact_name(match_tokens(prospect.name_raw or prospect.name_normalized)) or None
+
+    def _plan_link(
         self,
+        plan: CanonicalCompanyPlan,
         tenant_id: str,
         canonical_company_id: UUID,
-        prospect: CompanyProspect,
+        prospect: CompanyRow,
         match_rule: str,
-        evidence_map: Dict[UUID, List[UUID]],
+        evidence_map: EvidenceMap,
         existing_link_entity_ids: Set[UUID],
-        summary: dict,
     ) -> None:
-        evidence_ids = evidence_map.get(prospect.id, [])
+        summary = plan.summary
+        evidence_ids = list(evidence_map.get(prospect.id, ()))
         if not evidence_ids:
             summary["evidence_missing_skipped"] += 1
             summary["conflicts_skipped"] += 1
@@ -194,19 +258,18 @@ class CanonicalCompanyService:
             summary["multi_evidence_deterministic_choice"] += 1
             summary["conflicts_skipped"] += 1
 
-        link = await self.repo.upsert_canonical_company_link(
-            tenant_id=tenant_id,
-            canonical_company_id=canonical_company_id,
-            company_entity_id=prospect.id,
-            match_rule=match_rule,
-            evidence_source_document_id=evidence_id,
-            evidence_company_research_run_id=prospect.company_research_run_id,
-        )
+        plan.links[prospect.id] = {
+            "id": uuid.uuid4(),
+            "tenant_id": tenant_id,
+            "canonical_company_id": canonical_company_id,
+            "company_entity_id": prospect.id,
+            "match_rule": match_rule,
+            "evidence_source_document_id": evidence_id,
+            "evidence_company_research_run_id": prospect.company_research_run_id,
+        }
 
         if prospect.id in existing_link_entity_ids:
             summary["canonical_company_links_existing"] += 1
         else:
             summary["canonical_company_links_created"] += 1
             existing_link_entity_ids.add(prospect.id)
-
-        return
@@ -1,18 +1,115 @@
+import asyncio
 import re
 import uuid
-from typing import Dict, Iterable, List, Optional, Set
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse, urlunparse
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
 
-from app.models.company_research import (
-    ExecutiveProspect,
-    CanonicalPerson,
-    CanonicalPersonLink,
-)
 from app.repositories.company_research_repo import CompanyResearchRepository
+from app.services.run_resolution_snapshot import (
+    EvidenceMap,
+    ExecutiveRow,
+    RunSnapshot,
+    build_evidence_map,
+    load_run_snapshot,
+)
+
+
+@dataclass
+class CanonicalPeopleState:
+    # Run executives plus tenant executives sharing a run email or LinkedIn URL.
+    peers: Tuple[ExecutiveRow, ...]
+    evidence: EvidenceMap
+    people_by_email: Dict[str, UUID]
+    people_by_linkedin: Dict[str, UUID]
+    # (person_entity_id, canonical_person_id, company_prospect_id, name_normalized)
+    links: Tuple[tuple, ...]
+
+
+@dataclass
+class CanonicalPeoplePlan:
+    summary: dict = field(default_factory=dict)
+    people: List[dict] = field(default_factory=list)
+    # email_normalized -> row / person_entity_id -> row (last decision wins, as with row-by-row upserts)
+    emails: Dict[str, dict] = field(default_factory=dict)
+    links: Dict[UUID, dict] = field(default_factory=dict)
+
+
+class _PeoplePlanContext:
+    """In-memory stand-in for the canonical people tables while a plan is built."""
+
+    def __init__(self, snapshot: RunSnapshot, state: CanonicalPeopleState):
+        self.tenant_id = snapshot.tenant_id
+        self.plan = CanonicalPeoplePlan()
+        self.summary = self.plan.summary
+        self.evidence = state.evidence
+        self.people_by_email = dict(state.people_by_email)
+        self.people_by_linkedin = dict(state.people_by_linkedin)
+        # Peers grouped the way the lookups compare them: lower() of the stored value.
+        self.peers_by_email: Dict[str, List[ExecutiveRow]] = defaultdict(list)
+        self.peers_by_linkedin: Dict[str, List[ExecutiveRow]] = defaultdict(list)
+        for peer in state.peers:
+            if peer.email:
+                self.peers_by_email[peer.email.lower()].append(peer)
+            if peer.linkedin_url:
+                self.peers_by_linkedin[peer.linkedin_url.lower()].append(peer)
+        self.existing_link_person_ids: Set[UUID] = set()
+        self._link_keys: Dict[UUID, Tuple[UUID, Tuple[Optional[UUID], str]]] = {}
+        self._links_by_key: Dict[Tuple[Optional[UUID], str], Dict[UUID, UUID]] = defaultdict(dict)
+        for person_id, canonical_id, company_id, name in state.links:
+            self.existing_link_person_ids.add(person_id)
+            self._index_link(person_id, canonical_id, company_id, name)
+
+    def _index_link(self, person_id: UUID, canonical_id: UUID, company_id: Optional[UUID], name: Optional[str]) -> None:
+        previous = self._link_keys.get(person_id)
+        if previous is not None:
+            self._links_by_key[previous[1]].pop(person_id, None)
+        key = (company_id, (name or "").lower())
+        self._link_keys[person_id] = (canonical_id, key)
+        self._links_by_key[key][person_id] = canonical_id
+
+    def linked_people(self, company_id: UUID, name_norm: str) -> List[UUID]:
+        """Canonical person of each link whose executive has this company and lower(name_normalized)."""
+        return list(self._links_by_key.get((company_id, name_norm.lower()), {}).values())
+
+    def create_person(
+        self,
+        canonical_full_name: Optional[str] = None,
+        primary_email: Optional[str] = None,
+        primary_linkedin_url: Optional[str] = None,
+    ) -> UUID:
+        person_id = uuid.uuid4()
+        self.plan.people.append({
+            "id": person_id,
+            "tenant_id": self.tenant_id,
+            "canonical_full_name": canonical_full_name,
+            "primary_email": primary_email,
+            "primary_linkedin_url": primary_linkedin_url,
+        })
+        if primary_linkedin_url:
+            self.people_by_linkedin.setdefault(primary_linkedin_url.lower(), person_id)
+        return person_id
+
+    def link(self, canonical_id: UUID, exec_row: ExecutiveRow, match_rule: str, evidence_id: UUID) -> None:
+        self.plan.links[exec_row.id] = {
+            "id": uuid.uuid4(),
+            "tenant_id": self.tenant_id,
+            "canonical_person_id": canonical_id,
+            "person_entity_id": exec_row.id,
+            "match_rule": match_rule,
+            "evidence_source_document_id": evidence_id,
+            "evidence_company_research_run_id": exec_row.company_research_run_id,
+        }
+        self._index_link(exec_row.id, canonical_id, exec_row.company_prospect_id, exec_row.name_normalized)
+        if exec_row.id in self.existing_link_person_ids:
+            self.summary["canonical_person_links_existing"] += 1
+        else:
+            self.summary["canonical_person_links_created"] += 1
+            self.existing_link_person_ids.add(exec_row.id)
 
 
 class CanonicalPeopleService:
@@ -22,15 +119,58 @@ class CanonicalPeopleService:
         self.db = db
         self.repo = CompanyResearchRepository(db)
 
-    async def resolve_run_people(self, tenant_id: str, run_id: UUID) -> dict:
-        executives = await self.repo.list_executive_prospects_for_run(tenant_id, run_id)
-        evidence_rows = await self.repo.list_executive_evidence_for_run(tenant_id, run_id)
-        evidence_map = self._build_evidence_map(evidence_rows)
+    async def resolve_run_people(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        snapshot: Optional[RunSnapshot] = None,
+    ) -> dict:
+        if snapshot is None:
+            snapshot = await load_run_snapshot(self.repo, tenant_id, run_id)
+        state = await self.load_state(snapshot)
+        plan = await asyncio.to_thread(self.plan, snapshot, state)
+        return await self.apply_plan(plan)
+
+    async def load_state(self, snapshot: RunSnapshot) -> CanonicalPeopleState:
+        """Tenant rows the plan needs: email/LinkedIn peers, their evidence, canonical people and links."""
+        tenant_id, run_id = snapshot.tenant_id, snapshot.run_id
+        emails = sorted({e for e in (self._normalize_email(x.email) for x in snapshot.executives) if e})
+        linkedin_urls = sorted(
+            {u for u in (self._normalize_linkedin(x.linkedin_url) for x in snapshot.executives) if u}
+        )
+        company_ids = sorted({x.company_prospect_id for x in snapshot.executives if x.company_prospect_id}, key=str)
+
+        peers: Tuple[ExecutiveRow, ...] = ()
+        evidence = snapshot.executive_evidence
+        if emails or linkedin_urls:
+            peer_rows = await self.repo.list_executive_rows(tenant_id, run_id, emails, linkedin_urls)
+            peers = tuple(ExecutiveRow._make(row) for row in peer_rows)
+            evidence = build_evidence_map(
+                await self.repo.list_executive_evidence_pairs(tenant_id, run_id, emails, linkedin_urls)
+            )
+        return CanonicalPeopleState(
+            peers=peers,
+            evidence=evidence,
+            people_by_email=await self.repo.map_canonical_people_by_email(tenant_id, emails),
+            people_by_linkedin=await self.repo.map_canonical_people_by_linkedin(tenant_id, linkedin_urls),
+            links=tuple(
+                await self.repo.list_canonical_person_link_rows(
+                    tenant_id, run_id, emails, linkedin_urls, company_ids
+                )
+            ),
+        )
+
+    def plan(self, snapshot: RunSnapshot, state: CanonicalPeopleState) -> CanonicalPeoplePlan:
+        """Decide canonical people and links for the run's executives (no I/O).
 
-        existing_links = await self.repo.list_canonical_person_links(tenant_id)
-        existing_link_person_ids: Set[UUID] = {l.person_entity_id for l in existing_links}
+        Lookups that used to hit the database per group read ``state`` and see
+        the people and links planned earlier in the same pass, so decisions
+        match a row-at-a-time run.
+        """
+        executives = snapshot.executives
+        ctx = _PeoplePlanContext(snapshot, state)
 
-        summary = {
+        ctx.summary.update({
             "executives_scanned": len(executives),
             "canonical_people_created": 0,
             "canonical_people_matched": 0,
@@ -40,7 +180,7 @@ class CanonicalPeopleService:
             "evidence_missing_skipped": 0,
             "warnings_multi_evidence": 0,
             "multi_evidence_deterministic_choice": 0,
-        }
+        })
 
         handled_emails: Set[str] = set()
         handled_linkedin: Set[str] = set()
@@ -52,149 +192,90 @@ class CanonicalPeopleService:
             if email_norm:
                 if email_norm in handled_emails:
                     continue
-                await self._process_email_group(
-                    tenant_id=tenant_id,
-                    email_norm=email_norm,
-                    default_exec=exec_row,
-                    existing_link_person_ids=existing_link_person_ids,
-                    summary=summary,
-                )
+                self._plan_email_group(ctx, email_norm=email_norm, default_exec=exec_row)
                 handled_emails.add(email_norm)
                 continue
 
             if linkedin_norm:
                 if linkedin_norm in handled_linkedin:
                     continue
-                await self._process_linkedin_group(
-                    tenant_id=tenant_id,
-                    linkedin_norm=linkedin_norm,
-                    default_exec=exec_row,
-                    existing_link_person_ids=existing_link_person_ids,
-                    summary=summary,
-                )
+                self._plan_linkedin_group(ctx, linkedin_norm=linkedin_norm, default_exec=exec_row)
                 handled_linkedin.add(linkedin_norm)
                 continue
 
-            await self._process_name_company(
-                tenant_id=tenant_id,
-                exec_row=exec_row,
-                evidence_map=evidence_map,
-                existing_link_person_ids=existing_link_person_ids,
-                summary=summary,
-            )
+            self._plan_name_company(ctx, exec_row=exec_row)
 
-        return summary
+        return ctx.plan
 
-    async def _process_email_group(
-        self,
-        tenant_id: str,
-        email_norm: str,
-        default_exec: ExecutiveProspect,
-        existing_link_person_ids: Set[UUID],
-        summary: dict,
-    ) -> None:
-        execs = await self.repo.list_executive_prospects_by_email(tenant_id, email_norm)
-        evidence_rows = await self.repo.list_executive_evidence_for_exec_ids(tenant_id, [e.id for e in execs])
-        evidence_map = self._build_evidence_map(evidence_rows)
+    async def apply_plan(self, plan: CanonicalPeoplePlan) -> dict:
+        """Write a plan with one multi-row statement per table."""
+        await self.repo.bulk_create_canonical_people(plan.people)
+        await self.repo.bulk_upsert_canonical_person_emails(list(plan.emails.values()))
+        await self.repo.bulk_upsert_canonical_person_links(list(plan.links.values()))
+        await self.db.flush()
+        return plan.summary
 
-        canonical = await self.repo.get_canonical_person_by_email(tenant_id, email_norm)
-        if canonical:
+    def _plan_email_group(self, ctx: "_PeoplePlanContext", email_norm: str, default_exec: ExecutiveRow) -> None:
+        summary = ctx.summary
+        canonical_id = ctx.people_by_email.get(email_norm)
+        if canonical_id:
             summary["canonical_people_matched"] += 1
         else:
-            canonical = await self.repo.create_canonical_person(
-                tenant_id=tenant_id,
+            canonical_id = ctx.create_person(
                 canonical_full_name=self._normalize_person_name(default_exec.name_normalized or default_exec.name_raw),
                 primary_email=email_norm,
                 primary_linkedin_url=self._normalize_linkedin(default_exec.linkedin_url),
             )
             summary["canonical_people_created"] += 1
 
-        await self.repo.upsert_canonical_person_email(tenant_id, canonical.id, email_norm)
-
-        for exec_row in execs:
-            evidence_ids = self._collect_evidence_ids(exec_row, evidence_map)
-            if not evidence_ids:
-                summary["evidence_missing_skipped"] += 1
-                summary["conflicts_skipped"] += 1
-                continue
-            evidence_id, multi = self._select_evidence_id(evidence_ids)
-            if multi:
-                summary["warnings_multi_evidence"] += 1
-                summary["multi_evidence_deterministic_choice"] += 1
-
-            link = await self.repo.upsert_canonical_person_link(
-                tenant_id=tenant_id,
-                canonical_person_id=canonical.id,
-                person_entity_id=exec_row.id,
-                match_rule="email",
-                evidence_source_document_id=evidence_id,
-                evidence_company_research_run_id=exec_row.company_research_run_id,
-            )
+        ctx.people_by_email[email_norm] = canonical_id
+        ctx.plan.emails[email_norm] = {
+            "id": uuid.uuid4(),
+            "tenant_id": ctx.tenant_id,
+            "canonical_person_id": canonical_id,
+            "email_normalized": email_norm,
+        }
 
-            if exec_row.id in existing_link_person_ids:
-                summary["canonical_person_links_existing"] += 1
-            else:
-                summary["canonical_person_links_created"] += 1
-                existing_link_person_ids.add(exec_row.id)
+        for exec_row in ctx.peers_by_email.get(email_norm, ()):
+            self._plan_group_link(ctx, canonical_id, exec_row, match_rule="email")
 
-    async def _process_linkedin_group(
-        self,
-        tenant_id: str,
-        linkedin_norm: str,
-        default_exec: ExecutiveProspect,
-        existing_link_person_ids: Set[UUID],
-        summary: dict,
-    ) -> None:
-        execs = await self.repo.list_executive_prospects_by_linkedin(tenant_id, linkedin_norm)
-        evidence_rows = await self.repo.list_executive_evidence_for_exec_ids(tenant_id, [e.id for e in execs])
-        evidence_map = self._build_evidence_map(evidence_rows)
-
-        canonical = await self.repo.get_canonical_person_by_linkedin(tenant_id, linkedin_norm)
-        if canonical:
+    def _plan_linkedin_group(self, ctx: "_PeoplePlanContext", linkedin_norm: str, default_exec: ExecutiveRow) -> None:
+        summary = ctx.summary
+        canonical_id = ctx.people_by_linkedin.get(linkedin_norm)
+        if canonical_id:
             summary["canonical_people_matched"] += 1
         else:
-            canonical = await self.repo.create_canonical_person(
-                tenant_id=tenant_id,
+            canonical_id = ctx.create_person(
                 canonical_full_name=self._normalize_person_name(default_exec.name_normalized or default_exec.name_raw),
                 primary_linkedin_url=linkedin_norm,
             )
             summary["canonical_people_created"] += 1
 
-        for exec_row in execs:
-            evidence_ids = self._collect_evidence_ids(exec_row, evidence_map)
-            if not evidence_ids:
-                summary["evidence_missing_skipped"] += 1
-                summary["conflicts_skipped"] += 1
-                continue
-            evidence_id, multi = self._select_evidence_id(evidence_ids)
-            if multi:
-                summary["warnings_multi_evidence"] += 1
-                summary["multi_evidence_deterministic_choice"] += 1
-
-            link = await self.repo.upsert_canonical_person_link(
-                tenant_id=tenant_id,
-                canonical_person_id=canonical.id,
-                person_entity_id=exec_row.id,
-                match_rule="linkedin",
-                evidence_source_document_id=evidence_id,
-                evidence_company_research_run_id=exec_row.company_research_run_id,
-            )
+        for exec_row in ctx.peers_by_linkedin.get(linkedin_norm, ()):
+            self._plan_group_link(ctx, canonical_id, exec_row, match_rule="linkedin")
 
-            if exec_row.id in existing_link_person_ids:
-                summary["canonical_person_links_existing"] += 1
-            else:
-                summary["canonical_person_links_created"] += 1
-                existing_link_person_ids.add(exec_row.id)
-
-    async def _process_name_company(
+    def _plan_group_link(
         self,
-        tenant_id: str,
-        exec_row: ExecutiveProspect,
-        evidence_map: Dict[UUID, List[UUID]],
-        existing_link_person_ids: Set[UUID],
-        summary: dict,
+        ctx: "_PeoplePlanContext",
+        canonical_id: UUID,
+        exec_row: ExecutiveRow,
+        match_rule: str,
     ) -> None:
-        evidence_ids = self._collect_evidence_ids(exec_row, evidence_map)
+        summary = ctx.summary
+        evidence_ids = self._collect_evidence_ids(exec_row, ctx.evidence)
+        if not evidence_ids:
+            summary["evidence_missing_skipped"] += 1
+            summary["conflicts_skipped"] += 1
+            return
+        evidence_id, multi = self._select_evidence_id(evidence_ids)
+        if multi:
+            summary["warnings_multi_evidence"] += 1
+            summary["multi_evidence_deterministic_choice"] += 1
+        ctx.link(canonical_id, exec_row, match_rule, evidence_id)
+
+    def _plan_name_company(self, ctx: "_PeoplePlanContext", exec_row: ExecutiveRow) -> None:
+        summary = ctx.summary
+        evidence_ids = self._collect_evidence_ids(exec_row, ctx.evidence)
         if not evidence_ids:
             summary["evidence_missing_skipped"] += 1
             summary["conflicts_skipped"] += 1
@@ -211,76 +292,23 @@ class CanonicalPeopleService:
             summary["conflicts_skipped"] += 1
             return
 
-        canonical, multiple = await self._find_canonical_by_name_and_company(
-            tenant_id=tenant_id,
-            name_normalized=name_norm,
-            company_prospect_id=exec_row.company_prospect_id,
-        )
-        if multiple:
+        matches = ctx.linked_people(exec_row.company_prospect_id, name_norm)
+        if len(matches) > 1:
             summary["conflicts_skipped"] += 1
             return
-        if canonical:
+        if matches:
+            canonical_id = matches[0]
             summary["canonical_people_matched"] += 1
         else:
-            canonical = await self.repo.create_canonical_person(
-                tenant_id=tenant_id,
-                canonical_full_name=name_norm,
-            )
+            canonical_id = ctx.create_person(canonical_full_name=name_norm)
             summary["canonical_people_created"] += 1
 
-        link = await self.repo.upsert_canonical_person_link(
-            tenant_id=tenant_id,
-            canonical_person_id=canonical.id,
-            person_entity_id=exec_row.id,
-            match_rule="name_company",
-            evidence_source_document_id=evidence_id,
-            evidence_company_research_run_id=exec_row.company_research_run_id,
-        )
-
-        if exec_row.id in existing_link_person_ids:
-            summary["canonical_person_links_existing"] += 1
-        else:
-            summary["canonical_person_links_created"] += 1
-            existing_link_person_ids.add(exec_row.id)
-
-    async def _find_canonical_by_name_and_company(
-        self,
-        tenant_id: str,
-        name_normalized: str,
-        company_prospect_id: UUID,
-    ) -> tuple[Optional[CanonicalPerson], bool]:
-        query = (
-            select(CanonicalPerson)
-            .join(CanonicalPersonLink, CanonicalPersonLink.canonical_person_id == CanonicalPerson.id)
-            .join(ExecutiveProspect, ExecutiveProspect.id == CanonicalPersonLink.person_entity_id)
-            .where(
-                CanonicalPerson.tenant_id == tenant_id,
-                CanonicalPersonLink.tenant_id == tenant_id,
-                ExecutiveProspect.company_prospect_id == company_prospect_id,
-                func.lower(ExecutiveProspect.name_normalized) == name_normalized.lower(),
-            )
-            .limit(2)
-        )
-        result = await self.db.execute(query)
-        rows = result.scalars().all()
-        if len(rows) > 1:
-            return None, True
-        if not rows:
-            return None, False
-        return rows[0], False
-
-    def _build_evidence_map(self, evidence_rows: List) -> Dict[UUID, List[UUID]]:
-        mapping: Dict[UUID, List[UUID]] = {}
-        for ev in evidence_rows:
-            if not ev.source_document_id:
-                continue
-            mapping.setdefault(ev.executive_prospect_id, []).append(ev.source_document_id)
-        return mapping
+        ctx.link(canonical_id, exec_row, "name_company", evidence_id)
 
     def _collect_evidence_ids(
         self,
-        exec_row: ExecutiveProspect,
-        evidence_map: Dict[UUID, List[UUID]],
+        exec_row: ExecutiveRow,
+        evidence_map: EvidenceMap,
     ) -> List[UUID]:
         collected: Set[UUID] = set()
         if exec_row.source_document_id:
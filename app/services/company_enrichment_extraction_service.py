@@ -9,14 +9,18 @@ to guarantee idempotency across runs.
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import List, Optional
+from multiprocessing import get_context
+from typing import List, Optional, Tuple
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.repositories.company_research_repo import CompanyResearchRepository
 from app.schemas.enrichment_assignment import EnrichmentAssignmentCreate, EnrichmentAssignmentRead
 from app.services.enrichment_assignment_service import EnrichmentAssignmentService
@@ -42,6 +46,14 @@ class IndustryKeywordsMatch:
     confidence: float
 
 
+@dataclass(frozen=True)
+class ExtractedField:
+    field_key: str
+    value: object
+    confidence: float
+    value_normalized: Optional[str]
+
+
 class CompanyEnrichmentExtractionService:
     """Rule-based company enrichment extractor.
 
@@ -268,54 +280,158 @@ class CompanyEnrichmentExtractionService:
         if not content:
             return []
 
-        assignments: list[EnrichmentAssignmentCreate] = []
+        assignments = [
+            self._build_assignment(
+                tenant_id=tenant_id,
+                canonical_company_id=canonical_company_id,
+                source_document_id=source_document_id,
+                field_key=field.field_key,
+                value=field.value,
+                confidence=field.confidence,
+                value_normalized=field.value_normalized,
+            )
+            for field in self.extract_fields(content)
+        ]
+        if not assignments:
+            return []
 
-        hq_match = self._extract_hq_country(content)
-        if hq_match:
-            assignments.append(
-                self._build_assignment(
-                    tenant_id=tenant_id,
-                    canonical_company_id=canonical_company_id,
-                    source_document_id=source_document_id,
-                    field_key="hq_country",
-                    value=hq_match.country,
-                    confidence=hq_match.confidence,
-                    value_normalized=hq_match.country,
+        return await self.assignment_service.record_assignments(tenant_id, assignments)
+
+    async def extract_run_enrichment(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        batch_size: Optional[int] = None,
+        workers: Optional[int] = None,
+    ) -> dict:
+        """Extract enrichment for every (canonical company, evidence source) pair of a run.
+
+        Pairs are read in keyset batches. Pairs whose input scope hashes are already
+        recorded for the company are skipped before their text is loaded. The rest
+        are extracted (in a process pool when ``workers`` > 1), and each batch is
+        written with one multi-row upsert and committed.
+        """
+        batch_size = batch_size or settings.COMPANY_ENRICHMENT_BATCH_SIZE
+        workers = settings.COMPANY_ENRICHMENT_WORKERS if workers is None else workers
+        field_keys = ("hq_country", "ownership_signal", "industry_keywords")
+        summary = {
+            "batches": 0,
+            "pairs_scanned": 0,
+            "pairs_skipped_recorded": 0,
+            "pairs_without_text": 0,
+            "pairs_extracted": 0,
+            "assignments_upserted": 0,
+        }
+
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) if workers > 1 else None
+        try:
+            after: Optional[Tuple[UUID, UUID]] = None
+            while True:
+                pairs = await self.research_repo.list_run_enrichment_pairs(tenant_id, run_id, after=after, limit=batch_size)
+                if not pairs:
+                    break
+                after = pairs[-1]
+                summary["batches"] += 1
+                summary["pairs_scanned"] += len(pairs)
+
+                scope_hashes = {
+                    pair: [self._input_scope_hash(pair[1], key) for key in field_keys] for pair in pairs
+                }
+                recorded = await self.assignment_service.repo.list_recorded_scope_hashes(
+                    tenant_id,
+                    canonical_ids={company_id for company_id, _ in pairs},
+                    scope_hashes={h for hashes in scope_hashes.values() for h in hashes},
+                )
+                todo = [
+                    pair for pair in pairs
+                    if not any((pair[0], h) in recorded for h in scope_hashes[pair])
+                ]
+                summary["pairs_skipped_recorded"] += len(pairs) - len(todo)
+
+                texts = await self.research_repo.list_source_content_texts(
+                    tenant_id, list({source_id for _, source_id in todo})
+                )
+                with_text = [pair for pair in todo if (texts.get(pair[1]) or "").strip()]
+                summary["pairs_without_text"] += len(todo) - len(with_text)
+                todo = with_text
+                extracted = await self._extract_many(
+                    [texts[source_id].strip() for _, source_id in todo], executor, workers
+                )
+                summary["pairs_extracted"] += len(todo)
+
+                payloads = [
+                    self._build_assignment(
+                        tenant_id=tenant_id,
+                        canonical_company_id=company_id,
+                        source_document_id=source_id,
+                        field_key=field.field_key,
+                        value=field.value,
+                        confidence=field.confidence,
+                        value_normalized=field.value_normalized,
+                    )
+                    for (company_id, source_id), fields in zip(todo, extracted)
+                    for field in fields
+                ]
+                summary["assignments_upserted"] += await self.assignment_service.record_assignments_bulk(
+                    tenant_id, payloads
                 )
+                await self.db.commit()
+
+                if len(pairs) < batch_size:
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        return summary
+
+    async def _extract_many(
+        self,
+        contents: List[str],
+        executor: Optional[ProcessPoolExecutor],
+        workers: int,
+    ) -> List[List[ExtractedField]]:
+        if not contents:
+            return []
+        if executor is None:
+            return await asyncio.to_thread(extract_fields_batch, contents)
+        chunk = -(-len(contents) // workers)
+        loop = asyncio.get_running_loop()
+        parts = await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, extract_fields_batch, contents[start:start + chunk])
+                for start in range(0, len(contents), chunk)
             )
+        )
+        return [fields for part in parts for fields in part]
+
+    @classmethod
+    def extract_fields(cls, content: str) -> List[ExtractedField]:
+        """Run the HQ / ownership / industry rules over one document's text (no I/O)."""
+        fields: List[ExtractedField] = []
+
+        hq_match = cls._extract_hq_country(content)
+        if hq_match:
+            fields.append(ExtractedField("hq_country", hq_match.country, hq_match.confidence, hq_match.country))
 
-        ownership_match = self._extract_ownership_signal(content)
+        ownership_match = cls._extract_ownership_signal(content)
         if ownership_match:
-            assignments.append(
-                self._build_assignment(
-                    tenant_id=tenant_id,
-                    canonical_company_id=canonical_company_id,
-                    source_document_id=source_document_id,
-                    field_key="ownership_signal",
-                    value=ownership_match.signal,
-                    confidence=ownership_match.confidence,
-                    value_normalized=ownership_match.signal,
+            fields.append(
+                ExtractedField(
+                    "ownership_signal", ownership_match.signal, ownership_match.confidence, ownership_match.signal
                 )
             )
 
-        industry_match = self._extract_industry_keywords(content)
+        industry_match = cls._extract_industry_keywords(content)
         if industry_match:
-            assignments.append(
-                self._build_assignment(
-                    tenant_id=tenant_id,
-                    canonical_company_id=canonical_company_id,
-                    source_document_id=source_document_id,
-                    field_key="industry_keywords",
-                    value=industry_match.keywords,
-                    confidence=industry_match.confidence,
-                    value_normalized=", ".join(industry_match.keywords),
+            fields.append(
+                ExtractedField(
+                    "industry_keywords",
+                    industry_match.keywords,
+                    industry_match.confidence,
+                    ", ".join(industry_match.keywords),
                 )
             )
-
-        if not assignments:
-            return []
-
-        return await self.assignment_service.record_assignments(tenant_id, assignments)
+        return fields
 
     def _build_assignment(
         self,
@@ -344,41 +460,45 @@ class CompanyEnrichmentExtractionService:
         base = f"{self.INPUT_SCOPE_SALT}:{source_document_id}:{field_key}"
         return hashlib.sha256(base.encode("utf-8")).hexdigest()
 
-    def _extract_hq_country(self, text: str) -> Optional[HQCountryMatch]:
+    @classmethod
+    def _extract_hq_country(cls, text: str) -> Optional[HQCountryMatch]:
         # Use lower text for matching; stop at first deterministic hit with allowed country.
         normalized_text = text.lower()
-        for pattern, confidence, label in self.HQ_PATTERNS:
+        for pattern, confidence, label in cls.HQ_PATTERNS:
             match = pattern.search(normalized_text)
             if not match:
                 continue
             location_fragment = match.group("loc") or ""
-            country = self._match_country_name(location_fragment)
+            country = cls._match_country_name(location_fragment)
             if country:
                 return HQCountryMatch(country=country, confidence=confidence, pattern=label)
         return None
 
-    def _match_country_name(self, location_fragment: str) -> Optional[str]:
+    @classmethod
+    def _match_country_name(cls, location_fragment: str) -> Optional[str]:
         cleaned = re.sub(r"[^a-zA-Z\s]", " ", location_fragment.lower())
         cleaned = " ".join(cleaned.split())
-        for country in sorted(self.COUNTRY_SYNONYMS.keys()):
-            for synonym in self.COUNTRY_SYNONYMS[country]:
+        for country in sorted(cls.COUNTRY_SYNONYMS.keys()):
+            for synonym in cls.COUNTRY_SYNONYMS[country]:
                 if re.search(rf"\b{re.escape(synonym)}\b", cleaned):
                     return country
         return None
 
-    def _extract_ownership_signal(self, text: str) -> Optional[OwnershipMatch]:
+    @classmethod
+    def _extract_ownership_signal(cls, text: str) -> Optional[OwnershipMatch]:
         normalized = text.lower()
         best: Optional[OwnershipMatch] = None
-        for signal, confidence, patterns in self.OWNERSHIP_RULES:
+        for signal, confidence, patterns in cls.OWNERSHIP_RULES:
             for pattern in patterns:
                 if pattern.search(normalized):
                     candidate = OwnershipMatch(signal=signal, confidence=confidence, phrase=pattern.pattern)
-                    best = self._choose_stronger(best, candidate)
+                    best = cls._choose_stronger(best, candidate)
                     break
         return best
 
+    @classmethod
     def _choose_stronger(
-        self,
+        cls,
         current: Optional[OwnershipMatch],
         incoming: OwnershipMatch,
     ) -> OwnershipMatch:
@@ -389,16 +509,17 @@ class CompanyEnrichmentExtractionService:
         if incoming.confidence < current.confidence:
             return current
         # Tie: prefer deterministic priority order.
-        current_rank = self.OWNERSHIP_PRIORITY.index(current.signal)
-        incoming_rank = self.OWNERSHIP_PRIORITY.index(incoming.signal)
+        current_rank = cls.OWNERSHIP_PRIORITY.index(current.signal)
+        incoming_rank = cls.OWNERSHIP_PRIORITY.index(incoming.signal)
         if incoming_rank < current_rank:
             return incoming
         return current
 
-    def _extract_industry_keywords(self, text: str) -> Optional[IndustryKeywordsMatch]:
+    @classmethod
+    def _extract_industry_keywords(cls, text: str) -> Optional[IndustryKeywordsMatch]:
         normalized = text.lower()
         matches: list[tuple[str, int]] = []
-        for keyword in self.INDUSTRY_KEYWORDS:
+        for keyword in cls.INDUSTRY_KEYWORDS:
             pattern = rf"\b{re.escape(keyword.lower())}\b"
             occurrences = len(re.findall(pattern, normalized))
             if occurrences > 0:
@@ -415,4 +536,9 @@ class CompanyEnrichmentExtractionService:
         return IndustryKeywordsMatch(keywords=top_keywords, confidence=confidence)
 
 
-__all__ = ["CompanyEnrichmentExtractionService"]
\ No newline at end of file
+def extract_fields_batch(contents: List[str]) -> List[List[ExtractedField]]:
+    """Module-level entry point so batches can be shipped to a process pool."""
+    return [CompanyEnrichmentExtractionService.extract_fields(content) for content in contents]
+
+
+__all__ = ["CompanyEnrichmentExtractionService", "ExtractedField", "extract_fields_batch"]
\ No newline at end of file
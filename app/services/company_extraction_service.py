@@ -7,22 +7,21 @@ and prospect creation from raw sources.
 
 import asyncio
 import hashlib
+import importlib.util
 import io
 import os
 import re
 import time
 from contextlib import asynccontextmanager
 from email.utils import parsedate_to_datetime
-import httpx
 from typing import List, Tuple, Optional, Set, Dict, Any
 from uuid import UUID
 from datetime import datetime, timedelta
 from urllib.parse import urlparse
 from sqlalchemy.ext.asyncio import AsyncSession
-from bs4 import BeautifulSoup
-from pypdf import PdfReader
 
 from app.repositories.company_research_repo import CompanyResearchRepository
+from app.services.company_name_dedupe_service import CompanyNameDedupeService
 from app.models.company_research import ResearchSourceDocument, CompanyProspect
 from app.schemas.company_research import (
     ResearchEventCreate,
@@ -30,21 +29,34 @@ from app.schemas.company_research import (
     CompanyProspectEvidenceCreate,
     SourceDocumentUpdate,
 )
+from app.core.config import settings
+from app.core.domain_rate_control import DomainRateController, RequestSlot
+from app.core.telemetry import record_domain_wait
+from app.utils.http_cache import compute_next_check_at, format_check_time
 from app.utils.time import utc_now, utc_now_iso
 from app.utils.url_canonicalizer import canonicalize_url
 
 
+def _supported_content_codings() -> str:
+    """Content codings httpx can decode in this process (br needs a brotli package)."""
+    codings = ["gzip", "deflate"]
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+        codings.append("br")
+    return ", ".join(codings)
+
+
 class CompanyExtractionService:
     """Service for extracting companies from source documents."""
     _global_semaphore: Optional[asyncio.Semaphore] = None
-    _domain_limiters: Dict[str, Dict[str, Any]] = {}
+    _rate_controller: Optional[DomainRateController] = None
     _limiter_initialized = False
     _per_domain_concurrency: int = 1
     _per_domain_min_delay: float = 0.0
     _global_concurrency: int = 8
     _max_redirects: int = 5
     _fetch_timeout_seconds: float = 30.0
-    _max_fetch_bytes: int = 2_000_000
+    _max_fetch_bytes: int = 2_000_000  # decoded bytes; wire bytes are recorded alongside
+    _accept_encoding: str = _supported_content_codings()
     _allowed_content_types: set[str] = {
         "text/html",
         "application/pdf",
@@ -85,7 +97,16 @@ class CompanyExtractionService:
                 if CompanyExtractionService._global_concurrency > 0
                 else None
             )
-            CompanyExtractionService._domain_limiters = {}
+            CompanyExtractionService._rate_controller = DomainRateController(
+                initial_concurrency=desired_per_domain,
+                max_concurrency=settings.FETCH_RATE_MAX_CONCURRENCY,
+                min_delay=desired_min_delay,
+                max_delay=settings.FETCH_RATE_MAX_DELAY_MS / 1000.0,
+                delay_step=settings.FETCH_RATE_DELAY_STEP_MS / 1000.0,
+                latency_factor=settings.FETCH_RATE_LATENCY_FACTOR,
+                max_cooldown=settings.FETCH_RATE_MAX_COOLDOWN_SECONDS,
+                adaptive=settings.FETCH_RATE_ADAPTIVE,
+            )
             CompanyExtractionService._limiter_initialized = True
     
     @staticmethod
@@ -180,19 +201,6 @@ class CompanyExtractionService:
                 return True
         return False
 
-    def _get_domain_limiter(self, domain: str) -> Dict[str, Any]:
-        key = (domain or "unknown").lower()
-        limiter = CompanyExtractionService._domain_limiters.get(key)
-        concurrency = CompanyExtractionService._per_domain_concurrency
-        if not limiter or limiter.get("concurrency") != concurrency:
-            limiter = {
-                "semaphore": asyncio.Semaphore(concurrency),
-                "last_start": None,
-                "concurrency": concurrency,
-            }
-            CompanyExtractionService._domain_limiters[key] = limiter
-        return limiter
-
     async def _get_robots_policy(
         self,
         tenant_id: str,
@@ -201,6 +209,9 @@ class CompanyExtractionService:
         domain: str,
         user_agent: str,
     ) -> Dict[str, Any]:
+        import httpx  # deferred: only fetching processes need httpx
+        from app.core.telemetry_http import TelemetryTransport
+
         domain_norm = (domain or "").lower()
         user_agent_norm = (user_agent or "").lower()
         cache_key = (tenant_id, domain_norm, user_agent_norm)
@@ -255,7 +266,9 @@ class CompanyExtractionService:
         status_code: Optional[int] = None
         timeout = httpx.Timeout(self._fetch_timeout_seconds)
         try:
-            async with httpx.AsyncClient(timeout=timeout, follow_redirects=True, http2=False) as client:
+            async with httpx.AsyncClient(
+                timeout=timeout, follow_redirects=True, http2=False, transport=TelemetryTransport()
+            ) as client:
                 response = await client.get(robots_url, headers={"User-Agent": user_agent})
                 status_code = response.status_code
 
@@ -347,32 +360,78 @@ class CompanyExtractionService:
         self._robots_cache[cache_key] = {"policy": policy, "expires_at": expires_at}
         return policy
 
+    async def _seed_domain_rate(self, tenant_id: str, domain: str) -> None:
+        """Start a domain new to this process from the tenant's persisted limits."""
+        controller = CompanyExtractionService._rate_controller
+        if controller.knows(domain):
+            return
+        rows = await self.repo.list_domain_rate_limits(tenant_id, [domain])
+        if not rows:
+            controller.state(domain)
+            return
+        row = rows[0]
+        controller.seed(
+            domain,
+            concurrency_limit=row.concurrency_limit,
+            delay_ms=row.delay_ms,
+            latency_ewma_ms=row.latency_ewma_ms,
+            latency_floor_ms=row.latency_floor_ms,
+            throttle_count=row.throttle_count,
+            cooldown_until=row.cooldown_until,
+        )
+
+    async def _persist_domain_rate(self, tenant_id: str, domain: str) -> None:
+        limits = CompanyExtractionService._rate_controller.take_for_persist(
+            domain, settings.FETCH_RATE_PERSIST_SECONDS
+        )
+        if limits:
+            await self.repo.upsert_domain_rate_limit(tenant_id, domain, limits)
+
     @asynccontextmanager
-    async def _acquire_request_slot(self, url: str):
+    async def _acquire_request_slot(self, url: str, tenant_id: Optional[str] = None):
+        """Hold a global and a per-domain request slot for one request.
+
+        Yields a RequestSlot; the caller reports the response status (and
+        Retry-After) on it, and on release the outcome, or a transport error
+        when no response arrived, adjusts the domain's adaptive limits.
+        """
         domain = urlparse(url).netloc or "unknown"
         global_sem = CompanyExtractionService._global_semaphore
-        limiter = self._get_domain_limiter(domain)
+        controller = CompanyExtractionService._rate_controller
+        if tenant_id:
+            await self._seed_domain_rate(tenant_id, domain)
         wait_start = time.monotonic()
+        if global_sem:
+            await global_sem.acquire()
         try:
+            await controller.acquire(domain)
+        except BaseException:
             if global_sem:
-                await global_sem.acquire()
-            await limiter["semaphore"].acquire()
-
-            waited_ms = (time.monotonic() - wait_start) * 1000
-            min_delay = CompanyExtractionService._per_domain_min_delay
-            last_start = limiter.get("last_start")
-            if min_delay > 0 and last_start is not None:
-                elapsed = time.monotonic() - last_start
-                sleep_for = min_delay if elapsed >= min_delay else (min_delay - elapsed)
-                await asyncio.sleep(sleep_for)
-                waited_ms += sleep_for * 1000
-
-            limiter["last_start"] = time.monotonic()
-            yield domain, waited_ms
+                global_sem.release()
+            raise
+        slot = RequestSlot(domain=domain, waited_ms=(time.monotonic() - wait_start) * 1000)
+        record_domain_wait(slot.waited_ms)
+        failed = False
+        try:
+            yield slot
+        except Exception:
+            failed = True
+            raise
         finally:
-            limiter["semaphore"].release()
+            if slot.status_code is not None:
+                controller.record(
+                    domain,
+                    status_code=slot.status_code,
+                    latency=slot.latency,
+                    retry_after=slot.retry_after,
+                )
+            elif failed:
+                controller.record(domain, error=True)
+            controller.release(domain)
             if global_sem:
                 global_sem.release()
+        if tenant_id:
+            await self._persist_domain_rate(tenant_id, domain)
 
     @staticmethod
     def _parse_retry_after(header_value: Optional[str]) -> Optional[int]:
@@ -401,6 +460,8 @@ class CompanyExtractionService:
         4. Ignore content before first <h2>
         5. Log what was found and rejected
         """
+        from bs4 import BeautifulSoup  # deferred: heavy import, only needed when parsing
+
         soup = BeautifulSoup(html, 'html.parser')
         
         # CRITICAL: Only look inside main content area
@@ -552,8 +613,11 @@ class CompanyExtractionService:
         
         Returns summary of processing results with detailed stats.
         """
-        # Load extractable sources (URL sources must already be fetched)
-        sources = await self.repo.get_extractable_sources(tenant_id, run_id)
+        # Load extractable sources (URL sources must already be fetched) whose
+        # content or extraction changed since they were last processed
+        sources = await self.repo.list_sources_pending_processing(tenant_id, run_id)
+        # Upstream stamps as read; the processed stamp is only set where they still hold.
+        read_seqs = [(source.id, source.content_seq, source.extracted_seq) for source in sources]
         
         if not sources:
             return {
@@ -579,6 +643,7 @@ class CompanyExtractionService:
         total_new = 0
         total_existing = 0
         sources_detail = []
+        stamp = await self.repo.next_source_change_seq()
         
         # Process each source
         for source in sources:
@@ -595,6 +660,21 @@ class CompanyExtractionService:
                         }
                     )
                     continue
+                # Near-duplicates (syndicated copies) add no companies beyond their
+                # primary source, which is processed instead.
+                quality_flags = meta.get("quality_flags") or {}
+                primary_source_id = quality_flags.get("duplicate_primary_source_id")
+                if quality_flags.get("is_near_duplicate") and primary_source_id and primary_source_id != str(source.id):
+                    sources_detail.append(
+                        {
+                            "source_id": str(source.id),
+                            "title": source.title or source.url or "Unknown",
+                            "status": "skipped",
+                            "reason": "near_duplicate",
+                            "duplicate_of": primary_source_id,
+                        }
+                    )
+                    continue
                 # Extract text content if needed
                 fetch_metadata = {}
                 if source.source_type == "url" and source.status != "fetched":
@@ -737,6 +817,9 @@ class CompanyExtractionService:
                     ),
                 )
         
+        await self.repo.stamp_sources_consumed(
+            "processed_seq", stamp, ("content_seq", "extracted_seq"), read_seqs
+        )
         return {
             "processed": len(sources),
             "companies_found": total_companies,
@@ -793,7 +876,6 @@ class CompanyExtractionService:
         terminal_failures = 0
         details = []
         next_retry_at: Optional[datetime] = None
-        pending_recheck = False
 
         for source in sources:
             meta_before = dict(source.meta or {})
@@ -913,12 +995,6 @@ class CompanyExtractionService:
                 source.error_message = None
                 source.next_retry_at = None
 
-                pending_validators = {}
-                if isinstance(source.meta, dict):
-                    pending_validators = (source.meta.get("validators") or {}) if isinstance(source.meta.get("validators"), dict) else {}
-                if pending_validators.get("pending_recheck"):
-                    source.next_retry_at = utc_now() + timedelta(seconds=1)
-
                 await self.repo.create_research_event(
                     tenant_id=tenant_id,
                     data=ResearchEventCreate(
@@ -1057,17 +1133,14 @@ class CompanyExtractionService:
             now = utc_now()
             retry_backoff_seconds = max(1, int((next_retry_at - now).total_seconds()))
 
-        pending_recheck = any(
-            (
-                (validators := ((src.meta or {}).get("validators") or {})).get("pending_recheck")
-            )
+        # Conditional rechecks are owned by the revalidation scheduler
+        # (meta.validators.next_check_at); the step no longer reschedules itself.
+        next_check_times = [
+            validators["next_check_at"]
             for src in sources
             if src.source_type == "url"
-        )
-
-        pending_recheck_next_retry_at: Optional[datetime] = None
-        if pending_recheck and not retry_scheduled:
-            pending_recheck_next_retry_at = utc_now() + timedelta(seconds=1)
+            and (validators := ((src.meta or {}).get("validators") or {})).get("next_check_at")
+        ]
 
         return {
             "processed": len(sources),
@@ -1077,8 +1150,10 @@ class CompanyExtractionService:
             "retry_scheduled": retry_scheduled,
             "next_retry_at": next_retry_at.isoformat() if next_retry_at else None,
             "retry_backoff_seconds": retry_backoff_seconds,
-            "pending_recheck": pending_recheck,
-            "pending_recheck_next_retry_at": pending_recheck_next_retry_at.isoformat() if pending_recheck_next_retry_at else None,
+            "pending_recheck": False,
+            "pending_recheck_next_retry_at": None,
+            "revalidation_scheduled": len(next_check_times),
+            "next_check_at": min(next_check_times) if next_check_times else None,
             "selected": selected,
             "limited": limited,
             "force": force,
@@ -1101,19 +1176,78 @@ class CompanyExtractionService:
             return True
         return bool(validators.get("etag") or validators.get("last_modified"))
 
+    @staticmethod
+    def _schedule_revalidation(
+        validators: dict[str, Any],
+        headers: dict[str, Any],
+        body: Optional[bytes] = None,
+        body_sha256: Optional[str] = None,
+    ) -> None:
+        """Record when the revalidation scheduler should next check this source.
+
+        ``body`` (the raw response bytes of a 200) is fingerprinted so a later full
+        response can be compared with what was fetched, independent of how the text
+        was normalized afterwards. ``body_sha256`` passes a digest already computed
+        while the body streamed in.
+        """
+        next_check_at, interval, basis = compute_next_check_at(
+            headers or {},
+            now=utc_now(),
+            min_seconds=settings.SOURCE_REVALIDATION_MIN_SECONDS,
+            max_seconds=settings.SOURCE_REVALIDATION_MAX_SECONDS,
+            default_seconds=settings.SOURCE_REVALIDATION_DEFAULT_SECONDS,
+        )
+        validators["next_check_at"] = format_check_time(next_check_at)
+        validators["check_interval_seconds"] = interval
+        validators["freshness_basis"] = basis
+        if body_sha256 is not None:
+            validators["body_sha256"] = body_sha256
+        elif body is not None:
+            validators["body_sha256"] = hashlib.sha256(body).hexdigest()
+        validators.pop("pending_recheck", None)
+
+    async def _stamp_content_change(
+        self,
+        source: ResearchSourceDocument,
+        previous_body_sha256: Optional[str],
+    ) -> None:
+        """Move content_seq forward when a fetch produced a different body.
+
+        Downstream stages select rows whose content_seq is newer than their own
+        stamp, so an identical re-download does not re-queue the source.
+        """
+        current = ((source.meta or {}).get("validators") or {}).get("body_sha256")
+        if previous_body_sha256 and current == previous_body_sha256:
+            return
+        # No autoflush: a pending duplicate content_hash must reach
+        # _apply_content_dedupe before it is written.
+        with self.db.no_autoflush:
+            source.content_seq = await self.repo.next_source_change_seq()
+
     async def _fetch_content(
         self,
         tenant_id: str,
         source: ResearchSourceDocument,
+        *,
+        revalidate: bool = False,
     ) -> Dict[str, Any]:
-        """Fetch and extract content from source. Returns metadata about extraction method."""
+        """Fetch and extract content from source. Returns metadata about extraction method.
+
+        ``revalidate`` forces a network round-trip for already-fetched URL sources
+        (conditional when validators are stored), as used by the revalidation scheduler.
+        """
+        import httpx  # deferred: only fetching processes need httpx and pypdf
+        from pypdf import PdfReader
+        from app.core.telemetry_http import TelemetryTransport
+
         metadata = {"extraction_method": "unknown", "items_found": 0}
         http_info: Dict[str, Any] = {}
         
         if source.source_type == "url":
             meta = dict(source.meta or {})
             validators = dict(meta.get("validators") or {})
-            should_revalidate = self._should_revalidate(validators)
+            previous_body_sha256 = validators.get("body_sha256")
+            should_revalidate = revalidate or self._should_revalidate(validators)
 
             if source.content_text and source.content_hash and not should_revalidate:
                 metadata["extraction_method"] = "cached"
@@ -1131,6 +1265,7 @@ class CompanyExtractionService:
 
                     headers = {
                         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                        'Accept-Encoding': self._accept_encoding,
                         **(fetch_opts.get("headers") or {}),
                     }
 
@@ -1218,7 +1353,9 @@ class CompanyExtractionService:
                     last_exc: Optional[Exception] = None
                     fetched_payload: Optional[Dict[str, Any]] = None
                     timeout = httpx.Timeout(timeout_seconds)
-                    async with httpx.AsyncClient(timeout=timeout, follow_redirects=False, http2=False) as client:
+                    async with httpx.AsyncClient(
+                        timeout=timeout, follow_redirects=False, http2=False, transport=TelemetryTransport()
+                    ) as client:
                         for candidate_url in urls_to_try:
                             try:
                                 redirect_chain: list[Dict[str, Any]] = []
@@ -1226,7 +1363,8 @@ class CompanyExtractionService:
                                 current_url = candidate_url
 
                                 for _ in range(self._max_redirects + 1):
-                                    async with self._acquire_request_slot(current_url) as (domain, waited_ms):
+                                    async with self._acquire_request_slot(current_url, tenant_id) as slot:
+                                        domain, waited_ms = slot.domain, slot.waited_ms
                                         if waited_ms > 0:
                                             await self.repo.create_research_event(
                                                 tenant_id=tenant_id,
@@ -1256,6 +1394,12 @@ class CompanyExtractionService:
 
                                             status_code = response.status_code or 0
                                             location = response.headers.get("location")
+                                            slot.observe_response(
+                                                status_code,
+                                                self._parse_retry_after(response.headers.get("retry-after"))
+                                                if status_code in {429, 503}
+                                                else None,
+                                            )
 
                                             if status_code == 304:
                                                 source.status = "fetched"
@@ -1266,8 +1410,8 @@ class CompanyExtractionService:
                                                 source.http_final_url = str(response.url)
                                                 source.http_error_message = None
 
-                                                validators["pending_recheck"] = True
                                                 validators["last_checked_at"] = utc_now_iso()
+                                                self._schedule_revalidation(validators, dict(response.headers))
                                                 meta["validators"] = validators
                                                 source.meta = meta
                                                 source.fetched_at = source.fetched_at or utc_now()
@@ -1488,9 +1632,11 @@ class CompanyExtractionService:
                                                 return metadata
 
                                             content_chunks: list[bytes] = []
+                                            body_hasher = hashlib.sha256()
                                             bytes_read = 0
                                             async for chunk in response.aiter_bytes():
                                                 content_chunks.append(chunk)
+                                                body_hasher.update(chunk)
                                                 bytes_read += len(chunk)
                                                 if bytes_read > max_fetch_bytes:
                                                     source.status = "failed"
@@ -1502,6 +1648,7 @@ class CompanyExtractionService:
                                                         "headers": dict(response.headers),
                                                         "final_url": str(response.url),
                                                         "bytes_read": bytes_read,
+                                                        "wire_bytes": response.num_bytes_downloaded,
                                                         "content_type": response.headers.get("content-type"),
                                                     }
                                                     source.http_status_code = response.status_code
@@ -1523,6 +1670,7 @@ class CompanyExtractionService:
                                                             },
                                                             output_json={
                                                                 "bytes_read": bytes_read,
+                                                                "wire_bytes": response.num_bytes_downloaded,
                                                                 "max_bytes": max_fetch_bytes,
                                                                 "content_type": response.headers.get("content-type"),
                                                             },
@@ -1537,9 +1685,11 @@ class CompanyExtractionService:
                                                 "headers": dict(response.headers),
                                                 "url": str(response.url),
                                                 "bytes_read": bytes_read,
+                                                "wire_bytes": response.num_bytes_downloaded,
                                                 "content_type": response.headers.get("content-type"),
                                                 "reason_phrase": response.reason_phrase,
                                                 "content_bytes": content_bytes,
+                                                "body_sha256": body_hasher.hexdigest(),
                                             }
                                             response = None  # release reference
                                             break
@@ -1608,7 +1758,9 @@ class CompanyExtractionService:
                         return metadata
 
                     content_bytes = fetched_payload.get("content_bytes", b"")
+                    body_sha256 = fetched_payload.get("body_sha256")
                     bytes_read = fetched_payload.get("bytes_read", 0)
+                    wire_bytes = fetched_payload.get("wire_bytes")
                     response_status_code = fetched_payload.get("status")
                     response_headers = fetched_payload.get("headers", {})
                     response_url = fetched_payload.get("url")
@@ -1650,6 +1802,7 @@ class CompanyExtractionService:
                         "content_type": content_type_header,
                         "content_length": content_length,
                         "bytes_read": bytes_read,
+                        "wire_bytes": wire_bytes,
                     }
                     if redirect_chain:
                         http_info["redirect_chain"] = redirect_chain
@@ -1662,11 +1815,16 @@ class CompanyExtractionService:
 
                     is_pdf = content_type_header and "pdf" in content_type_header.lower()
                     if is_pdf:
+                        validators["last_checked_at"] = utc_now_iso()
+                        self._schedule_revalidation(validators, response_headers, content_bytes or b"", body_sha256)
+                        meta["validators"] = validators
+                        source.meta = meta
                         source.content_bytes = content_bytes
                         source.content_text = ""
-                        source.content_hash = hashlib.sha256(content_bytes or b"").hexdigest() if content_bytes else None
+                        source.content_hash = body_sha256 if content_bytes else None
                         source.status = "fetched"
                         source.fetched_at = utc_now()
+                        await self._stamp_content_change(source, previous_body_sha256)
                         metadata["extraction_method"] = "pdf_raw"
                         metadata["http"] = http_info
                         metadata["bytes_read"] = bytes_read
@@ -1698,7 +1856,7 @@ class CompanyExtractionService:
                         validators["no_store"] = True
                         validators["last_seen_at"] = utc_now_iso()
                         validators["last_checked_at"] = utc_now_iso()
-                        validators["pending_recheck"] = True
+                        self._schedule_revalidation(validators, response_headers, content_bytes or b"", body_sha256)
                         meta["validators"] = validators
                         source.meta = meta
                         metadata["validators"] = {"no_store": True}
@@ -1713,17 +1871,18 @@ class CompanyExtractionService:
                             validators.pop("last_modified", None)
                         validators["last_seen_at"] = utc_now_iso()
                         validators["last_checked_at"] = utc_now_iso()
-                        validators["pending_recheck"] = True
+                        self._schedule_revalidation(validators, response_headers, content_bytes or b"", body_sha256)
                         meta["validators"] = validators
                         source.meta = meta
                         metadata["validators"] = {
                             "etag": validators.get("etag"),
                             "last_modified": validators.get("last_modified"),
                         }
-                    elif validators:
+                    else:
                         validators.pop("etag", None)
                         validators.pop("last_modified", None)
-                        validators["pending_recheck"] = True
+                        validators["last_checked_at"] = utc_now_iso()
+                        self._schedule_revalidation(validators, response_headers, content_bytes or b"", body_sha256)
                         meta["validators"] = validators
                         source.meta = meta
 
@@ -1815,6 +1974,7 @@ class CompanyExtractionService:
                     source.content_hash = hashlib.sha256(source.content_text.encode()).hexdigest()
                     source.status = "fetched"
                     source.fetched_at = utc_now()
+                    await self._stamp_content_change(source, previous_body_sha256)
                     metadata.update(await self._apply_content_dedupe(tenant_id, source.company_research_run_id, source))
                     
                 except Exception as e:
@@ -1985,6 +2145,8 @@ class CompanyExtractionService:
         2. If structured data found, use that
         3. Otherwise fallback to plain text extraction
         """
+        from bs4 import BeautifulSoup  # deferred: heavy import, only needed when parsing
+
         soup = BeautifulSoup(html, 'html.parser')
         
         # Remove unwanted elements completely
@@ -2301,9 +2463,15 @@ class CompanyExtractionService:
         
         new_count = 0
         existing_count = 0
+        name_matcher = CompanyNameDedupeService(self.db)
         
         for company_name, snippet in companies:
             normalized = self._normalize_company_name(company_name)
+            if normalized not in existing_normalized:
+                # Fuzzy match through the name key index (also covers prospects beyond the listed page).
+                matched = await name_matcher.match_existing_prospect(tenant_id, run_id, company_name)
+                if matched:
+                    existing_normalized[normalized] = matched
             
             if normalized in existing_normalized:
                 # Company already exists - add evidence only
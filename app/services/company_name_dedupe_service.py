@@ -0,0 +1,208 @@
+import asyncio
+import hashlib
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.company_research import CompanyProspect
+from app.repositories.company_research_repo import CompanyResearchRepository
+from app.services.run_resolution_snapshot import EvidenceMap, build_evidence_map
+from app.utils.company_name_match import (
+    NameMatch,
+    best_name_match,
+    cluster_matches,
+    find_probable_duplicates,
+    lookup_keys,
+    name_match_keys,
+    name_similarity,
+)
+
+ENTITY_TYPE = "company"
+REASON_CODES = ["MATCH_COMPANY_NAME_FUZZY"]
+
+# (id, name_raw, name_match_keys, is_pinned, created_at), see list_company_name_match_rows
+NameRow = Tuple[UUID, Optional[str], Optional[list], bool, Optional[datetime]]
+
+
+@dataclass
+class CompanyMergePlan:
+    summary: dict
+    resolved: Dict[str, dict] = field(default_factory=dict)
+    links: Dict[str, dict] = field(default_factory=dict)
+    duplicate_ids: List[UUID] = field(default_factory=list)
+
+
+class CompanyNameDedupeService:
+    """Run-scoped fuzzy company-name matching: probable duplicates, auto-merge and ingest lookups."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repo = CompanyResearchRepository(db)
+
+    async def match_existing_prospect(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        name: str,
+        threshold: Optional[float] = None,
+    ) -> Optional[CompanyProspect]:
+        """The run prospect a newly seen name should be attached to, if one scores above the auto-merge threshold."""
+        keys = lookup_keys(name_match_keys(name))
+        if not keys:
+            return None
+        candidates = await self.repo.list_company_prospects_by_name_keys(tenant_id, run_id, keys)
+        by_id = {prospect.id: prospect for prospect in candidates}
+        best = best_name_match(
+            name,
+            ((prospect.id, prospect.name_raw) for prospect in candidates),
+            settings.PROSPECT_NAME_AUTO_MERGE_THRESHOLD if threshold is None else threshold,
+        )
+        return by_id[best[0]] if best else None
+
+    async def find_probable_duplicates(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        threshold: Optional[float] = None,
+    ) -> dict:
+        """Pairs of run prospects whose names score at least ``threshold``, best first."""
+        threshold = settings.PROSPECT_NAME_MATCH_THRESHOLD if threshold is None else threshold
+        rows = await self.repo.list_company_name_match_rows(tenant_id, run_id)
+        matches = await asyncio.to_thread(self._match, rows, threshold)
+        names = {row[0]: row[1] for row in rows}
+        return {
+            "prospects_scanned": len(rows),
+            "threshold": threshold,
+            "pairs": [
+                {
+                    "left_prospect_id": match.left_id,
+                    "left_name": names[match.left_id],
+                    "right_prospect_id": match.right_id,
+                    "right_name": names[match.right_id],
+                    "score": match.score,
+                    "shared_keys": match.shared_keys,
+                }
+                for match in matches
+            ],
+        }
+
+    async def merge_probable_duplicates(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        threshold: Optional[float] = None,
+        dry_run: bool = False,
+    ) -> dict:
+        """Merge run prospects whose names score at least ``threshold`` (default: the auto-merge threshold).
+
+        Each connected group keeps its pinned-then-oldest prospect; the others
+        are marked ``duplicate`` and recorded as company merge links.
+        """
+        threshold = settings.PROSPECT_NAME_AUTO_MERGE_THRESHOLD if threshold is None else threshold
+        rows = await self.repo.list_company_name_match_rows(tenant_id, run_id)
+        matches = await asyncio.to_thread(self._match, rows, threshold)
+        clustered = {member for group in cluster_matches(matches) for member in group}
+        evidence_map = build_evidence_map(await self.repo.list_company_evidence_pairs(tenant_id, sorted(clustered)))
+        plan = self.plan(tenant_id, run_id, rows, matches, evidence_map, threshold)
+        if dry_run:
+            return plan.summary
+        return await self.apply_plan(tenant_id, plan)
+
+    def plan(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        rows: Sequence[NameRow],
+        matches: Sequence[NameMatch],
+        evidence_map: EvidenceMap,
+        threshold: float,
+    ) -> CompanyMergePlan:
+        """Merge groups, resolved entities and merge links for the matched pairs (no I/O)."""
+        by_id = {row[0]: row for row in rows}
+        groups = cluster_matches(matches)
+        plan = CompanyMergePlan(
+            summary={
+                "entity_type": ENTITY_TYPE,
+                "prospects_scanned": len(rows),
+                "threshold": threshold,
+                "pairs_matched": len(matches),
+                "groups_merged": len(groups),
+                "duplicates_marked": 0,
+            }
+        )
+        for group in groups:
+            members = sorted((by_id[member_id] for member_id in group), key=self._canonical_sort_key)
+            canonical = members[0]
+            member_ids = [member[0] for member in members]
+            match_keys = {"match_type": "company_name", "threshold": threshold}
+            res_hash = self._hash_resolution(match_keys, canonical[0], member_ids)
+            plan.resolved[res_hash] = {
+                "id": uuid.uuid4(),
+                "tenant_id": tenant_id,
+                "company_research_run_id": run_id,
+                "entity_type": ENTITY_TYPE,
+                "canonical_entity_id": canonical[0],
+                "match_keys": match_keys,
+                "reason_codes": REASON_CODES,
+                "evidence_source_document_ids": self._collect_evidence_ids(member_ids, evidence_map),
+                "resolution_hash": res_hash,
+            }
+            for member in members[1:]:
+                link_match_keys = {
+                    **match_keys,
+                    "score": round(name_similarity(canonical[1], member[1]), 4),
+                    "canonical_id": str(canonical[0]),
+                    "duplicate_id": str(member[0]),
+                }
+                link_hash = self._hash_resolution(link_match_keys, canonical[0], [member[0]])
+                plan.links[link_hash] = {
+                    "id": uuid.uuid4(),
+                    "tenant_id": tenant_id,
+                    "company_research_run_id": run_id,
+                    "entity_type": ENTITY_TYPE,
+                    "resolved_hash": res_hash,
+                    "canonical_entity_id": canonical[0],
+                    "duplicate_entity_id": member[0],
+                    "match_keys": link_match_keys,
+                    "reason_codes": REASON_CODES,
+                    "evidence_source_document_ids": self._collect_evidence_ids([canonical[0], member[0]], evidence_map),
+                    "resolution_hash": link_hash,
+                }
+                plan.duplicate_ids.append(member[0])
+        plan.summary["duplicates_marked"] = len(plan.duplicate_ids)
+        return plan
+
+    async def apply_plan(self, tenant_id: str, plan: CompanyMergePlan) -> dict:
+        resolved_ids = await self.repo.bulk_upsert_resolved_entities(list(plan.resolved.values()))
+        links = []
+        for row in plan.links.values():
+            link = dict(row)
+            link["resolved_entity_id"] = resolved_ids.get(link.pop("resolved_hash"))
+            links.append(link)
+        await self.repo.bulk_upsert_entity_merge_links(links)
+        await self.repo.mark_company_prospects_duplicate(tenant_id, plan.duplicate_ids)
+        await self.db.flush()
+        return plan.summary
+
+    def _match(self, rows: Sequence[NameRow], threshold: float) -> List[NameMatch]:
+        return find_probable_duplicates(
+            ((row[0], row[1], row[2] or None) for row in rows),
+            threshold,
+            max_block=settings.PROSPECT_NAME_MATCH_MAX_BLOCK,
+        )
+
+    def _canonical_sort_key(self, row: NameRow) -> Tuple[bool, datetime, str]:
+        return (not row[3], row[4] or datetime.max, str(row[0]))
+
+    def _collect_evidence_ids(self, prospect_ids: Sequence[UUID], evidence_map: EvidenceMap) -> List[str]:
+        return sorted({str(ev_id) for prospect_id in prospect_ids for ev_id in evidence_map.get(prospect_id, ())})
+
+    def _hash_resolution(self, match_keys: dict, canonical_id: UUID, member_ids: List[UUID]) -> str:
+        ordered_members = sorted(str(mid) for mid in member_ids)
+        payload = f"{ENTITY_TYPE}|{canonical_id}|{match_keys}|{ordered_members}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -5,6 +5,7 @@ Provides validation and orchestration for company discovery operations.
 Phase 1: Backend structures only, no external AI/crawling yet.
 """
 
+import asyncio
 import csv
 import hashlib
 import io
@@ -15,7 +16,7 @@ import uuid
 import zipfile
 from pathlib import Path, PurePosixPath
 from collections import defaultdict
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime, timezone
 from urllib.parse import urlparse, urlunparse
 from uuid import UUID
@@ -24,7 +25,8 @@ from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert
 
 from app.core.config import settings
-from app.repositories.company_research_repo import CompanyResearchRepository
+from app.core.telemetry import STEP_METRIC_MAXES, STEP_METRIC_SUMS, render_job_queue_metrics, render_step_metrics
+from app.repositories.company_research_repo import JOB_PRIORITY_CLASSES, CompanyResearchRepository
 from app.repositories.enrichment_assignment_repository import EnrichmentAssignmentRepository
 from app.repositories.candidate_repository import CandidateRepository
 from app.repositories.contact_repository import ContactRepository
@@ -45,6 +47,7 @@ from app.models.company_research import (
     CompanyResearchJob,
     CompanyResearchRunPlan,
     CompanyResearchRunStep,
+    DomainRateLimit,
     ExecutiveProspect,
     ExecutiveProspectEvidence,
     ExecutiveMergeDecision,
@@ -53,15 +56,21 @@ from app.models.ai_enrichment_record import AIEnrichmentRecord
 from app.models.activity_log import ActivityLog
 from app.services.ai_proposal_service import AIProposalService
 from app.services.company_extraction_service import CompanyExtractionService
+from app.services.company_name_dedupe_service import CompanyNameDedupeService
 from app.services.company_source_extraction_service import CompanySourceExtractionService
 from app.services.entity_resolution_service import EntityResolutionService
 from app.services.canonical_people_service import CanonicalPeopleService
 from app.services.canonical_company_service import CanonicalCompanyService
+from app.services.company_enrichment_extraction_service import CompanyEnrichmentExtractionService
+from app.services.run_resolution_snapshot import load_run_snapshot
 from app.services.discovery_provider import ExternalProviderConfigError, get_discovery_provider, DiscoveryProviderResult
 from app.services.integration_settings_service import IntegrationSettingsService
 from app.services.search_cache_service import SearchCacheService
+from app.services.contact_enrichment_service import ContactEnrichmentService, JOB_TYPE_EXEC_CONTACT_ENRICHMENT
+from app.services.job_lease import JobLeaseLostError
 from app.schemas.ai_proposal import AIProposal
 from app.schemas.ai_enrichment import AIEnrichmentCreate
+from app.schemas.contact_enrichment import ContactEnrichmentRequest
 from app.schemas.llm_discovery import LlmDiscoveryPayload, LlmCompany, LlmEvidence, LlmRunContext
 from app.schemas.executive_discovery import ExecutiveDiscoveryPayload
 from app.schemas.company_research import (
@@ -93,7 +102,10 @@ from app.schemas.source_document import SourceDocumentCreate as ResearchEventSou
 from app.schemas.candidate import CandidateCreate
 from app.schemas.contact import ContactCreate
 from app.schemas.candidate_assignment import CandidateAssignmentCreate
+from app.utils.canonical_json import CanonicalPayload, canonical_dumps, canonical_hash
+from app.utils.content_codec import IncrementalDecoder
 from app.utils.url_canonicalizer import canonicalize_url
+from app.utils.zip_stream import DeterministicZipStream
 
 
 class CompanyResearchService:
@@ -111,6 +123,16 @@ class CompanyResearchService:
         "internal": 1,
         "both": 2,
     }
+    EXEC_VERIFICATION_WEIGHTS = {
+        "verified": 1000.0,
+        "partial": 500.0,
+        "unverified": 0.0,
+    }
+    EXEC_PROVENANCE_WEIGHTS = {
+        "both": 200.0,
+        "internal": 100.0,
+        "external": 100.0,
+    }
 
     GCC_COUNTRY_ORDER: list[tuple[str, str]] = [
         ("UAE", "AE"),
@@ -128,11 +150,21 @@ class CompanyResearchService:
     EXPORT_MAX_EXECUTIVES = settings.EXPORT_PACK_MAX_EXECUTIVES
     EXPORT_STORAGE_ROOT = settings.EXPORT_PACK_STORAGE_ROOT
     EVIDENCE_BUNDLE_MAX_ZIP_BYTES = settings.EVIDENCE_BUNDLE_MAX_ZIP_BYTES
+    EVIDENCE_BUNDLE_STREAM_CHUNK_BYTES = settings.EVIDENCE_BUNDLE_STREAM_CHUNK_BYTES
+    EVIDENCE_BUNDLE_SPOOL_ROOT = settings.EVIDENCE_BUNDLE_SPOOL_ROOT
+    SOURCE_PAYLOAD_EXTENSIONS = {
+        "application/pdf": ".pdf",
+        "text/html": ".html",
+        "application/json": ".json",
+        "text/plain": ".txt",
+    }
     
     def __init__(self, db: AsyncSession):
         self.db = db
         self.repo = CompanyResearchRepository(db)
         self.assignment_repo = EnrichmentAssignmentRepository(db)
+        # (tenant_id, run_id) -> step_key -> plan not yet written (see _take_resolution_plan)
+        self._resolution_plans: Dict[Tuple[str, UUID], Dict[str, Any]] = {}
 
     def _split_name(self, full_name: str) -> tuple[str, str]:
         tokens = [token for token in (full_name or "").strip().split() if token]
@@ -313,6 +345,13 @@ class CompanyResearchService:
                 "enabled": True,
                 "max_attempts": 2,
             },
+            {
+                "step_key": "company_enrichment",
+                "step_order": 29,
+                "rationale": "Extract HQ, ownership and industry enrichment for the run's canonical companies",
+                "enabled": True,
+                "max_attempts": 2,
+            },
             {
                 "step_key": "ingest_lists",
                 "step_order": 30,
@@ -339,6 +378,28 @@ class CompanyResearchService:
             "steps": steps,
         }
 
+    async def render_step_metrics(self, tenant_id: str, since: Optional[datetime] = None) -> str:
+        """Prometheus text exposition of step telemetry aggregated across the tenant's runs."""
+
+        rows = await self.repo.aggregate_step_metrics(
+            tenant_id,
+            sum_fields=[field for _metric, field, _scale, _help in STEP_METRIC_SUMS],
+            max_fields=[field for _metric, field, _scale, _help in STEP_METRIC_MAXES],
+            since=since,
+        )
+        return render_step_metrics(rows)
+
+    async def render_job_queue_metrics(self, tenant_id: str, since: datetime) -> str:
+        """Prometheus text exposition of the tenant's job queue waits (p50/p95/max) and waiting backlog."""
+
+        waits = await self.repo.aggregate_job_queue_waits(tenant_id, since)
+        waiting = await self.repo.aggregate_waiting_jobs(tenant_id)
+        return render_job_queue_metrics(str(tenant_id), waits, waiting, JOB_PRIORITY_CLASSES)
+
+    async def list_domain_rate_limits(self, tenant_id: str) -> List[DomainRateLimit]:
+        """Fetch limits the workers learned per domain, as last written back (FETCH_RATE_PERSIST_SECONDS)."""
+        return await self.repo.list_domain_rate_limits(tenant_id)
+
     async def ensure_plan_and_steps(
         self,
         tenant_id: str,
@@ -526,6 +587,22 @@ class CompanyResearchService:
             limit=limit,
             offset=offset,
         )
+
+    async def list_latest_metrics_for_prospects(
+        self,
+        tenant_id: str,
+        prospect_ids: List[UUID],
+    ) -> Dict[UUID, List[Any]]:
+        """Latest metric per key for a batch of prospects (single query)."""
+        return await self.repo.list_latest_company_metrics_for_prospects(tenant_id, prospect_ids)
+
+    async def summarize_evidence_for_prospects(
+        self,
+        tenant_id: str,
+        prospect_ids: List[UUID],
+    ) -> Dict[UUID, dict]:
+        """Evidence counts and list membership for a batch of prospects (single query)."""
+        return await self.repo.summarize_evidence_for_prospects(tenant_id, prospect_ids)
     
     async def update_prospect_manual_fields(
         self,
@@ -1412,77 +1489,38 @@ class CompanyResearchService:
         limit: int = 50,
         offset: int = 0,
     ) -> List[dict]:
-        """Deterministically rank executives with explainability and stable tie-breakers."""
+        """Deterministically rank executives with explainability and stable tie-breakers.
 
-        rows = await self.repo.list_executive_rank_inputs(
+        Scoring, filtering, ``ROW_NUMBER()`` positions and paging run in SQL, so only
+        the requested page is loaded; positions are stable across pages.
+        """
+
+        rows = await self.repo.list_ranked_executives(
             tenant_id=tenant_id,
             run_id=run_id,
+            verification_weights=self.EXEC_VERIFICATION_WEIGHTS,
+            provenance_weights=self.EXEC_PROVENANCE_WEIGHTS,
+            verification_order=self.EXEC_VERIFICATION_ORDER,
+            provenance_order=self.EXEC_PROVENANCE_ORDER,
             company_prospect_id=company_prospect_id,
+            provenance=provenance,
+            verification_status=verification_status,
+            q=q,
+            limit=limit,
+            offset=offset,
         )
 
-        ver_weights = {
-            "verified": 1000.0,
-            "partial": 500.0,
-            "unverified": 0.0,
-        }
-        prov_weights = {
-            "both": 200.0,
-            "internal": 100.0,
-            "external": 100.0,
-        }
-
-        provenance_filter = provenance.lower() if provenance else None
-        verification_filter = verification_status.lower() if verification_status else None
-        query_filter = q.lower() if q else None
-
         ranked: List[dict] = []
         for row in rows:
-            exec_row = row.get("executive")
-            company_row = row.get("company")
-            evidence_ids_raw = row.get("evidence_source_document_ids") or []
-
             evidence_ids_sorted = sorted(
-                {UUID(str(eid)) for eid in evidence_ids_raw if eid},
+                {UUID(str(eid)) for eid in row.get("evidence_source_document_ids") or [] if eid},
                 key=lambda eid: str(eid),
             )
-
-            provenance_value = (
-                (getattr(exec_row, "discovered_by", None) or getattr(exec_row, "source_label", None) or "")
-                .strip()
-                .lower()
-            )
-            provenance_value = provenance_value or None
-
-            verification_value = (
-                (getattr(exec_row, "verification_status", None) or getattr(company_row, "verification_status", None) or "unverified")
-                .strip()
-                .lower()
-            )
-
-            if provenance_filter and (provenance_value or "") != provenance_filter:
-                continue
-            if verification_filter and verification_value != verification_filter:
-                continue
-            if company_prospect_id and getattr(exec_row, "company_prospect_id", None) != company_prospect_id:
-                continue
-
-            display_name = (
-                getattr(exec_row, "name_normalized", None)
-                or getattr(exec_row, "name_raw", None)
-                or getattr(exec_row, "name", None)
-                or ""
-            )
-            title = getattr(exec_row, "title", None) or ""
-
-            if query_filter:
-                if query_filter not in display_name.lower() and query_filter not in title.lower():
-                    continue
-
-            ver_weight = float(ver_weights.get(verification_value, 0.0))
-            prov_weight = float(prov_weights.get(provenance_value, 0.0)) if provenance_value else 0.0
-            evidence_weight = float(min(len(evidence_ids_sorted) * 10.0, 100.0))
-
-            rank_score = float(ver_weight + prov_weight + evidence_weight)
+            provenance_value = row.get("provenance") or None
+            verification_value = row.get("verification_status")
+            ver_weight = float(row.get("verification_weight") or 0.0)
+            prov_weight = float(row.get("provenance_weight") or 0.0)
+            evidence_weight = float(row.get("evidence_weight") or 0.0)
 
             reasons = [
                 {
@@ -1507,33 +1545,21 @@ class CompanyResearchService:
 
             ranked.append(
                 {
-                    "executive_id": exec_row.id,
-                    "company_prospect_id": exec_row.company_prospect_id,
-                    "display_name": display_name,
-                    "title": title or None,
+                    "executive_id": row["executive_id"],
+                    "company_prospect_id": row["company_prospect_id"],
+                    "display_name": row.get("display_name") or "",
+                    "title": row.get("title") or None,
                     "provenance": provenance_value,
                     "verification_status": verification_value,
-                    "rank_score": rank_score,
-                    "rank_position": 0,
+                    "rank_score": float(row.get("rank_score") or 0.0),
+                    "rank_position": int(row["rank_position"]),
+                    "company_rank_position": int(row["company_rank_position"]),
                     "evidence_source_document_ids": evidence_ids_sorted,
                     "why_ranked": reasons,
                 }
             )
 
-        ranked_sorted = sorted(
-            ranked,
-            key=lambda item: (
-                -item["rank_score"],
-                -self.EXEC_VERIFICATION_ORDER.get(item.get("verification_status") or "", -1),
-                -self.EXEC_PROVENANCE_ORDER.get(item.get("provenance") or "", -1),
-                str(item["executive_id"]),
-            ),
-        )
-
-        for idx, item in enumerate(ranked_sorted, start=1):
-            item["rank_position"] = idx
-
-        return ranked_sorted[offset : offset + limit]
+        return ranked
 
     # ====================================================================
     # Job Queue Operations
@@ -1544,9 +1570,15 @@ class CompanyResearchService:
         worker_id: str,
         job_type: Optional[str] = None,
         *,
-        stale_after_seconds: int = 1800,
+        stale_after_seconds: Optional[int] = None,
     ) -> Optional[CompanyResearchJob]:
-        return await self.repo.claim_next_job(worker_id, job_type=job_type, stale_after_seconds=stale_after_seconds)
+        return await self.repo.claim_next_job(
+            worker_id,
+            job_type=job_type,
+            stale_after_seconds=stale_after_seconds or settings.JOB_LEASE_SECONDS,
+            tenant_max_running=settings.JOB_TENANT_MAX_RUNNING,
+            tenant_candidates=settings.JOB_CLAIM_TENANT_CANDIDATES,
+        )
 
     async def mark_job_running(self, job_id: UUID, worker_id: str) -> Optional[CompanyResearchJob]:
         return await self.repo.mark_job_running(job_id, worker_id)
@@ -1677,9 +1709,10 @@ class CompanyResearchService:
         self,
         tenant_id: str,
         *,
-        stale_after_seconds: int = 1800,
+        stale_after_seconds: Optional[int] = None,
         limit: int = 50,
     ) -> List[CompanyResearchJob]:
+        stale_after_seconds = stale_after_seconds or settings.JOB_LEASE_SECONDS
         jobs = await self.repo.recover_stuck_jobs(
             tenant_id=tenant_id,
             job_type="acquire_extract_async",
@@ -2153,8 +2186,8 @@ class CompanyResearchService:
                 zf.writestr(info, file_map[name])
         return buffer.getvalue()
 
-    async def build_evidence_bundle(self, tenant_id: str, run_id: UUID) -> Tuple[bytes, dict, Dict[str, bytes]]:
-        """Create a deterministic evidence bundle zip for a research run."""
+    async def _evidence_bundle_listing(self, tenant_id: str, run_id: UUID) -> Tuple[Any, Dict[str, bytes], List[dict]]:
+        """Run, export pack, source and decision listings shared by both bundle builders."""
 
         run = await self.get_research_run(tenant_id, run_id)
         if not run:
@@ -2199,20 +2232,21 @@ class CompanyResearchService:
                 }
             )
 
-        sources = await self.repo.list_source_documents_for_run(tenant_id, run_id)
+        sources = await self.repo.list_source_bundle_descriptors(tenant_id, run_id)
+        sources = sorted(sources, key=lambda s: (_iso(s.get("created_at")) or "", str(s["id"])))
         sources_payload = []
-        for src in sorted(sources, key=lambda s: (_iso(getattr(s, "created_at", None)) or "", str(s.id))):
+        for src in sources:
             sources_payload.append(
                 {
-                    "id": str(src.id),
-                    "source_type": src.source_type,
-                    "title": getattr(src, "title", None),
-                    "url": getattr(src, "url", None),
-                    "original_url": getattr(src, "original_url", None),
-                    "content_hash": getattr(src, "content_hash", None),
-                    "http_status_code": getattr(src, "http_status_code", None),
-                    "status": getattr(src, "status", None),
-                    "created_at": _iso(getattr(src, "created_at", None)),
+                    "id": str(src["id"]),
+                    "source_type": src["source_type"],
+                    "title": src.get("title"),
+                    "url": src.get("url"),
+                    "original_url": src.get("original_url"),
+                    "content_hash": src.get("content_hash"),
+                    "http_status_code": src.get("http_status_code"),
+                    "status": src.get("status"),
+                    "created_at": _iso(src.get("created_at")),
                 }
             )
 
@@ -2251,6 +2285,15 @@ class CompanyResearchService:
             "decisions.json": json.dumps(decisions_payload, sort_keys=True, indent=2).encode("utf-8"),
             "openapi_paths.json": json.dumps(openapi_paths, sort_keys=True, indent=2).encode("utf-8"),
         }
+        return run, file_map, sources
+
+    async def build_evidence_bundle(self, tenant_id: str, run_id: UUID) -> Tuple[bytes, dict, Dict[str, bytes]]:
+        """Create a deterministic evidence bundle zip for a research run."""
+
+        def _iso(value):
+            return value.isoformat() if value else None
+
+        run, file_map, _sources = await self._evidence_bundle_listing(tenant_id, run_id)
 
         manifest_entries = []
         for name in sorted(file_map.keys()):
@@ -2281,6 +2324,172 @@ class CompanyResearchService:
 
         return bundle_bytes, manifest, file_map
 
+    async def prepare_evidence_bundle_stream(self, tenant_id: str, run_id: UUID) -> dict:
+        """Load bundle listings and source descriptors; fingerprint them for spool reuse."""
+
+        run, file_map, sources = await self._evidence_bundle_listing(tenant_id, run_id)
+        fingerprint = hashlib.sha256(b"evidence-bundle-stream/1\n")
+        for name in sorted(file_map):
+            fingerprint.update(name.encode("utf-8") + b"\0" + hashlib.sha256(file_map[name]).digest())
+        for src in sources:
+            fingerprint.update(f"{src['id']}:{src.get('bytes_length')}:{src.get('text_length')}\n".encode("utf-8"))
+        return {"run": run, "files": file_map, "sources": sources, "fingerprint": fingerprint.hexdigest()}
+
+    def _source_payload_name(self, source: dict) -> Optional[str]:
+        if source.get("bytes_length"):
+            mime = (source.get("mime_type") or "").split(";")[0].strip().lower()
+            return f"sources/{source['id']}{self.SOURCE_PAYLOAD_EXTENSIONS.get(mime, '.bin')}"
+        if source.get("text_length"):
+            return f"sources/{source['id']}.txt"
+        return None
+
+    async def _iter_source_payload(self, tenant_id: str, source: dict) -> AsyncIterator[bytes]:
+        """Yield a source's raw bytes (or its text as UTF-8) in chunk-sized slices from one query.
+
+        A compressed payload is read in slices of its compressed form and decoded as they arrive.
+        """
+
+        chunk_size = max(1, self.EVIDENCE_BUNDLE_STREAM_CHUNK_BYTES)
+        if source.get("bytes_length"):
+            field = "content_bytes"
+        elif source.get("text_length"):
+            field = "content_text"
+        else:
+            return
+
+        codec = source.get("content_codec")
+        decoder = IncrementalDecoder(codec, chunk_size)
+        async for piece in self.repo.stream_source_payload(
+            tenant_id,
+            source["id"],
+            field=field,
+            chunk_size=chunk_size,
+            packed=codec is not None,
+        ):
+            for data in decoder.feed(piece.encode("utf-8") if isinstance(piece, str) else bytes(piece)):
+                yield data
+        for data in decoder.finish():
+            yield data
+
+    async def stream_evidence_bundle(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        *,
+        prepared: Optional[dict] = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield a deterministic evidence bundle zip that includes source payloads.
+
+        Listings come first, then one ``sources/<id>.<ext>`` entry per source with
+        content, then MANIFEST.json (size and sha256 of every entry, hashed while
+        writing) and MANIFEST.sha256. Memory is bounded by one payload chunk plus
+        metadata, so the bundle is not subject to EVIDENCE_BUNDLE_MAX_ZIP_BYTES.
+        """
+
+        def _iso(value):
+            return value.isoformat() if value else None
+
+        prepared = prepared or await self.prepare_evidence_bundle_stream(tenant_id, run_id)
+        run = prepared["run"]
+        archive = DeterministicZipStream()
+        manifest_entries = []
+
+        for name in sorted(prepared["files"]):
+            entry, data = archive.write_entry(name, prepared["files"][name])
+            manifest_entries.append({"file_name": name, "size_bytes": entry.size, "sha256": entry.sha256})
+            yield data
+
+        for source in prepared["sources"]:
+            name = self._source_payload_name(source)
+            if not name:
+                continue
+            entry = archive.open_entry(name, size_hint=source.get("bytes_length") or None)
+            async for chunk in self._iter_source_payload(tenant_id, source):
+                data = entry.write(chunk)
+                if data:
+                    yield data
+            yield entry.close()
+            manifest_entries.append(
+                {
+                    "file_name": name,
+                    "size_bytes": entry.size,
+                    "sha256": entry.sha256,
+                    "source_document_id": str(source["id"]),
+                    "content_hash": source.get("content_hash"),
+                }
+            )
+
+        manifest = {
+            "run_id": str(run_id),
+            "tenant_id": str(tenant_id),
+            "generated_at": _iso(getattr(run, "updated_at", None)) or _iso(getattr(run, "created_at", None)),
+            "sources_included": True,
+            "files": manifest_entries,
+        }
+        manifest_bytes = json.dumps(manifest, sort_keys=True, indent=2).encode("utf-8")
+        manifest_sha = hashlib.sha256(manifest_bytes).hexdigest()
+        _entry, data = archive.write_entry("MANIFEST.json", manifest_bytes)
+        yield data
+        _entry, data = archive.write_entry(
+            "MANIFEST.sha256",
+            f"SHA256(MANIFEST.json)={manifest_sha}\n".encode("utf-8"),
+        )
+        yield data
+        yield archive.close()
+
+    def _evidence_spool_root(self) -> Path:
+        root = Path(self.EVIDENCE_BUNDLE_SPOOL_ROOT)
+        resolved_root = root if root.is_absolute() else (Path.cwd() / root).resolve()
+        resolved_root.mkdir(parents=True, exist_ok=True)
+        return resolved_root
+
+    async def spool_evidence_bundle(self, tenant_id: str, run_id: UUID) -> Path:
+        """Write the streaming bundle to disk once per content fingerprint and return its path.
+
+        A completed spool is reused until the run's listings or payload sizes change,
+        so interrupted downloads can resume with Range requests against the same file.
+        """
+
+        prepared = await self.prepare_evidence_bundle_stream(tenant_id, run_id)
+        # File system calls run in worker threads so writing a large bundle does not block the event loop.
+        run_dir = await asyncio.to_thread(self._evidence_spool_root) / str(tenant_id) / str(run_id)
+        target = run_dir / f"{prepared['fingerprint']}.zip"
+        if await asyncio.to_thread(target.exists):
+            return target
+
+        await asyncio.to_thread(run_dir.mkdir, parents=True, exist_ok=True)
+        partial = run_dir / f"{prepared['fingerprint']}.{uuid.uuid4().hex}.part"
+        try:
+            handle = await asyncio.to_thread(partial.open, "wb")
+            try:
+                pending = bytearray()
+                async for data in self.stream_evidence_bundle(tenant_id, run_id, prepared=prepared):
+                    pending += data
+                    if len(pending) >= self.EVIDENCE_BUNDLE_STREAM_CHUNK_BYTES:
+                        await asyncio.to_thread(handle.write, bytes(pending))
+                        pending.clear()
+                await asyncio.to_thread(self._finish_spool_file, handle, bytes(pending))
+            finally:
+                await asyncio.to_thread(handle.close)
+            await asyncio.to_thread(os.replace, partial, target)
+        finally:
+            await asyncio.to_thread(partial.unlink, missing_ok=True)
+
+        await asyncio.to_thread(self._drop_stale_spools, run_dir, target)
+        return target
+
+    @staticmethod
+    def _finish_spool_file(handle, tail: bytes) -> None:
+        handle.write(tail)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+    @staticmethod
+    def _drop_stale_spools(run_dir: Path, keep: Path) -> None:
+        for stale in run_dir.glob("*.zip"):
+            if stale != keep:
+                stale.unlink(missing_ok=True)
+
     async def _company_evidence_map(self, tenant_id: str, prospect_ids: List[UUID]) -> Dict[UUID, List[UUID]]:
         if not prospect_ids:
             return {}
@@ -3335,11 +3544,6 @@ class CompanyResearchService:
             normalized = normalized[:2]
         return normalized or None
 
-    @staticmethod
-    def _canonical_json(data: Any) -> str:
-        """Return deterministic JSON string for hashing/idempotency."""
-        return json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
-
     @staticmethod
     def _normalize_seed_raw_text(raw_text: Optional[str]) -> str:
         """Normalize raw seed payload text for stable hashing."""
@@ -3426,8 +3630,8 @@ class CompanyResearchService:
             raise ValueError("invalid_purpose")
 
         parsed = LlmDiscoveryPayload(**payload)
-        canonical = self._canonical_json(parsed.canonical_dict())
-        content_hash = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        canonical = CanonicalPayload.of(parsed.canonical_dict())
+        content_hash = canonical.sha256
 
         existing_source = await self.repo.find_source_by_hash(tenant_id, run_id, content_hash)
         if existing_source and existing_source.source_type == "llm_json":
@@ -3460,7 +3664,7 @@ class CompanyResearchService:
                 source_type="llm_json",
                 title=title or "External LLM JSON",
                 mime_type="application/json",
-                content_text=canonical,
+                content_text=canonical.text,
                 content_hash=content_hash,
                 meta=source_meta,
             ),
@@ -3520,8 +3724,8 @@ class CompanyResearchService:
             "schema_version": "external_llm_discovery_v1",
         }
 
-        canonical_envelope = self._canonical_json(envelope)
-        content_hash = hashlib.sha256(canonical_envelope.encode("utf-8")).hexdigest()
+        canonical_envelope = CanonicalPayload.of(envelope)
+        content_hash = canonical_envelope.sha256
 
         existing_source = await self.repo.find_source_by_hash(tenant_id, run_id, content_hash)
         if existing_source and existing_source.source_type == "llm_json":
@@ -3565,7 +3769,7 @@ class CompanyResearchService:
                 source_type="llm_json",
                 title=f"External LLM discovery ({provider})",
                 mime_type="application/json",
-                content_text=canonical_envelope,
+                content_text=canonical_envelope.text,
                 content_hash=content_hash,
                 meta=source_meta,
             ),
@@ -3704,8 +3908,8 @@ class CompanyResearchService:
         envelope_source = None
         envelope_source_id = None
         if provider_result.envelope:
-            envelope_canonical = self._canonical_json(provider_result.envelope)
-            envelope_hash = hashlib.sha256(envelope_canonical.encode("utf-8")).hexdigest()
+            envelope_canonical = CanonicalPayload.of(provider_result.envelope)
+            envelope_hash = envelope_canonical.sha256
             existing_envelope = await self.repo.find_source_by_hash(tenant_id, run_id, envelope_hash)
             if existing_envelope:
                 envelope_source = existing_envelope
@@ -3717,7 +3921,7 @@ class CompanyResearchService:
                         source_type="discovery_provider_envelope",
                         title=f"Discovery envelope: {provider_key}",
                         mime_type="application/json",
-                        content_text=envelope_canonical,
+                        content_text=envelope_canonical.text,
                         content_hash=envelope_hash,
                         meta={
                             "kind": "discovery_provider_envelope",
@@ -3784,8 +3988,8 @@ class CompanyResearchService:
         raw_source_id = str(raw_source.id) if raw_source else None
 
         parsed = provider_result.payload
-        canonical_json = self._canonical_json(parsed.canonical_dict())
-        content_hash = hashlib.sha256(canonical_json.encode("utf-8")).hexdigest()
+        canonical = CanonicalPayload.of(parsed.canonical_dict())
+        content_hash = canonical.sha256
 
         if provider_key in {"google_cse", "google_search"} and cache_status == "miss":
             try:
@@ -3849,7 +4053,7 @@ class CompanyResearchService:
                 source_type=doc_source_type,
                 title=f"Discovery provider: {provider_key}",
                 mime_type="application/json",
-                content_text=canonical_json,
+                content_text=canonical.text,
                 content_hash=content_hash,
                 meta=source_meta,
             ),
@@ -4240,8 +4444,7 @@ class CompanyResearchService:
             try:
                 payload_dict = json.loads(src.content_text or "{}")
                 parsed = LlmDiscoveryPayload(**payload_dict)
-                canonical = self._canonical_json(parsed.canonical_dict())
-                content_hash = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+                content_hash = canonical_hash(parsed.canonical_dict())
                 summary = await self._ingest_discovery_payload(
                     tenant_id=tenant_id,
                     run_id=run_id,
@@ -4343,6 +4546,7 @@ class CompanyResearchService:
         # Track evidence we have already attached for a given company and discovery source to avoid
         # violating the unique constraint (tenant_id, company_prospect_id, source_document_id, source_type, source_name).
         evidence_seen: set[tuple[str, str, str]] = set()
+        name_matcher = CompanyNameDedupeService(self.db)
 
         for company in parsed_payload.companies:
             norm_name = self._normalize_company_name(company.name)
@@ -4350,6 +4554,10 @@ class CompanyResearchService:
                 continue
 
             existing = prospect_map.get(norm_name)
+            if not existing:
+                existing = await name_matcher.match_existing_prospect(tenant_id, run_id, company.name)
+                if existing:
+                    prospect_map[norm_name] = existing
             if existing:
                 stats["companies_existing"] += 1
                 existing.discovered_by = self._merge_discovered_by(existing.discovered_by, discovery_label)
@@ -4533,13 +4741,13 @@ class CompanyResearchService:
     ) -> dict:
         """Ingest executive discovery payload with gating and idempotency."""
         parsed = ExecutiveDiscoveryPayload(**payload)
-        response_canonical = self._canonical_json(parsed.canonical_dict())
+        response_canonical = canonical_dumps(parsed.canonical_dict())
 
         req_payload = request_payload or payload
         if isinstance(req_payload, ExecutiveDiscoveryPayload):
-            request_canonical = self._canonical_json(req_payload.canonical_dict())
+            request_canonical = canonical_dumps(req_payload.canonical_dict())
         else:
-            request_canonical = self._canonical_json(req_payload)
+            request_canonical = canonical_dumps(req_payload)
 
         response_hash = hashlib.sha256(f"{engine}:response:{response_canonical}".encode("utf-8")).hexdigest()
         request_hash = hashlib.sha256(f"{engine}:request:{request_canonical}".encode("utf-8")).hexdigest()
@@ -5143,8 +5351,7 @@ class CompanyResearchService:
         }
 
     def _hash_job_params(self, params: dict) -> str:
-        normalized = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
-        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        return canonical_hash(params)
 
     async def enqueue_acquire_extract_job(
         self,
@@ -5302,6 +5509,8 @@ class CompanyResearchService:
             )
             await self.db.commit()
             return job
+        except JobLeaseLostError:
+            raise
         except Exception as exc:  # noqa: BLE001
             error_payload = {"message": str(exc), "type": type(exc).__name__}
             await self.mark_job_failed(
@@ -5325,10 +5534,230 @@ class CompanyResearchService:
             await self.db.commit()
             raise
 
+    async def enqueue_contact_enrichment_job(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        executive_ids: List[UUID],
+        request: ContactEnrichmentRequest,
+    ) -> dict:
+        run = await self.get_research_run(tenant_id, run_id)
+        if not run:
+            raise ValueError("run_not_found")
+
+        ordered_ids = list(dict.fromkeys(executive_ids))
+        known = await self.repo.list_executive_ids_in_run(tenant_id, run_id, ordered_ids)
+        missing = [eid for eid in ordered_ids if eid not in known]
+        if missing:
+            raise ValueError("executives_not_in_run", missing)
+
+        params = {
+            "executive_ids": [str(eid) for eid in ordered_ids],
+            **request.model_dump(mode="json"),
+        }
+        params_hash = self._hash_job_params(params)
+        job_type = JOB_TYPE_EXEC_CONTACT_ENRICHMENT
+
+        reused_reason: Optional[str] = None
+        job = await self.repo.get_active_job_by_params(tenant_id, run_id, job_type, params_hash)
+        if job:
+            reused_reason = "inflight"
+        else:
+            job = await self.repo.enqueue_parametrized_job(
+                tenant_id=tenant_id,
+                run_id=run_id,
+                job_type=job_type,
+                params_json=params,
+                params_hash=params_hash,
+                max_attempts=3,
+            )
+
+        await self.repo.create_research_event(
+            tenant_id=tenant_id,
+            data=RunResearchEventCreate(
+                company_research_run_id=run_id,
+                event_type="contact_enrichment_enqueued",
+                status="ok",
+                input_json={
+                    "job_id": str(job.id),
+                    "executive_count": len(ordered_ids),
+                    "providers": request.providers,
+                    "params_hash": params_hash,
+                },
+                output_json={"job_status": job.status, "reused_reason": reused_reason},
+                error_message=None,
+            ),
+        )
+        await self.db.flush()
+
+        return {
+            "job": job,
+            "params_hash": params_hash,
+            "reused_reason": reused_reason,
+            "executive_count": len(ordered_ids),
+        }
+
+    async def execute_contact_enrichment_job(
+        self,
+        tenant_id: str,
+        job_id: UUID,
+        *,
+        worker_id: str = "contact_enrichment_inline",
+    ) -> CompanyResearchJob:
+        """Enrich the job's executives in batches, publishing progress after each batch.
+
+        Each batch commits its enrichments and the updated ``progress_json`` together,
+        so partial results are pollable and a retried job skips executives already
+        enriched within the TTL window.
+        """
+        job = await self.get_job_for_tenant(tenant_id, job_id)
+        if not job or job.job_type != JOB_TYPE_EXEC_CONTACT_ENRICHMENT:
+            raise ValueError("job_not_found")
+
+        params = job.params_json or {}
+        executive_ids = [UUID(str(eid)) for eid in params.get("executive_ids") or []]
+        request = ContactEnrichmentRequest(**{k: v for k, v in params.items() if k != "executive_ids"})
+
+        job = await self.mark_job_running(job.id, worker_id)
+        if not job:
+            raise ValueError("job_not_found")
+        await self.repo.create_research_event(
+            tenant_id=tenant_id,
+            data=RunResearchEventCreate(
+                company_research_run_id=job.run_id,
+                event_type="contact_enrichment_started",
+                status="ok",
+                input_json={"job_id": str(job.id), "executive_count": len(executive_ids)},
+                output_json=None,
+                error_message=None,
+            ),
+        )
+        await self.db.commit()
+
+        run_id = job.run_id
+        progress: dict[str, Any] = {
+            "total": len(executive_ids),
+            "processed": 0,
+            "counts": {},
+            "items": [],
+        }
+        batch_size = max(1, settings.BULK_ENRICH_JOB_BATCH_SIZE)
+        enrichment_service = ContactEnrichmentService(self.db)
+
+        try:
+            for start in range(0, len(executive_ids), batch_size):
+                batch = executive_ids[start : start + batch_size]
+                batch_results = await enrichment_service.enrich_executives(tenant_id, run_id, batch, request)
+                for exec_id, results in batch_results:
+                    if results is None:
+                        progress["counts"]["not_found"] = progress["counts"].get("not_found", 0) + 1
+                        progress["items"].append({"executive_id": str(exec_id), "status": "not_found", "results": []})
+                        continue
+                    for result in results:
+                        progress["counts"][result.status] = progress["counts"].get(result.status, 0) + 1
+                    progress["items"].append(
+                        {
+                            "executive_id": str(exec_id),
+                            "status": "done",
+                            "results": [result.model_dump(mode="json") for result in results],
+                        }
+                    )
+                progress["processed"] = min(start + len(batch), len(executive_ids))
+                # Reassign a fresh dict so the JSONB column is flagged dirty.
+                await self.repo.update_job_progress(job.id, dict(progress))
+                await self.db.commit()
+
+            job = await self.mark_job_succeeded(job.id, progress_json=dict(progress))
+            await self.repo.create_research_event(
+                tenant_id=tenant_id,
+                data=RunResearchEventCreate(
+                    company_research_run_id=job.run_id,
+                    event_type="contact_enrichment_finished",
+                    status="ok",
+                    input_json={"job_id": str(job.id)},
+                    output_json={"processed": progress["processed"], "counts": progress["counts"]},
+                    error_message=None,
+                ),
+            )
+            await self.db.commit()
+            return job
+        except JobLeaseLostError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            await self.db.rollback()
+            error_payload = {"message": str(exc), "type": type(exc).__name__}
+            await self.mark_job_failed(
+                job_id=job_id,
+                last_error=str(exc),
+                backoff_seconds=30,
+                error_json=error_payload,
+                progress_json=dict(progress),
+            )
+            await self.repo.create_research_event(
+                tenant_id=tenant_id,
+                data=RunResearchEventCreate(
+                    company_research_run_id=run_id,
+                    event_type="contact_enrichment_finished",
+                    status="failed",
+                    input_json={"job_id": str(job_id)},
+                    output_json={"processed": progress["processed"], "counts": progress["counts"]},
+                    error_message=str(exc),
+                ),
+            )
+            await self.db.commit()
+            raise
+
     # ========================================================================
     # Entity Resolution (Stage 6.1)
     # ========================================================================
 
+    async def _plan_run_resolution(self, tenant_id: str, run_id: UUID) -> Dict[str, Any]:
+        """Plan all three Stage 6 steps from one snapshot, computing the decisions concurrently."""
+        snapshot = await load_run_snapshot(self.repo, tenant_id, run_id)
+        resolvers = {
+            "entity_resolution": EntityResolutionService(self.db),
+            "canonical_people_resolution": CanonicalPeopleService(self.db),
+            "canonical_company_resolution": CanonicalCompanyService(self.db),
+        }
+        # The session serialises the (few, batched) state reads; planning is pure and runs in threads.
+        states = {step_key: await resolver.load_state(snapshot) for step_key, resolver in resolvers.items()}
+        plans = await asyncio.gather(
+            *(asyncio.to_thread(resolver.plan, snapshot, states[step_key]) for step_key, resolver in resolvers.items())
+        )
+        return dict(zip(resolvers, plans))
+
+    async def _take_resolution_plan(self, tenant_id: str, run_id: UUID, step_key: str):
+        """This step's plan, planning all three steps when none is pending for it.
+
+        The resolvers do not read each other's output, so the plans made when
+        entity_resolution runs stay valid for the two canonical steps while they
+        follow it back to back in the same worker pass. The worker drops them
+        otherwise (release_resolution_plans), so a retried step or a new job
+        re-plans from a fresh snapshot.
+        """
+        key = (str(tenant_id), run_id)
+        plans = self._resolution_plans.get(key)
+        if not plans or next(iter(plans)) != step_key:
+            planned = await self._plan_run_resolution(tenant_id, run_id)
+            order = list(planned)
+            # Keep this step's plan and those of the steps after it, in step order.
+            plans = self._resolution_plans[key] = {k: planned[k] for k in order[order.index(step_key):]}
+        plan = plans.pop(step_key)
+        if not plans:
+            del self._resolution_plans[key]
+        return plan
+
+    def release_resolution_plans(self, next_step_key: Optional[str] = None) -> None:
+        """Drop pending resolution plans, except those left for ``next_step_key``.
+
+        The worker calls this before each step and when a pass ends (success,
+        failure, backoff or a lost lease), so an unwritten plan never outlives
+        the pass or the step order it was made for.
+        """
+        for key, plans in list(self._resolution_plans.items()):
+            if next_step_key is None or next(iter(plans)) != next_step_key:
+                del self._resolution_plans[key]
+
     async def run_entity_resolution_step(
         self,
         tenant_id: str,
@@ -5351,10 +5780,8 @@ class CompanyResearchService:
         )
 
         try:
-            summary = await resolver.resolve_run_entities(
-                tenant_id=tenant_id,
-                run_id=run_id,
-            )
+            plan = await self._take_resolution_plan(tenant_id, run_id, "entity_resolution")
+            summary = await resolver.apply_plan(plan)
         except Exception as exc:  # noqa: BLE001
             await self.repo.create_research_event(
                 tenant_id=tenant_id,
@@ -5437,6 +5864,46 @@ class CompanyResearchService:
         resolver = EntityResolutionService(self.db)
         return await resolver.list_entity_merge_links(tenant_id, run_id, entity_type=entity_type)
 
+    # ========================================================================
+    # Fuzzy Company-Name Dedupe
+    # ========================================================================
+
+    async def list_probable_duplicate_prospects(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        threshold: Optional[float] = None,
+    ) -> dict:
+        """Pairs of run prospects whose names probably refer to the same company."""
+        return await CompanyNameDedupeService(self.db).find_probable_duplicates(tenant_id, run_id, threshold=threshold)
+
+    async def merge_probable_duplicate_prospects(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        threshold: Optional[float] = None,
+        dry_run: bool = False,
+    ) -> dict:
+        """Mark fuzzy name duplicates above the auto-merge threshold and record company merge links."""
+        summary = await CompanyNameDedupeService(self.db).merge_probable_duplicates(
+            tenant_id,
+            run_id,
+            threshold=threshold,
+            dry_run=dry_run,
+        )
+        if not dry_run:
+            await self.repo.create_research_event(
+                tenant_id=tenant_id,
+                data=RunResearchEventCreate(
+                    company_research_run_id=run_id,
+                    event_type="prospect_name_merge",
+                    status="ok",
+                    input_json={"threshold": summary["threshold"]},
+                    output_json=summary,
+                ),
+            )
+        return summary
+
     # ========================================================================
     # Canonical People Resolution (Stage 6.2)
     # ========================================================================
@@ -5449,7 +5916,8 @@ class CompanyResearchService:
         """Resolve tenant-wide canonical people with evidence-first linking."""
 
         resolver = CanonicalPeopleService(self.db)
-        summary = await resolver.resolve_run_people(tenant_id=tenant_id, run_id=run_id)
+        plan = await self._take_resolution_plan(tenant_id, run_id, "canonical_people_resolution")
+        summary = await resolver.apply_plan(plan)
 
         enriched_summary = {
             "stage": "6.2_canonical_people",
@@ -5516,7 +5984,8 @@ class CompanyResearchService:
         """Resolve tenant-wide canonical companies with domain-first deterministic linking."""
 
         resolver = CanonicalCompanyService(self.db)
-        summary = await resolver.resolve_run_companies(tenant_id=tenant_id, run_id=run_id)
+        plan = await self._take_resolution_plan(tenant_id, run_id, "canonical_company_resolution")
+        summary = await resolver.apply_plan(plan)
 
         enriched_summary = {
             "stage": "6.3_canonical_companies",
@@ -5571,6 +6040,39 @@ class CompanyResearchService:
             company_entity_id=company_entity_id,
         )
 
+    # ========================================================================
+    # Company Enrichment (Stage 7.2, run-wide)
+    # ========================================================================
+
+    async def run_company_enrichment_step(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+    ) -> dict:
+        """Extract rule-based enrichment for every canonical company / evidence source pair of the run."""
+
+        extractor = CompanyEnrichmentExtractionService(self.db)
+        summary = await extractor.extract_run_enrichment(tenant_id=tenant_id, run_id=run_id)
+
+        enriched_summary = {
+            "stage": "7.2_company_enrichment",
+            "entity_type": "company",
+            **summary,
+        }
+
+        await self.repo.create_research_event(
+            tenant_id=tenant_id,
+            data=RunResearchEventCreate(
+                company_research_run_id=run_id,
+                event_type="company_enrichment",
+                status="ok",
+                input_json={"stage": "7.2_company_enrichment", "entity_type": "company"},
+                output_json=enriched_summary,
+            ),
+        )
+
+        return enriched_summary
+
     # ========================================================================
     # List Ingestion
     # ========================================================================
@@ -5683,8 +6185,14 @@ class CompanyResearchService:
             )
             await self.db.execute(stmt)
 
+        name_matcher = CompanyNameDedupeService(self.db)
         for norm_name, entries in entries_by_norm.items():
             prospect = existing_map.get(norm_name)
+            if not prospect:
+                # "BankMuscat" after "Bank Muscat SAOG": same company under a different normalized name.
+                prospect = await name_matcher.match_existing_prospect(tenant_id, run_id, entries[0]["raw"])
+                if prospect:
+                    existing_map[norm_name] = prospect
             if prospect:
                 stats["existing"] += 1
             else:
@@ -7,37 +7,48 @@ from __future__ import annotations
 import hashlib
 import io
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from bs4 import BeautifulSoup
-from pypdf import PdfReader
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.repositories.company_research_repo import CompanyResearchRepository
 from app.schemas.company_research import ResearchEventCreate
+from app.utils.html_text_stream import HtmlTextStream
+from app.utils.minhash import LshIndex, estimate_jaccard, lsh_band_keys, minhash_signature
 from app.utils.time import utc_now
 
 
 class CompanySourceExtractionService:
     """Extracts text and quality signals from research source documents."""
 
-    EXTRACTION_VERSION = "5.2.0"
+    EXTRACTION_VERSION = "5.3.0"
     MIN_WORDS_HTML = 150
     MIN_WORDS_PDF = 50
     EXTREME_MIN_WORDS = 5
     PAYWALL_KEYWORDS = ["subscribe", "sign in", "log in", "access denied", "registration", "paywall"]
     ERROR_KEYWORDS = ["page not found", "404", "service unavailable", "temporarily unavailable"]
     TEMPLATE_SIGNATURE_BYTES = 2000
+    HTML_PARSE_CHUNK_BYTES = 64 * 1024
     SIGNATURE_TOKEN_COUNT = 500
     UNIQUE_TOKEN_RATIO_MIN = 0.12
     ALPHA_RATIO_MIN = 0.55
+    # Near-duplicate detection: 64 permutations in 16 bands of 4 rows puts the LSH
+    # candidate threshold near Jaccard 0.5; candidates are confirmed at 0.8.
+    MINHASH_NUM_PERM = 64
+    MINHASH_SHINGLE_SIZE = 5
+    LSH_BANDS = 16
+    NEAR_DUPLICATE_JACCARD = 0.8
 
     def __init__(self, db: AsyncSession):
         self.db = db
         self.repo = CompanyResearchRepository(db)
 
     async def extract_sources(self, tenant_id: str, run_id) -> dict:
-        sources = await self.repo.get_extractable_sources(tenant_id, run_id)
+        # Only sources whose content changed since their last extraction (or that
+        # were extracted by an older version); see list_sources_pending_extraction.
+        sources = await self.repo.list_sources_pending_extraction(tenant_id, run_id, self.EXTRACTION_VERSION)
+        read_seqs = [(source.id, source.content_seq) for source in sources]
+        stamp = await self.repo.next_source_change_seq() if sources else None
         summary = {
             "count": len(sources),
             "processed": 0,
@@ -123,6 +134,9 @@ class CompanySourceExtractionService:
                 "is_pdf_bytes_missing": False,
                 "is_unsupported_type": False,
                 "is_boilerplate_dominant": False,
+                "is_near_duplicate": False,
+                "near_duplicate_similarity": None,
+                "near_duplicate_of_source_id": None,
                 "duplicate_group_key": None,
                 "duplicate_primary_source_id": None,
             }
@@ -184,6 +198,11 @@ class CompanySourceExtractionService:
             token_prefix = " ".join(tokens[: self.SIGNATURE_TOKEN_COUNT])
             signature_tokens = hashlib.sha256(token_prefix.encode("utf-8")).hexdigest()
             template_signature = signature_prefix_2k
+            minhash = minhash_signature(
+                tokens,
+                num_perm=self.MINHASH_NUM_PERM,
+                shingle_size=self.MINHASH_SHINGLE_SIZE,
+            )
 
             extraction_meta = {
                 "version": self.EXTRACTION_VERSION,
@@ -203,6 +222,8 @@ class CompanySourceExtractionService:
                 "reason_codes": sorted(reason_codes),
                 "mime_type_used": mime or (source.mime_type or "unknown"),
                 "template_signature": template_signature,
+                "minhash": minhash,
+                "lsh_bands": lsh_band_keys(minhash, self.LSH_BANDS),
                 "thresholds": {
                     "min_words": min_words,
                     "min_words_html": self.MIN_WORDS_HTML,
@@ -212,6 +233,10 @@ class CompanySourceExtractionService:
                     "unique_token_ratio_min": self.UNIQUE_TOKEN_RATIO_MIN,
                     "alpha_ratio_min": self.ALPHA_RATIO_MIN,
                     "extreme_min_words": self.EXTREME_MIN_WORDS,
+                    "minhash_num_perm": self.MINHASH_NUM_PERM,
+                    "minhash_shingle_size": self.MINHASH_SHINGLE_SIZE,
+                    "lsh_bands": self.LSH_BANDS,
+                    "near_duplicate_jaccard": self.NEAR_DUPLICATE_JACCARD,
                 },
                 "extracted_at": extraction_timestamp.isoformat(),
             }
@@ -257,21 +282,51 @@ class CompanySourceExtractionService:
                 "word_count": word_count,
             })
 
+        await self.repo.stamp_sources_consumed("extracted_seq", stamp, ("content_seq",), read_seqs)
         await self.db.commit()
         return summary
 
+    @staticmethod
+    def _template_signature(extraction_meta: Dict[str, Any]) -> Optional[str]:
+        return extraction_meta.get("signature_prefix_2k") or extraction_meta.get("signature_exact") or extraction_meta.get("text_hash")
+
     async def classify_sources(self, tenant_id: str, run_id) -> dict:
-        sources = await self.repo.list_source_documents_for_run(tenant_id, run_id)
+        # Classify only sources extracted since their last classification. Their
+        # clusters are completed with the run's other members that share a template
+        # signature or an LSH band (index lookup, not a scan of the run).
+        changed = await self.repo.list_sources_pending_classification(tenant_id, run_id)
+        read_seqs = [(source.id, source.extracted_seq) for source in changed]
+        stamp = await self.repo.next_source_change_seq() if changed else None
+        signatures = set()
+        band_keys = set()
+        for source in changed:
+            meta = source.meta if isinstance(source.meta, dict) else {}
+            extraction_meta = meta.get("extraction") or {}
+            sig = self._template_signature(extraction_meta)
+            if sig:
+                signatures.add(sig)
+            band_keys.update(extraction_meta.get("lsh_bands") or [])
+        members = await self.repo.list_duplicate_candidates(
+            tenant_id,
+            run_id,
+            sorted(signatures),
+            band_keys=sorted(band_keys),
+            exclude_ids=[source.id for source in changed],
+        )
+        sources = changed + members
+
         summary = {
             "count": len(sources),
+            "changed": len(changed),
             "processed": 0,
             "skipped": 0,
             "duplicates": 0,
+            "near_duplicates": 0,
             "updated": 0,
             "sources": [],
         }
 
-        groups: dict[str, list[dict[str, Any]]] = {}
+        candidates: dict[str, dict[str, Any]] = {}
         for source in sources:
             meta = dict(source.meta or {}) if isinstance(source.meta, dict) else {}
             extraction_meta: Dict[str, Any] = meta.get("extraction") or {}
@@ -281,25 +336,27 @@ class CompanySourceExtractionService:
             if (extraction_meta.get("word_count") or 0) == 0:
                 summary["skipped"] += 1
                 continue
-            sig = extraction_meta.get("signature_prefix_2k") or extraction_meta.get("signature_exact") or extraction_meta.get("text_hash")
+            sig = self._template_signature(extraction_meta)
             if not sig:
                 summary["skipped"] += 1
                 continue
-            groups.setdefault(sig, []).append({
+            candidates[str(source.id)] = {
                 "source": source,
                 "meta": meta,
                 "extraction": extraction_meta,
+                "signature": sig,
+                "minhash": extraction_meta.get("minhash") or [],
                 "word_count": extraction_meta.get("word_count") or 0,
                 "id_str": str(source.id),
-            })
-
-        for group_sig, candidates in groups.items():
-            if len(candidates) < 2:
-                continue
+            }
 
-            candidates_sorted = sorted(candidates, key=lambda c: (-c["word_count"], c["id_str"]))
+        clusters, matches = self._duplicate_clusters(candidates)
+        for cluster in clusters:
+            candidates_sorted = sorted(cluster, key=lambda c: (-c["word_count"], c["id_str"]))
             primary = candidates_sorted[0]
             primary_id = primary["id_str"]
+            group_sig = primary["signature"]
+            matched_via = self._matched_members(primary_id, matches)
 
             for idx, candidate in enumerate(candidates_sorted):
                 src = candidate["source"]
@@ -307,10 +364,23 @@ class CompanySourceExtractionService:
                 extraction_meta = candidate["extraction"]
                 quality_flags = dict(meta.get("quality_flags") or {})
                 reason_codes = set(extraction_meta.get("reason_codes") or [])
+                near_duplicate = idx != 0 and candidate["signature"] != group_sig
 
                 if idx == 0:
                     quality_flags.setdefault("duplicate_group_key", group_sig)
                     quality_flags.setdefault("duplicate_primary_source_id", primary_id)
+                elif near_duplicate:
+                    # Transitive members are scored against the member they matched, not the primary.
+                    matched = candidates[matched_via[candidate["id_str"]]]
+                    quality_flags["is_near_duplicate"] = True
+                    quality_flags["near_duplicate_similarity"] = round(
+                        estimate_jaccard(matched["minhash"], candidate["minhash"]), 4
+                    )
+                    quality_flags["near_duplicate_of_source_id"] = matched["id_str"]
+                    quality_flags["duplicate_group_key"] = group_sig
+                    quality_flags["duplicate_primary_source_id"] = primary_id
+                    reason_codes.add("FLAG_NEAR_DUPLICATE")
+                    summary["near_duplicates"] += 1
                 else:
                     quality_flags["is_duplicate_template"] = True
                     quality_flags["duplicate_group_key"] = group_sig
@@ -330,13 +400,74 @@ class CompanySourceExtractionService:
                     "id": str(src.id),
                     "decision": decision,
                     "duplicate": idx != 0,
+                    "near_duplicate": near_duplicate,
                     "group": group_sig,
                     "primary": primary_id,
                 })
 
+        await self.repo.stamp_sources_consumed("classified_seq", stamp, ("extracted_seq",), read_seqs)
         await self.db.commit()
         return summary
 
+    def _duplicate_clusters(
+        self, candidates: Dict[str, Dict[str, Any]]
+    ) -> Tuple[List[List[Dict[str, Any]]], Dict[str, Set[str]]]:
+        """Group candidates sharing a template signature or a MinHash similarity above the threshold.
+
+        Also returns each candidate's direct matches, so a member joined through
+        another member can be attributed to the pair that actually matched.
+        """
+        parent = {key: key for key in candidates}
+        matches: Dict[str, Set[str]] = {key: set() for key in candidates}
+
+        def find(key: str) -> str:
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        def union(left: str, right: str) -> None:
+            root_left, root_right = find(left), find(right)
+            if root_left != root_right:
+                parent[max(root_left, root_right)] = min(root_left, root_right)
+
+        by_signature: Dict[str, str] = {}
+        index = LshIndex(self.LSH_BANDS)
+        for key, candidate in candidates.items():
+            first = by_signature.setdefault(candidate["signature"], key)
+            if first != key:
+                union(first, key)
+                matches[first].add(key)
+                matches[key].add(first)
+            index.add(key, candidate["minhash"], candidate["extraction"].get("lsh_bands"))
+
+        for key in candidates:
+            for other, _similarity in index.near_duplicates(key, self.NEAR_DUPLICATE_JACCARD):
+                union(key, other)
+                matches[key].add(other)
+                matches[other].add(key)
+
+        clusters: Dict[str, List[Dict[str, Any]]] = {}
+        for key, candidate in candidates.items():
+            clusters.setdefault(find(key), []).append(candidate)
+        return [cluster for _, cluster in sorted(clusters.items()) if len(cluster) > 1], matches
+
+    @staticmethod
+    def _matched_members(primary_id: str, matches: Dict[str, Set[str]]) -> Dict[str, str]:
+        """Map each member of the primary's cluster to the member it matched on the shortest path from the primary."""
+        matched_via: Dict[str, str] = {}
+        frontier = [primary_id]
+        seen = {primary_id}
+        while frontier:
+            next_frontier = []
+            for key in frontier:
+                for other in sorted(matches[key] - seen):
+                    seen.add(other)
+                    matched_via[other] = key
+                    next_frontier.append(other)
+            frontier = next_frontier
+        return matched_via
+
     def _tokenize(self, text: str) -> List[str]:
         return re.findall(r"\b\w+\b", (text or "").lower())
 
@@ -367,32 +498,18 @@ class CompanySourceExtractionService:
     def _extract_html(self, raw_bytes: bytes) -> tuple[str, Optional[str]]:
         if not raw_bytes:
             return "", None
-        try:
-            html = raw_bytes.decode("utf-8", errors="replace")
-        except Exception:
-            html = raw_bytes.decode("latin-1", errors="replace")
-
-        soup = BeautifulSoup(html, "html.parser")
-        for tag in soup.find_all(["script", "style", "noscript"]):
-            tag.decompose()
-
-        title: Optional[str] = None
-        og_title = soup.find("meta", attrs={"property": "og:title"}) or soup.find("meta", attrs={"name": "og:title"})
-        if og_title and og_title.get("content"):
-            title = og_title.get("content")
-        elif soup.title and soup.title.string:
-            title = soup.title.string
-        else:
-            h1 = soup.find("h1")
-            if h1 and h1.get_text(strip=True):
-                title = h1.get_text(strip=True)
-
-        text = soup.get_text(" ", strip=True)
-        return text, title
+        stream = HtmlTextStream()
+        view = memoryview(raw_bytes)
+        for start in range(0, len(view), self.HTML_PARSE_CHUNK_BYTES):
+            stream.feed(view[start : start + self.HTML_PARSE_CHUNK_BYTES])
+        stream.close()
+        return stream.text, stream.title
 
     def _extract_pdf(self, raw_bytes: bytes) -> tuple[str, Optional[int], bool]:
         if not raw_bytes:
             return "", None, True
+        from pypdf import PdfReader  # deferred: heavy import, only needed when parsing
+
         try:
             reader = PdfReader(io.BytesIO(raw_bytes))
         except Exception:
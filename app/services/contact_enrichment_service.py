@@ -2,13 +2,17 @@
 Contact enrichment orchestration service.
 """
 
+import asyncio
 import re
+import time
+import weakref
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.activity_log import ActivityLog
 from app.models.candidate import Candidate
 from app.repositories.candidate_repository import CandidateRepository
@@ -22,12 +26,20 @@ from app.schemas.source_document import SourceDocumentCreate as EventSourceDocum
 from app.schemas.company_research import SourceDocumentCreate as ResearchSourceDocumentCreate
 from app.schemas.ai_enrichment import AIEnrichmentCreate
 from app.schemas.contact_enrichment import ContactEnrichmentRequest, ProviderEnrichmentResult
-from app.utils.canonical_json import canonical_dumps, canonical_hash
+from app.utils.canonical_json import CanonicalPayload
 from app.services.contact_enrichment import MockLushaAdapter, MockSignalHireAdapter
 from app.models.company_research import ExecutiveProspectEvidence
 
 PURPOSE_CONTACT_ENRICHMENT = "candidate_contact_enrichment"
 PURPOSE_EXEC_CONTACT_ENRICHMENT = "executive_contact_enrichment"
+JOB_TYPE_EXEC_CONTACT_ENRICHMENT = "exec_contact_enrichment"
+
+# Provider limiters are process-wide so concurrent jobs and requests share one
+# budget per provider. asyncio primitives belong to a single loop, so they are
+# held per running loop (one per worker process in practice).
+_PROVIDER_LIMITERS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Dict[str, Any]]]" = (
+    weakref.WeakKeyDictionary()
+)
 
 
 class ContactEnrichmentService:
@@ -104,8 +116,8 @@ class ContactEnrichmentService:
                 "candidate": candidate_context,
                 "payload": raw_payload,
             }
-            content_hash = canonical_hash(payload_with_context)
-            canonical_text = canonical_dumps(payload_with_context)
+            canonical = CanonicalPayload.of(payload_with_context)
+            content_hash = canonical.sha256
 
             existing = await self.ai_enrichment_repo.get_by_hash(
                 tenant_uuid,
@@ -148,7 +160,7 @@ class ContactEnrichmentService:
                     document_type="provider_json",
                     title=f"{normalized_provider.title()} contact data",
                     url=raw_payload.get("source_url") if isinstance(raw_payload, dict) else None,
-                    text_content=canonical_text,
+                    text_content=canonical.text,
                     doc_metadata={
                         "provider": normalized_provider,
                         "mode": request.mode,
@@ -331,149 +343,244 @@ class ContactEnrichmentService:
         if not executive:
             return None
 
-        tenant_uuid = UUID(str(tenant_id))
-        exec_context = self._executive_context(executive)
-        provider_results: List[ProviderEnrichmentResult] = []
+        results = await self._enrich_loaded_executives(tenant_id, [executive], request)
+        await self.db.commit()
+        return results[executive.id]
 
-        for provider_name in request.providers:
-            normalized_provider = provider_name.lower()
-            adapter = self.adapters.get(normalized_provider)
-            if not adapter:
-                provider_results.append(
-                    ProviderEnrichmentResult(
-                        provider=normalized_provider,
-                        status="error",
-                        message="Unsupported provider",
-                    )
-                )
-                continue
+    async def enrich_executives(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        executive_ids: List[UUID],
+        request: ContactEnrichmentRequest,
+    ) -> List[Tuple[UUID, Optional[List[ProviderEnrichmentResult]]]]:
+        """Enrich a batch of run executives concurrently without committing.
+
+        The caller commits, so the enrichments land in the same transaction as
+        whatever progress it records for the batch. Returns ``(executive_id, results)`` in input order (duplicates dropped);
+        ``results`` is None for ids that are not executives of the run.
+        """
+        ordered_ids = list(dict.fromkeys(executive_ids))
+        executives = await self.company_repo.list_executive_prospects_by_ids(tenant_id, run_id, ordered_ids)
+        results = await self._enrich_loaded_executives(tenant_id, executives, request)
+        return [(exec_id, results.get(exec_id)) for exec_id in ordered_ids]
+
+    async def _enrich_loaded_executives(
+        self,
+        tenant_id: str,
+        executives: List[Any],
+        request: ContactEnrichmentRequest,
+    ) -> Dict[UUID, List[ProviderEnrichmentResult]]:
+        """Run every (executive, provider) lookup for a batch.
 
-            recent = await self.ai_enrichment_repo.get_latest_for_provider(
+        The TTL recency check and the payload idempotency check are one query each
+        for the whole batch. Provider calls fan out concurrently under each
+        provider's limiter; database writes then happen serially on the session.
+        """
+        tenant_uuid = UUID(str(tenant_id))
+        providers = list(dict.fromkeys(name.lower() for name in request.providers))
+        supported = [name for name in providers if name in self.adapters]
+        results: Dict[UUID, Dict[str, ProviderEnrichmentResult]] = {executive.id: {} for executive in executives}
+
+        recent_by_key: Dict[Tuple[str, UUID], Any] = {}
+        if supported and not request.force and request.ttl_minutes > 0:
+            recent_by_key = await self.ai_enrichment_repo.list_latest_for_providers(
                 tenant_uuid,
-                normalized_provider,
+                supported,
                 PURPOSE_EXEC_CONTACT_ENRICHMENT,
-                executive_id,
+                [executive.id for executive in executives],
                 "EXECUTIVE",
             )
-            if recent and not request.force and request.ttl_minutes > 0:
-                deadline = recent.created_at + timedelta(minutes=request.ttl_minutes)
-                now = datetime.now(timezone.utc)
-                if deadline > now:
-                    recent_source = self._source_document_from_enrichment(recent)
-                    provider_results.append(
-                        ProviderEnrichmentResult(
-                            provider=normalized_provider,
-                            status="skipped",
-                            enrichment_id=recent.id,
-                            message="TTL window not expired",
-                            source_document_id=recent_source,
-                        )
+
+        now = datetime.now(timezone.utc)
+        lookups: List[Tuple[Any, Dict[str, Any], str]] = []
+        for executive in executives:
+            exec_context = self._executive_context(executive)
+            for provider in providers:
+                if provider not in self.adapters:
+                    results[executive.id][provider] = ProviderEnrichmentResult(
+                        provider=provider,
+                        status="error",
+                        message="Unsupported provider",
                     )
                     continue
 
-            raw_payload = await adapter.fetch_contacts(exec_context)
+                recent = recent_by_key.get((provider, executive.id))
+                if recent and recent.created_at + timedelta(minutes=request.ttl_minutes) > now:
+                    results[executive.id][provider] = ProviderEnrichmentResult(
+                        provider=provider,
+                        status="skipped",
+                        enrichment_id=recent.id,
+                        message="TTL window not expired",
+                        source_document_id=self._source_document_from_enrichment(recent),
+                    )
+                    continue
+                lookups.append((executive, exec_context, provider))
+
+        payloads = await asyncio.gather(
+            *(self._fetch_contacts_limited(provider, exec_context) for _, exec_context, provider in lookups),
+            return_exceptions=True,
+        )
+
+        fetched: List[Tuple[Any, Dict[str, Any], str, Any, CanonicalPayload]] = []
+        for (executive, exec_context, provider), raw_payload in zip(lookups, payloads):
+            if isinstance(raw_payload, Exception):
+                results[executive.id][provider] = ProviderEnrichmentResult(
+                    provider=provider,
+                    status="error",
+                    message=f"Provider call failed: {raw_payload}",
+                )
+                continue
             payload_with_context = {
-                "provider": normalized_provider,
+                "provider": provider,
                 "mode": request.mode,
                 "executive": exec_context,
                 "payload": raw_payload,
             }
-            content_hash = canonical_hash(payload_with_context)
-            canonical_text = canonical_dumps(payload_with_context)
+            fetched.append((executive, exec_context, provider, raw_payload, CanonicalPayload.of(payload_with_context)))
 
-            existing = await self.ai_enrichment_repo.get_by_hash(
+        existing_by_key: Dict[Tuple[str, str, UUID], Any] = {}
+        if fetched and not request.force:
+            existing_by_key = await self.ai_enrichment_repo.list_by_hashes(
                 tenant_uuid,
-                normalized_provider,
                 PURPOSE_EXEC_CONTACT_ENRICHMENT,
-                content_hash,
-                executive_id,
                 "EXECUTIVE",
+                [(provider, canonical.sha256, executive.id) for executive, _, provider, _, canonical in fetched],
             )
-            if existing and not request.force:
-                existing_source = self._source_document_from_enrichment(existing)
-                provider_results.append(
-                    ProviderEnrichmentResult(
-                        provider=normalized_provider,
-                        status="skipped",
-                        enrichment_id=existing.id,
-                        message="Identical payload already processed",
-                        source_document_id=existing_source,
-                    )
+
+        for executive, exec_context, provider, raw_payload, canonical in fetched:
+            existing = existing_by_key.get((provider, canonical.sha256, executive.id))
+            if existing:
+                results[executive.id][provider] = ProviderEnrichmentResult(
+                    provider=provider,
+                    status="skipped",
+                    enrichment_id=existing.id,
+                    message="Identical payload already processed",
+                    source_document_id=self._source_document_from_enrichment(existing),
                 )
                 continue
-
-            source_document = await self.company_repo.create_source_document(
+            results[executive.id][provider] = await self._record_executive_enrichment(
                 tenant_id,
-                ResearchSourceDocumentCreate(
-                    company_research_run_id=executive.company_research_run_id,
-                    source_type="provider_json",
-                    title=f"{normalized_provider.title()} contact data (executive)",
-                    url=raw_payload.get("source_url") if isinstance(raw_payload, dict) else None,
-                    original_url=raw_payload.get("source_url") if isinstance(raw_payload, dict) else None,
-                    content_text=canonical_text,
-                    content_hash=content_hash,
-                    mime_type="application/json",
-                    meta={
-                        "provider": normalized_provider,
-                        "mode": request.mode,
-                        "schema_version": raw_payload.get("schema_version") if isinstance(raw_payload, dict) else None,
-                        "content_hash": content_hash,
-                        "company_name": exec_context.get("company_name"),
-                        "entity": "executive",
-                    },
-                    max_attempts=1,
-                ),
-            )
-
-            evidence = ExecutiveProspectEvidence(
-                tenant_id=tenant_uuid,
-                executive_prospect_id=executive_id,
-                source_type="contact_enrichment",
-                source_name=f"{normalized_provider} contact enrichment",
-                source_url=raw_payload.get("source_url") if isinstance(raw_payload, dict) else None,
-                raw_snippet=None,
-                evidence_weight=0.5,
-                source_document_id=source_document.id,
-                source_content_hash=content_hash,
-            )
-            self.db.add(evidence)
-
-            enrichment = await self.ai_enrichment_repo.create(
-                tenant_uuid,
-                AIEnrichmentCreate(
-                    target_type="EXECUTIVE",
-                    target_id=executive_id,
-                    model_name=f"mock-{normalized_provider}",
-                    enrichment_type="CONTACT_POINTS",
-                    payload={
-                        "provider_payload": raw_payload,
-                        "source_document_id": str(source_document.id),
-                        "executive_id": str(executive_id),
-                    },
-                    company_research_run_id=executive.company_research_run_id,
-                    purpose=PURPOSE_EXEC_CONTACT_ENRICHMENT,
-                    provider=normalized_provider,
-                    input_scope_hash=content_hash,
-                    content_hash=content_hash,
-                    source_document_id=source_document.id,
-                    status="success",
-                    error_message=None,
-                ),
+                executive,
+                exec_context,
+                provider,
+                request,
+                raw_payload,
+                canonical,
             )
 
-            provider_results.append(
-                ProviderEnrichmentResult(
-                    provider=normalized_provider,
-                    status="created",
-                    added_points=0,
-                    skipped_points=0,
-                    enrichment_id=enrichment.id,
-                    source_document_id=source_document.id,
-                )
-            )
+        return {
+            exec_id: [by_provider[provider] for provider in providers if provider in by_provider]
+            for exec_id, by_provider in results.items()
+        }
 
-        await self.db.commit()
-        return provider_results
+    def _get_provider_limiter(self, provider: str) -> Dict[str, Any]:
+        limiters = _PROVIDER_LIMITERS.setdefault(asyncio.get_running_loop(), {})
+        limiter = limiters.get(provider)
+        if not limiter:
+            rate = settings.BULK_ENRICH_PROVIDER_RATE_PER_SECOND
+            limiter = {
+                "semaphore": asyncio.Semaphore(max(1, settings.BULK_ENRICH_PROVIDER_CONCURRENCY)),
+                "interval": 1.0 / rate if rate > 0 else 0.0,
+                "next_start": 0.0,
+            }
+            limiters[provider] = limiter
+        return limiter
+
+    async def _fetch_contacts_limited(self, provider: str, exec_context: Dict[str, Any]) -> Any:
+        limiter = self._get_provider_limiter(provider)
+        async with limiter["semaphore"]:
+            interval = limiter["interval"]
+            if interval:
+                # Reserve the next start slot before sleeping so concurrent callers space out.
+                now = time.monotonic()
+                start_at = max(now, limiter["next_start"])
+                limiter["next_start"] = start_at + interval
+                if start_at > now:
+                    await asyncio.sleep(start_at - now)
+            return await self.adapters[provider].fetch_contacts(exec_context)
+
+    async def _record_executive_enrichment(
+        self,
+        tenant_id: str,
+        executive: Any,
+        exec_context: Dict[str, Any],
+        provider: str,
+        request: ContactEnrichmentRequest,
+        raw_payload: Any,
+        canonical: CanonicalPayload,
+    ) -> ProviderEnrichmentResult:
+        tenant_uuid = UUID(str(tenant_id))
+        executive_id = executive.id
+        content_hash = canonical.sha256
+
+        source_document = await self.company_repo.create_source_document(
+            tenant_id,
+            ResearchSourceDocumentCreate(
+                company_research_run_id=executive.company_research_run_id,
+                source_type="provider_json",
+                title=f"{provider.title()} contact data (executive)",
+                url=raw_payload.get("source_url") if isinstance(raw_payload, dict) else None,
+                original_url=raw_payload.get("source_url") if isinstance(raw_payload, dict) else None,
+                content_text=canonical.text,
+                content_hash=content_hash,
+                mime_type="application/json",
+                meta={
+                    "provider": provider,
+                    "mode": request.mode,
+                    "schema_version": raw_payload.get("schema_version") if isinstance(raw_payload, dict) else None,
+                    "content_hash": content_hash,
+                    "company_name": exec_context.get("company_name"),
+                    "entity": "executive",
+                },
+                max_attempts=1,
+            ),
+        )
+
+        evidence = ExecutiveProspectEvidence(
+            tenant_id=tenant_uuid,
+            executive_prospect_id=executive_id,
+            source_type="contact_enrichment",
+            source_name=f"{provider} contact enrichment",
+            source_url=raw_payload.get("source_url") if isinstance(raw_payload, dict) else None,
+            raw_snippet=None,
+            evidence_weight=0.5,
+            source_document_id=source_document.id,
+            source_content_hash=content_hash,
+        )
+        self.db.add(evidence)
+
+        enrichment = await self.ai_enrichment_repo.create(
+            tenant_uuid,
+            AIEnrichmentCreate(
+                target_type="EXECUTIVE",
+                target_id=executive_id,
+                model_name=f"mock-{provider}",
+                enrichment_type="CONTACT_POINTS",
+                payload={
+                    "provider_payload": raw_payload,
+                    "source_document_id": str(source_document.id),
+                    "executive_id": str(executive_id),
+                },
+                company_research_run_id=executive.company_research_run_id,
+                purpose=PURPOSE_EXEC_CONTACT_ENRICHMENT,
+                provider=provider,
+                input_scope_hash=content_hash,
+                content_hash=content_hash,
+                source_document_id=source_document.id,
+                status="success",
+                error_message=None,
+            ),
+        )
+
+        return ProviderEnrichmentResult(
+            provider=provider,
+            status="created",
+            added_points=0,
+            skipped_points=0,
+            enrichment_id=enrichment.id,
+            source_document_id=source_document.id,
+        )
 
     async def _backfill_candidate_contacts(self, candidate: Candidate, added_points: List[Any]) -> None:
         if not added_points:
@@ -8,15 +8,12 @@ import csv
 import json
 import os
 import time
-import hashlib
 from dataclasses import dataclass
 from io import StringIO
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 from uuid import UUID
 
-import httpx
-
 from app.core.config import settings
 from app.schemas.company_research import (
     GoogleSearchProviderRequest,
@@ -26,6 +23,7 @@ from app.schemas.company_research import (
     XaiGrokProviderRequest,
 )
 from app.schemas.llm_discovery import LlmDiscoveryPayload, LlmCompany, LlmEvidence, LlmRunContext
+from app.utils.canonical_json import canonical_dumps, canonical_hash
 from app.utils.url_canonicalizer import canonicalize_url
 
 
@@ -292,7 +290,7 @@ class SeedListProvider(DiscoveryProvider):
             )
 
         companies_sorted = sorted(companies, key=lambda c: c.name.lower())
-        raw_payload = json.dumps(request.model_dump(exclude_none=True, mode="json"), sort_keys=True)
+        raw_payload = canonical_dumps(request.model_dump(exclude_none=True, mode="json"))
         return companies_sorted, raw_payload
 
     def run(
@@ -366,8 +364,7 @@ class GoogleSearchProvider(DiscoveryProvider):
         """Return canonical_params, cache_key, request_hash for caching."""
         request_obj = self._normalize_params(request)
         canonical_params = self._canonical_params(request_obj)
-        canonical_json = json.dumps(canonical_params, sort_keys=True, separators=(",", ":"))
-        request_hash = hashlib.sha256(canonical_json.encode("utf-8")).hexdigest()
+        request_hash = canonical_hash(canonical_params)
         cache_key = f"{self.key}:{request_hash}"
         return canonical_params, cache_key, request_hash
 
@@ -418,6 +415,8 @@ class GoogleSearchProvider(DiscoveryProvider):
         )
 
     def _http_fetch(self, url: str, params: dict[str, Any]) -> tuple[int, dict, dict[str, str]]:
+        import httpx  # deferred: only live provider calls need httpx
+
         resp = httpx.get(url, params=params, timeout=15.0)
         try:
             payload = resp.json()
@@ -684,6 +683,8 @@ class XaiGrokProvider(DiscoveryProvider):
         }
 
     def _http_post(self, url: str, json_body: dict[str, Any], headers: dict[str, str]) -> tuple[int, dict, dict[str, str]]:
+        import httpx  # deferred: only live provider calls need httpx
+
         resp = httpx.post(url, json=json_body, headers=headers, timeout=30.0)
         try:
             payload = resp.json()
@@ -835,7 +836,7 @@ class XaiGrokProvider(DiscoveryProvider):
                 source_type="llm_json",
                 envelope=envelope,
                 error={"code": "upstream_error", "message": "xAI Grok returned non-200", "status_code": status_code},
-                raw_input_text=json.dumps(request_body, sort_keys=True),
+                raw_input_text=canonical_dumps(request_body),
                 raw_input_meta={"normalized_params": canonical_params, "fixture_path": fixture_path},
             )
 
@@ -871,7 +872,7 @@ class XaiGrokProvider(DiscoveryProvider):
             version=self.version,
             source_type="llm_json",
             envelope=envelope,
-            raw_input_text=json.dumps(request_body, sort_keys=True),
+            raw_input_text=canonical_dumps(request_body),
             raw_input_meta={"normalized_params": canonical_params, "fixture_path": fixture_path},
         )
 
@@ -2,8 +2,7 @@
 Service for enrichment assignments with evidence-backed, idempotent writes.
 """
 
-import hashlib
-import json
+import uuid
 from typing import List
 from uuid import UUID
 
@@ -11,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.repositories.enrichment_assignment_repository import EnrichmentAssignmentRepository
 from app.schemas.enrichment_assignment import EnrichmentAssignmentCreate, EnrichmentAssignmentRead
+from app.utils.canonical_json import canonical_dumps, canonical_hash
 
 JsonValue = dict | list | str | int | float | bool | None
 
@@ -24,7 +24,7 @@ class EnrichmentAssignmentService:
 
     def _canonical_value(self, value: JsonValue) -> JsonValue:
         try:
-            json.dumps(value, sort_keys=True, default=str)
+            canonical_dumps(value)
             return value
         except TypeError:
             return str(value)
@@ -44,8 +44,7 @@ class EnrichmentAssignmentService:
             "source_document_id": str(payload.source_document_id),
             "input_scope_hash": payload.input_scope_hash,
         }
-        serialized = json.dumps(base, sort_keys=True, separators=(",", ":"), default=str)
-        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+        return canonical_hash(base)
 
     async def record_assignment(
         self,
@@ -77,6 +76,35 @@ class EnrichmentAssignmentService:
             results.append(await self.record_assignment(tenant_id, payload))
         return results
 
+    async def record_assignments_bulk(
+        self,
+        tenant_id: str,
+        payloads: List[EnrichmentAssignmentCreate],
+    ) -> int:
+        """Upsert assignments with one multi-row statement; the caller commits. Returns rows written."""
+        rows: dict = {}
+        for payload in payloads:
+            if not payload.source_document_id:
+                raise ValueError("source_document_required")
+            canonical_value = self._canonical_value(payload.value)
+            content_hash = self._compute_content_hash(payload, canonical_value)
+            rows[(payload.target_entity_type, payload.target_canonical_id, payload.field_key, content_hash,
+                  payload.source_document_id)] = {
+                "id": uuid.uuid4(),
+                "tenant_id": tenant_id,
+                "target_entity_type": payload.target_entity_type,
+                "target_canonical_id": payload.target_canonical_id,
+                "field_key": payload.field_key,
+                "value_json": canonical_value,
+                "value_normalized": payload.value_normalized,
+                "confidence": payload.confidence,
+                "derived_by": payload.derived_by,
+                "source_document_id": payload.source_document_id,
+                "input_scope_hash": payload.input_scope_hash,
+                "content_hash": content_hash,
+            }
+        return await self.repo.bulk_upsert_assignments(list(rows.values()))
+
     async def list_for_canonical_company(
         self,
         tenant_id: str,
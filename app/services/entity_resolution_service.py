@@ -1,13 +1,32 @@
+import asyncio
 import hashlib
 import re
+import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.company_research import ExecutiveProspect, ExecutiveProspectEvidence
 from app.repositories.company_research_repo import CompanyResearchRepository
+from app.services.run_resolution_snapshot import EvidenceMap, ExecutiveRow, RunSnapshot, load_run_snapshot
+
+ENTITY_TYPE = "executive"
+
+
+@dataclass
+class EntityResolutionState:
+    resolved_hashes: Set[str]
+    link_pairs: Set[Tuple[UUID, UUID]]
+
+
+@dataclass
+class EntityResolutionPlan:
+    summary: dict
+    # resolution_hash -> row; links carry their group's hash as "resolved_hash"
+    resolved: Dict[str, dict] = field(default_factory=dict)
+    links: Dict[str, dict] = field(default_factory=dict)
 
 
 class EntityResolutionService:
@@ -17,20 +36,33 @@ class EntityResolutionService:
         self.db = db
         self.repo = CompanyResearchRepository(db)
 
-    async def resolve_run_entities(self, tenant_id: str, run_id: UUID, dry_run: bool = False) -> dict:
-        entity_type = "executive"
-        executives = await self.repo.list_executive_prospects_for_run(tenant_id, run_id)
-        evidence_rows = await self.repo.list_executive_evidence_for_run(tenant_id, run_id)
-
-        evidence_map = self._build_evidence_map(evidence_rows)
+    async def resolve_run_entities(
+        self,
+        tenant_id: str,
+        run_id: UUID,
+        dry_run: bool = False,
+        snapshot: Optional[RunSnapshot] = None,
+    ) -> dict:
+        if snapshot is None:
+            snapshot = await load_run_snapshot(self.repo, tenant_id, run_id)
+        state = await self.load_state(snapshot)
+        plan = await asyncio.to_thread(self.plan, snapshot, state)
+        return await self.apply_plan(plan, dry_run=dry_run)
+
+    async def load_state(self, snapshot: RunSnapshot) -> EntityResolutionState:
+        resolved_hashes, link_pairs = await self.repo.list_resolution_hashes_for_run(
+            snapshot.tenant_id, snapshot.run_id, entity_type=ENTITY_TYPE
+        )
+        return EntityResolutionState(resolved_hashes=resolved_hashes, link_pairs=link_pairs)
+
+    def plan(self, snapshot: RunSnapshot, state: EntityResolutionState) -> EntityResolutionPlan:
+        """Group the run's executives and build resolved entity / merge link rows (no I/O)."""
+        entity_type = ENTITY_TYPE
+        tenant_id, run_id = snapshot.tenant_id, snapshot.run_id
+        executives = snapshot.executives
+        evidence_map = snapshot.executive_evidence
         groups = self._group_executives(executives)
 
-        existing_resolved = await self.repo.list_resolved_entities_for_run(tenant_id, run_id, entity_type=entity_type)
-        existing_links = await self.repo.list_entity_merge_links_for_run(tenant_id, run_id, entity_type=entity_type)
-
-        existing_resolved_hashes = {r.resolution_hash for r in existing_resolved}
-        existing_link_pairs = {(l.canonical_entity_id, l.duplicate_entity_id) for l in existing_links}
-
         summary = {
             "entity_type": entity_type,
             "executives_scanned": len(executives),
@@ -40,16 +72,17 @@ class EntityResolutionService:
             "merge_links_existing": 0,
             "skipped": False,
         }
+        plan = EntityResolutionPlan(summary=summary)
 
         if not executives:
             summary["skipped"] = True
             summary["reason"] = "no_executives"
-            return summary
+            return plan
 
         if not groups:
             summary["skipped"] = True
             summary["reason"] = "no_groups"
-            return summary
+            return plan
 
         for key, members in groups.items():
             if len(members) < 2:
@@ -61,19 +94,18 @@ class EntityResolutionService:
             evidence_ids = self._collect_evidence_ids(members, evidence_map)
             res_hash = self._hash_resolution(entity_type, match_keys, canonical.id, [m.id for m in members])
 
-            resolved = None
-            if not dry_run:
-                resolved = await self.repo.upsert_resolved_entity(
-                    tenant_id=tenant_id,
-                    run_id=run_id,
-                    entity_type=entity_type,
-                    canonical_entity_id=canonical.id,
-                    match_keys=match_keys,
-                    reason_codes=reason_codes,
-                    evidence_source_document_ids=evidence_ids,
-                    resolution_hash=res_hash,
-                )
-            summary["resolved_groups"] += 0 if res_hash in existing_resolved_hashes else 1
+            plan.resolved[res_hash] = {
+                "id": uuid.uuid4(),
+                "tenant_id": tenant_id,
+                "company_research_run_id": run_id,
+                "entity_type": entity_type,
+                "canonical_entity_id": canonical.id,
+                "match_keys": match_keys,
+                "reason_codes": reason_codes,
+                "evidence_source_document_ids": evidence_ids,
+                "resolution_hash": res_hash,
+            }
+            summary["resolved_groups"] += 0 if res_hash in state.resolved_hashes else 1
 
             for member in members:
                 if member.id == canonical.id:
@@ -86,28 +118,42 @@ class EntityResolutionService:
                     canonical.id,
                     [member.id],
                 )
-
-                if dry_run:
-                    continue
-
-                link = await self.repo.upsert_entity_merge_link(
-                    tenant_id=tenant_id,
-                    run_id=run_id,
-                    entity_type=entity_type,
-                    resolved_entity_id=resolved.id if resolved else None,
-                    canonical_entity_id=canonical.id,
-                    duplicate_entity_id=member.id,
-                    match_keys=link_match_keys,
-                    reason_codes=reason_codes,
-                    evidence_source_document_ids=link_evidence,
-                    resolution_hash=link_hash,
-                )
-                if (link.canonical_entity_id, link.duplicate_entity_id) in existing_link_pairs:
+                plan.links[link_hash] = {
+                    "id": uuid.uuid4(),
+                    "tenant_id": tenant_id,
+                    "company_research_run_id": run_id,
+                    "entity_type": entity_type,
+                    "resolved_hash": res_hash,
+                    "canonical_entity_id": canonical.id,
+                    "duplicate_entity_id": member.id,
+                    "match_keys": link_match_keys,
+                    "reason_codes": reason_codes,
+                    "evidence_source_document_ids": link_evidence,
+                    "resolution_hash": link_hash,
+                }
+                if (canonical.id, member.id) in state.link_pairs:
                     summary["merge_links_existing"] += 1
                 else:
                     summary["merge_links_written"] += 1
 
-        return summary
+        return plan
+
+    async def apply_plan(self, plan: EntityResolutionPlan, dry_run: bool = False) -> dict:
+        """Write a plan with one multi-row upsert per table."""
+        if dry_run:
+            summary = dict(plan.summary)
+            summary["merge_links_written"] = 0
+            summary["merge_links_existing"] = 0
+            return summary
+        resolved_ids = await self.repo.bulk_upsert_resolved_entities(list(plan.resolved.values()))
+        links = []
+        for row in plan.links.values():
+            link = dict(row)
+            link["resolved_entity_id"] = resolved_ids.get(link.pop("resolved_hash"))
+            links.append(link)
+        await self.repo.bulk_upsert_entity_merge_links(links)
+        await self.db.flush()
+        return plan.summary
 
     async def list_resolved_entities(self, tenant_id: str, run_id: UUID, entity_type: str | None = None) -> List:
         return await self.repo.list_resolved_entities_for_run(tenant_id, run_id, entity_type=entity_type)
@@ -115,8 +161,8 @@ class EntityResolutionService:
     async def list_entity_merge_links(self, tenant_id: str, run_id: UUID, entity_type: str | None = None) -> List:
         return await self.repo.list_entity_merge_links_for_run(tenant_id, run_id, entity_type=entity_type)
 
-    def _group_executives(self, executives: List[ExecutiveProspect]) -> Dict[Tuple[str, str, str], List[ExecutiveProspect]]:
-        grouped: Dict[Tuple[str, str, str], List[ExecutiveProspect]] = {}
+    def _group_executives(self, executives: List[ExecutiveRow]) -> Dict[Tuple[str, str, str], List[ExecutiveRow]]:
+        grouped: Dict[Tuple[str, str, str], List[ExecutiveRow]] = {}
         for exec_row in executives:
             key = self._build_match_key(exec_row)
             if not key:
@@ -124,7 +170,7 @@ class EntityResolutionService:
             grouped.setdefault(key, []).append(exec_row)
         return grouped
 
-    def _build_match_key(self, exec_row: ExecutiveProspect) -> Tuple[str, str, str] | None:
+    def _build_match_key(self, exec_row: ExecutiveRow) -> Tuple[str, str, str] | None:
         email_norm = self._normalize_email(exec_row.email)
         name_norm = self._normalize_person(exec_row.name_normalized or exec_row.name_raw)
         company_key = str(exec_row.company_prospect_id)
@@ -146,14 +192,14 @@ class EntityResolutionService:
             return ["MATCH_EMAIL", "STAGE6_1_RESOLUTION"]
         return ["MATCH_NAME_AND_COMPANY", "STAGE6_1_RESOLUTION"]
 
-    def _canonical_sort_key(self, exec_row: ExecutiveProspect) -> Tuple[datetime, str]:
+    def _canonical_sort_key(self, exec_row: ExecutiveRow) -> Tuple[datetime, str]:
         created = exec_row.created_at or datetime.max
         return (created, str(exec_row.id))
 
     def _collect_evidence_ids(
         self,
-        exec_rows: Iterable[ExecutiveProspect],
-        evidence_map: Dict[UUID, List[UUID]],
+        exec_rows: Iterable[ExecutiveRow],
+        evidence_map: EvidenceMap,
     ) -> List[str]:
         collected: set[str] = set()
         for exec_row in exec_rows:
@@ -163,14 +209,6 @@ class EntityResolutionService:
                 collected.add(str(ev_id))
         return sorted(collected)
 
-    def _build_evidence_map(self, evidence_rows: List[ExecutiveProspectEvidence]) -> Dict[UUID, List[UUID]]:
-        mapping: Dict[UUID, List[UUID]] = {}
-        for ev in evidence_rows:
-            if not ev.source_document_id:
-                continue
-            mapping.setdefault(ev.executive_prospect_id, []).append(ev.source_document_id)
-        return mapping
-
     def _normalize_person(self, name: str | None) -> str:
         if not name:
             return ""
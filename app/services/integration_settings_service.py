@@ -7,7 +7,6 @@ from datetime import datetime
 from typing import Any, Optional
 from uuid import UUID, uuid4
 
-import httpx
 from fastapi import status
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -165,6 +164,8 @@ class IntegrationSettingsService:
         if not api_key:
             return DEFAULT_XAI_MODELS
 
+        import httpx  # deferred: only live provider calls need httpx
+
         try:
             async with httpx.AsyncClient(timeout=5.0) as client:
                 resp = await client.get(
@@ -0,0 +1,128 @@
+"""
+Heartbeat lease and fencing for claimed company research jobs.
+
+A claimed job is leased to its worker: ``claim_next_job`` stamps
+``locked_by``/``locked_at`` and increments the job's ``lease_token``. While the
+worker executes the job (and its steps), ``JobLease`` renews ``locked_at``
+every JOB_HEARTBEAT_SECONDS on its own short-lived session, so a live job never
+looks stale, while a dead worker's job becomes reclaimable after
+JOB_LEASE_SECONDS instead of a half-hour timeout.
+
+Because a stalled worker (long GC pause, network partition) may wake up after
+its job was reclaimed, the lease also fences the worker's session: every
+commit first re-reads the job row ``FOR UPDATE`` and raises
+``JobLeaseLostError`` unless it still carries the worker's token, so the
+zombie's writes are never committed. Callers roll back and move on.
+
+Steps have no lease of their own; they run under their job's lease, and a
+reclaim reopens the steps the previous holder left running.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from typing import AsyncContextManager, Callable, Optional
+from uuid import UUID
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import get_async_session_context
+from app.models.company_research import CompanyResearchJob
+from app.repositories.company_research_repo import CompanyResearchRepository
+
+logger = logging.getLogger(__name__)
+
+
+class JobLeaseLostError(RuntimeError):
+    """The job was reclaimed (or finished elsewhere) after this worker's lease lapsed."""
+
+
+class JobLease:
+    """Async context manager: heartbeat ``job_id``'s lease and fence ``session``'s commits."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        job_id: UUID,
+        worker_id: str,
+        lease_token: int,
+        *,
+        heartbeat_seconds: Optional[float] = None,
+        session_factory: Callable[[], AsyncContextManager[AsyncSession]] = get_async_session_context,
+    ) -> None:
+        self.session = session
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lease_token = lease_token
+        self.heartbeat_seconds = heartbeat_seconds or settings.JOB_HEARTBEAT_SECONDS
+        self.session_factory = session_factory
+        self.renewals = 0
+        self._lost = False
+        self._stopped = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def lost(self) -> bool:
+        return self._lost
+
+    def check(self) -> None:
+        """Raise JobLeaseLostError once a heartbeat (or a fenced commit) found the lease gone."""
+        if self._lost:
+            raise JobLeaseLostError(f"lease_lost:{self.job_id}")
+
+    async def __aenter__(self) -> "JobLease":
+        event.listen(self.session.sync_session, "before_commit", self._fence)
+        self._task = asyncio.create_task(self._heartbeat())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            # Cancel rather than wait: a renewal in flight can be blocked on the job row
+            # lock that the worker's own (fenced) session still holds.
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        event.remove(self.session.sync_session, "before_commit", self._fence)
+
+    async def _heartbeat(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=self.heartbeat_seconds)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                async with self.session_factory() as session:
+                    renewed = await CompanyResearchRepository(session).renew_job_lease(
+                        self.job_id,
+                        self.worker_id,
+                        self.lease_token,
+                    )
+            except Exception:  # noqa: BLE001
+                # A missed beat is not fatal; the lease only lapses after JOB_LEASE_SECONDS.
+                logger.exception("Lease heartbeat for job %s failed", self.job_id)
+                continue
+            if self._stopped.is_set():
+                return
+            if not renewed:
+                self._lost = True
+                logger.warning("Worker %s lost the lease on job %s", self.worker_id, self.job_id)
+                return
+            self.renewals += 1
+
+    def _fence(self, session: Session) -> None:
+        """before_commit hook: only the current lease holder may commit."""
+        holder = session.execute(
+            select(CompanyResearchJob.lease_token)
+            .where(CompanyResearchJob.id == self.job_id)
+            .with_for_update()
+        ).scalar_one_or_none()
+        if holder != self.lease_token:
+            self._lost = True
+            raise JobLeaseLostError(f"lease_lost:{self.job_id}")
@@ -0,0 +1,136 @@
+"""
+Retention and rollup for the monthly research_events partitions.
+
+Each maintenance pass:
+
+- creates partitions for the current month and RESEARCH_EVENTS_PARTITION_MONTHS_AHEAD
+  months ahead, so new events never land in the default partition;
+- compacts raw partitions whose month ended more than
+  RESEARCH_EVENTS_ROLLUP_AFTER_DAYS ago: high-volume event types
+  (RESEARCH_EVENTS_ROLLUP_EVENT_TYPES) are replaced by one ``events_rollup``
+  row per run with per-type counts, everything else is kept, and the raw
+  partition is dropped;
+- drops whole partitions whose month ended more than
+  RESEARCH_EVENTS_RETENTION_DAYS ago (0 keeps compacted months forever).
+
+Each partition change commits on its own, so an interrupted pass resumes where
+it stopped.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.repositories.research_event_partition_repository import (
+    ResearchEventPartitionRepository,
+    add_months,
+    month_start,
+    parse_partition_name,
+    partition_name,
+)
+from app.utils.time import utc_now
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PartitionPlan:
+    create: List[date] = field(default_factory=list)
+    compact: List[date] = field(default_factory=list)
+    drop: List[str] = field(default_factory=list)
+
+
+def rollup_event_types() -> List[str]:
+    return [value.strip() for value in settings.RESEARCH_EVENTS_ROLLUP_EVENT_TYPES.split(",") if value.strip()]
+
+
+def plan_partition_maintenance(
+    existing: Sequence[str],
+    now: datetime,
+    *,
+    months_ahead: int,
+    rollup_after_days: int,
+    retention_days: int,
+) -> PartitionPlan:
+    """Decide which monthly partitions to create, compact and drop at ``now``.
+
+    A month is only compacted or dropped once its whole range is older than
+    the cutoff; the default partition is never touched.
+    """
+    plan = PartitionPlan()
+    months = {}
+    for name in existing:
+        parsed = parse_partition_name(name)
+        if parsed is not None:
+            months[parsed[0]] = (name, parsed[1])
+
+    current = month_start(now)
+    plan.create = [m for m in (add_months(current, i) for i in range(months_ahead + 1)) if m not in months]
+
+    rollup_cutoff = now - timedelta(days=rollup_after_days)
+    retention_cutoff = now - timedelta(days=retention_days) if retention_days > 0 else None
+    for month, (name, compacted) in sorted(months.items()):
+        month_end = add_months(month, 1)
+        ended_at = datetime(month_end.year, month_end.month, 1, tzinfo=now.tzinfo)
+        if retention_cutoff is not None and ended_at <= retention_cutoff:
+            plan.drop.append(name)
+        elif not compacted and ended_at <= rollup_cutoff:
+            plan.compact.append(month)
+    return plan
+
+
+class ResearchEventRetentionService:
+    """Runs partition maintenance for research_events."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repo = ResearchEventPartitionRepository(db)
+
+    async def run_maintenance(self, *, now: Optional[datetime] = None, dry_run: bool = False) -> Dict[str, Any]:
+        now = now or utc_now()
+        plan = plan_partition_maintenance(
+            await self.repo.list_partitions(),
+            now,
+            months_ahead=settings.RESEARCH_EVENTS_PARTITION_MONTHS_AHEAD,
+            rollup_after_days=settings.RESEARCH_EVENTS_ROLLUP_AFTER_DAYS,
+            retention_days=settings.RESEARCH_EVENTS_RETENTION_DAYS,
+        )
+        summary: Dict[str, Any] = {
+            "created": [partition_name(m) for m in plan.create],
+            "compacted": [],
+            "dropped": list(plan.drop),
+            "dry_run": dry_run,
+        }
+        if dry_run:
+            summary["compacted"] = [{"partition": partition_name(m)} for m in plan.compact]
+            await self.db.rollback()
+            return summary
+
+        for month in plan.create:
+            await self.repo.create_partition(month)
+            await self.db.commit()
+
+        types = rollup_event_types()
+        for month in plan.compact:
+            result = await self.repo.compact_partition(month, types)
+            await self.db.commit()
+            logger.info(
+                "Compacted %s: kept %s events, %s rollup rows for %s high-volume events",
+                result["partition"],
+                result["kept"],
+                result["rollup_rows"],
+                result["compacted_events"],
+            )
+            summary["compacted"].append(result)
+
+        for name in plan.drop:
+            await self.repo.drop_partition(name)
+            await self.db.commit()
+            logger.info("Dropped research_events partition %s (older than retention)", name)
+        return summary
@@ -30,10 +30,7 @@ from app.schemas.ai_proposal import AIProposal, AIProposalSource, AIProposalComp
 from app.services.ai_proposal_service import AIProposalService
 from app.services.durable_job_service import DurableJobService
 from app.services.job_queue import submit_background_job
-
-
-def _canonical_json(data: dict) -> str:
-    return json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+from app.utils.canonical_json import canonical_hash
 
 
 def _sha256(content: str) -> str:
@@ -254,8 +251,7 @@ class ResearchRunService:
                     raise ValueError(f"bundle_validation_failed: {str(exc)}")
         
 
-        canonical = _canonical_json(bundle.model_dump())
-        bundle_hash = _sha256(canonical)
+        bundle_hash = canonical_hash(bundle.model_dump())
 
         # Check if bundle already accepted
         if run.bundle_sha256 and run.bundle_sha256 == bundle_hash:
@@ -0,0 +1,238 @@
+"""
+Server-sent event stream of a research run's progress.
+
+``create_research_event`` NOTIFYs ``research_events`` with the event's routing
+keys when it commits. Each API process keeps one LISTEN connection
+(``RunEventBroker``) and wakes the streams subscribed to that run; a woken
+stream re-reads new events with a short-lived session, so no database
+connection is held while a viewer idles. Notifications only say "look again":
+a missed one (listener reconnect) is covered by the keepalive catch-up.
+
+Messages:
+
+- ``event: research_event`` / ``event: step`` (step_* event types): one
+  ResearchEventRead; ``id`` is ``<created_at>|<event id>`` for Last-Event-ID resume
+- ``event: steps``: all run steps, sent first and after step_* events
+- ``event: end``: the run is finished; the stream closes
+
+Events are read with a small overlap (RUN_EVENT_STREAM_REORDER_SECONDS) and
+de-duplicated by id, because created_at order can differ from commit order
+across workers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.repositories.company_research_repo import RUN_EVENT_CHANNEL, CompanyResearchRepository
+from app.schemas.company_research import CompanyResearchRunStepRead, ResearchEventRead
+from app.utils.time import utc_now
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_RUN_STATUSES = {"succeeded", "failed", "cancelled"}
+# Event types after which the run may have finished.
+RUN_END_EVENT_TYPES = {"worker_completed", "worker_failed", "worker_cancelled"}
+PAGE_SIZE = 500
+SENT_ID_WINDOW = 5000
+RECONNECT_SECONDS = 5
+
+EventCursor = Tuple[datetime, str]
+
+
+def event_cursor(event) -> str:
+    return f"{event.created_at.isoformat()}|{event.id}"
+
+
+def parse_event_cursor(value: Optional[str]) -> Optional[EventCursor]:
+    """Parse a Last-Event-ID; None when absent or malformed (the stream then starts from the backlog)."""
+    if not value or "|" not in value:
+        return None
+    created_at, _, event_id = value.rpartition("|")
+    try:
+        return datetime.fromisoformat(created_at), str(UUID(event_id))
+    except ValueError:
+        return None
+
+
+def format_sse(event: str, data, event_id: Optional[str] = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append("data: " + json.dumps(data, separators=(",", ":"), default=str))
+    return "\n".join(lines) + "\n\n"
+
+
+def _listen_dsn() -> str:
+    return make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class RunEventBroker:
+    """One LISTEN connection per process, fanning notifications out to per-run wake-up queues."""
+
+    def __init__(self, channel: str = RUN_EVENT_CHANNEL):
+        self.channel = channel
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._task: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def subscribe(self, run_id) -> AsyncIterator[asyncio.Queue]:
+        """Queue that receives a token whenever the run may have new events (tokens coalesce)."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        key = str(run_id)
+        self._subscribers[key].add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(key)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[key]
+            if not self._subscribers and self._task is not None:
+                self._task.cancel()
+                self._task = None
+
+    def _wake(self, queues: Iterable[asyncio.Queue]) -> None:
+        for queue in queues:
+            if queue.empty():
+                queue.put_nowait(True)
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            run_id = json.loads(payload)["run_id"]
+        except (ValueError, KeyError, TypeError):
+            return
+        self._wake(self._subscribers.get(run_id, ()))
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                conn = await asyncpg.connect(_listen_dsn())
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Run event listener could not connect: %s", exc)
+                await asyncio.sleep(RECONNECT_SECONDS)
+                continue
+            closed = asyncio.Event()
+            conn.add_termination_listener(lambda _conn: closed.set())
+            try:
+                await conn.add_listener(self.channel, self._on_notify)
+                # Catch up on anything appended while we were not listening.
+                self._wake([q for queues in self._subscribers.values() for q in queues])
+                await closed.wait()
+                logger.warning("Run event listener connection closed; reconnecting")
+            finally:
+                if not conn.is_closed():
+                    await conn.close()
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+
+run_event_broker = RunEventBroker()
+
+
+async def stream_run_events(
+    tenant_id: str,
+    run_id: UUID,
+    *,
+    last_event_id: Optional[str] = None,
+    broker: RunEventBroker = run_event_broker,
+    session_factory: Callable = AsyncSessionLocal,
+    keepalive_seconds: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """Yield SSE messages for a run until it finishes (or the client disconnects)."""
+    keepalive = keepalive_seconds or settings.RUN_EVENT_STREAM_KEEPALIVE_SECONDS
+    overlap = timedelta(seconds=settings.RUN_EVENT_STREAM_REORDER_SECONDS)
+    sent_order: Deque[str] = deque()
+    sent: Set[str] = set()
+    resume = parse_event_cursor(last_event_id)
+    high_water: Optional[datetime] = resume[0] if resume else None
+    first = True
+
+    def _mark_sent(event_id: str) -> None:
+        sent.add(event_id)
+        sent_order.append(event_id)
+        if len(sent_order) > SENT_ID_WINDOW:
+            sent.discard(sent_order.popleft())
+
+    async with broker.subscribe(run_id) as wakeups:
+        while True:
+            messages: List[str] = []
+            async with session_factory() as session:
+                repo = CompanyResearchRepository(session)
+                if high_water is None:
+                    backlog = await repo.list_research_events_for_run(
+                        tenant_id, run_id, limit=settings.RUN_EVENT_STREAM_BACKLOG
+                    )
+                    fresh = list(reversed(backlog))
+                else:
+                    fresh = []
+                    created_from = high_water - overlap
+                    after_id = None
+                    while True:
+                        page = await repo.list_research_events_since(
+                            tenant_id, run_id, created_from, PAGE_SIZE, after_id=after_id
+                        )
+                        for event in page:
+                            key = str(event.id)
+                            if key in sent:
+                                continue
+                            if resume and (event.created_at, key) <= resume:
+                                # The client saw this before reconnecting.
+                                _mark_sent(key)
+                                continue
+                            fresh.append(event)
+                        if len(page) < PAGE_SIZE:
+                            break
+                        # Next page by keyset, so boundary rows are neither repeated nor skipped.
+                        created_from, after_id = page[-1].created_at, page[-1].id
+                    resume = None
+
+                for event in fresh:
+                    _mark_sent(str(event.id))
+                    high_water = event.created_at if high_water is None else max(high_water, event.created_at)
+                    kind = "step" if event.event_type.startswith("step_") else "research_event"
+                    payload = ResearchEventRead.model_validate(event).model_dump(mode="json")
+                    messages.append(format_sse(kind, payload, event_cursor(event)))
+                if high_water is None:
+                    # Nothing stored yet: later reads start from now.
+                    high_water = utc_now()
+
+                types = {event.event_type for event in fresh}
+                if first or any(t.startswith("step_") for t in types):
+                    steps = await repo.list_steps(tenant_id, run_id)
+                    messages.append(
+                        format_sse(
+                            "steps",
+                            [CompanyResearchRunStepRead.model_validate(s).model_dump(mode="json") for s in steps],
+                        )
+                    )
+                finished = False
+                if first or types & RUN_END_EVENT_TYPES:
+                    run = await repo.get_company_research_run(tenant_id, run_id)
+                    finished = run is None or run.status in TERMINAL_RUN_STATUSES
+            first = False
+
+            for message in messages:
+                yield message
+            if finished:
+                yield format_sse("end", {"run_id": str(run_id)})
+                return
+
+            try:
+                await asyncio.wait_for(wakeups.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
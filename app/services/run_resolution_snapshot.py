@@ -0,0 +1,90 @@
+"""
+Shared, read-only snapshot of the rows the Stage 6 resolvers work from.
+
+entity_resolution, canonical_people_resolution and canonical_company_resolution
+all start from the run's executives and their evidence, and the tenant's
+company prospects and their evidence. ``load_run_snapshot`` reads those row
+sets once as compact named tuples (no ORM identity map, no eager-loaded
+relationships) so the three resolvers can plan from the same data, off the
+event loop and concurrently, before writing their results in bulk.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from app.repositories.company_research_repo import CompanyResearchRepository
+
+
+class ExecutiveRow(NamedTuple):
+    """Column order matches EXECUTIVE_ROW_COLUMNS."""
+
+    id: UUID
+    company_research_run_id: UUID
+    company_prospect_id: Optional[UUID]
+    name_raw: Optional[str]
+    name_normalized: Optional[str]
+    email: Optional[str]
+    linkedin_url: Optional[str]
+    source_document_id: Optional[UUID]
+    created_at: Optional[datetime]
+
+
+class CompanyRow(NamedTuple):
+    """Column order matches COMPANY_ROW_COLUMNS."""
+
+    id: UUID
+    company_research_run_id: UUID
+    name_raw: Optional[str]
+    name_normalized: Optional[str]
+    website_url: Optional[str]
+    hq_country: Optional[str]
+    created_at: Optional[datetime]
+
+
+EvidenceMap = Dict[UUID, Tuple[UUID, ...]]
+
+
+def build_evidence_map(pairs: Iterable[Tuple[UUID, Optional[UUID]]]) -> EvidenceMap:
+    """(entity_id, source_document_id) pairs -> entity_id -> source document ids, in row order."""
+    mapping: Dict[UUID, List[UUID]] = defaultdict(list)
+    for entity_id, source_document_id in pairs:
+        if source_document_id:
+            mapping[entity_id].append(source_document_id)
+    return {entity_id: tuple(ids) for entity_id, ids in mapping.items()}
+
+
+@dataclass(frozen=True)
+class RunSnapshot:
+    tenant_id: str
+    run_id: UUID
+    # Run executives, oldest first.
+    executives: Tuple[ExecutiveRow, ...]
+    executive_evidence: EvidenceMap
+    # Tenant company prospects with a website or a country, oldest first.
+    companies: Tuple[CompanyRow, ...]
+    # Evidence for prospects with a website and for run prospects with a country.
+    company_evidence: EvidenceMap
+
+    @property
+    def run_companies(self) -> Tuple[CompanyRow, ...]:
+        return tuple(c for c in self.companies if c.company_research_run_id == self.run_id)
+
+
+async def load_run_snapshot(repo: CompanyResearchRepository, tenant_id: str, run_id: UUID) -> RunSnapshot:
+    executives = await repo.list_executive_rows(tenant_id, run_id)
+    executive_evidence = await repo.list_executive_evidence_pairs(tenant_id, run_id)
+    companies = await repo.list_company_rows_for_resolution(tenant_id)
+    company_evidence = await repo.list_company_evidence_pairs_for_resolution(tenant_id, run_id)
+    return RunSnapshot(
+        tenant_id=tenant_id,
+        run_id=run_id,
+        executives=tuple(ExecutiveRow._make(row) for row in executives),
+        executive_evidence=build_evidence_map(executive_evidence),
+        companies=tuple(CompanyRow._make(row) for row in companies),
+        company_evidence=build_evidence_map(company_evidence),
+    )
@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-import hashlib
-import json
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 from uuid import UUID
@@ -16,6 +14,7 @@ from app.repositories.search_cache_repository import SearchCacheRepository
 from app.repositories.source_document_repository import SourceDocumentRepository
 from app.schemas.llm_discovery import LlmDiscoveryPayload
 from app.schemas.source_document import SourceDocumentCreate
+from app.utils.canonical_json import CanonicalPayload
 
 
 class SearchCacheService:
@@ -29,10 +28,9 @@ class SearchCacheService:
     @staticmethod
     def build_cache_key(provider: str, canonical_params: dict[str, Any]) -> tuple[str, str, str]:
         """Return cache_key, request_hash, canonical_json."""
-        canonical_json = json.dumps(canonical_params, sort_keys=True, separators=(",", ":"))
-        request_hash = hashlib.sha256(canonical_json.encode("utf-8")).hexdigest()
-        cache_key = f"{provider}:{request_hash}"
-        return cache_key, request_hash, canonical_json
+        canonical = CanonicalPayload.of(canonical_params)
+        cache_key = f"{provider}:{canonical.sha256}"
+        return cache_key, canonical.sha256, canonical.text
 
     async def get_cache_hit(
         self,
@@ -78,9 +76,9 @@ class SearchCacheService:
         raw_input_meta: Optional[dict[str, Any]],
         ttl_seconds: int,
     ) -> TenantSearchCache:
-        canonical_payload = payload.canonical_dict()
-        payload_text = json.dumps(canonical_payload, sort_keys=True)
-        content_hash = hashlib.sha256(payload_text.encode("utf-8")).hexdigest()
+        canonical = CanonicalPayload.of(payload.canonical_dict())
+        payload_text = canonical.text
+        content_hash = canonical.sha256
 
         event_id = await self._ensure_research_event(tenant_id, provider)
         doc = await self.doc_repo.create(
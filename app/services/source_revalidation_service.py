@@ -0,0 +1,170 @@
+"""
+Conditional-GET revalidation scheduler for fetched URL sources.
+
+Every successful fetch records meta.validators.next_check_at from the
+response's Cache-Control/Expires/Last-Modified headers (see
+CompanyExtractionService._schedule_revalidation). This service picks up due
+sources in batches, re-requests them with If-None-Match/If-Modified-Since and:
+
+- on 304, only moves next_check_at forward (no re-extraction);
+- on changed content, clears the source's processing markers and re-opens the
+  extract/classify/process steps of its run so only that source is re-extracted
+  (the steps skip sources whose material/processed markers are unchanged);
+- on failure, keeps the last good content and retries at the default interval.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.company_research import ResearchSourceDocument
+from app.repositories.company_research_repo import JOB_PRIORITY_MAINTENANCE, CompanyResearchRepository
+from app.services.company_extraction_service import CompanyExtractionService
+from app.utils.http_cache import format_check_time
+from app.utils.time import utc_now, utc_now_iso
+
+# Steps re-opened for a run when at least one of its sources changed.
+REVALIDATION_REQUEUE_STEPS = ["extract_url_sources", "classify_sources", "process_sources"]
+
+# Source fields restored when a revalidation request fails, so a transient error
+# does not knock previously good content out of the run.
+_RESTORE_ON_FAILURE = (
+    "status",
+    "error_message",
+    "last_error",
+    "http_error_message",
+    "http_status_code",
+    "http_headers",
+    "http_final_url",
+    "mime_type",
+    "next_retry_at",
+)
+
+
+class SourceRevalidationService:
+    """Revalidates due URL sources with conditional requests."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repo = CompanyResearchRepository(db)
+        self.extractor = CompanyExtractionService(db)
+
+    async def revalidate_due_sources(
+        self,
+        *,
+        limit: Optional[int] = None,
+        tenant_id: Optional[str] = None,
+        run_id: Optional[UUID] = None,
+    ) -> Dict[str, Any]:
+        """Revalidate one batch of due sources and re-queue runs whose sources changed."""
+        batch_size = limit if limit is not None else settings.SOURCE_REVALIDATION_BATCH_SIZE
+        sources = await self.repo.list_sources_due_for_revalidation(
+            format_check_time(utc_now()),
+            limit=max(0, int(batch_size)),
+            tenant_id=tenant_id,
+            run_id=run_id,
+        )
+
+        summary: Dict[str, Any] = {
+            "checked": len(sources),
+            "not_modified": 0,
+            "unchanged": 0,
+            "changed": 0,
+            "failed": 0,
+            "runs_requeued": 0,
+            "details": [],
+        }
+        changed_by_run: Dict[tuple[str, UUID], List[str]] = defaultdict(list)
+
+        for source in sources:
+            outcome = await self._revalidate_source(source)
+            summary[outcome] += 1
+            validators = (source.meta or {}).get("validators") or {}
+            summary["details"].append(
+                {
+                    "source_id": str(source.id),
+                    "run_id": str(source.company_research_run_id),
+                    "outcome": outcome,
+                    "next_check_at": validators.get("next_check_at"),
+                }
+            )
+            if outcome == "changed":
+                changed_by_run[(str(source.tenant_id), source.company_research_run_id)].append(str(source.id))
+
+        for (run_tenant_id, changed_run_id), source_ids in changed_by_run.items():
+            if await self._requeue_run(run_tenant_id, changed_run_id, source_ids):
+                summary["runs_requeued"] += 1
+
+        await self.db.flush()
+        return summary
+
+    async def _revalidate_source(self, source: ResearchSourceDocument) -> str:
+        previous_meta = dict(source.meta or {})
+        previous_body_hash = (previous_meta.get("validators") or {}).get("body_sha256")
+        previous_fields = {field: getattr(source, field) for field in _RESTORE_ON_FAILURE}
+
+        fetch_meta = await self.extractor._fetch_content(str(source.tenant_id), source, revalidate=True)
+
+        meta = dict(source.meta or {})
+        validators = dict(meta.get("validators") or {})
+
+        if source.status not in {"fetched", "processed"}:
+            for field, value in previous_fields.items():
+                setattr(source, field, value)
+            validators = dict(previous_meta.get("validators") or {})
+            validators["last_checked_at"] = utc_now_iso()
+            validators["last_error"] = fetch_meta.get("error") or "revalidation_failed"
+            validators["next_check_at"] = format_check_time(
+                utc_now() + timedelta(seconds=settings.SOURCE_REVALIDATION_DEFAULT_SECONDS)
+            )
+            previous_meta["validators"] = validators
+            source.meta = previous_meta
+            return "failed"
+
+        validators.pop("last_error", None)
+        if fetch_meta.get("not_modified"):
+            meta["validators"] = validators
+            source.meta = meta
+            return "not_modified"
+
+        # Sources fetched before body fingerprints existed count as changed once.
+        if previous_body_hash and validators.get("body_sha256") == previous_body_hash:
+            meta["validators"] = validators
+            source.meta = meta
+            return "unchanged"
+
+        validators["changed_at"] = utc_now_iso()
+        meta["validators"] = validators
+        meta.pop("processed_at", None)
+        meta.pop("processed_summary", None)
+        source.meta = meta
+        return "changed"
+
+    async def _requeue_run(self, tenant_id: str, run_id: UUID, source_ids: List[str]) -> bool:
+        reopened = await self.repo.reopen_steps(tenant_id, run_id, REVALIDATION_REQUEUE_STEPS)
+        if not reopened:
+            # Steps are still pending/running; the active job picks the sources up.
+            return False
+
+        await self.repo.enqueue_run_job(tenant_id=tenant_id, run_id=run_id, priority=JOB_PRIORITY_MAINTENANCE)
+        run = await self.repo.get_company_research_run(tenant_id, run_id)
+        if run and run.status in {"succeeded", "failed"}:
+            await self.repo.set_run_status(tenant_id, run_id, status="queued", last_error=None)
+
+        await self.repo.append_research_event(
+            tenant_id,
+            run_id,
+            "revalidation_requeued",
+            f"{len(source_ids)} source(s) changed; re-running {', '.join(step.step_key for step in reopened)}",
+            meta_json={
+                "changed_source_ids": source_ids,
+                "steps": [step.step_key for step in reopened],
+            },
+        )
+        return True
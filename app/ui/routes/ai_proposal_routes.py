@@ -10,7 +10,6 @@ import json
 
 from fastapi import APIRouter, Depends, Request, Form, HTTPException
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import ValidationError
 
@@ -20,10 +19,10 @@ from app.services.ai_proposal_service import AIProposalService
 from app.services.company_research_service import CompanyResearchService
 from app.schemas.company_research import SourceDocumentCreate
 from app.schemas.ai_proposal import AIProposal
+from app.ui.templating import templates
 
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/ui/templates")
 
 
 @router.post("/ui/company-research/runs/{run_id}/validate-proposal")
@@ -6,7 +6,6 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -15,10 +14,10 @@ from app.models.tenant import Tenant
 from app.services.auth_service import AuthService
 from app.ui.session import session_manager
 from app.ui.dependencies import get_optional_ui_user
+from app.ui.templating import templates
 
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/ui/templates")
 
 
 @router.get("/login", response_class=HTMLResponse)
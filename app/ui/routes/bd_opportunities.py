@@ -8,7 +8,6 @@ from collections import defaultdict
 
 from fastapi import APIRouter, Depends, Request, Query, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -20,10 +19,10 @@ from app.models.company import Company
 from app.models.contact import Contact
 from app.repositories.bd_opportunity_repository import BDOpportunityRepository
 from app.schemas.bd_opportunity import BDOpportunityCreate, BDOpportunityUpdate
+from app.ui.templating import templates
 
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/ui/templates")
 
 
 @router.get("/ui/bd-opportunities", response_class=HTMLResponse)
@@ -9,7 +9,6 @@ from datetime import date
 
 from fastapi import APIRouter, Depends, Request, Query, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -27,10 +26,10 @@ from app.models.company import Company
 from app.models.candidate_assignment import CandidateAssignment
 from app.models.pipeline_stage import PipelineStage
 from app.services.contact_enrichment_service import ContactEnrichmentService
+from app.ui.templating import templates
 
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/ui/templates")
 
 
 @router.get("/ui/candidates", response_class=HTMLResponse)
@@ -9,7 +9,6 @@ from datetime import date
 
 from fastapi import APIRouter, Depends, Request, Query, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy import select, func, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -24,10 +23,10 @@ from app.models.candidate_assignment import CandidateAssignment
 from app.schemas.company import CompanyCreate, CompanyUpdate
 from app.repositories.company_repository import CompanyRepository
 from app.services.entity_research_service import EntityResearchService
+from app.ui.templating import templates
 
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/ui/templates")
 
 
 @router.get("/ui/companies", response_class=HTMLResponse)
@@ -2,13 +2,13 @@
 Company Research routes for UI.
 """
 
+import json
 from typing import Optional
 from uuid import UUID
 from urllib.parse import urlencode
 
 from fastapi import APIRouter, Depends, Request, Query, Form, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -20,6 +20,7 @@ from app.models.company import Company
 from app.services.company_research_service import CompanyResearchService
 from app.services.company_extraction_service import CompanyExtractionService
 from app.services.ai_proposal_service import AIProposalService
+from app.services.run_event_stream import stream_run_events
 from app.schemas.company_research import (
     CompanyResearchRunCreate,
     CompanyProspectCreate,
@@ -28,10 +29,10 @@ from app.schemas.company_research import (
     SourceDocumentCreate,
 )
 from app.schemas.ai_proposal import AIProposal
+from app.ui.templating import templates
 
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/ui/templates")
 
 
 def _filter_rankings(
@@ -74,6 +75,114 @@ def _filter_rankings(
     return filtered
 
 
+RUN_DETAIL_PROSPECT_PAGE_SIZE = 100
+
+
+def _format_metric_value(metric) -> Optional[str]:
+    """Format a CompanyMetric for the run detail table (None when the typed value is empty)."""
+    if metric.value_type == "number" and metric.value_number is not None:
+        value = metric.value_number
+        currency = metric.value_currency or ""
+        unit = metric.unit or ""
+        # Format large numbers with B/M suffixes
+        if value >= 1_000_000_000:
+            return f"{currency} {value/1_000_000_000:.1f}B{unit}"
+        if value >= 1_000_000:
+            return f"{currency} {value/1_000_000:.1f}M{unit}"
+        return f"{currency} {value:,.0f}{unit}"
+    if metric.value_type == "text" and metric.value_text is not None:
+        return metric.value_text
+    if metric.value_type == "bool" and metric.value_bool is not None:
+        return "✓" if metric.value_bool else "✗"
+    if metric.value_type == "json" and metric.value_json is not None:
+        return json.dumps(metric.value_json)[:50] + "..."
+    return None
+
+
+async def _load_prospect_window(
+    service: CompanyResearchService,
+    tenant_id,
+    run_id: UUID,
+    order_by: str,
+    limit: int,
+    offset: int,
+) -> tuple[list[dict], int]:
+    """
+    Assemble one page of prospects for the run detail view.
+
+    Issues a fixed number of queries regardless of page size: count, prospects
+    (+ batched evidence/source documents), evidence aggregates and latest metrics.
+    """
+    total = await service.count_prospects_for_run(tenant_id, run_id)
+    prospects_list = await service.list_prospects_for_run_with_evidence(
+        tenant_id=tenant_id,
+        run_id=run_id,
+        order_by=order_by,
+        limit=limit,
+        offset=offset,
+    )
+    prospect_ids = [prospect.id for prospect in prospects_list]
+    evidence_summary = await service.summarize_evidence_for_prospects(tenant_id, prospect_ids)
+    metrics_by_prospect = await service.list_latest_metrics_for_prospects(tenant_id, prospect_ids)
+
+    prospects = []
+    for prospect in prospects_list:
+        evidence_details = []
+        for ev in prospect.evidence:
+            evidence_detail = {
+                "id": str(ev.id),
+                "source_type": ev.source_type,
+                "source_name": ev.source_name,
+                "source_url": ev.source_url,
+                "raw_snippet": ev.raw_snippet,
+                "evidence_weight": ev.evidence_weight,
+                "source_document": None
+            }
+            if ev.source_document:
+                evidence_detail["source_document"] = {
+                    "id": str(ev.source_document.id),
+                    "title": ev.source_document.title,
+                    "url": ev.source_document.url,
+                    "content_hash": ev.source_document.content_hash,
+                    "fetched_at": ev.source_document.fetched_at.isoformat() if ev.source_document.fetched_at else None,
+                }
+            evidence_details.append(evidence_detail)
+
+        metrics_dict = {}
+        for metric in metrics_by_prospect.get(prospect.id, []):
+            formatted = _format_metric_value(metric)
+            if formatted is not None:
+                metrics_dict[metric.metric_key] = formatted
+
+        summary = evidence_summary.get(prospect.id) or {}
+        list_sources = summary.get("list_sources") or []
+        prospects.append({
+            "id": str(prospect.id),
+            "name_raw": prospect.name_raw,
+            "name_normalized": prospect.name_normalized,
+            "website_url": prospect.website_url,
+            "hq_city": prospect.hq_city,
+            "hq_country": prospect.hq_country,
+            "sector": prospect.sector,
+            "description": prospect.description,
+            "relevance_score": prospect.relevance_score,
+            "evidence_score": prospect.evidence_score,
+            "manual_priority": prospect.manual_priority,
+            "is_pinned": prospect.is_pinned,
+            "status": prospect.status,
+            "review_status": prospect.review_status,
+            "exec_search_enabled": prospect.exec_search_enabled,
+            "evidence_count": summary.get("evidence_count", 0),
+            "evidence_details": evidence_details,
+            "list_sources": ", ".join(list_sources) if list_sources else "-",
+            "ai_rank": prospect.ai_rank,
+            "ai_score": prospect.ai_score,
+            "metrics": metrics_dict,  # Latest value per metric key
+        })
+
+    return prospects, total
+
+
 @router.get("/ui/company-research", response_class=HTMLResponse)
 async def company_research_list(
     request: Request,
@@ -462,9 +571,13 @@ async def company_research_run_detail(
     error_message: Optional[str] = Query(None),
     exec_discovered_by: Optional[str] = Query(None, description="Filter executive list by provenance"),
     exec_verification_status: Optional[str] = Query(None, description="Filter executives by verification status"),
+    prospect_limit: int = Query(RUN_DETAIL_PROSPECT_PAGE_SIZE, ge=1, le=500),
+    prospect_offset: int = Query(0, ge=0),
 ):
     """
     Company Research Run detail page - shows prospects with sorting.
+
+    Prospects are rendered one window at a time (prospect_limit/prospect_offset).
     """
     service = CompanyResearchService(session)
     
@@ -490,12 +603,14 @@ async def company_research_run_detail(
             "company_name": role_row.company_name,
         }
     
-    # Get prospects with selected ordering
-    prospects_list = await service.list_prospects_for_run_with_evidence(
+    # Prospects: one windowed page plus batched metric/evidence loaders
+    prospects, prospect_total = await _load_prospect_window(
+        service,
         tenant_id=current_user.tenant_id,
         run_id=run_id,
         order_by=order_by,
-        limit=200,
+        limit=prospect_limit,
+        offset=prospect_offset,
     )
 
     eligible_exec_companies = await service.list_executive_eligible_companies(
@@ -521,8 +636,7 @@ async def company_research_run_detail(
     plan, run_steps = await service.ensure_plan_and_steps(current_user.tenant_id, run_id)
     steps_sorted = sorted(run_steps, key=lambda s: s.step_order)
     
-    # Fetch evidence for each prospect to show counts and sources
-    from app.models.company_research import CompanyProspectEvidence, CompanyMetric
+    from app.models.company_research import CompanyMetric, CompanyProspect
     
     # Get all available metric keys for this run (for dynamic sorting dropdown)
     metrics_keys_query = select(CompanyMetric.metric_key).where(
@@ -531,103 +645,26 @@ async def company_research_run_detail(
     ).distinct()
     metrics_keys_result = await session.execute(metrics_keys_query)
     available_metrics = sorted([row[0] for row in metrics_keys_result])
-    
-    prospects = []
-    prospect_lookup = {}
-    for prospect in prospects_list:
-        # Evidence is already loaded via the relationship
-        evidence_list = prospect.evidence
-        prospect_lookup[prospect.id] = prospect
-        
-        # Collect list sources and build evidence details
-        list_sources = set()
-        evidence_details = []
-        
-        for ev in evidence_list:
-            if ev.source_type == "manual_list" and ev.source_name:
-                # Extract just "A" or "B" from "List A" or "List B"
-                if "A" in ev.source_name:
-                    list_sources.add("A")
-                elif "B" in ev.source_name:
-                    list_sources.add("B")
-            
-            # Build evidence detail with source document info
-            evidence_detail = {
-                "id": str(ev.id),
-                "source_type": ev.source_type,
-                "source_name": ev.source_name,
-                "source_url": ev.source_url,
-                "raw_snippet": ev.raw_snippet,
-                "evidence_weight": ev.evidence_weight,
-                "source_document": None
+
+    # Executive groups need status flags for parents outside the current prospect window
+    prospect_lookup = {p["id"]: p for p in prospects}
+    missing_parent_ids = {
+        row.get("company_prospect_id")
+        for row in executive_rows
+        if row.get("company_prospect_id") and str(row.get("company_prospect_id")) not in prospect_lookup
+    }
+    if missing_parent_ids:
+        parent_result = await session.execute(
+            select(CompanyProspect.id, CompanyProspect.status, CompanyProspect.exec_search_enabled).where(
+                CompanyProspect.tenant_id == current_user.tenant_id,
+                CompanyProspect.id.in_(missing_parent_ids),
+            )
+        )
+        for parent_row in parent_result.all():
+            prospect_lookup[str(parent_row.id)] = {
+                "status": parent_row.status,
+                "exec_search_enabled": parent_row.exec_search_enabled,
             }
-            
-            # Add source document details if available
-            if ev.source_document:
-                evidence_detail["source_document"] = {
-                    "id": str(ev.source_document.id),
-                    "title": ev.source_document.title,
-                    "url": ev.source_document.url,
-                    "content_hash": ev.source_document.content_hash,
-                    "fetched_at": ev.source_document.fetched_at.isoformat() if ev.source_document.fetched_at else None,
-                }
-            
-            evidence_details.append(evidence_detail)
-        
-        # Get all metrics for this prospect (we'll display them dynamically)
-        all_metrics_query = select(CompanyMetric).where(
-            CompanyMetric.tenant_id == current_user.tenant_id,
-            CompanyMetric.company_prospect_id == prospect.id,
-        ).order_by(CompanyMetric.metric_key, CompanyMetric.as_of_date.desc().nullslast())
-        
-        all_metrics_result = await session.execute(all_metrics_query)
-        all_metrics = all_metrics_result.scalars().all()
-        
-        # Build metrics dict for easy access
-        metrics_dict = {}
-        for metric in all_metrics:
-            if metric.metric_key not in metrics_dict:
-                # Format the metric value based on type
-                if metric.value_type == "number" and metric.value_number is not None:
-                    value = metric.value_number
-                    currency = metric.value_currency or ""
-                    unit = metric.unit or ""
-                    # Format large numbers with B/M suffixes
-                    if value >= 1_000_000_000:
-                        metrics_dict[metric.metric_key] = f"{currency} {value/1_000_000_000:.1f}B{unit}"
-                    elif value >= 1_000_000:
-                        metrics_dict[metric.metric_key] = f"{currency} {value/1_000_000:.1f}M{unit}"
-                    else:
-                        metrics_dict[metric.metric_key] = f"{currency} {value:,.0f}{unit}"
-                elif metric.value_type == "text" and metric.value_text is not None:
-                    metrics_dict[metric.metric_key] = metric.value_text
-                elif metric.value_type == "bool" and metric.value_bool is not None:
-                    metrics_dict[metric.metric_key] = "✓" if metric.value_bool else "✗"
-                elif metric.value_type == "json" and metric.value_json is not None:
-                    import json
-                    metrics_dict[metric.metric_key] = json.dumps(metric.value_json)[:50] + "..."
-        
-        prospects.append({
-            "id": str(prospect.id),
-            "name_raw": prospect.name_raw,
-            "name_normalized": prospect.name_normalized,
-            "website_url": prospect.website_url,
-            "hq_city": prospect.hq_city,
-            "hq_country": prospect.hq_country,
-            "sector": prospect.sector,
-            "description": prospect.description,
-            "relevance_score": prospect.relevance_score,
-            "evidence_score": prospect.evidence_score,
-            "manual_priority": prospect.manual_priority,
-            "is_pinned": prospect.is_pinned,
-            "status": prospect.status,
-            "evidence_count": len(evidence_list),
-            "evidence_details": evidence_details,
-            "list_sources": ", ".join(sorted(list_sources)) if list_sources else "-",
-            "ai_rank": prospect.ai_rank,
-            "ai_score": prospect.ai_score,
-            "metrics": metrics_dict,  # All metrics for this prospect
-        })
 
     def _merge_provenance(current: Optional[str], incoming: Optional[str]) -> Optional[str]:
         if not incoming:
@@ -652,7 +689,7 @@ async def company_research_run_detail(
 
     exec_groups = {}
     for exec_row in executive_rows:
-        parent = prospect_lookup.get(exec_row.get("company_prospect_id"))
+        parent = prospect_lookup.get(str(exec_row.get("company_prospect_id"))) or {}
         group = exec_groups.setdefault(
             exec_row.get("company_prospect_id"),
             {
@@ -661,8 +698,8 @@ async def company_research_run_detail(
                 "canonical_company_id": exec_row.get("canonical_company_id"),
                 "verification_status": exec_row.get("verification_status"),
                 "discovered_by": exec_row.get("discovered_by"),
-                "status": getattr(parent, "status", None),
-                "exec_search_enabled": getattr(parent, "exec_search_enabled", None),
+                "status": parent.get("status"),
+                "exec_search_enabled": parent.get("exec_search_enabled"),
                 "executives": [],
             },
         )
@@ -775,6 +812,17 @@ async def company_research_run_detail(
         }
     )
 
+    prospect_page_params = {
+        k: v
+        for k, v in {
+            "order_by": order_by,
+            "exec_discovered_by": exec_discovered_by,
+            "exec_verification_status": exec_verification_status,
+            "prospect_limit": prospect_limit,
+        }.items()
+        if v not in {None, ""}
+    }
+
     export_pack_rows = [
         {
             "id": str(rec.id),
@@ -803,6 +851,17 @@ async def company_research_run_detail(
             },
             "role_info": role_info,
             "prospects": prospects,
+            "prospect_total": prospect_total,
+            "prospect_limit": prospect_limit,
+            "prospect_offset": prospect_offset,
+            "prospect_current_page": (prospect_offset // prospect_limit) + 1,
+            "prospect_total_pages": max(1, (prospect_total + prospect_limit - 1) // prospect_limit),
+            "prospect_prev_url": urlencode(
+                {**prospect_page_params, "prospect_offset": max(0, prospect_offset - prospect_limit)}
+            ),
+            "prospect_next_url": urlencode(
+                {**prospect_page_params, "prospect_offset": prospect_offset + prospect_limit}
+            ),
             "sources": sources,
             "plan": plan_context,
             "steps": steps_context,
@@ -842,6 +901,30 @@ async def company_research_run_detail(
     )
 
 
+@router.get("/ui/company-research/runs/{run_id}/events/stream")
+async def company_research_run_event_stream(
+    request: Request,
+    run_id: UUID,
+    last_event_id: Optional[str] = Query(None, description="Resume after this event (the Last-Event-ID header wins)"),
+    current_user: UIUser = Depends(get_current_ui_user_and_tenant),
+    session: AsyncSession = Depends(get_db),
+):
+    """Live run progress for the run detail page (server-sent events)."""
+    service = CompanyResearchService(session)
+    run = await service.get_research_run(current_user.tenant_id, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Research run not found")
+    return StreamingResponse(
+        stream_run_events(
+            str(current_user.tenant_id),
+            run_id,
+            last_event_id=request.headers.get("last-event-id") or last_event_id,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/ui/company-research/prospects/{prospect_id}/update-manual")
 async def update_prospect_manual_ui(
     prospect_id: UUID,
@@ -1,17 +1,20 @@
 """
 Dashboard route for UI.
+
+The four panels are loaded concurrently, each on its own pooled session, and
+cached per tenant for a few seconds (see app/core/dashboard_cache.py).
 """
 
-from datetime import datetime
-from typing import List, Dict, Any
+import asyncio
+from typing import Any, Callable, Dict, List
 
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_db
+from app.core.dashboard_cache import dashboard_cache
+from app.db.session import AsyncSessionLocal
 from app.ui.dependencies import get_current_ui_user_and_tenant, UIUser
 from app.models.role import Role
 from app.models.company import Company
@@ -19,61 +22,47 @@ from app.models.candidate import Candidate
 from app.models.candidate_assignment import CandidateAssignment
 from app.models.task import Task
 from app.models.bd_opportunity import BDOpportunity
+from app.ui.templating import templates
 
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/ui/templates")
 
 
-@router.get("/dashboard", response_class=HTMLResponse)
-async def dashboard(
-    request: Request,
-    current_user: UIUser = Depends(get_current_ui_user_and_tenant),
-    session: AsyncSession = Depends(get_db),
-):
-    """
-    Dashboard home screen with tables showing active work.
-    """
-    
-    # A. My Active Roles
-    # Get roles with candidate counts
+async def _load_active_roles(session: AsyncSession, tenant_id) -> List[Dict[str, Any]]:
+    """A. My Active Roles, with the trigger-maintained candidate count."""
+    # Columns rather than the Role entity: Role eager-loads its activity logs.
     roles_query = (
         select(
-            Role,
+            Role.id,
+            Role.title,
+            Role.status,
+            Role.candidate_count,
+            Role.updated_at,
             Company.name.label("company_name"),
-            func.count(CandidateAssignment.id).label("candidate_count")
         )
-        .join(Company, and_(Company.id == Role.company_id, Company.tenant_id == current_user.tenant_id))
-        .outerjoin(
-            CandidateAssignment,
-            and_(
-                CandidateAssignment.role_id == Role.id,
-                CandidateAssignment.tenant_id == current_user.tenant_id
-            )
-        )
-        .where(Role.tenant_id == current_user.tenant_id)
-        .group_by(Role.id, Company.name)
+        .join(Company, and_(Company.id == Role.company_id, Company.tenant_id == tenant_id))
+        .where(Role.tenant_id == tenant_id)
         .order_by(Role.updated_at.desc())
         .limit(10)
     )
     
     roles_result = await session.execute(roles_query)
-    roles_rows = roles_result.all()
     
     active_roles = []
-    for row in roles_rows:
-        role = row[0]
+    for row in roles_result.all():
         active_roles.append({
-            "id": role.id,
-            "title": role.title,
+            "id": row.id,
+            "title": row.title,
             "company_name": row.company_name,
-            "status": role.status,
+            "status": row.status,
             "candidate_count": row.candidate_count,
-            "updated_at": role.updated_at,
+            "updated_at": row.updated_at,
         })
-    
-    # B. Candidates Requiring Action
-    # Get candidate assignments that are in process (not PLACED or REJECTED)
+    return active_roles
+
+
+async def _load_action_candidates(session: AsyncSession, tenant_id) -> List[Dict[str, Any]]:
+    """B. Candidate assignments that are in process (not PLACED or REJECTED)."""
     action_query = (
         select(
             CandidateAssignment,
@@ -81,10 +70,10 @@ async def dashboard(
             Candidate.last_name,
             Role.title.label("role_title"),
         )
-        .join(Candidate, and_(Candidate.id == CandidateAssignment.candidate_id, Candidate.tenant_id == current_user.tenant_id))
-        .join(Role, and_(Role.id == CandidateAssignment.role_id, Role.tenant_id == current_user.tenant_id))
+        .join(Candidate, and_(Candidate.id == CandidateAssignment.candidate_id, Candidate.tenant_id == tenant_id))
+        .join(Role, and_(Role.id == CandidateAssignment.role_id, Role.tenant_id == tenant_id))
         .where(
-            CandidateAssignment.tenant_id == current_user.tenant_id,
+            CandidateAssignment.tenant_id == tenant_id,
             CandidateAssignment.status.not_in(["PLACED", "REJECTED"])
         )
         .order_by(CandidateAssignment.updated_at.desc())
@@ -92,10 +81,9 @@ async def dashboard(
     )
     
     action_result = await session.execute(action_query)
-    action_rows = action_result.all()
     
     action_candidates = []
-    for row in action_rows:
+    for row in action_result.all():
         assignment = row[0]
         action_candidates.append({
             "candidate_id": assignment.candidate_id,
@@ -106,13 +94,15 @@ async def dashboard(
             "is_hot": assignment.is_hot,
             "last_interaction": assignment.updated_at,
         })
-    
-    # C. My Tasks
-    # Get tasks assigned to current user
+    return action_candidates
+
+
+async def _load_my_tasks(session: AsyncSession, tenant_id) -> List[Dict[str, Any]]:
+    """C. My Tasks."""
     tasks_query = (
         select(Task)
         .where(
-            Task.tenant_id == current_user.tenant_id,
+            Task.tenant_id == tenant_id,
             # For now, show all tasks; later can filter by assigned_to_user
         )
         .order_by(Task.due_date.asc().nulls_last())
@@ -120,10 +110,9 @@ async def dashboard(
     )
     
     tasks_result = await session.execute(tasks_query)
-    tasks = tasks_result.scalars().all()
     
     my_tasks = []
-    for task in tasks:
+    for task in tasks_result.scalars().all():
         # Try to resolve related entity name (simplified)
         related_entity_name = None
         if task.related_entity_type and task.related_entity_id:
@@ -137,22 +126,23 @@ async def dashboard(
             "due_date": task.due_date,
             "status": task.status,
         })
-    
-    # D. BD Snapshot
-    # Get active BD opportunities
+    return my_tasks
+
+
+async def _load_bd_opportunities(session: AsyncSession, tenant_id) -> List[Dict[str, Any]]:
+    """D. BD Snapshot: the most recently updated BD opportunities."""
     bd_query = (
         select(BDOpportunity, Company.name.label("company_name"))
-        .join(Company, and_(Company.id == BDOpportunity.company_id, Company.tenant_id == current_user.tenant_id))
-        .where(BDOpportunity.tenant_id == current_user.tenant_id)
+        .join(Company, and_(Company.id == BDOpportunity.company_id, Company.tenant_id == tenant_id))
+        .where(BDOpportunity.tenant_id == tenant_id)
         .order_by(BDOpportunity.updated_at.desc())
         .limit(10)
     )
     
     bd_result = await session.execute(bd_query)
-    bd_rows = bd_result.all()
     
     bd_opportunities = []
-    for row in bd_rows:
+    for row in bd_result.all():
         opp = row[0]
         bd_opportunities.append({
             "company_name": row.company_name,
@@ -162,6 +152,47 @@ async def dashboard(
             "probability": opp.probability or 0,
             "updated_at": opp.updated_at,
         })
+    return bd_opportunities
+
+
+PANEL_LOADERS = {
+    "active_roles": _load_active_roles,
+    "action_candidates": _load_action_candidates,
+    "my_tasks": _load_my_tasks,
+    "bd_opportunities": _load_bd_opportunities,
+}
+
+
+async def load_dashboard_panels(
+    tenant_id,
+    session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Return the tenant's dashboard panels, from the cache or loaded concurrently."""
+    cached = dashboard_cache.get(tenant_id)
+    if cached is not None:
+        return cached
+    generation = dashboard_cache.generation(tenant_id)
+    
+    async def _load(loader):
+        # An AsyncSession runs one statement at a time, so each panel gets its own.
+        async with session_factory() as session:
+            return await loader(session, tenant_id)
+    
+    results = await asyncio.gather(*(_load(loader) for loader in PANEL_LOADERS.values()))
+    panels = dict(zip(PANEL_LOADERS, results))
+    dashboard_cache.put(tenant_id, panels, generation)
+    return panels
+
+
+@router.get("/dashboard", response_class=HTMLResponse)
+async def dashboard(
+    request: Request,
+    current_user: UIUser = Depends(get_current_ui_user_and_tenant),
+):
+    """
+    Dashboard home screen with tables showing active work.
+    """
+    panels = await load_dashboard_panels(current_user.tenant_id)
     
     return templates.TemplateResponse(
         "dashboard.html",
@@ -169,9 +200,6 @@ async def dashboard(
             "request": request,
             "current_user": current_user,
             "active_page": "dashboard",
-            "active_roles": active_roles,
-            "action_candidates": action_candidates,
-            "my_tasks": my_tasks,
-            "bd_opportunities": bd_opportunities,
+            **panels,
         }
     )
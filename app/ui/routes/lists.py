@@ -1,6 +1,5 @@
 from fastapi import APIRouter, Depends, Request, Form, Query
 from fastapi.responses import RedirectResponse
-from fastapi.templating import Jinja2Templates
 from app.ui.dependencies import get_current_ui_user_and_tenant, UIUser
 from app.core.dependencies import get_db
 from app.core.permissions import raise_if_not_roles, Roles
@@ -13,12 +12,12 @@ from app.schemas.list import ListCreate, ListUpdate
 from app.schemas.list_item import ListItemCreate
 from app.repositories.list_repository import ListRepository
 from app.repositories.list_item_repository import ListItemRepository
+from app.ui.templating import templates
 from typing import Optional
 from uuid import UUID
 import uuid
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/ui/templates")
 
 
 @router.get("/ui/lists")
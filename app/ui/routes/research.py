@@ -4,7 +4,6 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -19,9 +18,9 @@ from app.services.integration_settings_service import IntegrationSettingsService
 from app.services.discovery_provider import ExternalProviderConfigError, get_discovery_provider
 from app.ui.dependencies import get_current_ui_user_and_tenant, UIUser
 from app.schemas.company_research import CompanyResearchRunCreate, CompanyProspectUpdateManual
+from app.ui.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/ui/templates")
 
 
 async def _discovery_config_status(session: AsyncSession, tenant_id: UUID) -> tuple[dict, dict]:
@@ -8,16 +8,15 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, Request, Form, File, HTTPException, UploadFile
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.dependencies import get_db
 from app.ui.dependencies import get_current_ui_user_and_tenant, UIUser
 from app.services.research_run_service import ResearchRunService
 from app.schemas.research_run import ResearchRunCreate, RunBundleV1
+from app.ui.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/ui/templates")
 
 
 @router.get("/ui/research/upload", response_class=HTMLResponse)
@@ -9,7 +9,6 @@ from datetime import datetime
 
 from fastapi import APIRouter, Depends, Request, Query, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy import select, func, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -24,10 +23,10 @@ from app.models.pipeline_stage import PipelineStage
 from app.repositories.candidate_assignment_repository import CandidateAssignmentRepository
 from app.repositories.role_repository import RoleRepository
 from app.schemas.role import RoleCreate, RoleUpdate
+from app.ui.templating import templates
 
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/ui/templates")
 
 
 @router.get("/ui/roles", response_class=HTMLResponse)
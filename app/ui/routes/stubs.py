@@ -5,7 +5,6 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request, status
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.dependencies import get_db
@@ -13,10 +12,10 @@ from app.errors import AppError
 from app.services.integration_settings_service import IntegrationSettingsService
 from app.services.secrets_service import require_master_key, set_runtime_master_key
 from app.ui.dependencies import UIUser, get_current_ui_user_and_tenant
+from app.ui.templating import templates
 
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/ui/templates")
 
 
 def _ensure_admin(user: UIUser) -> None:
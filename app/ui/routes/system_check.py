@@ -7,7 +7,6 @@ to verify the system is working correctly.
 
 from fastapi import APIRouter, Request, Depends
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
@@ -18,9 +17,9 @@ from app.schemas.company_research import (
     CompanyResearchRunCreate,
     CompanyProspectCreate,
 )
+from app.ui.templating import templates
 
 router = APIRouter(tags=["ui-system-check"])
-templates = Jinja2Templates(directory="app/ui/templates")
 
 
 async def run_diagnostic_checks(db: AsyncSession, tenant_id: str, role_id: str = None):
@@ -1,6 +1,5 @@
 from fastapi import APIRouter, Depends, Request, Form, Query
 from fastapi.responses import RedirectResponse
-from fastapi.templating import Jinja2Templates
 from app.ui.dependencies import get_current_ui_user_and_tenant, UIUser
 from app.core.dependencies import get_db
 from app.core.permissions import raise_if_not_roles, Roles
@@ -13,13 +12,13 @@ from app.models.company import Company
 from app.models.contact import Contact
 from app.schemas.task import TaskCreate, TaskUpdate
 from app.repositories.task_repository import TaskRepository
+from app.ui.templating import templates
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
 import uuid
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/ui/templates")
 
 
 @router.get("/ui/tasks")
@@ -0,0 +1,57 @@
+"""
+Shared Jinja2 template environment for the UI routes.
+
+Every UI route module renders through the one ``templates`` object here, so
+each template is parsed and compiled once per process rather than once per
+route module. Compiled templates are also written to a filesystem bytecode
+cache (UI_TEMPLATE_CACHE_DIR, default: Jinja's per-user temp directory), so a
+fresh process loads bytecode instead of re-parsing templates; run
+``python scripts/maintenance/precompile_templates.py`` at build time to fill
+the cache before the first request.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+import jinja2
+from fastapi.templating import Jinja2Templates
+
+from app.core.config import settings
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+
+
+def build_template_environment(
+    bytecode_cache: bool = True,
+    cache_dir: Optional[str] = None,
+) -> jinja2.Environment:
+    """Environment with the same loader and autoescaping as Jinja2Templates(directory=...)."""
+    cache = None
+    if bytecode_cache:
+        if cache_dir:
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+            cache = jinja2.FileSystemBytecodeCache(cache_dir)
+        else:
+            cache = jinja2.FileSystemBytecodeCache()
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(str(TEMPLATE_DIR)),
+        autoescape=True,
+        bytecode_cache=cache,
+    )
+
+
+def precompile_templates(env: Optional[jinja2.Environment] = None) -> int:
+    """Load every template so its bytecode is cached. Returns the number of templates loaded."""
+    env = env or templates.env
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+
+templates = Jinja2Templates(
+    env=build_template_environment(
+        bytecode_cache=settings.UI_TEMPLATE_BYTECODE_CACHE,
+        cache_dir=settings.UI_TEMPLATE_CACHE_DIR,
+    )
+)
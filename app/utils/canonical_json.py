@@ -1,38 +1,192 @@
 """
 Deterministic JSON serialization utilities.
 
-Used for hashing enrichment payloads to enforce idempotency.
+Every content hash, idempotency key and cache key in the app is the SHA-256 of
+one canonical form:
+
+- object keys sorted by code point, separators ``,`` and ``:`` with no
+  whitespace;
+- ASCII only: every character outside ``\\x20``-``\\x7e`` is escaped the way
+  ``json.dumps(ensure_ascii=True)`` escapes it (lower-case ``\\uXXXX``,
+  surrogate pairs above the BMP);
+- numbers as ``json.dumps`` writes them (``repr`` for floats, so ``1e-05`` and
+  ``1e+16``); NaN and infinities are not JSON and encode as ``null``;
+- tuples encode as arrays, sets and frozensets as sorted arrays, enums as their
+  value; any other non-JSON value (datetime, date, UUID, Decimal, ...) encodes
+  as the string ``str(value)``;
+- the hash is taken over the UTF-8 (ASCII) bytes of that text.
+
+``orjson`` is used when installed. Its output only reaches callers when it is
+byte-identical to the stdlib form: payloads holding integers beyond 64 bits,
+non-string keys or floats that orjson writes differently (exponents and values
+below 1e-4: ``1e16`` / ``1e+16``, ``0.00001`` / ``1e-05``) are re-encoded with
+the stdlib encoder, and non-ASCII output is escaped afterwards.
+tests/test_canonical_json.py checks both paths against each other and against
+the older ``json.dumps(..., default=str)`` call sites this module replaced.
 """
 
+import codecs
 import hashlib
 import json
-from datetime import date, datetime
-from decimal import Decimal
-from typing import Any
+import math
+import re
+from dataclasses import dataclass
+from enum import Enum
+from functools import cached_property
+from json.encoder import encode_basestring_ascii
+from typing import Any, Iterator
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is not installed
+    orjson = None
+
+# Containers nested this deep or less are walked by iter_canonical_bytes; deeper values are encoded in one call.
+STREAM_DEPTH = 2
+
+_ESCAPE_ERRORS = "canonical_json.escape"
+# Where orjson's float text differs from repr(); matches inside strings only cost a stdlib re-encode.
+_SMALL_FLOAT = b"0.0000"
+_FLOAT_EXPONENT = re.compile(rb"e(?<=[0-9]e)(?=-?[0-9])")
 
 
 def _canonical_default(value: Any) -> Any:
     """Serialize unsupported types into stable JSON-friendly values."""
-    if isinstance(value, (datetime, date)):
-        return value.isoformat()
-    if isinstance(value, Decimal):
+    if isinstance(value, float):  # float subclasses (numpy.float64) encode as plain floats
         return float(value)
-    if isinstance(value, set):
+    if isinstance(value, tuple):  # named tuples encode as arrays
+        return list(value)
+    if isinstance(value, (set, frozenset)):
         return sorted(value)
-    raise TypeError(f"Type {type(value)} not serializable")
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+_ENCODER = json.JSONEncoder(
+    sort_keys=True,
+    separators=(",", ":"),
+    default=_canonical_default,
+    ensure_ascii=True,
+    allow_nan=False,
+)
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+def _finite(value: Any) -> Any:
+    """``value`` with NaN and infinities replaced by None (the stdlib encoder rejects them)."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def _escape_non_ascii(error: UnicodeEncodeError) -> "tuple[str, int]":
+    return encode_basestring_ascii(error.object[error.start : error.end])[1:-1], error.end
+
+
+codecs.register_error(_ESCAPE_ERRORS, _escape_non_ascii)
+
+
+def _stdlib_bytes(value: Any) -> bytes:
+    try:
+        text = _ENCODER.encode(value)
+    except ValueError as exc:
+        if not str(exc).startswith("Out of range float"):
+            raise
+        text = _ENCODER.encode(_finite(value))
+    return text.encode("ascii")
+
+
+def _orjson_bytes(value: Any) -> "bytes | None":
+    """orjson output when it matches the canonical form, else None."""
+    try:
+        data = orjson.dumps(value, default=_canonical_default, option=_ORJSON_OPTIONS)
+    except TypeError:  # orjson.JSONEncodeError: 64-bit overflow, non-str keys, lone surrogates, cycles
+        return None
+    if _SMALL_FLOAT in data or _FLOAT_EXPONENT.search(data):
+        return None
+    if not data.isascii():
+        data = data.decode("utf-8").encode("ascii", _ESCAPE_ERRORS)
+    if b"\x7f" in data:  # only ever inside strings
+        data = data.replace(b"\x7f", b"\\u007f")
+    return data
+
+
+def canonical_bytes(value: Any) -> bytes:
+    """Canonical JSON of ``value`` as ASCII bytes (see the module docstring)."""
+    if orjson is not None:
+        data = _orjson_bytes(value)
+        if data is not None:
+            return data
+    return _stdlib_bytes(value)
 
 
 def canonical_dumps(value: Any) -> str:
     """Return deterministic JSON with sorted keys and tight separators."""
-    return json.dumps(
-        value,
-        sort_keys=True,
-        separators=(",", ":"),
-        default=_canonical_default,
-        ensure_ascii=True,
-    )
-
-
-def canonical_hash(value: Any) -> str:
-    """Compute SHA-256 hash of canonical JSON representation."""
-    return hashlib.sha256(canonical_dumps(value).encode("utf-8")).hexdigest()
\ No newline at end of file
+    return canonical_bytes(value).decode("ascii")
+
+
+def iter_canonical_bytes(value: Any, depth: int = STREAM_DEPTH) -> Iterator[bytes]:
+    """Yield the canonical form of ``value`` in pieces; joined they equal ``canonical_bytes(value)``.
+
+    Objects and arrays down to ``depth`` levels are walked and each member is
+    encoded on its own, so a large list of records never exists as one string.
+    """
+    if depth > 0 and isinstance(value, dict) and all(isinstance(key, str) for key in value):
+        yield b"{"
+        for index, key in enumerate(sorted(value)):
+            yield (b"," if index else b"") + canonical_bytes(key) + b":"
+            yield from iter_canonical_bytes(value[key], depth - 1)
+        yield b"}"
+    elif depth > 0 and isinstance(value, (list, tuple)):
+        yield b"["
+        for index, item in enumerate(value):
+            if index:
+                yield b","
+            yield from iter_canonical_bytes(item, depth - 1)
+        yield b"]"
+    else:
+        yield canonical_bytes(value)
+
+
+def canonical_hash(value: Any, stream: bool = False) -> str:
+    """Compute SHA-256 hash of canonical JSON representation.
+
+    With ``stream=True`` the payload is hashed piece by piece
+    (``iter_canonical_bytes``) instead of being encoded in one string first.
+    """
+    if not stream:
+        return hashlib.sha256(canonical_bytes(value)).hexdigest()
+    digest = hashlib.sha256()
+    for chunk in iter_canonical_bytes(value):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class CanonicalPayload:
+    """A payload encoded once to its canonical bytes; text and hash are derived on first use and cached.
+
+    Use it where the same payload is both stored and hashed, or hashed more
+    than once, instead of encoding it at each step.
+    """
+
+    data: bytes
+
+    @classmethod
+    def of(cls, value: Any) -> "CanonicalPayload":
+        return cls(canonical_bytes(value))
+
+    @cached_property
+    def text(self) -> str:
+        return self.data.decode("ascii")
+
+    @cached_property
+    def sha256(self) -> str:
+        return hashlib.sha256(self.data).hexdigest()
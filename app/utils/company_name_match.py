@@ -0,0 +1,258 @@
+"""Blocking keys and similarity scoring for fuzzy company-name matching.
+
+Names are reduced to match tokens (accents folded, punctuation and "&" split
+off, stopwords and trailing legal-form tokens such as "SAOG" or "Ltd" dropped)
+and a compact form (the tokens joined without spaces), so "Bank Muscat SAOG",
+"BankMuscat" and "Bank of Muscat" all compact to "bankmuscat".
+
+Blocking keys are stored on ``company_prospects.name_match_keys`` behind a GIN
+index:
+
+- ``n:<compact>``: the compact name, an exact-match key;
+- ``s:<sorted tokens>``: the tokens in sorted order, so word order does not
+  matter ("Muscat Bank" / "Bank Muscat");
+- ``t:<token>``: each token of three or more characters;
+- ``b:<band>:<hash>``: MinHash/LSH band keys over character trigrams of the
+  compact name (see ``app.utils.minhash``), catching misspellings and joined or
+  split words.
+
+Only names sharing a name or sorted-token key, or at least ``min_shared_keys``
+keys of any kind, are scored, and blocks larger than ``max_block`` (a token such
+as "bank" shared by hundreds of prospects) are skipped, so a pass costs at most
+``max_block`` comparisons per name instead of one per pair.
+Scores are the larger of Jaro-Winkler on the compact forms and the Jaccard
+similarity of the token sets; names whose numeric tokens differ ("Fund 2019" /
+"Fund 2020") are scored on the token sets alone.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+from app.utils.minhash import lsh_band_keys, minhash_signature
+
+NAME_KEY_PREFIX = "n:"
+SORTED_KEY_PREFIX = "s:"
+TOKEN_KEY_PREFIX = "t:"
+BAND_KEY_PREFIX = "b:"
+
+NAME_NUM_PERM = 18
+NAME_LSH_BANDS = 6
+NAME_SHINGLE_SIZE = 3
+MIN_TOKEN_KEY_LENGTH = 3
+DEFAULT_MAX_BLOCK = 200
+# One shared band or token key alone is mostly chance on short names; see benchmarks/bench_name_match.py.
+DEFAULT_MIN_SHARED_KEYS = 2
+
+# Trailing legal-form tokens, dropped repeatedly ("Acme Holdings Co. Ltd" -> "acme").
+LEGAL_SUFFIXES = frozenset(
+    {
+        "ag", "bsc", "bv", "co", "company", "corp", "corporation", "gmbh", "group", "holding",
+        "holdings", "inc", "incorporated", "kg", "kpsc", "kscp", "limited", "llc", "lp", "ltd",
+        "nv", "pjsc", "plc", "psc", "qpsc", "qsc", "sa", "saog", "saoc", "sas", "spa", "srl",
+    }
+)
+STOPWORDS = frozenset({"and", "of", "the"})
+
+_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+def match_tokens(name: Optional[str]) -> List[str]:
+    """Tokens a name is matched on; empty for a blank name."""
+    if not name:
+        return []
+    folded = unicodedata.normalize("NFKD", name)
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch)).lower().replace("&", " and ")
+    # "S.A.O.G." and "L.L.C." lose their dots before splitting so they read as one token.
+    folded = re.sub(r"\b((?:[a-z]\.){2,})", lambda m: m.group(1).replace(".", ""), folded)
+    tokens = [token for token in _SPLIT.split(folded) if token]
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    kept = [token for token in tokens if token not in STOPWORDS]
+    return kept or tokens
+
+
+def compact_name(tokens: Sequence[str]) -> str:
+    return "".join(tokens)
+
+
+def name_match_keys(name: Optional[str]) -> List[str]:
+    """Blocking keys for a name (sorted, no duplicates); empty for a blank name."""
+    tokens = match_tokens(name)
+    if not tokens:
+        return []
+    compact = compact_name(tokens)
+    keys = {NAME_KEY_PREFIX + compact, SORTED_KEY_PREFIX + compact_name(sorted(tokens))}
+    keys.update(TOKEN_KEY_PREFIX + token for token in tokens if len(token) >= MIN_TOKEN_KEY_LENGTH)
+    signature = minhash_signature(list(compact), num_perm=NAME_NUM_PERM, shingle_size=NAME_SHINGLE_SIZE)
+    keys.update(BAND_KEY_PREFIX + key for key in lsh_band_keys(signature, NAME_LSH_BANDS))
+    return sorted(keys)
+
+
+def lookup_keys(keys: Iterable[str]) -> List[str]:
+    """The keys used to look up candidates for a single name.
+
+    Token keys are left out: one common token would pull in a large share of
+    the tenant's prospects, and the name, sorted-token and band keys already
+    cover word order and spelling variants. Bulk passes use all keys with block size capping instead.
+    """
+    return [key for key in keys if not key.startswith(TOKEN_KEY_PREFIX)]
+
+
+def jaro_winkler(left: str, right: str, prefix_weight: float = 0.1) -> float:
+    if left == right:
+        return 1.0 if left else 0.0
+    if not left or not right:
+        return 0.0
+    window = max(len(left), len(right)) // 2 - 1
+    left_matched = [False] * len(left)
+    right_matched = [False] * len(right)
+    matches = 0
+    for i, ch in enumerate(left):
+        end = min(len(right), i + window + 1)
+        j = right.find(ch, max(0, i - window), end)
+        while j != -1 and right_matched[j]:
+            j = right.find(ch, j + 1, end)
+        if j != -1:
+            left_matched[i] = right_matched[j] = True
+            matches += 1
+    if not matches:
+        return 0.0
+    left_chars = [ch for ch, hit in zip(left, left_matched) if hit]
+    right_chars = [ch for ch, hit in zip(right, right_matched) if hit]
+    transpositions = sum(1 for a, b in zip(left_chars, right_chars) if a != b) / 2
+    jaro = (matches / len(left) + matches / len(right) + (matches - transpositions) / matches) / 3
+    prefix = 0
+    for a, b in zip(left[:4], right[:4]):
+        if a != b:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_weight * (1 - jaro)
+
+
+def token_set_similarity(left: Sequence[str], right: Sequence[str]) -> float:
+    left_set, right_set = set(left), set(right)
+    if not left_set or not right_set:
+        return 0.0
+    return len(left_set & right_set) / len(left_set | right_set)
+
+
+def tokens_similarity(left: Sequence[str], right: Sequence[str]) -> float:
+    token_score = token_set_similarity(left, right)
+    if {t for t in left if any(c.isdigit() for c in t)} != {t for t in right if any(c.isdigit() for c in t)}:
+        return token_score
+    return max(jaro_winkler(compact_name(left), compact_name(right)), token_score)
+
+
+def name_similarity(left: Optional[str], right: Optional[str]) -> float:
+    """Similarity of two company names in [0, 1]; 1.0 when they share a compact form."""
+    return tokens_similarity(match_tokens(left), match_tokens(right))
+
+
+def best_name_match(
+    name: str,
+    candidates: Iterable[Tuple[Hashable, Optional[str]]],
+    threshold: float,
+) -> Optional[Tuple[Hashable, float]]:
+    """The (id, score) of the most similar candidate scoring at least ``threshold``.
+
+    Ties go to the earliest candidate, so callers pass candidates oldest first.
+    """
+    tokens = match_tokens(name)
+    if not tokens:
+        return None
+    best: Optional[Tuple[Hashable, float]] = None
+    for candidate_id, candidate_name in candidates:
+        score = tokens_similarity(tokens, match_tokens(candidate_name))
+        if score >= threshold and (best is None or score > best[1]):
+            best = (candidate_id, score)
+    return best
+
+
+@dataclass(frozen=True)
+class NameMatch:
+    left_id: Hashable
+    right_id: Hashable
+    score: float
+    shared_keys: int
+
+
+def find_probable_duplicates(
+    names: Iterable[Tuple[Hashable, Optional[str], Optional[Sequence[str]]]],
+    threshold: float,
+    max_block: int = DEFAULT_MAX_BLOCK,
+    min_shared_keys: int = DEFAULT_MIN_SHARED_KEYS,
+) -> List[NameMatch]:
+    """Pairs of names scoring at least ``threshold`` among those sharing blocking keys.
+
+    ``names`` yields (id, name, stored keys or None); missing keys are computed.
+    Each pair is scored once and reported with ``left_id`` the earlier of the
+    two in input order. Results are sorted by descending score.
+    """
+    order: Dict[Hashable, int] = {}
+    tokens: Dict[Hashable, List[str]] = {}
+    blocks: Dict[str, List[Hashable]] = defaultdict(list)
+    for item_id, name, keys in names:
+        if item_id in order:
+            continue
+        item_tokens = match_tokens(name)
+        if not item_tokens:
+            continue
+        order[item_id] = len(order)
+        tokens[item_id] = item_tokens
+        for key in keys if keys is not None else name_match_keys(name):
+            blocks[key].append(item_id)
+
+    shared: Dict[Tuple[Hashable, Hashable], int] = defaultdict(int)
+    exact: Set[Tuple[Hashable, Hashable]] = set()
+    for key, members in blocks.items():
+        if len(members) < 2 or len(members) > max_block:
+            continue
+        is_exact = key.startswith((NAME_KEY_PREFIX, SORTED_KEY_PREFIX))
+        for i, left in enumerate(members):
+            for right in members[i + 1 :]:
+                shared[(left, right)] += 1
+                if is_exact:
+                    exact.add((left, right))
+
+    matches = []
+    for (left, right), count in shared.items():
+        if count < min_shared_keys and (left, right) not in exact:
+            continue
+        score = tokens_similarity(tokens[left], tokens[right])
+        if score >= threshold:
+            matches.append(NameMatch(left, right, round(score, 4), count))
+    matches.sort(key=lambda m: (-m.score, order[m.left_id], order[m.right_id]))
+    return matches
+
+
+def cluster_matches(matches: Iterable[NameMatch]) -> List[List[Hashable]]:
+    """Connected groups of matched ids (union-find), each in first-seen order."""
+    parent: Dict[Hashable, Hashable] = {}
+    seen: List[Hashable] = []
+
+    def _find(item: Hashable) -> Hashable:
+        if item not in parent:
+            parent[item] = item
+            seen.append(item)
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    for match in matches:
+        left, right = _find(match.left_id), _find(match.right_id)
+        if left != right:
+            parent[right] = left
+
+    groups: Dict[Hashable, List[Hashable]] = defaultdict(list)
+    for item in seen:
+        groups[_find(item)].append(item)
+    return [members for members in groups.values() if len(members) > 1]
+
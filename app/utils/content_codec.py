@@ -0,0 +1,120 @@
+"""Compression codecs for stored source payloads.
+
+``source_documents.content_codec`` names the codec a row's ``content_bytes``
+and ``content_text_packed`` are compressed with; NULL means the payloads are
+stored raw (``content_text`` holds the text), which is how rows written before
+compression and payloads below the size threshold are kept.
+``ResearchSourceDocument.content_bytes`` / ``.content_text`` encode and decode
+transparently.
+
+zstd needs the optional ``zstandard`` package. Without it ``resolve_codec``
+writes stdlib gzip instead, and reading a zstd row raises
+``CodecUnavailableError``.
+"""
+
+from __future__ import annotations
+
+import gzip
+import zlib
+from typing import Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional dependency, see module docstring
+    zstandard = None
+
+CODEC_ZSTD = "zstd"
+CODEC_GZIP = "gzip"
+CODECS = (CODEC_ZSTD, CODEC_GZIP)
+ZSTD_LEVEL = 3
+GZIP_LEVEL = 6
+# zstd's decompressobj has no output limit, so input is fed to it in slices of this size.
+ZSTD_INPUT_SLICE = 64 * 1024
+
+
+class CodecUnavailableError(RuntimeError):
+    """The row was written with a codec this process cannot decode."""
+
+
+def resolve_codec(name: Optional[str]) -> Optional[str]:
+    """The codec to write with for a configured name ("zstd", "gzip", "none"); None stores raw."""
+    name = (name or "").strip().lower()
+    if name in ("", "none", "identity"):
+        return None
+    if name not in CODECS:
+        raise ValueError(f"unknown_content_codec:{name}")
+    if name == CODEC_ZSTD and zstandard is None:
+        return CODEC_GZIP
+    return name
+
+
+def compress(data: bytes, codec: Optional[str]) -> bytes:
+    if codec is None:
+        return data
+    if codec == CODEC_ZSTD:
+        _require_zstd()
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if codec == CODEC_GZIP:
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"unknown_content_codec:{codec}")
+
+
+def decompress(data: bytes, codec: Optional[str]) -> bytes:
+    if codec is None:
+        return data
+    return b"".join(iter_decompress(data, codec))
+
+
+def iter_decompress(data: bytes, codec: Optional[str], chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+    """Decode ``data`` into pieces of at most ``chunk_size`` bytes."""
+    decoder = IncrementalDecoder(codec, chunk_size)
+    yield from decoder.feed(data)
+    yield from decoder.finish()
+
+
+class IncrementalDecoder:
+    """Decode a payload that arrives in pieces (e.g. slices read from the database).
+
+    ``feed`` and ``finish`` yield decoded pieces of at most ``chunk_size`` bytes,
+    so neither the compressed nor the decoded payload is held whole.
+    """
+
+    def __init__(self, codec: Optional[str], chunk_size: int = 1024 * 1024) -> None:
+        self.codec = codec
+        self.chunk_size = max(1, chunk_size)
+        if codec is None:
+            self._decoder = None
+        elif codec == CODEC_ZSTD:
+            _require_zstd()
+            self._decoder = zstandard.ZstdDecompressor().decompressobj()
+        elif codec == CODEC_GZIP:
+            self._decoder = zlib.decompressobj(wbits=31)
+        else:
+            raise ValueError(f"unknown_content_codec:{codec}")
+
+    def feed(self, data: bytes) -> Iterator[bytes]:
+        if self.codec is None:
+            yield from self._slices(data)
+        elif self.codec == CODEC_GZIP:
+            pending = bytes(data)
+            while pending:
+                piece = self._decoder.decompress(pending, self.chunk_size)
+                pending = self._decoder.unconsumed_tail
+                if piece:
+                    yield piece
+        else:
+            for start in range(0, len(data), ZSTD_INPUT_SLICE):
+                yield from self._slices(self._decoder.decompress(data[start : start + ZSTD_INPUT_SLICE]))
+
+    def finish(self) -> Iterator[bytes]:
+        if self.codec == CODEC_GZIP:
+            yield from self._slices(self._decoder.flush())
+
+    def _slices(self, data: bytes) -> Iterator[bytes]:
+        for start in range(0, len(data), self.chunk_size):
+            yield data[start : start + self.chunk_size]
+
+
+def _require_zstd() -> None:
+    if zstandard is None:
+        raise CodecUnavailableError("content_codec_unavailable:zstd (install zstandard)")
@@ -0,0 +1,265 @@
+"""Incremental HTML-to-text extraction without building a DOM.
+
+``HtmlTextStream`` is fed raw response bytes chunk by chunk and produces the
+page's visible text, its title and the sha256 of the bytes in one pass, with
+memory bounded by the extracted text rather than the parsed tree. It drives
+the stdlib ``HTMLParser`` the same way BeautifulSoup's ``html.parser``
+builder does (character references, entities, comments, CDATA, void
+elements, end-tag matching), so its output matches what
+``BeautifulSoup(html, "html.parser")`` gave for:
+
+- text: ``soup.get_text(" ", strip=True)`` after decomposing
+  script/style/noscript
+- title: og:title meta content, else ``soup.title.string``, else the first
+  h1's ``get_text(strip=True)``
+"""
+
+from __future__ import annotations
+
+import codecs
+import hashlib
+from html.entities import html5
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple, Union
+
+REMOVED_TAGS = frozenset({"script", "style", "noscript"})
+# Strings directly under these are template/ruby annotation strings, which get_text() leaves out.
+UNLISTED_STRING_TAGS = frozenset({"template", "rt", "rp"})
+VOID_TAGS = frozenset({
+    "area", "base", "basefont", "bgsound", "br", "col", "command", "embed", "frame", "hr", "image",
+    "img", "input", "isindex", "keygen", "link", "menuitem", "meta", "nextid", "param", "source",
+    "spacer", "track", "wbr",
+})
+ENTITY_TO_CHARACTER = {name[:-1]: value for name, value in html5.items() if name.endswith(";")}
+# Whitespace-only strings collapse to a single space or newline, as in BeautifulSoup.endData().
+_DROP_ASCII_SPACES = str.maketrans("", "", "\x20\x0a\x09\x0c\x0d")
+
+_TEXT, _CDATA, _OTHER = "text", "cdata", "other"
+
+# A captured title subtree: each node is the list of its children (strings or nodes).
+_TitleNode = List[Union[str, "_TitleNode"]]
+
+
+def _node_string(node: _TitleNode) -> Optional[str]:
+    """``Tag.string``: the only child string, looking through single-child tags."""
+    if len(node) != 1:
+        return None
+    child = node[0]
+    return child if isinstance(child, str) else _node_string(child)
+
+
+class _OpenTag:
+    __slots__ = ("name", "title_node")
+
+    def __init__(self, name: str, title_node: Optional[_TitleNode] = None) -> None:
+        self.name = name
+        self.title_node = title_node
+
+
+class _TextParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self.pieces: List[str] = []
+        self.og_property: Optional[Dict[str, str]] = None
+        self.og_name: Optional[Dict[str, str]] = None
+        self.title_root: Optional[_TitleNode] = None
+        self.h1_pieces: Optional[List[str]] = None
+        self._stack: List[_OpenTag] = []
+        self._data: List[str] = []
+        self._closed_void: List[str] = []
+        self._removed = 0
+        self._unlisted = 0
+        self._title_level: Optional[int] = None
+        self._h1_level: Optional[int] = None
+
+    # -- string assembly ---------------------------------------------------
+
+    def _flush(self, kind: str = _TEXT) -> None:
+        if not self._data:
+            return
+        string = "".join(self._data)
+        self._data = []
+        if self._removed:
+            return
+        if self._title_level is not None:
+            if not string.translate(_DROP_ASCII_SPACES):
+                string = "\n" if "\n" in string else " "
+            self._stack[-1].title_node.append(string)
+        if kind == _CDATA or (kind == _TEXT and not self._unlisted):
+            stripped = string.strip()
+            if stripped:
+                self.pieces.append(stripped)
+                if self._h1_level is not None:
+                    self.h1_pieces.append(stripped)
+
+    def handle_data(self, data: str) -> None:
+        self._data.append(data)
+
+    def handle_charref(self, name: str) -> None:
+        if name.startswith(("x", "X")):
+            number = int(name.lstrip("xX"), 16)
+        else:
+            number = int(name)
+        data = None
+        if number < 256:
+            # Numeric references below 256 are read as windows-1252, e.g. &#147; for a curly quote.
+            try:
+                data = bytes([number]).decode("windows-1252")
+            except UnicodeDecodeError:
+                pass
+        if not data:
+            try:
+                data = chr(number)
+            except (ValueError, OverflowError):
+                pass
+        self.handle_data(data or "\N{REPLACEMENT CHARACTER}")
+
+    def handle_entityref(self, name: str) -> None:
+        character = ENTITY_TO_CHARACTER.get(name)
+        self.handle_data(character if character is not None else f"&{name}")
+
+    def _handle_string(self, data: str, kind: str) -> None:
+        self._flush()
+        self._data.append(data)
+        self._flush(kind)
+
+    def handle_comment(self, data: str) -> None:
+        self._handle_string(data, _OTHER)
+
+    def handle_decl(self, data: str) -> None:
+        self._handle_string(data[len("DOCTYPE "):] if data.startswith("DOCTYPE ") else data, _OTHER)
+
+    def handle_pi(self, data: str) -> None:
+        self._handle_string(data, _OTHER)
+
+    def unknown_decl(self, data: str) -> None:
+        if data.upper().startswith("CDATA["):
+            self._handle_string(data[len("CDATA["):], _CDATA)
+        else:
+            self._handle_string(data, _OTHER)
+
+    # -- tags --------------------------------------------------------------
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._start(tag, attrs)
+        if tag in VOID_TAGS:
+            self._end(tag)
+            self._closed_void.append(tag)
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._start(tag, attrs)
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._closed_void:
+            # The end tag of a void element that was already closed when it started.
+            self._closed_void.remove(tag)
+            return
+        self._end(tag)
+
+    def _start(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._flush()
+        title_node: Optional[_TitleNode] = None
+        if not self._removed and tag not in REMOVED_TAGS:
+            if tag == "meta":
+                values = {key: value or "" for key, value in attrs}
+                if self.og_property is None and values.get("property") == "og:title":
+                    self.og_property = values
+                if self.og_name is None and values.get("name") == "og:title":
+                    self.og_name = values
+            if self._title_level is not None:
+                title_node = []
+                self._stack[-1].title_node.append(title_node)
+            elif tag == "title" and self.title_root is None:
+                title_node = self.title_root = []
+                self._title_level = len(self._stack)
+            if tag == "h1" and self.h1_pieces is None:
+                self.h1_pieces = []
+                self._h1_level = len(self._stack)
+        self._stack.append(_OpenTag(tag, title_node))
+        if tag in REMOVED_TAGS:
+            self._removed += 1
+        if tag in UNLISTED_STRING_TAGS:
+            self._unlisted += 1
+
+    def _end(self, tag: str) -> None:
+        self._flush()
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index].name == tag:
+                break
+        else:
+            return
+        while len(self._stack) > index:
+            closed = self._stack.pop()
+            if closed.name in REMOVED_TAGS:
+                self._removed -= 1
+            if closed.name in UNLISTED_STRING_TAGS:
+                self._unlisted -= 1
+        if self._title_level is not None and len(self._stack) <= self._title_level:
+            self._title_level = None
+        if self._h1_level is not None and len(self._stack) <= self._h1_level:
+            self._h1_level = None
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+    # -- results -----------------------------------------------------------
+
+    def title(self) -> Optional[str]:
+        og_title = self.og_property if self.og_property is not None else self.og_name
+        if og_title is not None and og_title.get("content"):
+            return og_title["content"]
+        if self.title_root is not None:
+            title = _node_string(self.title_root)
+            if title:
+                return title
+        if self.h1_pieces:
+            return "".join(self.h1_pieces)
+        return None
+
+
+class HtmlTextStream:
+    """Feed response bytes as they arrive; read ``text``, ``title`` and ``sha256`` after ``close()``."""
+
+    def __init__(self, encoding: str = "utf-8") -> None:
+        try:
+            decoder_factory = codecs.getincrementaldecoder(encoding)
+        except LookupError:
+            decoder_factory = codecs.getincrementaldecoder("utf-8")
+        self._decoder = decoder_factory(errors="replace")
+        self._parser = _TextParser()
+        self._sha = hashlib.sha256()
+        self.bytes_read = 0
+        self.closed = False
+
+    def feed(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        self._sha.update(chunk)
+        self.bytes_read += len(chunk)
+        text = self._decoder.decode(chunk)
+        if text:
+            self._parser.feed(text)
+
+    def close(self) -> "HtmlTextStream":
+        if not self.closed:
+            tail = self._decoder.decode(b"", final=True)
+            if tail:
+                self._parser.feed(tail)
+            self._parser.close()
+            self.closed = True
+        return self
+
+    @property
+    def text(self) -> str:
+        return " ".join(self._parser.pieces)
+
+    @property
+    def title(self) -> Optional[str]:
+        return self._parser.title()
+
+    @property
+    def sha256(self) -> str:
+        return self._sha.hexdigest()
+
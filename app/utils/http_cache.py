@@ -0,0 +1,130 @@
+"""HTTP freshness helpers for scheduling conditional revalidation of fetched sources."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+# Fraction of (Date - Last-Modified) used as heuristic freshness (RFC 9111 4.2.2).
+HEURISTIC_FRACTION = 0.1
+
+
+def _header(headers: Mapping[str, Any], name: str) -> Optional[str]:
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.lower())
+    if value is None:
+        lowered = name.lower()
+        for key, candidate in headers.items():
+            if str(key).lower() == lowered:
+                value = candidate
+                break
+    return str(value) if value is not None else None
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into {directive: argument-or-None}."""
+    directives: Dict[str, Optional[str]] = {}
+    if not value:
+        return directives
+    for part in str(value).split(","):
+        token = part.strip()
+        if not token:
+            continue
+        name, _, arg = token.partition("=")
+        directives[name.strip().lower()] = arg.strip().strip('"') if arg else None
+    return directives
+
+
+def parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse an HTTP-date; returns an aware UTC datetime or None when invalid."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError, IndexError):
+        return None
+    if parsed is None:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _seconds(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(
+    headers: Mapping[str, Any],
+    *,
+    now: datetime,
+) -> Tuple[Optional[int], str]:
+    """Return (lifetime_seconds, basis) derived from response headers.
+
+    Basis is one of: no_store, no_cache, max_age, expires, heuristic, none.
+    A None lifetime means the response carries no freshness information.
+    """
+    directives = parse_cache_control(_header(headers, "Cache-Control"))
+    if "no-store" in directives:
+        return None, "no_store"
+    if "no-cache" in directives:
+        return 0, "no_cache"
+
+    age = _seconds(_header(headers, "Age")) or 0
+    max_age = _seconds(directives.get("s-maxage"))
+    if max_age is None:
+        max_age = _seconds(directives.get("max-age"))
+    if max_age is not None:
+        return max(0, max_age - age), "max_age"
+
+    response_date = parse_http_date(_header(headers, "Date")) or now
+    expires_raw = _header(headers, "Expires")
+    if expires_raw is not None:
+        expires = parse_http_date(expires_raw)
+        if expires is None:
+            # Invalid Expires (e.g. "0") means already expired.
+            return 0, "expires"
+        return max(0, int((expires - response_date).total_seconds()) - age), "expires"
+
+    last_modified = parse_http_date(_header(headers, "Last-Modified"))
+    if last_modified is not None and last_modified < response_date:
+        lifetime = int((response_date - last_modified).total_seconds() * HEURISTIC_FRACTION)
+        return max(0, lifetime - age), "heuristic"
+
+    return None, "none"
+
+
+def compute_next_check_at(
+    headers: Mapping[str, Any],
+    *,
+    now: datetime,
+    min_seconds: int,
+    max_seconds: int,
+    default_seconds: int,
+) -> Tuple[datetime, int, str]:
+    """Return (next_check_at, interval_seconds, basis) for a fetched response.
+
+    The interval is the response's freshness lifetime clamped to
+    [min_seconds, max_seconds]; responses without freshness information (or
+    no-store responses, which cannot be revalidated cheaply) use default_seconds.
+    """
+    lifetime, basis = freshness_lifetime(headers, now=now)
+    interval = default_seconds if lifetime is None else lifetime
+    interval = max(int(min_seconds), min(int(max_seconds), int(interval)))
+    return now + timedelta(seconds=interval), interval, basis
+
+
+def format_check_time(value: datetime) -> str:
+    """Fixed-width UTC ISO timestamp so stored check times compare lexicographically."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec="seconds")
@@ -0,0 +1,116 @@
+"""MinHash signatures and LSH banding for near-duplicate text detection.
+
+Signatures are computed over word shingles with a fixed family of universal
+hash permutations, so values are stable across processes and can be stored in
+source meta and compared later. Band keys split a signature into ``bands``
+groups of rows; documents sharing any band key are near-duplicate candidates,
+which are then confirmed with the estimated Jaccard similarity.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+import struct
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_PERMUTATION_SEED = 1_147_483_647
+
+_permutation_cache: Dict[int, List[Tuple[int, int]]] = {}
+
+
+def _permutations(num_perm: int) -> List[Tuple[int, int]]:
+    perms = _permutation_cache.get(num_perm)
+    if perms is None:
+        rng = random.Random(_PERMUTATION_SEED)
+        perms = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+        _permutation_cache[num_perm] = perms
+    return perms
+
+
+def shingle_hashes(tokens: Sequence[str], shingle_size: int) -> Set[int]:
+    """Return 32-bit hashes of the word shingles in ``tokens``."""
+    if not tokens:
+        return set()
+    size = max(1, min(shingle_size, len(tokens)))
+    hashes: Set[int] = set()
+    for idx in range(len(tokens) - size + 1):
+        shingle = " ".join(tokens[idx : idx + size]).encode("utf-8")
+        hashes.add(struct.unpack("<I", hashlib.blake2b(shingle, digest_size=4).digest())[0])
+    return hashes
+
+
+def minhash_signature(tokens: Sequence[str], *, num_perm: int, shingle_size: int) -> List[int]:
+    """MinHash signature (``num_perm`` ints) of a token sequence; empty for empty input."""
+    hashes = shingle_hashes(tokens, shingle_size)
+    if not hashes:
+        return []
+    values = list(hashes)
+    return [
+        min(((a * value + b) % _MERSENNE_PRIME) & _MAX_HASH for value in values)
+        for a, b in _permutations(num_perm)
+    ]
+
+
+def lsh_band_keys(signature: Sequence[int], bands: int) -> List[str]:
+    """Split a signature into ``bands`` and return one key per band ("<band>:<hash>")."""
+    if not signature or bands <= 0 or len(signature) % bands:
+        return []
+    rows = len(signature) // bands
+    keys = []
+    for band in range(bands):
+        chunk = signature[band * rows : (band + 1) * rows]
+        digest = hashlib.blake2b(struct.pack(f"<{rows}I", *chunk), digest_size=8).hexdigest()
+        keys.append(f"{band}:{digest}")
+    return keys
+
+
+def estimate_jaccard(left: Sequence[int], right: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of the documents behind two signatures."""
+    if not left or not right or len(left) != len(right):
+        return 0.0
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+class LshIndex:
+    """In-memory banding index: band key -> item ids."""
+
+    def __init__(self, bands: int):
+        self.bands = bands
+        self._buckets: Dict[str, Set[Hashable]] = {}
+        self._signatures: Dict[Hashable, Sequence[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, item_id: Hashable, signature: Sequence[int], band_keys: Optional[Iterable[str]] = None) -> None:
+        if not signature:
+            return
+        self._signatures[item_id] = signature
+        for key in band_keys if band_keys is not None else lsh_band_keys(signature, self.bands):
+            self._buckets.setdefault(key, set()).add(item_id)
+
+    def candidates(self, item_id: Hashable) -> Set[Hashable]:
+        signature = self._signatures.get(item_id)
+        if not signature:
+            return set()
+        found: Set[Hashable] = set()
+        for key in lsh_band_keys(signature, self.bands):
+            found.update(self._buckets.get(key, ()))
+        found.discard(item_id)
+        return found
+
+    def near_duplicates(self, item_id: Hashable, threshold: float) -> List[Tuple[Hashable, float]]:
+        """Candidates whose estimated Jaccard similarity is at least ``threshold``."""
+        signature = self._signatures.get(item_id)
+        matches = []
+        for other in self.candidates(item_id):
+            similarity = estimate_jaccard(signature, self._signatures[other])
+            if similarity >= threshold:
+                matches.append((other, similarity))
+        return matches
@@ -0,0 +1,93 @@
+"""Incremental, deterministic zip writing with constant memory.
+
+``DeterministicZipStream`` wraps :class:`zipfile.ZipFile` around an in-memory
+sink that is drained after every write, so callers can forward the produced
+bytes (to an HTTP response or a spool file) as each chunk is added. Entries use
+fixed timestamps and permissions; with the same entries in the same order the
+archive bytes are identical. Each entry tracks the size and sha256 of its
+uncompressed content for manifests.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import zipfile
+from typing import List, Optional
+
+FIXED_DATE_TIME = (2020, 1, 1, 0, 0, 0)
+
+
+class _DrainableSink:
+    """Write-only file object; ``zipfile`` treats it as unseekable (data descriptors)."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        return None
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipStreamEntry:
+    def __init__(self, stream: "DeterministicZipStream", name: str, handle) -> None:
+        self.name = name
+        self.size = 0
+        self._sha = hashlib.sha256()
+        self._stream = stream
+        self._handle = handle
+
+    @property
+    def sha256(self) -> str:
+        return self._sha.hexdigest()
+
+    def write(self, chunk: bytes) -> bytes:
+        """Append content; returns archive bytes produced so far."""
+        if chunk:
+            self._handle.write(chunk)
+            self._sha.update(chunk)
+            self.size += len(chunk)
+        return self._stream._sink.drain()
+
+    def close(self) -> bytes:
+        self._handle.close()
+        self._stream._open_entry = None
+        return self._stream._sink.drain()
+
+
+class DeterministicZipStream:
+    def __init__(self) -> None:
+        self._sink = _DrainableSink()
+        self._zip = zipfile.ZipFile(self._sink, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True)
+        self._open_entry: Optional[ZipStreamEntry] = None
+
+    def open_entry(self, name: str, size_hint: Optional[int] = None) -> ZipStreamEntry:
+        """Start an entry; ``size_hint`` (or None when unknown) decides whether zip64 headers are used."""
+        if self._open_entry is not None:
+            raise RuntimeError(f"zip entry {self._open_entry.name!r} still open")
+        info = zipfile.ZipInfo(name, date_time=FIXED_DATE_TIME)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        info.file_size = size_hint or 0
+        handle = self._zip.open(info, "w", force_zip64=size_hint is None or size_hint > zipfile.ZIP64_LIMIT)
+        self._open_entry = ZipStreamEntry(self, name, handle)
+        return self._open_entry
+
+    def write_entry(self, name: str, content: bytes) -> tuple[ZipStreamEntry, bytes]:
+        """Add a small in-memory entry in one call; returns the entry and produced bytes."""
+        entry = self.open_entry(name, size_hint=len(content))
+        produced = entry.write(content)
+        return entry, produced + entry.close()
+
+    def close(self) -> bytes:
+        """Finish the archive (central directory); returns the remaining bytes."""
+        self._zip.close()
+        return self._sink.drain()
@@ -1,7 +1,8 @@
 """Worker runner for acquire_extract_async jobs with safe locking.
 
 Uses SELECT FOR UPDATE SKIP LOCKED via claim_next_job to ensure only one
-worker claims a job at a time. Designed for short-running loops and tests.
+worker claims a job at a time, and a JobLease heartbeat so a crashed runner's
+job is reclaimed within JOB_LEASE_SECONDS. Designed for short-running loops and tests.
 """
 
 from __future__ import annotations
@@ -10,10 +11,12 @@ import asyncio
 import logging
 import os
 import socket
+from functools import partial
 from typing import Optional
 
 from app.db.session import get_async_session_context
 from app.services.company_research_service import CompanyResearchService
+from app.services.job_lease import JobLease, JobLeaseLostError
 
 logger = logging.getLogger(__name__)
 
@@ -21,9 +24,15 @@ logger = logging.getLogger(__name__)
 class AcquireExtractJobRunner:
     """Poll and execute acquire_extract_async jobs."""
 
-    def __init__(self, worker_id: Optional[str] = None, poll_interval: float = 1.0) -> None:
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        poll_interval: float = 1.0,
+        db_profile: str = "worker",
+    ) -> None:
         self.worker_id = worker_id or f"acq-extract-{socket.gethostname()}-{os.getpid()}"
         self.poll_interval = poll_interval
+        self.db_profile = db_profile
         self._stop_event = asyncio.Event()
 
     def request_stop(self) -> None:
@@ -31,14 +40,27 @@ class AcquireExtractJobRunner:
 
     async def run_once(self) -> bool:
         """Claim and execute a single job if available."""
-        async with get_async_session_context() as session:
+        async with get_async_session_context(self.db_profile) as session:
             service = CompanyResearchService(session)
             job = await service.claim_next_job(self.worker_id, job_type="acquire_extract_async")
             if not job:
                 return False
 
-            logger.info("Worker %s running job %s", self.worker_id, job.id)
-            await service.execute_acquire_extract_job(str(job.tenant_id), job.id, worker_id=self.worker_id)
+            job_id = job.id
+            logger.info("Worker %s running job %s", self.worker_id, job_id)
+            lease = JobLease(
+                session,
+                job_id,
+                self.worker_id,
+                job.lease_token,
+                session_factory=partial(get_async_session_context, self.db_profile),
+            )
+            try:
+                async with lease:
+                    await service.execute_acquire_extract_job(str(job.tenant_id), job_id, worker_id=self.worker_id)
+            except JobLeaseLostError:
+                await session.rollback()
+                logger.warning("Worker %s lost the lease on job %s; discarded its uncommitted work", self.worker_id, job_id)
             return True
 
     async def run_forever(self) -> None:
@@ -54,5 +76,9 @@ class AcquireExtractJobRunner:
                 continue
 
 
-def get_default_runner(worker_id: Optional[str] = None, poll_interval: float = 1.0) -> AcquireExtractJobRunner:
-    return AcquireExtractJobRunner(worker_id=worker_id, poll_interval=poll_interval)
+def get_default_runner(
+    worker_id: Optional[str] = None,
+    poll_interval: float = 1.0,
+    db_profile: str = "worker",
+) -> AcquireExtractJobRunner:
+    return AcquireExtractJobRunner(worker_id=worker_id, poll_interval=poll_interval, db_profile=db_profile)
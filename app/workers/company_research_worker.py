@@ -2,17 +2,23 @@
 
 import argparse
 import asyncio
+import logging
 import os
 import socket
-from datetime import datetime, timedelta
-from typing import Optional
+from typing import FrozenSet, Optional
 
-from app.db.session import get_async_session_context
+from app.core.profiler import finish_profile, try_start_profile
+from app.core.telemetry import start_step_telemetry
+from app.db.session import configure_default_profile, get_async_session_context
 from app.services.company_research_service import CompanyResearchService
 from app.services.company_extraction_service import CompanyExtractionService
 from app.services.company_source_extraction_service import CompanySourceExtractionService
+from app.services.contact_enrichment_service import JOB_TYPE_EXEC_CONTACT_ENRICHMENT
+from app.services.job_lease import JobLease, JobLeaseLostError
 from app.utils.time import utc_now
 
+logger = logging.getLogger(__name__)
+
 
 async def _handle_cancel(
     service: CompanyResearchService,
@@ -44,7 +50,31 @@ async def _handle_cancel(
     )
 
 
-async def _process_job(service: CompanyResearchService, job, worker_id: str) -> None:
+def _parse_profile_steps(value: str) -> FrozenSet[str]:
+    return frozenset(part.strip() for part in (value or "").split(",") if part.strip())
+
+
+async def _process_job(
+    service: CompanyResearchService,
+    job,
+    worker_id: str,
+    profile_steps: FrozenSet[str] = frozenset(),
+    lease: Optional[JobLease] = None,
+) -> None:
+    try:
+        await _run_job_steps(service, job, worker_id, profile_steps=profile_steps, lease=lease)
+    finally:
+        # Resolution plans not yet written belong to this pass only.
+        service.release_resolution_plans()
+
+
+async def _run_job_steps(
+    service: CompanyResearchService,
+    job,
+    worker_id: str,
+    profile_steps: FrozenSet[str] = frozenset(),
+    lease: Optional[JobLease] = None,
+) -> None:
     tenant_id = str(job.tenant_id)
     run_id = job.run_id
 
@@ -81,6 +111,8 @@ async def _process_job(service: CompanyResearchService, job, worker_id: str) ->
     await service.lock_plan_on_start(tenant_id, run_id)
 
     while True:
+        if lease is not None:
+            lease.check()
         if job.cancel_requested:
             await _handle_cancel(service, job.id, tenant_id, run_id, reason="cancelled before step")
             await service.db.commit()
@@ -111,6 +143,8 @@ async def _process_job(service: CompanyResearchService, job, worker_id: str) ->
             await service.db.commit()
             return
 
+        service.release_resolution_plans(step.step_key)
+
         await service.append_event(
             tenant_id,
             run_id,
@@ -119,6 +153,12 @@ async def _process_job(service: CompanyResearchService, job, worker_id: str) ->
             meta_json={"step_id": str(step.id), "step_key": step.step_key},
         )
 
+        # SQL, HTTP and domain-wait telemetry for this step only (stored on the step).
+        telemetry = start_step_telemetry()
+        # Opt-in stack/SQL profile (--profile-steps); skipped while another profile is running.
+        profile = None
+        if step.step_key in profile_steps or "all" in profile_steps:
+            profile = try_start_profile(f"step {step.step_key}", tenant_id)
         try:
             if step.step_key == "external_llm_company_discovery":
                 allow_fixture = bool(int(os.getenv("EXTERNAL_LLM_ENABLED", "0") or 0))
@@ -127,7 +167,7 @@ async def _process_job(service: CompanyResearchService, job, worker_id: str) ->
                     run_id=run_id,
                     allow_fixture=allow_fixture,
                 )
-                await service.repo.mark_step_succeeded(step.id, output_json=summary)
+                await service.repo.mark_step_succeeded(step.id, output_json=summary, metrics_json=telemetry.snapshot())
                 await service.append_event(
                     tenant_id,
                     run_id,
@@ -152,6 +192,7 @@ async def _process_job(service: CompanyResearchService, job, worker_id: str) ->
                         step.id,
                         "pending_url_retries",
                         backoff_seconds=backoff_seconds,
+                        metrics_json=telemetry.snapshot(),
                     )
                     await service.mark_job_failed(job.id, "pending_url_retries", backoff_seconds=backoff_seconds)
                     await service.append_event(
@@ -165,43 +206,7 @@ async def _process_job(service: CompanyResearchService, job, worker_id: str) ->
                     await service.db.commit()
                     return
 
-                if result.get("pending_recheck"):
-                    step.status = "pending"
-                    pending_next = result.get("pending_recheck_next_retry_at")
-                    next_retry_at = None
-                    if isinstance(pending_next, str):
-                        try:
-                            next_retry_at = datetime.fromisoformat(pending_next)
-                        except ValueError:
-                            next_retry_at = None
-                    elif isinstance(pending_next, datetime):
-                        next_retry_at = pending_next
-
-                    backoff_seconds = 2
-                    if next_retry_at:
-                        delta_seconds = int((next_retry_at - utc_now()).total_seconds())
-                        backoff_seconds = max(1, delta_seconds)
-                    step.next_retry_at = next_retry_at or (utc_now() + timedelta(seconds=backoff_seconds))
-
-                    await service.mark_job_failed(job.id, "pending_url_recheck", backoff_seconds=backoff_seconds)
-                    await service.append_event(
-                        tenant_id,
-                        run_id,
-                        "step_pending",
-                        f"Revalidating step {step.step_key} with conditional fetch",
-                        meta_json={
-                            "step_key": step.step_key,
-                            "result": result,
-                            "next_retry_at": step.next_retry_at.isoformat() if step.next_retry_at else None,
-                            "pending_recheck_backoff": backoff_seconds,
-                        },
-                        status="ok",
-                    )
-                    await service.db.flush()
-                    await service.db.commit()
-                    return
-
-                await service.repo.mark_step_succeeded(step.id, output_json=result)
+                await service.repo.mark_step_succeeded(step.id, output_json=result, metrics_json=telemetry.snapshot())
                 await service.append_event(
                     tenant_id,
                     run_id,
@@ -219,7 +224,7 @@ async def _process_job(service: CompanyResearchService, job, worker_id: str) ->
                     tenant_id=tenant_id,
                     run_id=run_id,
                 )
-                await service.repo.mark_step_succeeded(step.id, output_json=result)
+                await service.repo.mark_step_succeeded(step.id, output_json=result, metrics_json=telemetry.snapshot())
                 await service.append_event(
                     tenant_id,
                     run_id,
@@ -237,7 +242,7 @@ async def _process_job(service: CompanyResearchService, job, worker_id: str) ->
                     tenant_id=tenant_id,
                     run_id=run_id,
                 )
-                await service.repo.mark_step_succeeded(step.id, output_json=result)
+                await service.repo.mark_step_succeeded(step.id, output_json=result, metrics_json=telemetry.snapshot())
                 await service.append_event(
                     tenant_id,
                     run_id,
@@ -255,7 +260,7 @@ async def _process_job(service: CompanyResearchService, job, worker_id: str) ->
                     tenant_id=tenant_id,
                     run_id=run_id,
                 )
-                await service.repo.mark_step_succeeded(step.id, output_json=result)
+                await service.repo.mark_step_succeeded(step.id, output_json=result, metrics_json=telemetry.snapshot())
                 await service.append_event(
                     tenant_id,
                     run_id,
@@ -272,7 +277,7 @@ async def _process_job(service: CompanyResearchService, job, worker_id: str) ->
                     tenant_id=tenant_id,
                     run_id=run_id,
                 )
-                await service.repo.mark_step_succeeded(step.id, output_json=summary)
+                await service.repo.mark_step_succeeded(step.id, output_json=summary, metrics_json=telemetry.snapshot())
                 await service.append_event(
                     tenant_id,
                     run_id,
@@ -289,7 +294,7 @@ async def _process_job(service: CompanyResearchService, job, worker_id: str) ->
                     tenant_id=tenant_id,
                     run_id=run_id,
                 )
-                await service.repo.mark_step_succeeded(step.id, output_json=summary)
+                await service.repo.mark_step_succeeded(step.id, output_json=summary, metrics_json=telemetry.snapshot())
                 await service.append_event(
                     tenant_id,
                     run_id,
@@ -306,7 +311,24 @@ async def _process_job(service: CompanyResearchService, job, worker_id: str) ->
                     tenant_id=tenant_id,
                     run_id=run_id,
                 )
-                await service.repo.mark_step_succeeded(step.id, output_json=summary)
+                await service.repo.mark_step_succeeded(step.id, output_json=summary, metrics_json=telemetry.snapshot())
+                await service.append_event(
+                    tenant_id,
+                    run_id,
+                    "step_succeeded",
+                    f"Completed step {step.step_key}",
+                    meta_json={"step_key": step.step_key, "result": summary},
+                )
+                await service.db.flush()
+                await service.db.commit()
+                continue
+
+            if step.step_key == "company_enrichment":
+                summary = await service.run_company_enrichment_step(
+                    tenant_id=tenant_id,
+                    run_id=run_id,
+                )
+                await service.repo.mark_step_succeeded(step.id, output_json=summary, metrics_json=telemetry.snapshot())
                 await service.append_event(
                     tenant_id,
                     run_id,
@@ -320,7 +342,7 @@ async def _process_job(service: CompanyResearchService, job, worker_id: str) ->
 
             if step.step_key == "ingest_lists":
                 summary = await service.ingest_list_sources(tenant_id, run_id)
-                await service.repo.mark_step_succeeded(step.id, output_json=summary)
+                await service.repo.mark_step_succeeded(step.id, output_json=summary, metrics_json=telemetry.snapshot())
                 await service.append_event(tenant_id, run_id, "step_succeeded", "Completed ingest_lists", meta_json=summary)
                 await service.db.flush()
                 await service.db.commit()
@@ -328,7 +350,7 @@ async def _process_job(service: CompanyResearchService, job, worker_id: str) ->
 
             if step.step_key == "ingest_proposal":
                 summary = await service.ingest_proposal_sources(tenant_id, run_id)
-                await service.repo.mark_step_succeeded(step.id, output_json=summary)
+                await service.repo.mark_step_succeeded(step.id, output_json=summary, metrics_json=telemetry.snapshot())
                 await service.append_event(tenant_id, run_id, "step_succeeded", "Completed ingest_proposal", meta_json=summary)
                 await service.db.flush()
                 await service.db.commit()
@@ -347,6 +369,7 @@ async def _process_job(service: CompanyResearchService, job, worker_id: str) ->
                         step.id,
                         "pending steps: " + ", ".join(blockers),
                         backoff_seconds=backoff_seconds,
+                        metrics_json=telemetry.snapshot(),
                     )
                     await service.append_event(
                         tenant_id,
@@ -360,7 +383,11 @@ async def _process_job(service: CompanyResearchService, job, worker_id: str) ->
                     await service.db.commit()
                     return
 
-                await service.repo.mark_step_succeeded(step.id, output_json={"completed": True})
+                await service.repo.mark_step_succeeded(
+                    step.id,
+                    output_json={"completed": True},
+                    metrics_json=telemetry.snapshot(),
+                )
                 await service.mark_job_succeeded(job.id)
                 await service.repo.set_run_status(
                     tenant_id,
@@ -391,11 +418,18 @@ async def _process_job(service: CompanyResearchService, job, worker_id: str) ->
             await service.db.commit()
             return
 
+        except JobLeaseLostError:
+            raise
         except Exception as exc:  # noqa: BLE001
             await service.db.rollback()
             backoff_seconds = min(300, 30 * max(1, step.attempt_count))
             message = str(exc)
-            await service.repo.mark_step_failed(step.id, message, backoff_seconds=backoff_seconds)
+            await service.repo.mark_step_failed(
+                step.id,
+                message,
+                backoff_seconds=backoff_seconds,
+                metrics_json=telemetry.snapshot(),
+            )
             await service.mark_job_failed(job.id, message, backoff_seconds=backoff_seconds)
             await service.repo.set_run_status(
                 tenant_id,
@@ -406,9 +440,17 @@ async def _process_job(service: CompanyResearchService, job, worker_id: str) ->
             await service.append_event(tenant_id, run_id, "step_failed", message, status="failed")
             await service.db.commit()
             return
+        finally:
+            telemetry.stop()
+            if profile is not None:
+                try:
+                    path = await finish_profile(profile)
+                    logger.info("Profile %s of step %s written to %s", profile.profile_id, step.step_key, path)
+                except OSError:
+                    logger.exception("Could not write profile %s of step %s", profile.profile_id, step.step_key)
 
 
-async def run_worker(loop: bool, sleep_seconds: int) -> int:
+async def run_worker(loop: bool, sleep_seconds: int, profile_steps: FrozenSet[str] = frozenset()) -> int:
     worker_id = f"{socket.gethostname()}:{os.getpid()}"
     async with get_async_session_context() as session:
         service = CompanyResearchService(session)
@@ -420,7 +462,23 @@ async def run_worker(loop: bool, sleep_seconds: int) -> int:
                 await asyncio.sleep(sleep_seconds)
                 continue
 
-            await _process_job(service, job, worker_id)
+            job_id = job.id
+            try:
+                # Heartbeat the job's lease while it runs; commits fail once another worker reclaimed it.
+                async with JobLease(session, job_id, worker_id, job.lease_token) as lease:
+                    if job.job_type == JOB_TYPE_EXEC_CONTACT_ENRICHMENT:
+                        try:
+                            await service.execute_contact_enrichment_job(str(job.tenant_id), job_id, worker_id=worker_id)
+                        except JobLeaseLostError:
+                            raise
+                        except Exception:  # noqa: BLE001
+                            # Failure is recorded on the job (retried with backoff); keep polling.
+                            logger.exception("Contact enrichment job %s failed", job_id)
+                    else:
+                        await _process_job(service, job, worker_id, profile_steps=profile_steps, lease=lease)
+            except JobLeaseLostError:
+                await session.rollback()
+                logger.warning("Worker %s lost the lease on job %s; discarded its uncommitted work", worker_id, job_id)
             if not loop:
                 return 0
 
@@ -430,10 +488,24 @@ def main() -> int:
     parser.add_argument("--once", action="store_true", help="Process a single job and exit")
     parser.add_argument("--loop", action="store_true", help="Run continuously")
     parser.add_argument("--sleep", type=int, default=2, help="Sleep seconds between polls when looping")
+    parser.add_argument(
+        "--db-profile",
+        default=os.getenv("WORKER_DB_PROFILE", "worker"),
+        help="Engine profile for the worker's database pool (api, worker, reporting)",
+    )
+    parser.add_argument(
+        "--profile-steps",
+        default=os.getenv("WORKER_PROFILE_STEPS", ""),
+        help="Comma-separated step keys (or 'all') to capture sampling profiles for (see app/core/profiler.py)",
+    )
     args = parser.parse_args()
 
+    configure_default_profile(args.db_profile)
+
     loop_mode = args.loop and not args.once
-    return asyncio.run(run_worker(loop=loop_mode, sleep_seconds=args.sleep))
+    return asyncio.run(
+        run_worker(loop=loop_mode, sleep_seconds=args.sleep, profile_steps=_parse_profile_steps(args.profile_steps))
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+"""Background job that maintains research_events partitions (create ahead, compact, drop)."""
+
+import argparse
+import asyncio
+import logging
+import os
+
+from app.db.session import configure_default_profile, get_async_session_context
+from app.services.research_event_retention_service import ResearchEventRetentionService
+
+logger = logging.getLogger(__name__)
+
+
+async def run_once(dry_run: bool = False) -> dict:
+    """Run one maintenance pass; each partition change commits on its own."""
+    async with get_async_session_context() as session:
+        summary = await ResearchEventRetentionService(session).run_maintenance(dry_run=dry_run)
+    logger.info(
+        "research_events maintenance%s: created %s, compacted %s, dropped %s",
+        " (dry run)" if dry_run else "",
+        summary["created"],
+        [item["partition"] for item in summary["compacted"]],
+        summary["dropped"],
+    )
+    return summary
+
+
+async def run_scheduler(loop: bool, sleep_seconds: int, dry_run: bool = False) -> int:
+    while True:
+        await run_once(dry_run=dry_run)
+        if not loop:
+            return 0
+        await asyncio.sleep(sleep_seconds)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="research_events partition retention and rollup")
+    parser.add_argument("--once", action="store_true", help="Run a single maintenance pass and exit")
+    parser.add_argument("--loop", action="store_true", help="Run continuously")
+    parser.add_argument("--sleep", type=int, default=6 * 60 * 60, help="Sleep seconds between passes when looping")
+    parser.add_argument("--dry-run", action="store_true", help="Report the planned changes without applying them")
+    parser.add_argument(
+        "--db-profile",
+        default=os.getenv("WORKER_DB_PROFILE", "worker"),
+        help="Engine profile for the job's database pool (api, worker, reporting)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    configure_default_profile(args.db_profile)
+
+    loop_mode = args.loop and not args.once
+    return asyncio.run(run_scheduler(loop=loop_mode, sleep_seconds=args.sleep, dry_run=args.dry_run))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
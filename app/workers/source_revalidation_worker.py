@@ -0,0 +1,78 @@
+"""Background scheduler that revalidates fetched URL sources with conditional GETs."""
+
+import argparse
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from app.db.session import configure_default_profile, get_async_session_context
+from app.services.source_revalidation_service import SourceRevalidationService
+
+logger = logging.getLogger(__name__)
+
+
+async def run_once(batch_size: Optional[int] = None, tenant_id: Optional[str] = None) -> dict:
+    """Revalidate one batch of due sources and commit the results."""
+    async with get_async_session_context() as session:
+        service = SourceRevalidationService(session)
+        summary = await service.revalidate_due_sources(limit=batch_size, tenant_id=tenant_id)
+    if summary["checked"]:
+        logger.info(
+            "Revalidated %s sources: %s not modified, %s unchanged, %s changed, %s failed, %s runs requeued",
+            summary["checked"],
+            summary["not_modified"],
+            summary["unchanged"],
+            summary["changed"],
+            summary["failed"],
+            summary["runs_requeued"],
+        )
+    return summary
+
+
+async def run_scheduler(
+    loop: bool,
+    sleep_seconds: int,
+    batch_size: Optional[int] = None,
+    tenant_id: Optional[str] = None,
+) -> int:
+    while True:
+        summary = await run_once(batch_size=batch_size, tenant_id=tenant_id)
+        if not loop:
+            return 0
+        # Drain backlogs without sleeping; idle when nothing was due.
+        if summary["checked"]:
+            continue
+        await asyncio.sleep(sleep_seconds)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Source revalidation scheduler")
+    parser.add_argument("--once", action="store_true", help="Revalidate a single batch and exit")
+    parser.add_argument("--loop", action="store_true", help="Run continuously")
+    parser.add_argument("--sleep", type=int, default=30, help="Sleep seconds between polls when idle")
+    parser.add_argument("--batch-size", type=int, default=None, help="Sources per batch (default SOURCE_REVALIDATION_BATCH_SIZE)")
+    parser.add_argument("--tenant-id", default=None, help="Restrict revalidation to one tenant")
+    parser.add_argument(
+        "--db-profile",
+        default=os.getenv("WORKER_DB_PROFILE", "worker"),
+        help="Engine profile for the scheduler's database pool (api, worker, reporting)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    configure_default_profile(args.db_profile)
+
+    loop_mode = args.loop and not args.once
+    return asyncio.run(
+        run_scheduler(
+            loop=loop_mode,
+            sleep_seconds=args.sleep,
+            batch_size=args.batch_size,
+            tenant_id=args.tenant_id,
+        )
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
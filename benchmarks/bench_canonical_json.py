@@ -0,0 +1,141 @@
+"""Developer benchmark: canonical JSON hashing cost per payload shape and encoder path.
+
+Builds deterministic payloads shaped like the app's hashed values: search
+cache parameters, LLM discovery payloads (``canonical_dict()`` output, some
+names in Arabic) and run bundles (datetimes, UUIDs and float confidences).
+Each is hashed with the old per-call-site ``json.dumps(..., default=str)`` +
+sha256, with ``app.utils.canonical_json.canonical_hash`` on the orjson path
+(when installed) and the stdlib path, and with streaming hashing. Reports
+microseconds per hash, peak traced memory of one-shot vs streaming hashing,
+and whether every path produced the same hash. No database access.
+
+Usage:
+    python benchmarks/bench_canonical_json.py [--companies 500] [--repeat 50] [--seed 7]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.utils import canonical_json  # noqa: E402
+from app.utils.canonical_json import canonical_hash  # noqa: E402
+
+SECTORS = ["Banking", "Insurance", "Telecom", "Logistics", "Energy"]
+ARABIC = ["بنك مسقط", "الشركة العمانية", "مجموعة الخليج"]
+
+
+def _legacy_hash(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")).hexdigest()
+
+
+def build_payloads(companies: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    started = datetime(2026, 10, 18, tzinfo=timezone.utc)
+    discovery = {
+        "provider": "xai_grok",
+        "model": "bench",
+        "run_context": {"query": "banks in oman", "geo": ["OM"]},
+        "companies": [
+            {
+                "name": rng.choice(ARABIC) if i % 10 == 0 else f"Company {i} {rng.choice(SECTORS)}",
+                "website_url": f"https://company{i}.example",
+                "hq_country": "OM",
+                "sector": rng.choice(SECTORS),
+                "evidence": [
+                    {"url": f"https://news.example/{i}/{j}", "label": "news", "snippet": "Lorem ipsum dolor sit amet " * 4}
+                    for j in range(3)
+                ],
+            }
+            for i in range(companies)
+        ],
+    }
+    bundle = {
+        "run_id": uuid.UUID(int=seed),
+        "steps": [{"step": f"step_{i}", "started_at": started + timedelta(seconds=i)} for i in range(10)],
+        "companies": [
+            {"name": f"Company {i}", "confidence": round(rng.random(), 3), "seen_at": started + timedelta(minutes=i)}
+            for i in range(companies)
+        ],
+    }
+    return {
+        "cache_params": {"query": "banks in oman", "country": "OM", "language": "en", "num": 10, "start": 1},
+        "discovery_payload": discovery,
+        "run_bundle": bundle,
+    }
+
+
+def _per_call_us(fn: Callable[[Any], str], value: Any, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(value)
+    return round((time.perf_counter() - started) / repeat * 1e6, 2)
+
+
+def _peak_kb(fn: Callable[[Any], str], value: Any) -> float:
+    tracemalloc.start()
+    fn(value)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def _stdlib_hash(value: Any) -> str:
+    fast, canonical_json.orjson = canonical_json.orjson, None
+    try:
+        return canonical_hash(value)
+    finally:
+        canonical_json.orjson = fast
+
+
+def _stream_hash(value: Any) -> str:
+    return canonical_hash(value, stream=True)
+
+
+def run(companies: int, repeat: int, seed: int) -> Dict[str, object]:
+    paths: Dict[str, Callable[[Any], str]] = {
+        "legacy_json_dumps": _legacy_hash,
+        "canonical_hash": canonical_hash,
+        "canonical_hash_stdlib": _stdlib_hash,
+        "canonical_hash_stream": _stream_hash,
+    }
+    results: Dict[str, object] = {}
+    for name, value in build_payloads(companies, seed).items():
+        calls = repeat * 100 if name == "cache_params" else repeat
+        hashes = {path: fn(value) for path, fn in paths.items()}
+        results[name] = {
+            "canonical_bytes": len(canonical_json.canonical_bytes(value)),
+            "us_per_hash": {path: _per_call_us(fn, value, calls) for path, fn in paths.items()},
+            "peak_kb": {path: _peak_kb(paths[path], value) for path in ("canonical_hash", "canonical_hash_stream")},
+            "identical": len(set(hashes.values())) == 1,
+        }
+    return {
+        "orjson": getattr(canonical_json.orjson, "__version__", None),
+        "payloads": results,
+        "params": {"companies": companies, "repeat": repeat, "seed": seed},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--companies", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    print(json.dumps(run(args.companies, args.repeat, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
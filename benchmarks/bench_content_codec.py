@@ -0,0 +1,86 @@
+"""Developer benchmark: stored size and codec cost for source payloads.
+
+Builds the synthetic article corpus the fixture server serves, extracts each
+page's text the way extraction does, and stores both through
+``app.utils.content_codec`` with every available codec. Reports raw vs stored
+bytes (the payload part of ``source_documents`` table size and of the I/O per
+extraction read) and compress/decompress throughput. No database or network
+access.
+
+Usage:
+    python benchmarks/bench_content_codec.py [--documents 500] [--sentences 40] [--seed 7]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.utils.content_codec import CODEC_GZIP, CODEC_ZSTD, compress, decompress, zstandard  # noqa: E402
+from app.utils.html_text_stream import HtmlTextStream  # noqa: E402
+from benchmarks.synthetic import company_article  # noqa: E402
+
+
+def build_corpus(documents: int, sentences: int, seed: int) -> Dict[str, List[bytes]]:
+    html_pages: List[bytes] = []
+    texts: List[bytes] = []
+    for index in range(documents):
+        raw = company_article(index, seed, sentences=sentences).encode("utf-8")
+        stream = HtmlTextStream()
+        stream.feed(raw)
+        html_pages.append(raw)
+        texts.append(stream.close().text.encode("utf-8"))
+    return {"html": html_pages, "text": texts}
+
+
+def measure(payloads: List[bytes], codec: str) -> Dict[str, object]:
+    raw_bytes = sum(len(p) for p in payloads)
+    started = time.perf_counter()
+    packed = [compress(p, codec) for p in payloads]
+    compress_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    for original, stored in zip(payloads, packed):
+        assert decompress(stored, codec) == original
+    decompress_seconds = time.perf_counter() - started
+    stored_bytes = sum(len(p) for p in packed)
+    mb = raw_bytes / 1_000_000
+    return {
+        "raw_bytes": raw_bytes,
+        "stored_bytes": stored_bytes,
+        "ratio": round(raw_bytes / stored_bytes, 2) if stored_bytes else None,
+        "compress_mb_per_sec": round(mb / compress_seconds, 1) if compress_seconds else None,
+        "decompress_mb_per_sec": round(mb / decompress_seconds, 1) if decompress_seconds else None,
+    }
+
+
+def run(documents: int, sentences: int, seed: int) -> Dict[str, object]:
+    corpus = build_corpus(documents, sentences, seed)
+    codecs = [CODEC_GZIP] + ([CODEC_ZSTD] if zstandard is not None else [])
+    return {
+        "documents": documents,
+        "codecs": {
+            codec: {kind: measure(payloads, codec) for kind, payloads in corpus.items()}
+            for codec in codecs
+        },
+        "params": {"sentences": sentences, "seed": seed, "zstd_available": zstandard is not None},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=500)
+    parser.add_argument("--sentences", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    print(json.dumps(run(args.documents, args.sentences, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
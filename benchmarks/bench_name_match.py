@@ -0,0 +1,149 @@
+"""Developer benchmark: fuzzy company-name blocking and scoring at tenant scale.
+
+Builds a deterministic set of company names (random coined words plus common
+sector words such as "Bank" or "Capital") and writes variants of some of them
+the way they show up in lists and AI proposals: legal suffixes, joined words,
+"X of Y", swapped words and doubled characters. Runs
+``app.utils.company_name_match.find_probable_duplicates`` at the given
+threshold and reports precision/recall against the planted variants, the
+number of pairs the blocking keys let through to scoring versus all pairs, and
+wall time. No database access.
+
+Usage:
+    python benchmarks/bench_name_match.py [--names 20000] [--variant-share 0.2] [--threshold 0.9] [--seed 7]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.utils.company_name_match import (  # noqa: E402
+    DEFAULT_MAX_BLOCK,
+    find_probable_duplicates,
+    name_match_keys,
+)
+
+SYLLABLES = ["al", "bar", "dan", "el", "far", "gul", "ha", "ir", "jan", "ka", "lu", "mar", "nor", "om", "qa", "ras", "sul", "tan", "wa", "zen"]
+SECTOR_WORDS = ["Bank", "Capital", "Energy", "Finance", "Insurance", "Investment", "Logistics", "Payments", "Telecom", "Trading"]
+LEGAL = ["SAOG", "LLC", "Ltd", "PJSC", "S.A.", "Co.", "Group"]
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+
+
+def _variant(rng: random.Random, name: str) -> str:
+    words = name.split()
+    kind = rng.randrange(5)
+    if kind == 0:
+        return f"{name} {rng.choice(LEGAL)}"
+    if kind == 1 and len(words) > 1:
+        return "".join(words[:2]) + (" " + " ".join(words[2:]) if len(words) > 2 else "")
+    if kind == 2 and len(words) > 1:
+        return f"{words[-1]} of {' '.join(words[:-1])}"
+    if kind == 3 and len(words) > 1:
+        return " ".join(reversed(words))
+    index = rng.randrange(len(name))
+    return name[:index] + name[index] + name[index:]  # doubled character
+
+
+def build_names(count: int, variant_share: float, seed: int) -> Tuple[List[Tuple[int, str]], Set[Tuple[int, int]]]:
+    rng = random.Random(seed)
+    names: List[Tuple[int, str]] = []
+    truth: Set[Tuple[int, int]] = set()
+    seen: Dict[str, int] = {}
+    bases: List[Tuple[int, str]] = []
+    while len(names) < count:
+        if bases and rng.random() < variant_share:
+            base_id, base = bases[rng.randrange(len(bases))]
+            name = _variant(rng, base)
+        else:
+            base_id = None
+            words = [_word(rng) for _ in range(rng.randint(1, 2))] + [rng.choice(SECTOR_WORDS)]
+            name = " ".join(words)
+            if name in seen:
+                continue
+            seen[name] = len(names)
+            bases.append((len(names), name))
+        item_id = len(names)
+        names.append((item_id, name))
+        if base_id is not None:
+            truth.add((base_id, item_id))
+    return names, truth
+
+
+def _closure(pairs: Set[Tuple[int, int]]) -> Set[Tuple[int, int]]:
+    """All pairs within each connected group (variants of variants are duplicates too)."""
+    parent: Dict[int, int] = {}
+
+    def _find(item: int) -> int:
+        parent.setdefault(item, item)
+        while parent[item] != item:
+            item = parent[item]
+        return item
+
+    for left, right in pairs:
+        parent[_find(right)] = _find(left)
+    groups: Dict[int, List[int]] = {}
+    for item in list(parent):
+        groups.setdefault(_find(item), []).append(item)
+    return {
+        (min(a, b), max(a, b)) for members in groups.values() for i, a in enumerate(members) for b in members[i + 1 :]
+    }
+
+
+def run(count: int, variant_share: float, seed: int, threshold: float, max_block: int) -> Dict[str, object]:
+    names, planted = build_names(count, variant_share, seed)
+    truth = _closure(planted)
+
+    started = time.perf_counter()
+    keyed = [(item_id, name, name_match_keys(name)) for item_id, name in names]
+    key_seconds = time.perf_counter() - started
+
+    block_sizes = Counter(key for _, _, keys in keyed for key in keys)
+
+    started = time.perf_counter()
+    matches = find_probable_duplicates(keyed, threshold, max_block=max_block)
+    match_seconds = time.perf_counter() - started
+    pairs_scored = len(find_probable_duplicates(keyed, 0.0, max_block=max_block))  # every blocked pair
+
+    found = {(min(m.left_id, m.right_id), max(m.left_id, m.right_id)) for m in matches}
+    true_positive = len(found & truth)
+    return {
+        "names": count,
+        "true_pairs": len(truth),
+        "found_pairs": len(found),
+        "precision": round(true_positive / len(found), 4) if found else 1.0,
+        "recall": round(true_positive / len(truth), 4) if truth else 1.0,
+        "pairs_scored": pairs_scored,
+        "all_pairs": count * (count - 1) // 2,
+        "blocks_skipped": sum(1 for size in block_sizes.values() if size > max_block),
+        "keys_per_sec": round(count / key_seconds, 1) if key_seconds else None,
+        "match_seconds": round(match_seconds, 3),
+        "params": {"threshold": threshold, "max_block": max_block, "variant_share": variant_share, "seed": seed},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--names", type=int, default=20_000)
+    parser.add_argument("--variant-share", type=float, default=0.2)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--max-block", type=int, default=DEFAULT_MAX_BLOCK)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    print(json.dumps(run(args.names, args.variant_share, args.seed, args.threshold, args.max_block), indent=2))
+
+
+if __name__ == "__main__":
+    main()
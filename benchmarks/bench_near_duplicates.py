@@ -0,0 +1,147 @@
+"""Developer benchmark: MinHash/LSH near-duplicate detection on a synthetic corpus.
+
+Builds a deterministic fixture corpus of base articles, syndicated variants of
+each (different header, dateline, ad block, small edits) and unrelated filler
+documents, then runs the same tokenisation, signature and banding parameters
+that ``CompanySourceExtractionService`` uses. Reports precision/recall of the
+detected near-duplicate pairs against ground truth and throughput for
+signature computation and index lookups. No database or network access.
+
+Usage:
+    python benchmarks/bench_near_duplicates.py [--bases 200] [--variants 3] [--distinct 400] [--seed 7]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.services.company_source_extraction_service import CompanySourceExtractionService  # noqa: E402
+from app.utils.minhash import LshIndex, lsh_band_keys, minhash_signature  # noqa: E402
+
+VOCABULARY = (
+    "bank capital revenue growth board director chief executive officer quarter results market share "
+    "acquisition merger regulator deposit loan credit fintech payments cloud platform customers europe "
+    "asia africa expansion strategy guidance dividend buyback investors analysts profit margin costs "
+    "technology digital branch network lending retail corporate treasury risk compliance appointed "
+    "announced reported expects plans launched signed partnership agreement billion million percent"
+).split()
+
+HEADERS = [
+    "breaking news from the wire",
+    "published by regional business daily",
+    "syndicated market update",
+    "sponsored newsletter edition",
+]
+ADS = [
+    "advertisement subscribe today for unlimited access to premium analysis",
+    "sign up for our morning briefing delivered to your inbox",
+    "related stories you may have missed this week",
+]
+
+
+def _article(rng: random.Random, words: int) -> List[str]:
+    return [rng.choice(VOCABULARY) for _ in range(words)]
+
+
+def _variant(rng: random.Random, base: List[str]) -> List[str]:
+    body = list(base)
+    # A handful of single-word edits (corrections, localisation).
+    for _ in range(max(1, len(body) // 200)):
+        body[rng.randrange(len(body))] = rng.choice(VOCABULARY)
+    dateline = f"updated {rng.randint(1, 28)} {rng.choice(['march', 'april', 'may'])} 2026".split()
+    return rng.choice(HEADERS).split() + dateline + body + rng.choice(ADS).split()
+
+
+def build_corpus(bases: int, variants: int, distinct: int, seed: int) -> Tuple[Dict[str, str], Set[Tuple[str, str]]]:
+    rng = random.Random(seed)
+    docs: Dict[str, str] = {}
+    truth: Set[Tuple[str, str]] = set()
+    for b in range(bases):
+        base = _article(rng, rng.randint(300, 900))
+        cluster = [f"base-{b}"]
+        docs[cluster[0]] = " ".join(base)
+        for v in range(variants):
+            doc_id = f"base-{b}-v{v}"
+            docs[doc_id] = " ".join(_variant(rng, base))
+            cluster.append(doc_id)
+        for i, left in enumerate(cluster):
+            for right in cluster[i + 1 :]:
+                truth.add(tuple(sorted((left, right))))
+    for d in range(distinct):
+        docs[f"distinct-{d}"] = " ".join(_article(rng, rng.randint(300, 900)))
+    return docs, truth
+
+
+def run(bases: int, variants: int, distinct: int, seed: int) -> Dict[str, object]:
+    service = CompanySourceExtractionService(db=None)
+    docs, truth = build_corpus(bases, variants, distinct, seed)
+    tokenised = {doc_id: service._tokenize(service._normalize_text(text)) for doc_id, text in docs.items()}
+
+    started = time.perf_counter()
+    signatures = {
+        doc_id: minhash_signature(
+            tokens,
+            num_perm=service.MINHASH_NUM_PERM,
+            shingle_size=service.MINHASH_SHINGLE_SIZE,
+        )
+        for doc_id, tokens in tokenised.items()
+    }
+    band_keys = {doc_id: lsh_band_keys(sig, service.LSH_BANDS) for doc_id, sig in signatures.items()}
+    signature_seconds = time.perf_counter() - started
+
+    index = LshIndex(service.LSH_BANDS)
+    for doc_id, sig in signatures.items():
+        index.add(doc_id, sig, band_keys[doc_id])
+
+    started = time.perf_counter()
+    found: Set[Tuple[str, str]] = set()
+    candidate_pairs = 0
+    for doc_id in signatures:
+        candidate_pairs += len(index.candidates(doc_id))
+        for other, _similarity in index.near_duplicates(doc_id, service.NEAR_DUPLICATE_JACCARD):
+            found.add(tuple(sorted((doc_id, other))))
+    lookup_seconds = time.perf_counter() - started
+
+    true_positive = len(found & truth)
+    n = len(docs)
+    return {
+        "documents": n,
+        "true_pairs": len(truth),
+        "found_pairs": len(found),
+        "precision": round(true_positive / len(found), 4) if found else 1.0,
+        "recall": round(true_positive / len(truth), 4) if truth else 1.0,
+        "candidate_pairs_checked": candidate_pairs // 2,
+        "all_pairs": n * (n - 1) // 2,
+        "signatures_per_sec": round(n / signature_seconds, 1) if signature_seconds else None,
+        "lookups_per_sec": round(n / lookup_seconds, 1) if lookup_seconds else None,
+        "params": {
+            "num_perm": service.MINHASH_NUM_PERM,
+            "shingle_size": service.MINHASH_SHINGLE_SIZE,
+            "bands": service.LSH_BANDS,
+            "threshold": service.NEAR_DUPLICATE_JACCARD,
+            "seed": seed,
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bases", type=int, default=200)
+    parser.add_argument("--variants", type=int, default=3)
+    parser.add_argument("--distinct", type=int, default=400)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    print(json.dumps(run(args.bases, args.variants, args.distinct, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
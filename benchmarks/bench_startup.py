@@ -0,0 +1,152 @@
+"""Developer benchmark: process start-up cost of the API, the worker and the acquire-extract runner.
+
+Each measurement runs in a fresh interpreter and records:
+
+- ``import_ms``: importing the entry module (``app.main``,
+  ``app.workers.company_research_worker``, ``app.workers.acquire_extract_job_runner``)
+- ``first_use_ms``: the first unit of work after import. For the API that is
+  ``GET /login`` through an in-process client (one template render and one
+  query, so it needs the database); for the worker and the runner it is the
+  first HTML extraction plus loading the fetch transport, which is where the
+  deferred parsing/HTTP imports are now paid
+- ``modules``: number of modules loaded after import, and which of the heavy
+  optional dependencies (httpx, bs4, pypdf) were loaded by the import alone
+
+All repeats share one template bytecode cache directory, so the first API
+repeat is a cold template cache and later ones are warm. A failing first use
+records ``first_use_error`` and the run continues.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat 5] [--targets api,worker,acquire_extract_runner]
+        [--output benchmarks/results/startup.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+
+TARGETS = {
+    "api": "app.main",
+    "worker": "app.workers.company_research_worker",
+    "acquire_extract_runner": "app.workers.acquire_extract_job_runner",
+}
+HEAVY_MODULES = ("httpx", "bs4", "pypdf")
+SAMPLE_HTML = b"<html><head><title>Acme</title></head><body><table><tr><td>Acme Bank</td></tr></table></body></html>"
+
+
+def _first_use(target: str) -> None:
+    if target == "api":
+        from fastapi.testclient import TestClient
+
+        from app.main import app
+
+        response = TestClient(app).get("/login")
+        response.raise_for_status()
+        return
+    from app.core.telemetry_http import TelemetryTransport  # noqa: F401  (first fetch)
+    from app.services.company_source_extraction_service import CompanySourceExtractionService
+
+    CompanySourceExtractionService(None)._extract_html(SAMPLE_HTML)
+
+
+def _child(target: str) -> Dict[str, Any]:
+    """Run inside the fresh interpreter: import the target, then do its first unit of work."""
+    import importlib
+
+    baseline_modules = len(sys.modules)
+    started = time.perf_counter()
+    importlib.import_module(TARGETS[target])
+    result: Dict[str, Any] = {
+        "import_ms": round((time.perf_counter() - started) * 1000, 3),
+        "modules": len(sys.modules) - baseline_modules,
+        "heavy_imported": [name for name in HEAVY_MODULES if name in sys.modules],
+    }
+    started = time.perf_counter()
+    try:
+        _first_use(target)
+    except Exception as exc:  # noqa: BLE001
+        result["first_use_error"] = f"{type(exc).__name__}: {exc}"[:300]
+    result["first_use_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return result
+
+
+def _measure(target: str, env: Dict[str, str]) -> Dict[str, Any]:
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child", target],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        return {"error": (completed.stderr.strip().splitlines() or ["no output"])[-1]}
+    return json.loads(lines[-1])
+
+
+def _summarize(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    ok = [s for s in samples if "error" not in s]
+    summary: Dict[str, Any] = {"repeats": len(samples), "samples": samples}
+    if not ok:
+        return summary
+    for field in ("import_ms", "first_use_ms"):
+        values = [s[field] for s in ok]
+        summary[f"{field}_first"] = values[0]
+        summary[f"{field}_median"] = round(statistics.median(values), 3)
+        summary[f"{field}_min"] = min(values)
+    summary["modules"] = ok[0]["modules"]
+    summary["heavy_imported"] = ok[0]["heavy_imported"]
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--targets", default=",".join(TARGETS), help="Comma-separated subset of " + ", ".join(TARGETS))
+    parser.add_argument("--output", type=Path, default=None, help="Results JSON (default benchmarks/results/startup.json)")
+    parser.add_argument("--child", choices=sorted(TARGETS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, str(ROOT))
+        print(json.dumps(_child(args.child)))
+        return 0
+
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+    unknown = [t for t in targets if t not in TARGETS]
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(unknown)}")
+
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="bench-startup-jinja-") as cache_dir:
+        env = dict(os.environ, UI_TEMPLATE_CACHE_DIR=cache_dir)
+        for target in targets:
+            results[target] = _summarize([_measure(target, env) for _ in range(max(1, args.repeat))])
+            summary = results[target]
+            print(
+                f"{target:24s} import median {summary.get('import_ms_median', '-')} ms, "
+                f"first use median {summary.get('first_use_ms_median', '-')} ms, "
+                f"heavy at import: {summary.get('heavy_imported', '-')}"
+            )
+
+    output = args.output or ROOT / "benchmarks" / "results" / "startup.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Compare a benchmark results file against a stored baseline.
+
+A step regresses when its wall time grows by more than ``--wall-tolerance``
+(relative, default 25%) or its query count by more than ``--query-tolerance``
+(default 10%) over the baseline, or when it errors where the baseline did not.
+Steps missing on either side are reported but do not fail the comparison.
+Exits 1 when any step regressed.
+
+Usage:
+    python -m benchmarks.compare benchmarks/results/1k.json benchmarks/baselines/1k.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+WALL_TOLERANCE = 0.25
+QUERY_TOLERANCE = 0.10
+# Sub-50ms steps are dominated by noise; only flag them on query growth.
+MIN_WALL_SECONDS = 0.05
+
+
+def _growth(current: float, baseline: float) -> float:
+    if not baseline:
+        return 0.0 if not current else float("inf")
+    return (current - baseline) / baseline
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    *,
+    wall_tolerance: float = WALL_TOLERANCE,
+    query_tolerance: float = QUERY_TOLERANCE,
+) -> List[Dict[str, Any]]:
+    """Return one row per step with growth ratios and a ``status`` of ok|regressed|new|missing."""
+    rows: List[Dict[str, Any]] = []
+    current_steps = current.get("steps", {})
+    baseline_steps = baseline.get("steps", {})
+    for name in sorted(set(current_steps) | set(baseline_steps)):
+        cur, base = current_steps.get(name), baseline_steps.get(name)
+        if base is None or cur is None:
+            rows.append({"step": name, "status": "new" if base is None else "missing"})
+            continue
+
+        wall_growth = _growth(cur.get("wall_seconds") or 0.0, base.get("wall_seconds") or 0.0)
+        query_growth = _growth(cur.get("queries") or 0, base.get("queries") or 0)
+        reasons = []
+        if cur.get("error") and not base.get("error"):
+            reasons.append("error")
+        if wall_growth > wall_tolerance and (cur.get("wall_seconds") or 0.0) >= MIN_WALL_SECONDS:
+            reasons.append("wall_time")
+        if query_growth > query_tolerance:
+            reasons.append("queries")
+        rows.append(
+            {
+                "step": name,
+                "status": "regressed" if reasons else "ok",
+                "reasons": reasons,
+                "wall_seconds": cur.get("wall_seconds"),
+                "baseline_wall_seconds": base.get("wall_seconds"),
+                "wall_growth": round(wall_growth, 3),
+                "queries": cur.get("queries"),
+                "baseline_queries": base.get("queries"),
+                "query_growth": round(query_growth, 3),
+            }
+        )
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("results", type=Path)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("--wall-tolerance", type=float, default=WALL_TOLERANCE)
+    parser.add_argument("--query-tolerance", type=float, default=QUERY_TOLERANCE)
+    args = parser.parse_args()
+
+    current = json.loads(args.results.read_text(encoding="utf-8"))
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if current.get("scale") != baseline.get("scale"):
+        print(f"scale mismatch: results={current.get('scale')} baseline={baseline.get('scale')}", file=sys.stderr)
+        return 2
+
+    rows = compare_results(
+        current,
+        baseline,
+        wall_tolerance=args.wall_tolerance,
+        query_tolerance=args.query_tolerance,
+    )
+    print(json.dumps(rows, indent=2))
+    return 1 if any(row["status"] == "regressed" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
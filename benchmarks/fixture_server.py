@@ -0,0 +1,84 @@
+"""Local HTTP fixture server that URL sources are fetched from during benchmarks.
+
+Pages are generated deterministically from their path, so fetch/extract work is
+replayable without network access:
+
+- ``/robots.txt``: allows everything
+- ``/company/<n>``: HTML article about synthetic company ``n`` (ETag aware, 304 on match)
+- anything else: 404
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+from benchmarks.synthetic import company_article
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    server_version = "BenchmarkFixture/1.0"
+
+    def do_GET(self) -> None:  # noqa: N802
+        path = self.path.split("?", 1)[0]
+        if path == "/robots.txt":
+            self._write(200, {"Content-Type": "text/plain"}, b"User-agent: *\nAllow: /\n")
+            return
+
+        if path.startswith("/company/") and path[len("/company/") :].isdigit():
+            index = int(path[len("/company/") :])
+            body = company_article(index, seed=self.server.seed).encode("utf-8")
+            etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self._write(304, {"ETag": etag}, b"")
+                return
+            self._write(200, {"Content-Type": "text/html; charset=utf-8", "ETag": etag}, body)
+            return
+
+        self._write(404, {"Content-Type": "text/plain"}, b"not found")
+
+    def _write(self, status: int, headers: dict, body: bytes) -> None:
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+        self.server.requests_served += 1
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A003
+        return
+
+
+class FixtureServer:
+    """Threaded fixture server on an ephemeral localhost port; use as a context manager."""
+
+    def __init__(self, seed: int, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._httpd = ThreadingHTTPServer((host, port), _FixtureHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.seed = seed
+        self._httpd.requests_served = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests_served(self) -> int:
+        return self._httpd.requests_served
+
+    def __enter__(self) -> "FixtureServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="bench-fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
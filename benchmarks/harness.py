@@ -0,0 +1,109 @@
+"""Measurement helpers shared by the pipeline benchmarks.
+
+``StepMeter`` wraps one pipeline step and records wall time, the number of SQL
+statements executed on any engine in this process, the process peak RSS after
+the step (and how much the step raised it), rows handled and rows/sec. Results
+are plain dicts so they serialise straight into the results JSON.
+"""
+
+from __future__ import annotations
+
+import platform
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:  # not available on Windows
+    import resource
+except ImportError:  # pragma: no cover - platform dependent
+    resource = None
+
+RESULTS_SCHEMA_VERSION = 1
+ROOT = Path(__file__).resolve().parents[1]
+
+
+class QueryCounter:
+    """Counts statements sent to the database by every SQLAlchemy engine."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._installed = False
+
+    def install(self) -> None:
+        if not self._installed:
+            event.listen(Engine, "before_cursor_execute", self._on_execute)
+            self._installed = True
+
+    def uninstall(self) -> None:
+        if self._installed:
+            event.remove(Engine, "before_cursor_execute", self._on_execute)
+            self._installed = False
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.count += 1
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Process high-water RSS in MiB (None where the platform cannot report it)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+class StepMeter:
+    """Collects one result dict per measured step."""
+
+    def __init__(self, counter: Optional[QueryCounter] = None) -> None:
+        self.counter = counter or QueryCounter()
+        self.counter.install()
+        self.steps: Dict[str, Dict[str, Any]] = {}
+
+    @asynccontextmanager
+    async def step(self, name: str) -> AsyncIterator[Dict[str, Any]]:
+        """Measure the enclosed block; set ``record["rows"]`` inside it for rows/sec.
+
+        Exceptions are recorded on the step (``error``) and not re-raised, so one
+        failing step does not hide the measurements of the others.
+        """
+        record: Dict[str, Any] = {"rows": 0}
+        rss_before = peak_rss_mb()
+        queries_before = self.counter.count
+        started = time.perf_counter()
+        try:
+            yield record
+        except Exception as exc:  # noqa: BLE001
+            record["error"] = f"{type(exc).__name__}: {exc}"[:500]
+        elapsed = time.perf_counter() - started
+        rss_after = peak_rss_mb()
+        rows = int(record.get("rows") or 0)
+        record.update(
+            {
+                "wall_seconds": round(elapsed, 4),
+                "queries": self.counter.count - queries_before,
+                "peak_rss_mb": rss_after,
+                "peak_rss_growth_mb": (
+                    round(rss_after - rss_before, 1) if rss_after is not None and rss_before is not None else None
+                ),
+                "rows": rows,
+                "rows_per_sec": round(rows / elapsed, 1) if rows and elapsed > 0 else None,
+            }
+        )
+        self.steps[name] = record
+
+
+def environment_info() -> Dict[str, Any]:
+    git = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=ROOT)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "git_rev": git.stdout.strip() if git.returncode == 0 else None,
+    }
@@ -0,0 +1,260 @@
+"""Developer benchmark: research pipeline steps on a synthetic tenant.
+
+Seeds a fresh synthetic tenant and run at the chosen scale (see
+``benchmarks/synthetic.py``), serves URL sources from a local fixture HTTP
+server, then measures each pipeline step in its own worker-profile session:
+
+    fetch_url_sources, process_sources, rank_prospects, rank_executives,
+    entity_resolution, canonical_people, canonical_companies, export_pack,
+    claim_next_job
+
+Per step it records wall time, SQL statement count, peak RSS and rows/sec, and
+writes one JSON document to ``--output``. ``--baseline`` compares the results
+against a stored baseline (see ``benchmarks/compare.py``) and exits 1 on a
+regression; ``--save-baseline`` stores the results as that baseline instead.
+
+Seeded data is left in place (it is tenant-scoped). Point DATABASE_URL at a
+disposable local Postgres at the current alembic head; non-local hosts are
+refused unless ``--allow-remote`` is given.
+
+Usage:
+    python -m benchmarks.run --scale 1k [--seed 7] [--url-sources 200] [--steps rank_prospects,export_pack]
+        [--output benchmarks/results/1k.json] [--baseline benchmarks/baselines/1k.json [--save-baseline]]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.engine import make_url
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.core.config import settings  # noqa: E402
+from app.db.session import configure_default_profile, get_async_session_context  # noqa: E402
+from app.models.company_research import CompanyResearchJob  # noqa: E402
+from app.services.company_extraction_service import CompanyExtractionService  # noqa: E402
+from app.services.company_research_service import CompanyResearchService  # noqa: E402
+from benchmarks.compare import compare_results  # noqa: E402
+from benchmarks.fixture_server import FixtureServer  # noqa: E402
+from benchmarks.harness import RESULTS_SCHEMA_VERSION, StepMeter, environment_info  # noqa: E402
+from benchmarks.synthetic import SCALES, SyntheticRun, seed_synthetic_run  # noqa: E402
+
+BENCH_JOB_TYPE = "benchmark_noop"
+CLAIM_WORKERS = 4
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", None}
+
+StepFn = Callable[[SyntheticRun, Dict[str, Any]], Awaitable[None]]
+
+
+async def _fetch_url_sources(synthetic: SyntheticRun, record: Dict[str, Any]) -> None:
+    async with get_async_session_context("worker") as session:
+        summary = await CompanyExtractionService(session).fetch_url_sources(str(synthetic.tenant_id), synthetic.run_id)
+    record["rows"] = synthetic.url_sources
+    record["summary"] = {k: v for k, v in summary.items() if isinstance(v, (int, float))}
+
+
+async def _process_sources(synthetic: SyntheticRun, record: Dict[str, Any]) -> None:
+    async with get_async_session_context("worker") as session:
+        summary = await CompanyExtractionService(session).process_sources(str(synthetic.tenant_id), synthetic.run_id)
+    record["rows"] = synthetic.sources
+    record["summary"] = {k: v for k, v in summary.items() if isinstance(v, (int, float))}
+
+
+async def _rank_prospects(synthetic: SyntheticRun, record: Dict[str, Any]) -> None:
+    async with get_async_session_context("worker") as session:
+        ranked = await CompanyResearchService(session).rank_prospects_for_run(
+            str(synthetic.tenant_id), synthetic.run_id, limit=synthetic.prospects
+        )
+    record["rows"] = len(ranked)
+
+
+async def _rank_executives(synthetic: SyntheticRun, record: Dict[str, Any]) -> None:
+    async with get_async_session_context("worker") as session:
+        ranked = await CompanyResearchService(session).rank_executives_for_run(
+            str(synthetic.tenant_id), synthetic.run_id, limit=synthetic.executives
+        )
+    record["rows"] = len(ranked)
+
+
+async def _entity_resolution(synthetic: SyntheticRun, record: Dict[str, Any]) -> None:
+    async with get_async_session_context("worker") as session:
+        await CompanyResearchService(session).run_entity_resolution_step(str(synthetic.tenant_id), synthetic.run_id)
+    record["rows"] = synthetic.executives
+
+
+async def _canonical_people(synthetic: SyntheticRun, record: Dict[str, Any]) -> None:
+    async with get_async_session_context("worker") as session:
+        await CompanyResearchService(session).run_canonical_people_resolution_step(
+            str(synthetic.tenant_id), synthetic.run_id
+        )
+    record["rows"] = synthetic.executives
+
+
+async def _canonical_companies(synthetic: SyntheticRun, record: Dict[str, Any]) -> None:
+    async with get_async_session_context("worker") as session:
+        await CompanyResearchService(session).run_canonical_company_resolution_step(
+            str(synthetic.tenant_id), synthetic.run_id
+        )
+    record["rows"] = synthetic.prospects
+
+
+async def _export_pack(synthetic: SyntheticRun, record: Dict[str, Any]) -> None:
+    async with get_async_session_context("reporting") as session:
+        _pack, zip_bytes, files = await CompanyResearchService(session).build_run_export_pack(
+            str(synthetic.tenant_id), synthetic.run_id
+        )
+    record["rows"] = synthetic.prospects
+    record["zip_bytes"] = len(zip_bytes)
+    record["files"] = len(files)
+
+
+async def _claim_next_job(synthetic: SyntheticRun, record: Dict[str, Any]) -> None:
+    """Drain benchmark-only no-op jobs with concurrent workers (SKIP LOCKED contention)."""
+    jobs = min(synthetic.prospects, 1_000)
+    async with get_async_session_context("worker") as session:
+        await session.execute(
+            insert(CompanyResearchJob),
+            [
+                {
+                    "tenant_id": synthetic.tenant_id,
+                    "run_id": synthetic.run_id,
+                    "job_type": BENCH_JOB_TYPE,
+                    "status": "queued",
+                    "params_json": {"n": n},
+                    "progress_json": {},
+                    "attempt_count": 0,
+                    "max_attempts": 1,
+                }
+                for n in range(jobs)
+            ],
+        )
+
+    claimed = 0
+
+    async def _worker(worker_id: str) -> None:
+        nonlocal claimed
+        while True:
+            async with get_async_session_context("worker") as session:
+                service = CompanyResearchService(session)
+                job = await service.claim_next_job(worker_id, job_type=BENCH_JOB_TYPE)
+                if not job:
+                    return
+                await service.mark_job_running(job.id, worker_id)
+                await service.mark_job_succeeded(job.id)
+            claimed += 1
+
+    await asyncio.gather(*(_worker(f"bench-{n}") for n in range(CLAIM_WORKERS)))
+    record["rows"] = claimed
+    record["workers"] = CLAIM_WORKERS
+
+
+STEPS: Dict[str, StepFn] = {
+    "fetch_url_sources": _fetch_url_sources,
+    "process_sources": _process_sources,
+    "rank_prospects": _rank_prospects,
+    "rank_executives": _rank_executives,
+    "entity_resolution": _entity_resolution,
+    "canonical_people": _canonical_people,
+    "canonical_companies": _canonical_companies,
+    "export_pack": _export_pack,
+    "claim_next_job": _claim_next_job,
+}
+
+
+async def run_benchmark(scale: str, seed: int, url_sources: int, steps: List[str]) -> Dict[str, Any]:
+    meter = StepMeter()
+    with FixtureServer(seed=seed) as server:
+        async with meter.step("seed") as record:
+            async with get_async_session_context("worker") as session:
+                synthetic = await seed_synthetic_run(
+                    session,
+                    count=SCALES[scale],
+                    seed=seed,
+                    fixture_base_url=server.base_url,
+                    url_sources=url_sources,
+                )
+            record["rows"] = synthetic.prospects + synthetic.executives + synthetic.sources + synthetic.evidence
+        if "error" in meter.steps["seed"]:
+            raise SystemExit(f"seeding failed: {meter.steps['seed']['error']}")
+
+        for name in steps:
+            async with meter.step(name) as record:
+                await STEPS[name](synthetic, record)
+        fixture_requests = server.requests_served
+
+    return {
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "scale": scale,
+        "seed": seed,
+        "dataset": {
+            "tenant_id": str(synthetic.tenant_id),
+            "run_id": str(synthetic.run_id),
+            "prospects": synthetic.prospects,
+            "executives": synthetic.executives,
+            "sources": synthetic.sources,
+            "url_sources": synthetic.url_sources,
+            "evidence": synthetic.evidence,
+            "fixture_requests": fixture_requests,
+        },
+        "environment": environment_info(),
+        "steps": meter.steps,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1k")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--url-sources", type=int, default=200, help="URL sources served by the fixture server")
+    parser.add_argument("--steps", default=",".join(STEPS), help="Comma-separated subset of steps, in order")
+    parser.add_argument("--output", type=Path, default=None, help="Results JSON (default benchmarks/results/<scale>.json)")
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results to --baseline instead of comparing")
+    parser.add_argument("--allow-remote", action="store_true", help="Allow a non-local DATABASE_URL host")
+    args = parser.parse_args()
+
+    steps = [name.strip() for name in args.steps.split(",") if name.strip()]
+    unknown = [name for name in steps if name not in STEPS]
+    if unknown:
+        parser.error(f"unknown steps: {', '.join(unknown)}")
+    host = make_url(settings.DATABASE_URL).host
+    if host not in LOCAL_HOSTS and not args.allow_remote:
+        parser.error(f"refusing to seed benchmark data into non-local database host {host!r} (use --allow-remote)")
+    if args.save_baseline and not args.baseline:
+        parser.error("--save-baseline requires --baseline")
+
+    configure_default_profile("worker")
+    results = asyncio.run(run_benchmark(args.scale, args.seed, args.url_sources, steps))
+
+    output = args.output or ROOT / "benchmarks" / "results" / f"{args.scale}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"results written to {output}")
+
+    if args.baseline is None:
+        return 0
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("scale") != results["scale"]:
+        print(f"scale mismatch: results={results['scale']} baseline={baseline.get('scale')}", file=sys.stderr)
+        return 2
+    rows = compare_results(results, baseline)
+    print(json.dumps(rows, indent=2))
+    return 1 if any(row["status"] == "regressed" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
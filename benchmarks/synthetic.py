@@ -0,0 +1,255 @@
+"""Deterministic synthetic tenants and research runs for the benchmarks.
+
+Every benchmark run seeds a fresh tenant (tenant, company, role, run) and then
+bulk-inserts prospects, executives, evidence and sources. Content is derived
+from the seed only, so two runs at the same scale and seed do the same work;
+row IDs are random so repeated runs never collide in one database.
+
+A small share of executives and company domains are deliberate duplicates so
+entity and canonical resolution have merges to make.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.company import Company
+from app.models.company_research import (
+    CompanyProspect,
+    CompanyProspectEvidence,
+    CompanyResearchRun,
+    ExecutiveProspect,
+    ExecutiveProspectEvidence,
+    ResearchSourceDocument,
+)
+from app.models.role import Role
+from app.models.tenant import Tenant
+from app.utils.company_name_match import name_match_keys
+
+SCALES: Dict[str, int] = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+INSERT_BATCH_SIZE = 2_000
+
+NAME_PREFIXES = ["Atlas", "Beacon", "Citrine", "Delta", "Granite", "Harbor", "Keystone", "Mesa", "Northwind", "Orion"]
+NAME_SUFFIXES = ["Bank", "Capital", "Holdings", "Payments", "Analytics", "Logistics", "Energy", "Health"]
+FIRST_NAMES = ["Amara", "Bilal", "Chen", "Dana", "Elif", "Farah", "Goran", "Hana", "Ivan", "Jade", "Kofi", "Lena"]
+LAST_NAMES = ["Okafor", "Haddad", "Lindqvist", "Moreau", "Nakamura", "Patel", "Quinn", "Rossi", "Silva", "Tanaka"]
+TITLES = ["Chief Executive Officer", "Chief Financial Officer", "Chief Operating Officer", "Chief Risk Officer"]
+SENTENCES = [
+    "{company} reported record quarterly revenue driven by demand in its digital division.",
+    "{company} appointed {person} as {title} following a board review.",
+    "Analysts expect {company} to expand into three new markets next year.",
+    "The board of {company} approved a dividend increase and a share buyback.",
+    "{person} joins {company} as {title} after a decade in regional banking.",
+    "Regulators cleared {company} to complete its acquisition of a payments provider.",
+]
+
+
+def company_name(index: int) -> str:
+    return f"{NAME_PREFIXES[index % len(NAME_PREFIXES)]} {NAME_SUFFIXES[(index // 10) % len(NAME_SUFFIXES)]} {index}"
+
+
+def person_name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def company_article(index: int, seed: int, sentences: int = 12) -> str:
+    """HTML article about company ``index``; deterministic for (index, seed)."""
+    rng = random.Random(f"{seed}:{index}")
+    company = company_name(index)
+    body = " ".join(
+        rng.choice(SENTENCES).format(company=company, person=person_name(rng), title=rng.choice(TITLES))
+        for _ in range(sentences)
+    )
+    return f"<html><head><title>{company} news</title></head><body><h1>{company}</h1><p>{body}</p></body></html>"
+
+
+def _text_source(index: int, seed: int, companies: int) -> str:
+    rng = random.Random(f"text:{seed}:{index}")
+    mentioned = [company_name(rng.randrange(companies)) for _ in range(3)]
+    return " ".join(
+        rng.choice(SENTENCES).format(company=name, person=person_name(rng), title=rng.choice(TITLES))
+        for name in mentioned
+        for _ in range(2)
+    )
+
+
+@dataclass
+class SyntheticRun:
+    tenant_id: uuid.UUID
+    role_id: uuid.UUID
+    run_id: uuid.UUID
+    prospects: int
+    executives: int
+    sources: int
+    url_sources: int
+    evidence: int
+
+
+def _batched(rows: List[dict], size: int = INSERT_BATCH_SIZE) -> Iterable[List[dict]]:
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+async def _bulk_insert(session: AsyncSession, model, rows: List[dict]) -> None:
+    for batch in _batched(rows):
+        await session.execute(insert(model), batch)
+
+
+async def seed_synthetic_run(
+    session: AsyncSession,
+    *,
+    count: int,
+    seed: int,
+    fixture_base_url: Optional[str],
+    url_sources: int,
+) -> SyntheticRun:
+    """Seed a new tenant with one run of ``count`` prospects, executives and sources.
+
+    ``url_sources`` of the sources are queued URL sources pointing at the fixture
+    server (none when ``fixture_base_url`` is None); the rest are text sources.
+    """
+    rng = random.Random(seed)
+    tenant_id, company_id, role_id, run_id = (uuid.uuid4() for _ in range(4))
+
+    await session.execute(insert(Tenant).values(id=tenant_id, name=f"benchmark-{count}-{seed}", status="active"))
+    await session.execute(insert(Company).values(id=company_id, tenant_id=tenant_id, name="Benchmark Client"))
+    await session.execute(
+        insert(Role).values(id=role_id, tenant_id=tenant_id, company_id=company_id, title="Benchmark Mandate", status="open")
+    )
+    await session.execute(
+        insert(CompanyResearchRun).values(
+            id=run_id,
+            tenant_id=tenant_id,
+            role_mandate_id=role_id,
+            name=f"benchmark {count}",
+            sector="banking",
+            region_scope=["AE", "SA"],
+            status="active",
+        )
+    )
+
+    url_count = min(url_sources, count) if fixture_base_url else 0
+    sources: List[dict] = []
+    for i in range(count):
+        row = {"id": uuid.uuid4(), "tenant_id": tenant_id, "company_research_run_id": run_id, "meta": {}}
+        if i < url_count:
+            url = f"{fixture_base_url}/company/{i}"
+            row.update(source_type="url", url=url, original_url=url, url_normalized=url, status="queued")
+        else:
+            text = _text_source(i, seed, count)
+            row.update(
+                source_type="text",
+                title=f"bench-text-{i}",
+                **ResearchSourceDocument.packed_content_values(None, text),
+                content_hash=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+                status="new",
+            )
+        sources.append(row)
+    await _bulk_insert(session, ResearchSourceDocument, sources)
+
+    prospects: List[dict] = []
+    prospect_evidence: List[dict] = []
+    for i in range(count):
+        name = company_name(i)
+        # Every 20th company shares a website with its predecessor (canonical merge work).
+        domain_index = i - 1 if i and i % 20 == 0 else i
+        prospect_id = uuid.uuid4()
+        prospects.append(
+            {
+                "id": prospect_id,
+                "tenant_id": tenant_id,
+                "company_research_run_id": run_id,
+                "role_mandate_id": role_id,
+                "name_raw": name,
+                "name_normalized": name.lower(),
+                "name_match_keys": name_match_keys(name),
+                "website_url": f"https://company-{domain_index}.example.com",
+                "hq_country": rng.choice(["AE", "SA"]),
+                "sector": "banking",
+                "data_confidence": 0.5,
+                "relevance_score": round(rng.random(), 2),
+                "evidence_score": round(rng.random(), 2),
+                "is_pinned": False,
+                "status": rng.choice(["new", "accepted"]),
+                "discovered_by": rng.choice(["internal", "grok", "seed_list"]),
+                "verification_status": rng.choice(["unverified", "partial", "verified"]),
+                "review_status": "accepted",
+                "exec_search_enabled": True,
+            }
+        )
+        source = sources[rng.randrange(len(sources))]
+        prospect_evidence.append(
+            {
+                "tenant_id": tenant_id,
+                "company_prospect_id": prospect_id,
+                "source_type": source["source_type"],
+                "source_name": f"bench-{source['source_type']}",
+                "source_url": source.get("url"),
+                "evidence_weight": 0.5,
+                "source_document_id": source["id"],
+                "source_content_hash": source.get("content_hash"),
+            }
+        )
+    await _bulk_insert(session, CompanyProspect, prospects)
+    await _bulk_insert(session, CompanyProspectEvidence, prospect_evidence)
+
+    executives: List[dict] = []
+    executive_evidence: List[dict] = []
+    previous: Optional[dict] = None
+    for i in range(count):
+        # Every 25th executive repeats the previous one at the same company (entity merge work).
+        if previous is not None and i % 25 == 0:
+            name, title, prospect_id = previous["name_raw"], previous["title"], previous["company_prospect_id"]
+        else:
+            name, title = person_name(rng), rng.choice(TITLES)
+            prospect_id = prospects[i % len(prospects)]["id"]
+        executive = {
+            "id": uuid.uuid4(),
+            "tenant_id": tenant_id,
+            "company_research_run_id": run_id,
+            "company_prospect_id": prospect_id,
+            "name_raw": name,
+            "name_normalized": name.lower(),
+            "title": title,
+            "profile_url": f"https://profiles.example.com/{name.lower().replace(' ', '-')}-{i % 997}",
+            "confidence": 0.5,
+            "status": "new",
+            "discovered_by": rng.choice(["internal", "external"]),
+            "verification_status": rng.choice(["unverified", "partial", "verified"]),
+            "review_status": "accepted",
+        }
+        executives.append(executive)
+        previous = executive
+        source = sources[rng.randrange(len(sources))]
+        executive_evidence.append(
+            {
+                "tenant_id": tenant_id,
+                "executive_prospect_id": executive["id"],
+                "source_type": source["source_type"],
+                "source_name": f"bench-{source['source_type']}",
+                "source_url": source.get("url"),
+                "evidence_weight": 0.5,
+                "source_document_id": source["id"],
+                "source_content_hash": source.get("content_hash"),
+            }
+        )
+    await _bulk_insert(session, ExecutiveProspect, executives)
+    await _bulk_insert(session, ExecutiveProspectEvidence, executive_evidence)
+
+    return SyntheticRun(
+        tenant_id=tenant_id,
+        role_id=role_id,
+        run_id=run_id,
+        prospects=len(prospects),
+        executives=len(executives),
+        sources=len(sources),
+        url_sources=url_count,
+        evidence=len(prospect_evidence) + len(executive_evidence),
+    )
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Fill company_prospects.name_match_keys for rows that have none.
+
+Migration d4a7c2e9f1b3 adds the column empty ('[]'); new and renamed prospects
+get their keys from the model. This script computes the keys of existing rows
+with the current app.utils.company_name_match.name_match_keys, in id order and
+batches of --batch-size. Until it has run, bulk duplicate passes compute the
+missing keys on the fly, but ingest lookups through the GIN index do not see
+those rows. Pass --all to recompute every row after the key derivation changes.
+
+Usage:
+    python scripts/maintenance/backfill_prospect_name_match_keys.py [--all] [--batch-size 1000]
+
+Environment variables (same as app/database defaults):
+    DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import psycopg2
+from dotenv import load_dotenv
+from psycopg2.extras import Json, execute_batch
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.utils.company_name_match import name_match_keys  # noqa: E402
+
+
+def connect_db():
+    load_dotenv()
+    return psycopg2.connect(
+        host=os.getenv("DB_HOST", "localhost"),
+        port=os.getenv("DB_PORT", 5432),
+        database=os.getenv("DB_NAME", "ats_db"),
+        user=os.getenv("DB_USER", "postgres"),
+        password=os.getenv("DB_PASSWORD", "postgres"),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--all", action="store_true", help="recompute keys of every prospect")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    conn = connect_db()
+    cur = conn.cursor()
+
+    print("=== Backfilling company prospect name match keys ===")
+
+    where = "TRUE" if args.all else "name_match_keys = '[]'::jsonb"
+    last_id = None
+    scanned = 0
+    updated = 0
+    while True:
+        cur.execute(
+            f"""
+            SELECT id, name_raw
+            FROM company_prospects
+            WHERE {where} AND (%s::uuid IS NULL OR id > %s::uuid)
+            ORDER BY id
+            LIMIT %s
+            """,
+            (last_id, last_id, args.batch_size),
+        )
+        rows = cur.fetchall()
+        if not rows:
+            break
+        updates = [(Json(keys), row_id) for row_id, name in rows if (keys := name_match_keys(name))]
+        execute_batch(cur, "UPDATE company_prospects SET name_match_keys = %s WHERE id = %s", updates)
+        conn.commit()
+        scanned += len(rows)
+        updated += len(updates)
+        last_id = rows[-1][0]
+
+    print(f"Scanned {scanned} prospects; updated {updated} rows.")
+
+    cur.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
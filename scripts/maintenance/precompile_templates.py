@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Compile every UI template into the Jinja bytecode cache (build-time step).
+
+Run once while building an image or release so the first request in each new
+process loads cached bytecode instead of parsing templates. Uses the same
+settings as the app (UI_TEMPLATE_CACHE_DIR; empty means Jinja's per-user temp
+directory, which only helps when the build and runtime users match).
+
+Usage:
+    UI_TEMPLATE_CACHE_DIR=/var/cache/ats/jinja python scripts/maintenance/precompile_templates.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.core.config import settings  # noqa: E402
+from app.ui.templating import precompile_templates  # noqa: E402
+
+
+def main() -> int:
+    if not settings.UI_TEMPLATE_BYTECODE_CACHE:
+        print("UI_TEMPLATE_BYTECODE_CACHE is disabled; nothing to precompile")
+        return 1
+    count = precompile_templates()
+    print(f"compiled {count} templates into {settings.UI_TEMPLATE_CACHE_DIR or 'the default Jinja cache directory'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
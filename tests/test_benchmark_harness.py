@@ -0,0 +1,74 @@
+"""Benchmark suite plumbing: step metering, baseline comparison and the fixture server."""
+import asyncio
+import urllib.request
+
+import pytest
+
+from benchmarks.compare import compare_results
+from benchmarks.fixture_server import FixtureServer
+from benchmarks.harness import StepMeter
+from benchmarks.synthetic import company_article
+
+
+@pytest.mark.unit
+def test_step_meter_records_rows_and_errors_without_raising():
+    meter = StepMeter()
+
+    async def _run():
+        async with meter.step("ok") as record:
+            record["rows"] = 10
+        async with meter.step("boom"):
+            raise RuntimeError("step failed")
+
+    asyncio.run(_run())
+    meter.counter.uninstall()
+
+    ok, boom = meter.steps["ok"], meter.steps["boom"]
+    assert ok["rows"] == 10 and ok["queries"] == 0 and ok["rows_per_sec"] > 0
+    assert "error" not in ok
+    assert boom["error"] == "RuntimeError: step failed"
+    assert boom["rows_per_sec"] is None
+
+
+@pytest.mark.unit
+def test_compare_flags_wall_query_and_error_regressions():
+    baseline = {
+        "steps": {
+            "rank": {"wall_seconds": 1.0, "queries": 10},
+            "export": {"wall_seconds": 2.0, "queries": 5},
+            "fetch": {"wall_seconds": 0.01, "queries": 3},
+            "gone": {"wall_seconds": 1.0, "queries": 1},
+        }
+    }
+    current = {
+        "steps": {
+            "rank": {"wall_seconds": 1.1, "queries": 10},
+            "export": {"wall_seconds": 3.0, "queries": 7},
+            "fetch": {"wall_seconds": 0.03, "queries": 3, "error": "ValueError: x"},
+            "new": {"wall_seconds": 1.0, "queries": 1},
+        }
+    }
+
+    rows = {row["step"]: row for row in compare_results(current, baseline)}
+
+    assert rows["rank"]["status"] == "ok"
+    assert rows["export"]["status"] == "regressed"
+    assert rows["export"]["reasons"] == ["wall_time", "queries"]
+    # Sub-50ms steps are not flagged on wall time, but errors still count.
+    assert rows["fetch"]["reasons"] == ["error"]
+    assert rows["gone"]["status"] == "missing" and rows["new"]["status"] == "new"
+
+
+@pytest.mark.unit
+def test_fixture_server_serves_deterministic_pages_and_revalidates():
+    with FixtureServer(seed=3) as server:
+        with urllib.request.urlopen(f"{server.base_url}/company/5") as response:
+            body = response.read().decode("utf-8")
+            etag = response.headers["ETag"]
+        request = urllib.request.Request(f"{server.base_url}/company/5", headers={"If-None-Match": etag})
+        with pytest.raises(urllib.error.HTTPError) as not_modified:
+            urllib.request.urlopen(request)
+
+    assert body == company_article(5, seed=3)
+    assert not_modified.value.code == 304
+    assert server.requests_served == 2
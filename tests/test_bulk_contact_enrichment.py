@@ -0,0 +1,179 @@
+"""Bulk executive contact enrichment: batched recency checks and bounded provider fan-out."""
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.contact_enrichment import ContactEnrichmentRequest, ProviderEnrichmentResult
+from app.services.contact_enrichment_service import ContactEnrichmentService
+
+
+class _Adapter:
+    def __init__(self, name):
+        self.provider = name
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch_contacts(self, context):
+        self.calls.append(context["id"])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.005)
+        self.in_flight -= 1
+        return {"emails": [{"value": f"{context['id'][:8]}@example.com"}], "source_url": None}
+
+
+class _EnrichmentRepo:
+    def __init__(self, recent):
+        self.recent = recent
+        self.latest_calls = []
+        self.hash_calls = []
+
+    async def list_latest_for_providers(self, tenant_id, providers, purpose, target_ids, target_type):
+        self.latest_calls.append((list(providers), list(target_ids)))
+        return dict(self.recent)
+
+    async def list_by_hashes(self, tenant_id, purpose, target_type, keys):
+        self.hash_calls.append(list(keys))
+        return {}
+
+
+class _CompanyRepo:
+    def __init__(self, executives):
+        self.executives = executives
+
+    async def list_executive_prospects_by_ids(self, tenant_id, run_id, executive_ids):
+        return [e for e in self.executives if e.id in set(executive_ids)]
+
+
+class _Session:
+    def __init__(self):
+        self.commits = 0
+
+    async def commit(self):
+        self.commits += 1
+
+
+def _executive(run_id):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        company_prospect_id=uuid.uuid4(),
+        company_prospect=SimpleNamespace(name_normalized="acme", name_raw="Acme"),
+        company_research_run_id=run_id,
+        name_raw="Jane Doe",
+        name_normalized="jane doe",
+        title="CFO",
+        linkedin_url=None,
+        profile_url=None,
+        email=None,
+        status="new",
+        verification_status="unverified",
+        review_status="new",
+    )
+
+
+@pytest.mark.unit
+def test_bulk_enrichment_batches_recency_and_bounds_provider_concurrency(monkeypatch):
+    monkeypatch.setattr(settings, "BULK_ENRICH_PROVIDER_CONCURRENCY", 3)
+    monkeypatch.setattr(settings, "BULK_ENRICH_PROVIDER_RATE_PER_SECOND", 0.0)
+
+    run_id = uuid.uuid4()
+    executives = [_executive(run_id) for _ in range(12)]
+    fresh = SimpleNamespace(
+        id=uuid.uuid4(),
+        created_at=datetime.now(timezone.utc) - timedelta(minutes=5),
+        source_document_id=None,
+        payload={},
+    )
+    enrichment_repo = _EnrichmentRepo({("lusha", executives[0].id): fresh})
+
+    session = _Session()
+    service = ContactEnrichmentService(session)
+    service.adapters = {"lusha": _Adapter("lusha"), "signalhire": _Adapter("signalhire")}
+    service.ai_enrichment_repo = enrichment_repo
+    service.company_repo = _CompanyRepo(executives)
+    recorded = []
+
+    async def _record(tenant_id, executive, exec_context, provider, request, raw_payload, canonical):
+        recorded.append((executive.id, provider, canonical.sha256))
+        return ProviderEnrichmentResult(provider=provider, status="created")
+
+    monkeypatch.setattr(service, "_record_executive_enrichment", _record)
+
+    missing_id = uuid.uuid4()
+    ids = [e.id for e in executives] + [missing_id, executives[1].id]
+    request = ContactEnrichmentRequest(providers=["Lusha", "signalhire", "lusha", "nope"])
+    results = asyncio.run(service.enrich_executives(str(uuid.uuid4()), run_id, ids, request))
+
+    # One recency query and one idempotency query for the whole batch.
+    assert len(enrichment_repo.latest_calls) == 1
+    assert len(enrichment_repo.hash_calls) == 1
+    assert enrichment_repo.latest_calls[0][0] == ["lusha", "signalhire"]
+
+    # Duplicates dropped, input order kept, unknown ids reported as None.
+    assert [exec_id for exec_id, _ in results] == [e.id for e in executives] + [missing_id]
+    assert results[-1][1] is None
+
+    first = {r.provider: r for r in results[0][1]}
+    assert [r.provider for r in results[0][1]] == ["lusha", "signalhire", "nope"]
+    assert first["lusha"].status == "skipped" and first["lusha"].enrichment_id == fresh.id
+    assert first["nope"].status == "error"
+
+    lusha, signalhire = service.adapters["lusha"], service.adapters["signalhire"]
+    assert len(lusha.calls) == 11 and len(signalhire.calls) == 12
+    assert 1 < lusha.max_in_flight <= 3 and 1 < signalhire.max_in_flight <= 3
+    assert len(recorded) == 23
+    # The caller commits the batch together with its progress.
+    assert session.commits == 0
+
+
+@pytest.mark.unit
+def test_provider_concurrency_is_shared_across_service_instances(monkeypatch):
+    monkeypatch.setattr(settings, "BULK_ENRICH_PROVIDER_CONCURRENCY", 2)
+    monkeypatch.setattr(settings, "BULK_ENRICH_PROVIDER_RATE_PER_SECOND", 0.0)
+
+    adapter = _Adapter("lusha")
+    services = [ContactEnrichmentService(_Session()) for _ in range(3)]
+    for service in services:
+        service.adapters = {"lusha": adapter}
+
+    async def _run():
+        await asyncio.gather(
+            *(
+                service._fetch_contacts_limited("lusha", {"id": str(uuid.uuid4())})
+                for service in services
+                for _ in range(3)
+            )
+        )
+
+    asyncio.run(_run())
+    assert len(adapter.calls) == 9
+    assert adapter.max_in_flight == 2
+
+
+@pytest.mark.unit
+def test_provider_rate_limit_spaces_call_starts(monkeypatch):
+    monkeypatch.setattr(settings, "BULK_ENRICH_PROVIDER_CONCURRENCY", 10)
+    monkeypatch.setattr(settings, "BULK_ENRICH_PROVIDER_RATE_PER_SECOND", 200.0)
+
+    service = ContactEnrichmentService(_Session())
+    starts = []
+
+    class _Timed:
+        async def fetch_contacts(self, context):
+            starts.append(asyncio.get_running_loop().time())
+            return {}
+
+    service.adapters = {"lusha": _Timed()}
+
+    async def _run():
+        await asyncio.gather(*(service._fetch_contacts_limited("lusha", {"id": str(i)}) for i in range(5)))
+
+    asyncio.run(_run())
+    # Slot i starts no earlier than i intervals after the first; a late wakeup
+    # can shrink one pairwise gap, so compare against the first start.
+    assert all(start - starts[0] >= 0.004 * i for i, start in enumerate(starts))
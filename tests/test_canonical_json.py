@@ -0,0 +1,153 @@
+"""Canonical JSON: orjson and stdlib paths, streaming hashes and the call sites it replaced."""
+import collections
+import enum
+import hashlib
+import json
+import random
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.enrichment_assignment_service import EnrichmentAssignmentService
+from app.services.search_cache_service import SearchCacheService
+from app.utils import canonical_json
+from app.utils.canonical_json import CanonicalPayload, canonical_bytes, canonical_hash, iter_canonical_bytes
+
+
+class Tier(str, enum.Enum):
+    TOP = "top"
+
+
+Pair = collections.namedtuple("Pair", "left right")
+
+PAYLOADS = [
+    {"query": "bank muscat", "country": "OM", "num": 10, "site_filter": None, "safe": True},
+    {"name": "Bank Muscat ش.م.ع.ع", "emoji": "🏦", "controls": "a\x00\x1f\x7f\b\t\n\f\r\"\\/\u2028"},
+    {"floats": [0.1, -0.0, 1e-05, 1e-4, 1e15, 1e16, 1.5e-07, 2.5e300, 5e-324], "url": "https://x.test:8080/a"},
+    {"big": 2**70, "small": -(2**63), "edge": 2**64 - 1},
+    {"when": datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc), "day": date(2026, 10, 18)},
+    {"id": uuid.UUID(int=7), "amount": Decimal("12.50"), "tier": Tier.TOP},
+    {"pair": Pair(1, "two"), "tuple": (1, (2, 3)), "nested": [[{"z": 1, "a": [{"y": None}]}]]},
+    {"é": 1, "e": 2, "E": 3, "": 4, "\U0001f600": 5},
+    [],
+    {},
+    "plain",
+    3.5,
+]
+
+
+def _legacy(value):
+    """The json.dumps form the migrated call sites used before (research run bundles, job params, ...)."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("ascii")
+
+
+def _stdlib(monkeypatch, value):
+    with monkeypatch.context() as patch:
+        patch.setattr(canonical_json, "orjson", None)
+        return canonical_bytes(value)
+
+
+def _random_payload(rng, depth=0):
+    kind = rng.randrange(8 if depth < 3 else 5)
+    if kind == 0:
+        return rng.choice([None, True, False])
+    if kind == 1:
+        return rng.randint(-(2**70), 2**70) if rng.random() < 0.1 else rng.randint(-1000, 1000)
+    if kind == 2:
+        return rng.choice([rng.random() * 10 ** rng.randint(-8, 20), float(rng.randint(0, 99))])
+    if kind == 3:
+        return "".join(rng.choice("ab:,.[]1e\"\\é😀\n\x7f ") for _ in range(rng.randint(0, 8)))
+    if kind == 4:
+        return rng.choice([uuid.UUID(int=rng.getrandbits(128)), datetime(2026, 1, rng.randint(1, 28))])
+    if kind == 5:
+        return [_random_payload(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    if kind == 6:
+        return tuple(_random_payload(rng, depth + 1) for _ in range(rng.randint(0, 3)))
+    return {f"k{rng.randint(0, 20)}é": _random_payload(rng, depth + 1) for _ in range(rng.randint(0, 4))}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("value", PAYLOADS, ids=range(len(PAYLOADS)))
+def test_fast_stdlib_streaming_and_legacy_encodings_are_byte_identical(monkeypatch, value):
+    expected = _legacy(value)
+    assert _stdlib(monkeypatch, value) == expected
+    assert canonical_bytes(value) == expected
+    assert b"".join(iter_canonical_bytes(value)) == expected
+    assert canonical_hash(value) == canonical_hash(value, stream=True) == hashlib.sha256(expected).hexdigest()
+
+
+@pytest.mark.unit
+def test_random_payloads_encode_identically_on_every_path(monkeypatch):
+    pytest.importorskip("orjson")
+    rng = random.Random(50)
+    for _ in range(500):
+        value = _random_payload(rng)
+        expected = _legacy(value)
+        assert canonical_bytes(value) == expected
+        assert _stdlib(monkeypatch, value) == expected
+        assert b"".join(iter_canonical_bytes(value, depth=3)) == expected
+
+
+@pytest.mark.unit
+def test_values_the_legacy_form_left_unstable_or_invalid(monkeypatch):
+    value = {"tags": {"b", "a"}, "frozen": frozenset({2, 1}), "score": float("nan"), "cap": float("inf")}
+    expected = b'{"cap":null,"frozen":[1,2],"score":null,"tags":["a","b"]}'
+    assert canonical_bytes(value) == _stdlib(monkeypatch, value) == expected
+    with pytest.raises(TypeError):
+        canonical_bytes({1: "int key", "a": "str key"})
+
+
+@pytest.mark.unit
+def test_streaming_yields_one_piece_per_record():
+    records = {"companies": [{"name": f"Company {i}", "website": f"https://c{i}.test"} for i in range(100)]}
+    pieces = list(iter_canonical_bytes(records))
+    assert len(pieces) > 100 and max(len(piece) for piece in pieces) < 80
+    assert b"".join(pieces) == canonical_bytes(records)
+
+
+@pytest.mark.unit
+def test_canonical_payload_encodes_once_and_caches_the_hash(monkeypatch):
+    expected_hash = canonical_hash({"a": [1, 2], "b": 1})
+    calls = []
+    original = canonical_json.canonical_bytes
+    monkeypatch.setattr(canonical_json, "canonical_bytes", lambda value: calls.append(value) or original(value))
+    payload = CanonicalPayload.of({"b": 1, "a": [1, 2]})
+    assert payload.text == '{"a":[1,2],"b":1}'
+    assert payload.sha256 is payload.sha256 and payload.sha256 == expected_hash
+    assert len(calls) == 1
+    with pytest.raises(AttributeError):
+        payload.data = b"{}"
+
+
+@pytest.mark.unit
+def test_migrated_call_sites_keep_their_hashes():
+    params = {"query": "banks in oman", "country": "OM", "num": 10}
+    cache_key, request_hash, text = SearchCacheService.build_cache_key("google_cse", params)
+    legacy = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    assert text == legacy and request_hash == hashlib.sha256(legacy.encode("utf-8")).hexdigest()
+    assert cache_key == f"google_cse:{request_hash}"
+
+    payload = SimpleNamespace(
+        target_entity_type="company",
+        target_canonical_id=uuid.UUID(int=1),
+        field_key="hq_country",
+        value_normalized="OM",
+        derived_by="rules",
+        source_document_id=uuid.UUID(int=2),
+        input_scope_hash="abc",
+    )
+    base = {
+        "target_entity_type": "company",
+        "target_canonical_id": str(uuid.UUID(int=1)),
+        "field_key": "hq_country",
+        "value": {"country": "Oman", "confidence": 0.9},
+        "value_normalized": "OM",
+        "derived_by": "rules",
+        "source_document_id": str(uuid.UUID(int=2)),
+        "input_scope_hash": "abc",
+    }
+    service = EnrichmentAssignmentService(db=None)
+    assert service._compute_content_hash(payload, base["value"]) == hashlib.sha256(_legacy(base)).hexdigest()
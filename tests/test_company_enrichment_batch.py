@@ -0,0 +1,91 @@
+"""Run-wide company enrichment: keyset batches, skip recorded scope hashes, one bulk upsert per batch."""
+import asyncio
+import uuid
+
+import pytest
+
+from app.services.company_enrichment_extraction_service import (
+    CompanyEnrichmentExtractionService,
+    extract_fields_batch,
+)
+
+TENANT = str(uuid.uuid4())
+RUN = uuid.uuid4()
+
+TEXTS = {
+    "hq": "Acme Solar. Headquarters: Berlin, Germany. A privately held solar and battery maker.",
+    "listed": "Listed on NASDAQ, the company builds wind farms.",
+    "blank": "   ",
+}
+
+
+class _ResearchRepo:
+    def __init__(self, pairs, texts):
+        self.pairs = sorted(pairs, key=lambda p: (str(p[0]), str(p[1])))
+        self.texts = texts
+        self.text_requests = []
+
+    async def list_run_enrichment_pairs(self, tenant_id, run_id, after=None, limit=200):
+        rows = [p for p in self.pairs if after is None or (str(p[0]), str(p[1])) > (str(after[0]), str(after[1]))]
+        return rows[:limit]
+
+    async def list_source_content_texts(self, tenant_id, source_ids):
+        self.text_requests.append(set(source_ids))
+        return {sid: self.texts[sid] for sid in source_ids if sid in self.texts}
+
+
+class _AssignmentRepo:
+    def __init__(self, recorded):
+        self.recorded = recorded
+        self.batches = []
+
+    async def list_recorded_scope_hashes(self, tenant_id, canonical_ids, scope_hashes):
+        return {(cid, h) for cid, h in self.recorded if cid in set(canonical_ids) and h in set(scope_hashes)}
+
+    async def bulk_upsert_assignments(self, rows):
+        self.batches.append(rows)
+        return len(rows)
+
+
+class _Session:
+    commits = 0
+
+    async def commit(self):
+        self.commits += 1
+
+
+@pytest.mark.unit
+def test_extract_fields_matches_the_per_document_rules():
+    [fields] = extract_fields_batch([TEXTS["hq"]])
+    by_key = {f.field_key: f for f in fields}
+    assert by_key["hq_country"].value == "Germany" and by_key["hq_country"].confidence == 0.90
+    assert by_key["ownership_signal"].value == "private_company"
+    assert by_key["industry_keywords"].value == ["solar", "battery"]  # by frequency
+
+
+@pytest.mark.unit
+def test_run_enrichment_skips_recorded_pairs_and_upserts_each_batch_once():
+    company_a, company_b = uuid.uuid4(), uuid.uuid4()
+    doc_hq, doc_listed, doc_blank, doc_done = (uuid.uuid4() for _ in range(4))
+    texts = {doc_hq: TEXTS["hq"], doc_listed: TEXTS["listed"], doc_blank: TEXTS["blank"], doc_done: TEXTS["hq"]}
+    pairs = [(company_a, doc_hq), (company_a, doc_done), (company_b, doc_listed), (company_b, doc_blank)]
+
+    session = _Session()
+    service = CompanyEnrichmentExtractionService(session)
+    done_hash = service._input_scope_hash(doc_done, "ownership_signal")
+    service.research_repo = _ResearchRepo(pairs, texts)
+    assignments = _AssignmentRepo(recorded={(company_a, done_hash)})
+    service.assignment_service.repo = assignments
+
+    summary = asyncio.run(service.extract_run_enrichment(TENANT, RUN, batch_size=3, workers=0))
+
+    assert summary["batches"] == 2 and summary["pairs_scanned"] == 4
+    assert summary["pairs_skipped_recorded"] == 1
+    assert summary["pairs_without_text"] == 1
+    assert summary["pairs_extracted"] == 2
+    assert all(doc_done not in requested for requested in service.research_repo.text_requests)
+    rows = [row for batch in assignments.batches for row in batch]
+    assert summary["assignments_upserted"] == len(rows) == 3 + 2  # hq doc: 3 fields, listed doc: ownership + wind
+    assert {row["source_document_id"] for row in rows} == {doc_hq, doc_listed}
+    assert all(len(row["content_hash"]) == 64 and row["input_scope_hash"] for row in rows)
+    assert session.commits == 2
@@ -0,0 +1,150 @@
+"""Fuzzy company-name matching: blocking keys, bulk scoring, merges and ingest lookups."""
+import asyncio
+import itertools
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.company_research import CompanyProspect
+from app.services.canonical_company_service import CanonicalCompanyService, CanonicalCompanyState
+from app.services.company_name_dedupe_service import CompanyNameDedupeService
+from app.services.run_resolution_snapshot import CompanyRow, RunSnapshot, build_evidence_map
+from app.utils.company_name_match import (
+    cluster_matches,
+    find_probable_duplicates,
+    lookup_keys,
+    name_match_keys,
+    name_similarity,
+)
+
+T0 = datetime(2026, 10, 18, tzinfo=timezone.utc)
+TENANT = str(uuid.uuid4())
+RUN = uuid.uuid4()
+
+SAME = [
+    ("Bank Muscat SAOG", "BankMuscat"),
+    ("Bank of Muscat", "Bank Muscat S.A.O.G."),
+    ("Muscat Bank", "Bank Muscat"),
+    ("Al Rajhi Bank", "Alrajhi Bank"),
+    ("Société Générale", "Societe Generale S.A."),
+    ("Mashreq Bank", "Mashreqbank PSC"),
+    ("Procter & Gamble Co.", "Procter and Gamble"),
+]
+DIFFERENT = [
+    ("Bank Muscat", "Bank Dhofar"),
+    ("Qatar National Bank", "Qatar Islamic Bank"),
+    ("Ahli Bank", "Ahli United Bank"),
+    ("Atlas Capital 1", "Atlas Capital 2"),
+]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("left,right", SAME)
+def test_variants_of_one_name_share_a_lookup_key_and_score_as_the_same(left, right):
+    assert set(lookup_keys(name_match_keys(left))) & set(name_match_keys(right))
+    assert name_similarity(left, right) >= 0.97
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("left,right", DIFFERENT)
+def test_different_companies_stay_below_the_match_threshold(left, right):
+    assert name_similarity(left, right) < 0.9
+
+
+def _blocked_together(left, right):
+    shared = set(name_match_keys(left)) & set(name_match_keys(right))
+    return len(shared) >= 2 or any(key[:2] in ("n:", "s:") for key in shared)
+
+
+@pytest.mark.unit
+def test_bulk_pass_finds_the_pairs_a_brute_force_pass_finds_without_comparing_every_pair():
+    same = SAME[:1] + SAME[3:]  # each company appears in one pair only
+    names = [(uuid.uuid4(), name, None) for pair in same + DIFFERENT[1:] for name in pair]
+    names += [(uuid.uuid4(), f"Harbor Bank {i}", None) for i in range(30)]  # one large "t:bank" block
+
+    matches = find_probable_duplicates(names, threshold=0.9, max_block=10)
+
+    brute = {
+        (a[0], b[0])
+        for a, b in itertools.combinations(names, 2)
+        if name_similarity(a[1], b[1]) >= 0.9 and _blocked_together(a[1], b[1])
+    }
+    assert {(m.left_id, m.right_id) for m in matches} == brute
+    assert len(matches) == len(same)
+    assert [m.score for m in matches] == sorted((m.score for m in matches), reverse=True)
+    groups = cluster_matches(matches)
+    assert sorted(len(g) for g in groups) == [2] * len(matches)
+
+
+@pytest.mark.unit
+def test_prospect_keys_follow_name_raw():
+    prospect = CompanyProspect(name_raw="Bank Muscat SAOG", name_normalized="bank muscat")
+    assert "n:bankmuscat" in prospect.name_match_keys
+    prospect.name_raw = "Omantel"
+    assert prospect.name_match_keys == name_match_keys("Omantel")
+
+
+def _row(seconds, name, pinned=False):
+    return (uuid.uuid4(), name, name_match_keys(name), pinned, T0 + timedelta(seconds=seconds))
+
+
+@pytest.mark.unit
+def test_merge_plan_keeps_the_pinned_then_oldest_prospect_of_each_group():
+    oldest = _row(0, "Bank Muscat SAOG")
+    pinned = _row(5, "BankMuscat", pinned=True)
+    joined = _row(9, "Bank of Muscat")
+    other = _row(1, "Bank Dhofar")
+    rows = [oldest, other, pinned, joined]
+    service = CompanyNameDedupeService(db=None)
+    matches = service._match(rows, 0.97)
+    evidence = build_evidence_map([(oldest[0], uuid.uuid4()), (joined[0], uuid.uuid4())])
+
+    plan = service.plan(TENANT, RUN, rows, matches, evidence, 0.97)
+
+    assert set(plan.duplicate_ids) == {oldest[0], joined[0]}
+    assert {link["canonical_entity_id"] for link in plan.links.values()} == {pinned[0]}
+    (resolved,) = plan.resolved.values()
+    assert resolved["entity_type"] == "company" and len(resolved["evidence_source_document_ids"]) == 2
+    assert plan.summary["groups_merged"] == 1 and plan.summary["duplicates_marked"] == 2
+
+
+@pytest.mark.unit
+def test_ingest_lookup_reuses_an_existing_prospect_only_above_the_auto_merge_threshold():
+    existing = SimpleNamespace(id=uuid.uuid4(), name_raw="Bank Muscat SAOG")
+    near = SimpleNamespace(id=uuid.uuid4(), name_raw="Bank Dhofar")
+    lookups = []
+
+    async def _by_keys(tenant_id, run_id, keys):
+        lookups.append(keys)
+        return [near, existing]
+
+    service = CompanyNameDedupeService(db=None)
+    service.repo = SimpleNamespace(list_company_prospects_by_name_keys=_by_keys)
+
+    assert asyncio.run(service.match_existing_prospect(TENANT, RUN, "BankMuscat")) is existing
+    assert asyncio.run(service.match_existing_prospect(TENANT, RUN, "Bank Nizwa")) is None
+    assert not any(key.startswith("t:") for key in lookups[0])
+
+
+@pytest.mark.unit
+def test_canonical_name_country_matching_groups_name_variants():
+    def _company(seconds, name):
+        return CompanyRow(uuid.uuid4(), RUN, name, name.lower(), None, "OM", T0 + timedelta(seconds=seconds))
+
+    first, second = _company(0, "Bank Muscat SAOG"), _company(1, "BankMuscat")
+    snapshot = RunSnapshot(
+        tenant_id=TENANT,
+        run_id=RUN,
+        executives=(),
+        executive_evidence={},
+        companies=(first, second),
+        company_evidence=build_evidence_map([(first.id, uuid.uuid4()), (second.id, uuid.uuid4())]),
+    )
+    state = CanonicalCompanyState(companies_by_domain={}, companies_by_name_country={}, link_entity_ids=set())
+
+    plan = CanonicalCompanyService(db=None).plan(snapshot, state)
+
+    assert len(plan.companies) == 1
+    assert {link["canonical_company_id"] for link in plan.links.values()} == {plan.companies[0]["id"]}
@@ -0,0 +1,89 @@
+"""UI dashboard panels: concurrent per-panel sessions, per-tenant cache and write invalidation."""
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import dashboard_cache as dashboard_cache_module
+from app.core.dashboard_cache import DashboardCache
+from app.models.role import Role
+from app.models.task import Task
+from app.models.user import User
+from app.ui.routes import dashboard
+
+
+@pytest.mark.unit
+def test_dashboard_cache_skips_puts_that_raced_an_invalidation():
+    cache = DashboardCache(ttl_seconds=60)
+    tenant = uuid.uuid4()
+
+    generation = cache.generation(tenant)
+    cache.invalidate_tenants([tenant])  # a write committed while panels were loading
+    assert cache.put(tenant, {"my_tasks": []}, generation) is False
+    assert cache.get(tenant) is None
+
+    assert cache.put(tenant, {"my_tasks": []}, cache.generation(tenant)) is True
+    assert cache.get(str(tenant)) == {"my_tasks": []}
+    assert cache.stats()["stale_puts"] == 1
+
+
+@pytest.mark.unit
+def test_committed_writes_invalidate_only_the_written_tenants(monkeypatch):
+    cache = DashboardCache(ttl_seconds=60)
+    monkeypatch.setattr(dashboard_cache_module, "dashboard_cache", cache)
+    written, untouched, ignored = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    for tenant in (written, untouched, ignored):
+        cache.put(tenant, {}, cache.generation(tenant))
+
+    session = SimpleNamespace(
+        new=[Task(tenant_id=written)],
+        dirty=[User(tenant_id=ignored)],
+        deleted=[],
+        info={},
+    )
+    dashboard_cache_module._remember_written_tenants(session, None)
+    dashboard_cache_module._invalidate_committed_tenants(session)
+    assert cache.get(written) is None
+    assert cache.get(untouched) == {} and cache.get(ignored) == {}
+
+    session = SimpleNamespace(new=[], dirty=[Role(tenant_id=untouched)], deleted=[], info={})
+    dashboard_cache_module._remember_written_tenants(session, None)
+    dashboard_cache_module._forget_rolled_back_tenants(session)
+    dashboard_cache_module._invalidate_committed_tenants(session)
+    assert cache.get(untouched) == {}
+
+
+@pytest.mark.unit
+def test_panels_load_concurrently_on_separate_sessions_then_come_from_cache(monkeypatch):
+    cache = DashboardCache(ttl_seconds=60)
+    monkeypatch.setattr(dashboard, "dashboard_cache", cache)
+    tenant = uuid.uuid4()
+    opened, running, peak = [], [0], [0]
+
+    @asynccontextmanager
+    async def _session_factory():
+        session = object()
+        opened.append(session)
+        yield session
+
+    def _loader(name):
+        async def _load(session, tenant_id):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+            return [{"panel": name, "tenant": tenant_id}]
+
+        return _load
+
+    monkeypatch.setattr(dashboard, "PANEL_LOADERS", {name: _loader(name) for name in dashboard.PANEL_LOADERS})
+
+    panels = asyncio.run(dashboard.load_dashboard_panels(tenant, session_factory=_session_factory))
+    assert set(panels) == {"active_roles", "action_candidates", "my_tasks", "bd_opportunities"}
+    assert panels["my_tasks"] == [{"panel": "my_tasks", "tenant": tenant}]
+    assert len(set(map(id, opened))) == 4 and peak[0] == 4
+
+    again = asyncio.run(dashboard.load_dashboard_panels(tenant, session_factory=_session_factory))
+    assert again is panels and len(opened) == 4
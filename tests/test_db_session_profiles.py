@@ -0,0 +1,37 @@
+import pytest
+
+from app.db import session as db_session
+
+
+@pytest.mark.unit
+def test_engine_profiles_have_separate_pools_and_server_settings():
+    profiles = db_session.ENGINE_PROFILES
+    assert {"api", "worker", "reporting"} <= set(profiles)
+    assert profiles["reporting"].read_only is True
+    assert profiles["api"].read_only is False
+
+    reporting = db_session.ENGINE_PROFILES["reporting"]
+    args = db_session._connect_args(reporting)
+    if reporting.url.startswith("postgresql+asyncpg"):
+        assert args["server_settings"]["default_transaction_read_only"] == "on"
+        assert args["server_settings"]["application_name"].endswith(":reporting")
+        assert args["statement_cache_size"] == reporting.statement_cache_size
+
+    assert db_session.get_engine("api") is not db_session.get_engine("worker")
+
+
+@pytest.mark.unit
+def test_configure_default_profile_rejects_unknown_profile():
+    with pytest.raises(ValueError):
+        db_session.configure_default_profile("nope")
+
+
+@pytest.mark.unit
+def test_pool_wait_stats_snapshot():
+    stats = db_session.PoolWaitStats()
+    stats.record(0.01)
+    stats.record(0.2)
+    snap = stats.snapshot()
+    assert snap["checkouts"] == 2
+    assert snap["max_wait_ms"] == pytest.approx(200.0)
+    assert snap["slow_checkouts_over_100ms"] == 1
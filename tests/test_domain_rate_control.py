@@ -0,0 +1,108 @@
+"""Adaptive per-domain fetch rate control: AIMD limits, Retry-After cooldown and persistence."""
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.domain_rate_control import DomainRateController
+from app.services.company_extraction_service import CompanyExtractionService
+from app.utils.time import utc_now
+
+
+def _controller(**overrides):
+    options = dict(initial_concurrency=2, max_concurrency=6, min_delay=0.0, max_delay=5.0, delay_step=0.1)
+    options.update(overrides)
+    return DomainRateController(**options)
+
+
+@pytest.mark.unit
+def test_healthy_domain_opens_up_and_a_throttling_one_backs_off():
+    controller = _controller()
+    for _ in range(20):
+        controller.record("cdn.example", status_code=200, latency=0.05)
+    assert controller.state("cdn.example").window == 6  # additive growth up to the cap
+
+    controller.record("fragile.example", status_code=200, latency=0.05)
+    controller.record("fragile.example", status_code=429, retry_after=30)
+    fragile = controller.state("fragile.example")
+    assert fragile.window == 1 and fragile.delay == pytest.approx(0.1)
+    assert fragile.cooldown_until > utc_now() + timedelta(seconds=25)
+    assert controller.take_for_persist("fragile.example", min_interval=3600)["throttle_count"] == 1
+    assert controller.take_for_persist("cdn.example", min_interval=0)["concurrency_limit"] == 6.0
+
+    controller.record("slow.example", status_code=200, latency=0.05)
+    for _ in range(5):
+        controller.record("slow.example", status_code=200, latency=1.0)
+    slow = controller.state("slow.example")
+    assert slow.window == 2 and slow.delay > 0  # latency far above its floor: no growth, more spacing
+
+
+@pytest.mark.unit
+def test_window_limits_in_flight_requests_and_growth_wakes_waiters():
+    controller = _controller(initial_concurrency=1)
+    order = []
+
+    async def _request(name):
+        await controller.acquire("a.example")
+        order.append(("start", name))
+        await asyncio.sleep(0.01)
+        order.append(("end", name))
+        controller.release("a.example")
+
+    async def _run():
+        await asyncio.gather(_request("first"), _request("second"))
+
+    asyncio.run(_run())
+    assert order == [("start", "first"), ("end", "first"), ("start", "second"), ("end", "second")]
+    assert controller.state("a.example").in_flight == 0
+
+
+@pytest.mark.unit
+def test_waiter_cancelled_after_being_woken_passes_its_slot_on():
+    controller = _controller(initial_concurrency=1)
+
+    async def _run():
+        await controller.acquire("a.example")
+        first = asyncio.create_task(controller.acquire("a.example"))
+        second = asyncio.create_task(controller.acquire("a.example"))
+        await asyncio.sleep(0)  # both waiting
+        controller.release("a.example")  # wakes first...
+        first.cancel()  # ...which is cancelled before it runs
+        await asyncio.wait_for(second, timeout=1)
+        assert first.cancelled()
+        return controller.state("a.example").in_flight
+
+    assert asyncio.run(_run()) == 1
+
+
+@pytest.mark.unit
+def test_request_slot_seeds_from_persisted_limits_and_writes_back_a_throttle(monkeypatch):
+    service = CompanyExtractionService(None)
+    controller = _controller()
+    monkeypatch.setattr(CompanyExtractionService, "_rate_controller", controller)
+    monkeypatch.setattr(CompanyExtractionService, "_global_semaphore", None)
+    persisted = SimpleNamespace(
+        concurrency_limit=4.0, delay_ms=200, latency_ewma_ms=80.0, latency_floor_ms=40.0,
+        throttle_count=3, cooldown_until=None,
+    )
+    written = []
+
+    async def _list(tenant_id, domains):
+        return [persisted] if domains == ["shop.example"] else []
+
+    async def _upsert(tenant_id, domain, limits):
+        written.append((tenant_id, domain, limits))
+
+    service.repo = SimpleNamespace(list_domain_rate_limits=_list, upsert_domain_rate_limit=_upsert)
+
+    async def _fetch():
+        async with service._acquire_request_slot("https://shop.example/catalog", "t1") as slot:
+            slot.observe_response(503, retry_after=5)
+
+    asyncio.run(_fetch())
+    state = controller.state("shop.example")
+    assert state.window == 2 and state.delay == pytest.approx(0.4)  # seeded 4 / 200ms, then halved / doubled
+    [(tenant_id, domain, limits)] = written
+    assert (tenant_id, domain) == ("t1", "shop.example")
+    assert limits["throttle_count"] == 4 and limits["last_status_code"] == 503 and limits["delay_ms"] == 400
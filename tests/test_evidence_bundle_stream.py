@@ -0,0 +1,153 @@
+"""Streaming evidence bundles: chunked source payloads, deterministic zip, manifest last."""
+import asyncio
+import hashlib
+import io
+import json
+import uuid
+import zipfile
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.routers.company_research import _spooled_file_response
+from app.services.company_research_service import CompanyResearchService
+
+
+class _Repo:
+    def __init__(self, payloads):
+        self.payloads = payloads
+        self.reads = []
+
+    async def stream_source_payload(self, tenant_id, source_id, *, field, chunk_size, packed=False):
+        self.reads.append((source_id, field, chunk_size))
+        payload = self.payloads[(source_id, field)]
+        for offset in range(0, len(payload), chunk_size):
+            yield payload[offset : offset + chunk_size]
+
+
+def _service(monkeypatch, tmp_path=None):
+    pdf_id, text_id, empty_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    pdf = bytes(range(256)) * 40
+    text = "Acme appointed a new CFO — résumé attached. " * 30
+    sources = [
+        {"id": pdf_id, "mime_type": "application/pdf", "bytes_length": len(pdf), "text_length": None, "content_hash": "h1"},
+        {"id": text_id, "mime_type": "text/html", "bytes_length": None, "text_length": len(text), "content_hash": "h2"},
+        {"id": empty_id, "mime_type": None, "bytes_length": None, "text_length": None, "content_hash": None},
+    ]
+    run = SimpleNamespace(updated_at=datetime(2026, 1, 2, tzinfo=timezone.utc), created_at=None)
+    files = {"run.json": b'{"id": "run"}', "sources.json": json.dumps(sources, default=str).encode("utf-8")}
+
+    service = CompanyResearchService(SimpleNamespace())
+    service.repo = _Repo({(pdf_id, "content_bytes"): pdf, (text_id, "content_text"): text})
+    monkeypatch.setattr(service, "EVIDENCE_BUNDLE_STREAM_CHUNK_BYTES", 1000)
+    if tmp_path is not None:
+        monkeypatch.setattr(service, "EVIDENCE_BUNDLE_SPOOL_ROOT", str(tmp_path))
+
+    async def _listing(tenant_id, run_id):
+        return run, dict(files), [dict(src) for src in sources]
+
+    monkeypatch.setattr(service, "_evidence_bundle_listing", _listing)
+    return service, {f"sources/{pdf_id}.pdf": pdf, f"sources/{text_id}.txt": text.encode("utf-8")}
+
+
+async def _collect(service, run_id):
+    return b"".join([chunk async for chunk in service.stream_evidence_bundle("tenant", run_id)])
+
+
+@pytest.mark.unit
+def test_stream_includes_chunked_payloads_and_manifest_last(monkeypatch):
+    service, expected = _service(monkeypatch)
+    run_id = uuid.uuid4()
+
+    first = asyncio.run(_collect(service, run_id))
+    reads = list(service.repo.reads)
+    assert asyncio.run(_collect(service, run_id)) == first
+
+    archive = zipfile.ZipFile(io.BytesIO(first))
+    assert archive.testzip() is None
+    names = archive.namelist()
+    assert names[:2] == ["run.json", "sources.json"]
+    assert names[-2:] == ["MANIFEST.json", "MANIFEST.sha256"]
+    for name, content in expected.items():
+        assert archive.read(name) == content
+
+    # One streamed read per source payload, in chunk-sized slices.
+    assert sorted(field for _id, field, _chunk in reads) == ["content_bytes", "content_text"]
+    assert {chunk for _id, _field, chunk in reads} == {1000}
+
+    manifest_bytes = archive.read("MANIFEST.json")
+    manifest = json.loads(manifest_bytes)
+    assert manifest["sources_included"] is True
+    assert [entry["file_name"] for entry in manifest["files"]] == names[:-2]
+    for entry in manifest["files"]:
+        data = archive.read(entry["file_name"])
+        assert entry["size_bytes"] == len(data)
+        assert entry["sha256"] == hashlib.sha256(data).hexdigest()
+    assert archive.read("MANIFEST.sha256").decode() == (
+        f"SHA256(MANIFEST.json)={hashlib.sha256(manifest_bytes).hexdigest()}\n"
+    )
+
+
+@pytest.mark.unit
+def test_spool_is_reused_and_served_with_ranges(monkeypatch, tmp_path):
+    service, _expected = _service(monkeypatch, tmp_path)
+    run_id = uuid.uuid4()
+
+    path = asyncio.run(service.spool_evidence_bundle("tenant", run_id))
+    reads = len(service.repo.reads)
+    assert asyncio.run(service.spool_evidence_bundle("tenant", run_id)) == path
+    assert len(service.repo.reads) == reads
+    assert list(path.parent.iterdir()) == [path]
+
+    data = path.read_bytes()
+    partial = _spooled_file_response(path, "bytes=100-199", "bundle.zip")
+    assert partial.status_code == 206
+    assert partial.headers["content-range"] == f"bytes 100-199/{len(data)}"
+    assert partial.headers["content-length"] == "100"
+
+    full = _spooled_file_response(path, None, "bundle.zip")
+    assert full.status_code == 200 and full.headers["accept-ranges"] == "bytes"
+
+    assert _spooled_file_response(path, f"bytes={len(data)}-", "bundle.zip").status_code == 416
+    assert _spooled_file_response(path, "bytes=-50", "bundle.zip").headers["content-range"] == (
+        f"bytes {len(data) - 50}-{len(data) - 1}/{len(data)}"
+    )
+
+
+@pytest.mark.unit
+def test_payload_stream_is_one_query_slicing_a_materialized_copy():
+    from sqlalchemy.dialects import postgresql
+
+    from app.repositories.company_research_repo import CompanyResearchRepository
+
+    statements = []
+
+    class _Result:
+        def __init__(self, rows):
+            self.rows = rows
+
+        def __aiter__(self):
+            return self._rows()
+
+        async def _rows(self):
+            for row in self.rows:
+                yield row
+
+        async def close(self):
+            pass
+
+    class _Session:
+        async def stream(self, stmt):
+            statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+            return _Result([(1, b"abc"), (4, b"def"), (7, b"g")])
+
+    async def _read():
+        repo = CompanyResearchRepository(_Session())
+        return [piece async for piece in repo.stream_source_payload("tenant", uuid.uuid4(), field="content_bytes", chunk_size=3)]
+
+    assert asyncio.run(_read()) == [b"abc", b"def", b"g"]
+    [sql] = statements
+    assert sql.startswith("WITH payload AS MATERIALIZED")
+    assert "source_documents.content_bytes || " in sql
+    assert "JOIN LATERAL generate_series(" in sql and "SUBSTRING(payload.value FROM g.start FOR" in sql
@@ -0,0 +1,189 @@
+"""SQL executive ranking matches the previous in-Python scoring and ordering."""
+import asyncio
+import re
+import uuid
+from types import SimpleNamespace
+from uuid import UUID
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+
+from app.db.session import AsyncSessionLocal
+from app.models.company_research import CompanyProspect, ExecutiveProspect, ExecutiveProspectEvidence
+from app.repositories.company_research_repo import CompanyResearchRepository
+from app.services.company_research_service import CompanyResearchService
+
+Svc = CompanyResearchService
+
+
+def golden_rank(rows, *, company_prospect_id=None, provenance=None, verification_status=None, q=None):
+    """The ranking as computed in Python before it moved to SQL (reference oracle)."""
+    ranked = []
+    for exec_row, company_row, evidence_ids_raw in rows:
+        evidence_ids = sorted({UUID(str(eid)) for eid in evidence_ids_raw or [] if eid}, key=str)
+        provenance_value = (exec_row.discovered_by or exec_row.source_label or "").strip().lower() or None
+        verification_value = (
+            (exec_row.verification_status or company_row.verification_status or "unverified").strip().lower()
+        )
+        if provenance and (provenance_value or "") != provenance.lower():
+            continue
+        if verification_status and verification_value != verification_status.lower():
+            continue
+        if company_prospect_id and exec_row.company_prospect_id != company_prospect_id:
+            continue
+        display_name = exec_row.name_normalized or exec_row.name_raw or ""
+        title = exec_row.title or ""
+        if q and q.lower() not in display_name.lower() and q.lower() not in title.lower():
+            continue
+        score = (
+            Svc.EXEC_VERIFICATION_WEIGHTS.get(verification_value, 0.0)
+            + (Svc.EXEC_PROVENANCE_WEIGHTS.get(provenance_value, 0.0) if provenance_value else 0.0)
+            + min(len(evidence_ids) * 10.0, 100.0)
+        )
+        ranked.append((exec_row.id, exec_row.company_prospect_id, score, verification_value, provenance_value))
+
+    ranked.sort(
+        key=lambda item: (
+            -item[2],
+            -Svc.EXEC_VERIFICATION_ORDER.get(item[3] or "", -1),
+            -Svc.EXEC_PROVENANCE_ORDER.get(item[4] or "", -1),
+            str(item[0]),
+        )
+    )
+    per_company = {}
+    result = []
+    for position, (exec_id, company_id, score, _v, _p) in enumerate(ranked, start=1):
+        per_company[company_id] = per_company.get(company_id, 0) + 1
+        result.append((exec_id, position, per_company[company_id], score))
+    return result
+
+
+class _CapturingSession:
+    def __init__(self, rows=()):
+        self.statements = []
+        self.rows = list(rows)
+
+    async def execute(self, stmt, *args, **kwargs):
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        self.statements.append((str(compiled), compiled.params))
+        return SimpleNamespace(mappings=lambda: SimpleNamespace(all=lambda: list(self.rows)))
+
+
+@pytest.mark.unit
+def test_ranking_query_windows_and_pages_in_sql():
+    session = _CapturingSession()
+    repo = CompanyResearchRepository(session)
+
+    asyncio.run(
+        repo.list_ranked_executives(
+            "tenant",
+            uuid.uuid4(),
+            verification_weights=Svc.EXEC_VERIFICATION_WEIGHTS,
+            provenance_weights=Svc.EXEC_PROVENANCE_WEIGHTS,
+            verification_order=Svc.EXEC_VERIFICATION_ORDER,
+            provenance_order=Svc.EXEC_PROVENANCE_ORDER,
+            q="Chief",
+            limit=25,
+            offset=50,
+        )
+    )
+
+    sql, params = session.statements[0]
+    assert "row_number() OVER (ORDER BY" in sql
+    assert "row_number() OVER (PARTITION BY executive_prospects.company_prospect_id ORDER BY" in sql
+    assert "ORDER BY rank_position" in sql
+    paging = re.search(r"LIMIT %\((\w+)\)s OFFSET %\((\w+)\)s$", sql.rstrip())
+    assert paging and (params[paging.group(1)], params[paging.group(2)]) == (25, 50)
+    assert "chief" in params.values()
+
+
+@pytest.mark.unit
+def test_service_maps_sql_rows_without_resorting():
+    exec_id, company_id, doc_a, doc_b = (uuid.uuid4() for _ in range(4))
+    row = {
+        "executive_id": exec_id,
+        "company_prospect_id": company_id,
+        "display_name": "jane doe",
+        "title": "",
+        "provenance": "",
+        "verification_status": "partial",
+        "verification_weight": 500,
+        "provenance_weight": 0,
+        "evidence_weight": 20,
+        "rank_score": 520,
+        "evidence_source_document_ids": [doc_b, doc_a],
+        "rank_position": 51,
+        "company_rank_position": 3,
+    }
+    service = CompanyResearchService(_CapturingSession(rows=[row]))
+
+    [item] = asyncio.run(service.rank_executives_for_run("tenant", uuid.uuid4(), limit=1, offset=50))
+
+    assert item["rank_position"] == 51
+    assert item["company_rank_position"] == 3
+    assert item["rank_score"] == 520.0
+    assert item["provenance"] is None and item["title"] is None
+    assert item["evidence_source_document_ids"] == sorted([doc_a, doc_b], key=str)
+    assert [r["weight"] for r in item["why_ranked"]] == [500.0, 0.0, 20.0]
+
+
+@pytest.mark.db
+@pytest.mark.asyncio
+async def test_sql_ranking_matches_golden_python_ordering():
+    async with AsyncSessionLocal() as db:
+        run_id = (
+            await db.execute(
+                select(ExecutiveProspect.company_research_run_id)
+                .group_by(ExecutiveProspect.company_research_run_id)
+                .order_by(func.count().desc())
+                .limit(1)
+            )
+        ).scalar_one_or_none()
+        if not run_id:
+            pytest.skip("No executive prospects available")
+        tenant_id = (
+            await db.execute(
+                select(ExecutiveProspect.tenant_id).where(ExecutiveProspect.company_research_run_id == run_id).limit(1)
+            )
+        ).scalar_one()
+
+        evidence_ids = func.array_agg(func.distinct(ExecutiveProspectEvidence.source_document_id))
+        rows = (
+            await db.execute(
+                select(ExecutiveProspect, CompanyProspect, evidence_ids)
+                .join(CompanyProspect, CompanyProspect.id == ExecutiveProspect.company_prospect_id)
+                .outerjoin(ExecutiveProspectEvidence, ExecutiveProspectEvidence.executive_prospect_id == ExecutiveProspect.id)
+                .where(
+                    ExecutiveProspect.tenant_id == tenant_id,
+                    ExecutiveProspect.company_research_run_id == run_id,
+                    CompanyProspect.tenant_id == tenant_id,
+                    CompanyProspect.company_research_run_id == run_id,
+                )
+                .group_by(ExecutiveProspect.id, CompanyProspect.id)
+            )
+        ).all()
+
+        service = CompanyResearchService(db)
+        first_company = rows[0][0].company_prospect_id
+        cases = [
+            {},
+            {"verification_status": "verified"},
+            {"provenance": "internal"},
+            {"company_prospect_id": first_company},
+            {"q": "e"},
+        ]
+        for filters in cases:
+            expected = golden_rank(rows, **filters)
+            actual = await service.rank_executives_for_run(
+                str(tenant_id), run_id, limit=len(rows) + 1, offset=0, **filters
+            )
+            got = [
+                (item["executive_id"], item["rank_position"], item["company_rank_position"], item["rank_score"])
+                for item in actual
+            ]
+            assert got == expected, filters
+
+            # Paging returns a window of the same ordering.
+            page = await service.rank_executives_for_run(str(tenant_id), run_id, limit=3, offset=2, **filters)
+            assert [item["executive_id"] for item in page] == [row[0] for row in expected[2:5]]
@@ -0,0 +1,75 @@
+"""Streaming HTML text extraction matches the BeautifulSoup pass it replaced."""
+import hashlib
+
+import pytest
+
+from app.services.company_source_extraction_service import CompanySourceExtractionService
+from app.utils.html_text_stream import HtmlTextStream
+from benchmarks.synthetic import company_article
+
+CORPUS = [
+    company_article(3, seed=7),
+    """<!DOCTYPE html><html><head><meta property="og:title" content="Acme &amp; Co">
+    <title>Ignored</title><style>p { color: red }</style></head>
+    <body><script>var x = "<p>no</p>";</script><p>Acme&nbsp;builds&#8212;widgets &copy 2024</p>
+    <noscript><p>enable js</p></noscript><!-- a comment --><p>Caf&eacute; &#147;quoted&#148; &#0; &bogus;</p></body></html>""",
+    """<html><head><meta name="og:title" content="Named og"><meta property="og:title" content="">
+    <title>  Fallback   title </title></head><body><h1>Header</h1></body></html>""",
+    """<html><head><title>\n   \n</title></head><body><div>a<br>b<br/>c<img src=x alt="y">d</div></body></html>""",
+    """<html><head><title>Split <b>title</b></title></head><body><h1> <span>First</span> heading </h1><h1>Second</h1></body></html>""",
+    """<html><head><title><span>Only child</span></title></head><body>text</body></html>""",
+    """<html><body><h1>  </h1><p>No title at all</p><![CDATA[ raw cdata ]]><?php echo 1 ?></body></html>""",
+    """<p>Unclosed <b>bold <i>italic</p> tail</b> after</em> more <template><p>tmpl</p></template>
+    <ruby>Kanji<rp>(</rp><rt>kan</rt><rp>)</rp></ruby><table><tr><td>1</td><td>2</td></tr></table>""",
+    """<html><head><noscript><meta property="og:title" content="hidden"><title>hidden</title></noscript></head>
+    <body><h1>Vis<script>x</script>ible</h1><p>Unicode: é中文 \U0001F600 and <a href="/?a=1&b=2">link</a></p></body></html>""",
+    "﻿<p>BOM first</p><p>&#x1F600; &#X41; &#99999999;</p><p>trailing &amp",
+    "<div>unterminated <span>tags and text",
+]
+
+
+def _reference_extract_html(raw_bytes):
+    """The former BeautifulSoup implementation of CompanySourceExtractionService._extract_html."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(raw_bytes.decode("utf-8", errors="replace"), "html.parser")
+    for tag in soup.find_all(["script", "style", "noscript"]):
+        tag.decompose()
+    title = None
+    og_title = soup.find("meta", attrs={"property": "og:title"}) or soup.find("meta", attrs={"name": "og:title"})
+    if og_title and og_title.get("content"):
+        title = og_title.get("content")
+    elif soup.title and soup.title.string:
+        title = soup.title.string
+    else:
+        h1 = soup.find("h1")
+        if h1 and h1.get_text(strip=True):
+            title = h1.get_text(strip=True)
+    return soup.get_text(" ", strip=True), title
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("html", CORPUS)
+def test_matches_the_beautifulsoup_extraction_for_any_chunking(html):
+    raw = html.encode("utf-8")
+    expected = _reference_extract_html(raw)
+    assert CompanySourceExtractionService(None)._extract_html(raw) == expected
+
+    for size in (1, 3, 7, 64):
+        stream = HtmlTextStream()
+        for start in range(0, len(raw), size):
+            stream.feed(raw[start : start + size])  # splits tags, entities and multi-byte characters
+        stream.close()
+        assert (stream.text, stream.title) == expected
+        assert stream.sha256 == hashlib.sha256(raw).hexdigest() and stream.bytes_read == len(raw)
+
+
+@pytest.mark.unit
+def test_invalid_bytes_and_declared_charset():
+    raw = b"<title>Caf\xe9</title><p>ok \xff\xfe bytes</p>"
+    assert CompanySourceExtractionService(None)._extract_html(raw) == _reference_extract_html(raw)
+
+    stream = HtmlTextStream("iso-8859-1")
+    stream.feed(raw)
+    assert stream.close().title == "Café"
+    assert HtmlTextStream("no-such-charset").close().text == ""
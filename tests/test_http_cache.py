@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.utils.http_cache import (
+    compute_next_check_at,
+    format_check_time,
+    freshness_lifetime,
+    parse_cache_control,
+)
+
+NOW = datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+BOUNDS = {"min_seconds": 300, "max_seconds": 7 * 86400, "default_seconds": 86400}
+
+
+@pytest.mark.unit
+def test_parse_cache_control_directives():
+    assert parse_cache_control('public, max-age=600, s-maxage="1200", no-transform') == {
+        "public": None,
+        "max-age": "600",
+        "s-maxage": "1200",
+        "no-transform": None,
+    }
+    assert parse_cache_control(None) == {}
+
+
+@pytest.mark.unit
+def test_freshness_prefers_max_age_and_subtracts_age():
+    headers = {"Cache-Control": "max-age=3600", "Age": "600", "Expires": "Thu, 01 Jan 2026 13:00:00 GMT"}
+    assert freshness_lifetime(headers, now=NOW) == (3000, "max_age")
+    assert freshness_lifetime({"cache-control": "s-maxage=10, max-age=99"}, now=NOW) == (10, "max_age")
+
+
+@pytest.mark.unit
+def test_freshness_from_expires_and_invalid_expires():
+    headers = {"Date": "Thu, 01 Jan 2026 12:00:00 GMT", "Expires": "Thu, 01 Jan 2026 14:00:00 GMT"}
+    assert freshness_lifetime(headers, now=NOW) == (7200, "expires")
+    assert freshness_lifetime({"Expires": "0"}, now=NOW) == (0, "expires")
+
+
+@pytest.mark.unit
+def test_freshness_heuristic_and_missing():
+    headers = {"Date": "Thu, 01 Jan 2026 12:00:00 GMT", "Last-Modified": "Mon, 22 Dec 2025 12:00:00 GMT"}
+    # 10% of the 10 days since Last-Modified
+    assert freshness_lifetime(headers, now=NOW) == (86400, "heuristic")
+    assert freshness_lifetime({"ETag": '"abc"'}, now=NOW) == (None, "none")
+    assert freshness_lifetime({"Cache-Control": "no-store"}, now=NOW) == (None, "no_store")
+    assert freshness_lifetime({"Cache-Control": "no-cache, max-age=60"}, now=NOW) == (0, "no_cache")
+
+
+@pytest.mark.unit
+def test_compute_next_check_at_clamps_interval():
+    next_at, interval, basis = compute_next_check_at({"Cache-Control": "max-age=5"}, now=NOW, **BOUNDS)
+    assert (interval, basis) == (300, "max_age")
+    assert next_at == NOW + timedelta(seconds=300)
+
+    _, interval, _ = compute_next_check_at({"Cache-Control": "max-age=99999999"}, now=NOW, **BOUNDS)
+    assert interval == 7 * 86400
+
+    _, interval, basis = compute_next_check_at({}, now=NOW, **BOUNDS)
+    assert (interval, basis) == (86400, "none")
+
+
+@pytest.mark.unit
+def test_format_check_time_is_fixed_width_utc():
+    with_micros = NOW.replace(microsecond=123456)
+    assert format_check_time(with_micros) == "2026-01-01T12:00:00+00:00"
+    assert format_check_time(NOW) < format_check_time(NOW + timedelta(seconds=1))
+    assert format_check_time(datetime(2026, 1, 1, 14, 0, tzinfo=timezone(timedelta(hours=2)))) == "2026-01-01T12:00:00+00:00"
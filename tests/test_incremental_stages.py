@@ -0,0 +1,164 @@
+"""Pipeline stages only consume sources whose upstream change stamp moved."""
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.company_research_repo import CompanyResearchRepository
+from app.services.company_source_extraction_service import CompanySourceExtractionService
+
+VERSION = CompanySourceExtractionService.EXTRACTION_VERSION
+
+
+class _CapturingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt, *args, **kwargs):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: []), rowcount=0)
+
+    async def commit(self):
+        return None
+
+
+class _FakeRepo:
+    def __init__(self, changed, members, on_lookup=None):
+        self.changed = changed
+        self.members = members
+        self.on_lookup = on_lookup
+        self.signature_calls = []
+        self.stamps_drawn = 0
+
+    async def list_sources_pending_classification(self, tenant_id, run_id):
+        return list(self.changed)
+
+    async def next_source_change_seq(self):
+        self.stamps_drawn += 1
+        return 1000 + self.stamps_drawn
+
+    async def list_duplicate_candidates(self, tenant_id, run_id, signatures, band_keys=None, exclude_ids=None):
+        self.signature_calls.append((list(signatures), list(exclude_ids or [])))
+        if self.on_lookup:
+            self.on_lookup()
+        return [m for m in self.members if m.meta["extraction"]["signature_prefix_2k"] in signatures]
+
+
+    async def stamp_sources_consumed(self, stamp_column, stamp, upstream_columns, read_values):
+        by_id = {source.id: source for source in self.changed + self.members}
+        stamped = 0
+        for source_id, *read in read_values:
+            source = by_id[source_id]
+            if [getattr(source, column) for column in upstream_columns] == read:
+                setattr(source, stamp_column, stamp)
+                stamped += 1
+        return stamped
+
+
+def _source(signature, word_count):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        extracted_seq=10,
+        classified_seq=None,
+        meta={
+            "extraction": {
+                "version": VERSION,
+                "signature_prefix_2k": signature,
+                "word_count": word_count,
+                "reason_codes": [],
+            },
+            "quality_flags": {},
+        },
+    )
+
+
+def _service(repo):
+    service = CompanySourceExtractionService(_CapturingSession())
+    service.repo = repo
+    return service
+
+
+@pytest.mark.unit
+def test_classify_only_loads_changed_sources_and_their_signature_group():
+    changed = _source("sig-a", word_count=200)
+    primary = _source("sig-a", word_count=900)
+    unrelated = _source("sig-b", word_count=500)
+    repo = _FakeRepo(changed=[changed], members=[primary, unrelated])
+
+    summary = asyncio.run(_service(repo).classify_sources("tenant", uuid.uuid4()))
+
+    assert repo.signature_calls == [(["sig-a"], [changed.id])]
+    assert summary["count"] == 2
+    assert summary["changed"] == 1
+    assert summary["duplicates"] == 1
+    assert changed.meta["quality_flags"]["is_duplicate_template"] is True
+    assert changed.meta["quality_flags"]["duplicate_primary_source_id"] == str(primary.id)
+    # Only the consumed (changed) row is stamped; group members keep their stamp.
+    assert changed.classified_seq == 1001
+    assert primary.classified_seq is None
+    assert unrelated.classified_seq is None
+
+
+@pytest.mark.unit
+def test_classify_with_no_changes_draws_no_stamp():
+    repo = _FakeRepo(changed=[], members=[_source("sig-a", 100)])
+
+    summary = asyncio.run(_service(repo).classify_sources("tenant", uuid.uuid4()))
+
+    assert summary["count"] == 0
+    assert repo.stamps_drawn == 0
+    assert repo.signature_calls == [([], [])]
+
+
+@pytest.mark.unit
+def test_source_re_extracted_while_classifying_stays_pending():
+    changed = _source("sig-a", word_count=200)
+    other = _source("sig-b", word_count=300)
+
+    def _concurrent_extraction():
+        changed.extracted_seq = 1500
+
+    repo = _FakeRepo(changed=[changed, other], members=[], on_lookup=_concurrent_extraction)
+
+    asyncio.run(_service(repo).classify_sources("tenant", uuid.uuid4()))
+
+    assert changed.classified_seq is None  # still below its new extracted_seq
+    assert other.classified_seq == 1001
+
+
+@pytest.mark.unit
+def test_consumed_stamp_is_compare_and_set_on_the_values_read():
+    session = _CapturingSession()
+    source_id = uuid.uuid4()
+
+    asyncio.run(
+        CompanyResearchRepository(session).stamp_sources_consumed(
+            "processed_seq", 7, ("content_seq", "extracted_seq"), [(source_id, 5, None)]
+        )
+    )
+
+    [sql] = session.statements
+    assert sql.startswith("UPDATE source_documents SET processed_seq=")
+    assert (
+        "WHERE (source_documents.id, coalesce(source_documents.content_seq, %(coalesce_1)s), "
+        "coalesce(source_documents.extracted_seq, %(coalesce_2)s)) IN" in sql
+    )
+
+
+@pytest.mark.unit
+def test_pending_stage_queries_compare_change_stamps():
+    session = _CapturingSession()
+    repo = CompanyResearchRepository(session)
+    run_id = uuid.uuid4()
+
+    asyncio.run(repo.list_sources_pending_extraction("tenant", run_id, VERSION))
+    asyncio.run(repo.list_sources_pending_classification("tenant", run_id))
+    asyncio.run(repo.list_sources_pending_processing("tenant", run_id))
+    extraction_sql, classification_sql, processing_sql = session.statements
+
+    assert "source_documents.extracted_seq < source_documents.content_seq" in extraction_sql
+    assert "IS DISTINCT FROM" in extraction_sql
+    assert "source_documents.classified_seq < source_documents.extracted_seq" in classification_sql
+    assert "source_documents.processed_seq < greatest(source_documents.content_seq, source_documents.extracted_seq)" in processing_sql
@@ -0,0 +1,84 @@
+"""Tenant-fair, priority-aware job claiming and queue-wait metrics."""
+import asyncio
+import re
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.telemetry import render_job_queue_metrics
+from app.repositories.company_research_repo import JOB_PRIORITY_CLASSES, CompanyResearchRepository
+
+
+class _Result:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return list(self.rows)
+
+    def scalar_one_or_none(self):
+        return self.rows[0] if self.rows else None
+
+
+class _Db:
+    def __init__(self, results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return _Result(self.results.pop(0))
+
+    async def flush(self):
+        pass
+
+    async def refresh(self, obj):
+        pass
+
+
+@pytest.mark.unit
+def test_claim_falls_through_to_the_next_tenant_when_a_job_is_locked():
+    busy, starved = uuid.uuid4(), uuid.uuid4()
+    job = SimpleNamespace(status="queued", locked_at=None, locked_by=None, claimed_at=None, tenant_id=starved, lease_token=0)
+    db = _Db([[busy, starved], [], [job]])  # tenant order, busy tenant's job skip-locked, starved tenant's job
+
+    claimed = asyncio.run(CompanyResearchRepository(db).claim_next_job("w1", tenant_max_running=2))
+
+    assert claimed is job and job.locked_by == "w1" and job.claimed_at == job.locked_at and job.lease_token == 1
+    order_sql, *lock_sql = db.statements
+    assert "GROUP BY company_research_jobs.tenant_id" in order_sql
+    assert re.search(r"max\(company_research_jobs_\d\.claimed_at\)", order_sql) and "NULLS FIRST" in order_sql
+    assert "count(*)" in order_sql  # per-tenant running cap
+    assert all("FOR UPDATE SKIP LOCKED" in sql for sql in lock_sql)
+    assert all("ORDER BY company_research_jobs.priority, company_research_jobs.created_at" in sql for sql in lock_sql)
+
+
+@pytest.mark.unit
+def test_claim_without_cap_and_no_waiting_tenants_returns_none():
+    db = _Db([[]])
+
+    assert asyncio.run(CompanyResearchRepository(db).claim_next_job("w1", job_type="acquire_extract_async")) is None
+    [order_sql] = db.statements
+    assert "count(*)" not in order_sql and "company_research_jobs.job_type = " in order_sql
+
+
+@pytest.mark.unit
+def test_queue_metrics_report_p95_wait_and_waiting_backlog_per_tenant():
+    tenant = str(uuid.uuid4())
+    waits = [{"job_type": "company_research_run", "priority": 0, "jobs": 4, "wait_sum": 10.0,
+              "wait_p50": 1.5, "wait_p95": 6.25, "wait_max": 7.0}]
+    waiting = [{"job_type": "acquire_extract_async", "priority": 1, "jobs": 300, "oldest_wait": 900.5}]
+
+    text = render_job_queue_metrics(tenant, waits, waiting, JOB_PRIORITY_CLASSES)
+
+    labels = f'tenant_id="{tenant}",job_type="company_research_run",priority="interactive"'
+    assert f'research_job_queue_wait_seconds{{{labels},quantile="0.95"}} 6.25' in text
+    assert f"research_job_queue_wait_seconds_count{{{labels}}} 4" in text
+    batch = f'tenant_id="{tenant}",job_type="acquire_extract_async",priority="batch"'
+    assert f"research_jobs_waiting{{{batch}}} 300" in text
+    assert f"research_job_oldest_waiting_seconds{{{batch}}} 900.5" in text
@@ -0,0 +1,129 @@
+"""Job lease heartbeat, fencing tokens and reclaiming a lapsed lease."""
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.company_research_repo import CompanyResearchRepository
+from app.services.job_lease import JobLease, JobLeaseLostError
+from app.utils.time import utc_now
+
+
+class _Db:
+    """Replays canned results: a list of rows, or a result object as-is (UPDATE rowcount)."""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        result = self.results.pop(0)
+        if isinstance(result, list):
+            rows = result
+            return SimpleNamespace(
+                scalars=lambda: SimpleNamespace(all=lambda: list(rows)),
+                scalar_one_or_none=lambda: rows[0] if rows else None,
+            )
+        return result
+
+    async def flush(self):
+        pass
+
+    async def refresh(self, obj):
+        pass
+
+
+@asynccontextmanager
+async def _session_factory():
+    yield object()
+
+
+@pytest.mark.unit
+def test_heartbeat_renews_until_the_lease_is_gone(monkeypatch):
+    answers = [True, True, False]
+    calls = []
+
+    async def _renew(self, job_id, worker_id, lease_token):
+        calls.append((job_id, worker_id, lease_token))
+        return answers.pop(0)
+
+    monkeypatch.setattr(CompanyResearchRepository, "renew_job_lease", _renew)
+    job_id = uuid.uuid4()
+
+    async def _run():
+        async with JobLease(AsyncSession(), job_id, "w1", 7, heartbeat_seconds=0.01, session_factory=_session_factory) as lease:
+            await asyncio.sleep(0.2)
+            return lease
+
+    lease = asyncio.run(_run())
+    assert calls == [(job_id, "w1", 7)] * 3 and lease.renewals == 2
+    assert lease.lost
+    with pytest.raises(JobLeaseLostError):
+        lease.check()
+
+
+@pytest.mark.unit
+def test_exit_cancels_a_renewal_blocked_on_the_job_row(monkeypatch):
+    blocked = []
+
+    async def _renew(self, job_id, worker_id, lease_token):
+        blocked.append(job_id)
+        await asyncio.Event().wait()  # waits on the row lock the worker's session holds
+
+    monkeypatch.setattr(CompanyResearchRepository, "renew_job_lease", _renew)
+
+    async def _run():
+        lease = JobLease(AsyncSession(), uuid.uuid4(), "w1", 7, heartbeat_seconds=0.01, session_factory=_session_factory)
+        async with lease:
+            while not blocked:
+                await asyncio.sleep(0.01)
+        return lease
+
+    lease = asyncio.run(asyncio.wait_for(_run(), timeout=5))
+    assert lease._task.cancelled() and not lease.lost
+
+
+@pytest.mark.unit
+def test_commits_are_fenced_only_inside_the_lease():
+    session = AsyncSession()
+    lease = JobLease(session, uuid.uuid4(), "w1", 3, heartbeat_seconds=60, session_factory=_session_factory)
+
+    async def _run():
+        async with lease:
+            assert event.contains(session.sync_session, "before_commit", lease._fence)
+
+    asyncio.run(_run())
+    assert not event.contains(session.sync_session, "before_commit", lease._fence)
+
+    def _holder(token):
+        return SimpleNamespace(execute=lambda stmt: SimpleNamespace(scalar_one_or_none=lambda: token))
+
+    lease._fence(_holder(3))  # still ours
+    assert not lease.lost
+    with pytest.raises(JobLeaseLostError):
+        lease._fence(_holder(4))  # reclaimed by another worker
+    assert lease.lost
+
+
+@pytest.mark.unit
+def test_reclaiming_a_lapsed_lease_bumps_the_token_and_reopens_running_steps():
+    tenant = uuid.uuid4()
+    job = SimpleNamespace(
+        status="running", locked_at=utc_now().replace(year=2000), locked_by="zombie", claimed_at=None,
+        tenant_id=tenant, run_id=uuid.uuid4(), job_type="company_research_run", lease_token=4,
+        last_error=None, next_retry_at=None, cancel_requested=False,
+    )
+    db = _Db([[tenant], [job], SimpleNamespace(rowcount=2)])
+    claimed = asyncio.run(CompanyResearchRepository(db).claim_next_job("w2", stale_after_seconds=60))
+
+    assert claimed is job and job.locked_by == "w2" and job.lease_token == 5
+    assert job.status == "failed" and job.last_error == "lease_expired"
+    reopen_sql = db.statements[-1]
+    assert reopen_sql.startswith("UPDATE company_research_run_steps SET status=")
+    assert "company_research_run_steps.status = %(status_1)s" in reopen_sql
@@ -0,0 +1,145 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.company_source_extraction_service import CompanySourceExtractionService
+from app.utils.minhash import LshIndex, estimate_jaccard, lsh_band_keys, minhash_signature
+
+NUM_PERM = CompanySourceExtractionService.MINHASH_NUM_PERM
+SHINGLE = CompanySourceExtractionService.MINHASH_SHINGLE_SIZE
+BANDS = CompanySourceExtractionService.LSH_BANDS
+
+ARTICLE = (
+    "acme holdings reported record quarterly revenue driven by strong demand in its cloud division "
+    "the board approved a new buyback programme and raised the dividend for shareholders while "
+    "management reiterated guidance for the full year citing resilient enterprise spending and "
+    "continued expansion into european markets through recent acquisitions of regional providers"
+).split()
+
+
+def _signature(tokens):
+    return minhash_signature(tokens, num_perm=NUM_PERM, shingle_size=SHINGLE)
+
+
+@pytest.mark.unit
+def test_signature_is_deterministic_and_sized():
+    first = _signature(ARTICLE)
+    assert first == _signature(list(ARTICLE))
+    assert len(first) == NUM_PERM
+    assert _signature([]) == []
+    assert len(lsh_band_keys(first, BANDS)) == BANDS
+
+
+@pytest.mark.unit
+def test_near_duplicate_scores_high_and_unrelated_scores_low():
+    syndicated = ["published", "monday", "by", "newswire"] + ARTICLE + ["advertisement", "subscribe", "today"]
+    unrelated = (
+        "regional banks tightened lending standards as deposit outflows slowed and regulators proposed "
+        "new liquidity rules for mid sized institutions with assets above fifty billion dollars"
+    ).split()
+
+    base = _signature(ARTICLE)
+    assert estimate_jaccard(base, _signature(syndicated)) >= CompanySourceExtractionService.NEAR_DUPLICATE_JACCARD
+    assert estimate_jaccard(base, _signature(unrelated)) < 0.2
+
+    index = LshIndex(BANDS)
+    index.add("base", base)
+    index.add("copy", _signature(syndicated))
+    index.add("other", _signature(unrelated))
+    assert [item for item, _ in index.near_duplicates("base", 0.8)] == ["copy"]
+
+
+def _extracted_source(tokens, word_count):
+    signature = _signature(tokens)
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        extracted_seq=1,
+        classified_seq=None,
+        meta={
+            "extraction": {
+                "version": CompanySourceExtractionService.EXTRACTION_VERSION,
+                "signature_prefix_2k": uuid.uuid4().hex,
+                "word_count": word_count,
+                "reason_codes": [],
+                "minhash": signature,
+                "lsh_bands": lsh_band_keys(signature, BANDS),
+            },
+            "quality_flags": {},
+        },
+    )
+
+
+class _Repo:
+    def __init__(self, changed, members):
+        self.changed = changed
+        self.members = members
+        self.band_keys = None
+
+    async def list_sources_pending_classification(self, tenant_id, run_id):
+        return list(self.changed)
+
+    async def next_source_change_seq(self):
+        return 1
+
+    async def stamp_sources_consumed(self, stamp_column, stamp, upstream_columns, read_values):
+        return len(read_values)
+
+    async def list_duplicate_candidates(self, tenant_id, run_id, signatures, band_keys=None, exclude_ids=None):
+        self.band_keys = band_keys
+        return list(self.members)
+
+
+class _Session:
+    async def commit(self):
+        return None
+
+
+@pytest.mark.unit
+def test_classify_flags_near_duplicates_found_through_lsh_bands():
+    copy = _extracted_source(["breaking"] + ARTICLE + ["advertisement"], word_count=60)
+    original = _extracted_source(ARTICLE, word_count=58)
+    service = CompanySourceExtractionService(_Session())
+    service.repo = _Repo(changed=[copy], members=[original])
+
+    summary = asyncio.run(service.classify_sources("tenant", uuid.uuid4()))
+
+    assert service.repo.band_keys == sorted(copy.meta["extraction"]["lsh_bands"])
+    assert summary["near_duplicates"] == 1
+    assert summary["duplicates"] == 0
+    # The longer copy becomes the primary; the original is the near-duplicate.
+    flags = original.meta["quality_flags"]
+    assert flags["is_near_duplicate"] is True
+    assert flags["duplicate_primary_source_id"] == str(copy.id)
+    assert flags["near_duplicate_similarity"] >= 0.8
+    assert "FLAG_NEAR_DUPLICATE" in original.meta["extraction"]["reason_codes"]
+    assert original.meta["extraction"]["decision"] == "flag"
+    assert not copy.meta["quality_flags"].get("is_near_duplicate")
+
+
+@pytest.mark.unit
+def test_transitive_near_duplicate_is_scored_against_the_member_it_matched():
+    words = [f"w{i}" for i in range(114)]
+    primary = _extracted_source(words[:100], word_count=100)
+    middle = _extracted_source(words[7:107], word_count=99)
+    tail = _extracted_source(words[14:114], word_count=98)
+    service = CompanySourceExtractionService(_Session())
+    service.repo = _Repo(changed=[tail], members=[primary, middle])
+
+    summary = asyncio.run(service.classify_sources("tenant", uuid.uuid4()))
+
+    assert summary["near_duplicates"] == 2
+    signature = {source.id: source.meta["extraction"]["minhash"] for source in (primary, middle, tail)}
+    threshold = CompanySourceExtractionService.NEAR_DUPLICATE_JACCARD
+    assert estimate_jaccard(signature[primary.id], signature[tail.id]) < threshold
+
+    middle_flags = middle.meta["quality_flags"]
+    assert middle_flags["near_duplicate_of_source_id"] == str(primary.id)
+    tail_flags = tail.meta["quality_flags"]
+    assert tail_flags["duplicate_primary_source_id"] == str(primary.id)
+    assert tail_flags["near_duplicate_of_source_id"] == str(middle.id)
+    assert tail_flags["near_duplicate_similarity"] == round(
+        estimate_jaccard(signature[middle.id], signature[tail.id]), 4
+    )
+    assert tail_flags["near_duplicate_similarity"] >= threshold
@@ -0,0 +1,89 @@
+import time
+import uuid
+
+import pytest
+
+from app.core.principal_cache import CachedPrincipal, PrincipalCache
+
+
+def _principal(user_id=None, role="viewer", is_active=True):
+    return CachedPrincipal(
+        id=user_id or uuid.uuid4(),
+        tenant_id=uuid.uuid4(),
+        email="user@example.com",
+        full_name="Test User",
+        role=role,
+        is_active=is_active,
+        created_at=None,
+        updated_at=None,
+    )
+
+
+@pytest.mark.unit
+def test_principal_cache_hit_miss_and_ratio():
+    cache = PrincipalCache(ttl_seconds=60)
+    principal = _principal()
+
+    assert cache.get(principal.id, 100) is None
+    cache.put(100, principal)
+    assert cache.get(principal.id, 100) == principal
+    # A different token (iat) for the same user is a separate entry
+    assert cache.get(principal.id, 101) is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["hit_ratio"] == pytest.approx(1 / 3, abs=1e-4)
+
+
+@pytest.mark.unit
+def test_principal_cache_invalidate_user_drops_all_tokens():
+    cache = PrincipalCache(ttl_seconds=60)
+    user_id = uuid.uuid4()
+    cache.put(1, _principal(user_id, role="admin"))
+    cache.put(2, _principal(user_id, role="admin"))
+    other = _principal()
+    cache.put(1, other)
+
+    assert cache.invalidate_user(user_id) == 2
+    assert cache.get(user_id, 1) is None
+    assert cache.get(user_id, 2) is None
+    assert cache.get(other.id, 1) == other
+
+
+@pytest.mark.unit
+def test_principal_cache_expiry_and_eviction():
+    cache = PrincipalCache(ttl_seconds=0.01, max_entries=2)
+    first = _principal()
+    cache.put(None, first)
+    time.sleep(0.02)
+    assert cache.get(first.id, None) is None
+    assert cache.stats()["expirations"] == 1
+
+    cache = PrincipalCache(ttl_seconds=60, max_entries=2)
+    a, b, c = _principal(), _principal(), _principal()
+    cache.put(None, a)
+    cache.put(None, b)
+    cache.put(None, c)
+    assert cache.get(a.id, None) is None
+    assert cache.get(c.id, None) == c
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.unit
+def test_cached_principal_round_trips_to_transient_user():
+    principal = _principal(role="consultant")
+    user = principal.to_user()
+    assert user.id == principal.id
+    assert user.tenant_id == principal.tenant_id
+    assert user.role == "consultant"
+    assert CachedPrincipal.from_user(user) == principal
+
+
+@pytest.mark.unit
+def test_disabled_cache_never_stores():
+    cache = PrincipalCache(ttl_seconds=0)
+    principal = _principal()
+    cache.put(1, principal)
+    assert cache.get(principal.id, 1) is None
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,129 @@
+"""Opt-in sampling profiler: stack samples, SQL timeline, artifacts and middleware opt-in."""
+import asyncio
+import json
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core import dependencies, profiler
+from app.core.jwt import create_access_token
+
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += 1
+    return total
+
+
+@pytest.mark.unit
+def test_profile_samples_stacks_and_sql_and_writes_artifacts(tmp_path):
+    engine = create_engine("sqlite://")
+    profiler.instrument_engine(engine)
+    profiler.instrument_engine(engine)  # idempotent
+
+    async def _profiled():
+        with engine.connect() as conn:
+            conn.execute(text("select 1"))  # not profiled
+            profile = profiler.try_start_profile("GET /runs/{run_id}/prospects-ranked", "tenant-a")
+            assert profile is not None
+            assert profiler.try_start_profile("other", "tenant-a") is None  # one profile per process
+            conn.execute(text("create table t (x integer)"))
+            conn.execute(text("insert into t values (1), (2)"))
+            _busy(0.1)
+            path = await profiler.finish_profile(profile, root=str(tmp_path))
+            conn.execute(text("select 2"))  # not profiled once finished
+        return profile, path
+
+    profile, path = asyncio.run(_profiled())
+
+    timeline = json.loads(path.read_text())
+    assert timeline["sql_count"] == 2
+    assert timeline["sql"][1]["statement"] == "insert into t values (1), (2)"
+    assert timeline["sample_count"] > 0
+
+    collapsed = (tmp_path / "tenant-a" / f"{profile.profile_id}.collapsed.txt").read_text()
+    assert "_busy (test_profiler.py:" in collapsed
+    speedscope = json.loads((tmp_path / "tenant-a" / f"{profile.profile_id}.speedscope.json").read_text())
+    assert speedscope["profiles"][0]["type"] == "sampled"
+    assert len(speedscope["profiles"][0]["samples"]) == len(speedscope["profiles"][0]["weights"])
+
+    assert profiler.profile_artifact_path("tenant-a", profile.profile_id, "collapsed", root=str(tmp_path))
+    assert profiler.profile_artifact_path("tenant-b", profile.profile_id, "collapsed", root=str(tmp_path)) is None
+    assert profiler.profile_artifact_path("tenant-a", "../tenant-b/x", "timeline", root=str(tmp_path)) is None
+    [summary] = profiler.list_profiles("tenant-a", root=str(tmp_path))
+    assert summary["profile_id"] == profile.profile_id and "sql" not in summary
+
+    # The process slot is free again.
+    again = profiler.try_start_profile("again", "tenant-a")
+    again.stop()
+    profiler._profile_lock.release()
+
+
+@pytest.mark.unit
+def test_finish_profile_writes_artifacts_off_the_event_loop(tmp_path, monkeypatch):
+    threads = []
+    write_profile = profiler.write_profile
+
+    def _write(profile, root=None):
+        threads.append(threading.get_ident())
+        return write_profile(profile, root)
+
+    monkeypatch.setattr(profiler, "write_profile", _write)
+
+    async def _run():
+        profile = profiler.try_start_profile("step x", "tenant-a")
+        await profiler.finish_profile(profile, root=str(tmp_path))
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(_run())
+    assert threads and threads[0] != loop_thread
+
+
+@pytest.mark.unit
+def test_middleware_profiles_only_admin_requests_that_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler.settings, "PROFILING_ROOT", str(tmp_path))
+    admin_id, viewer_id, inactive_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    users = {
+        admin_id: SimpleNamespace(tenant_id="tenant-a", role="admin", is_active=True),
+        viewer_id: SimpleNamespace(tenant_id="tenant-a", role="viewer", is_active=True),
+        inactive_id: SimpleNamespace(tenant_id="tenant-a", role="admin", is_active=False),
+    }
+
+    async def _lookup(db, user_id, token_iat):
+        return users.get(user_id)
+
+    monkeypatch.setattr(dependencies, "load_principal_user", _lookup)
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    async def call(headers):
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/runs/1", "headers": headers}
+        await profiler.ProfilingMiddleware(app)(scope, None, send)
+        return dict(sent[0]["headers"])
+
+    def token(user_id, role):
+        return create_access_token({"user_id": str(user_id), "tenant_id": "tenant-a", "role": role})
+
+    def opted_in(bearer):
+        return [(b"x-profile", b"1"), (b"authorization", f"Bearer {bearer}".encode())]
+
+    admin = token(admin_id, "viewer")  # the principal's role counts, not the claim
+    assert b"x-profile-id" not in asyncio.run(call([(b"authorization", f"Bearer {admin}".encode())]))
+    assert b"x-profile-id" not in asyncio.run(call(opted_in(token(viewer_id, "admin"))))
+    assert b"x-profile-id" not in asyncio.run(call(opted_in(token(inactive_id, "admin"))))
+    headers = asyncio.run(call(opted_in(admin)))
+    profile_id = headers[b"x-profile-id"].decode()
+    assert profiler.profile_artifact_path("tenant-a", profile_id, "speedscope", root=str(tmp_path))
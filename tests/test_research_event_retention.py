@@ -0,0 +1,109 @@
+"""research_events partition planning: create ahead, compact after the rollup window, drop after retention."""
+import asyncio
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.models.company_research import CompanyResearchEvent
+from app.repositories.research_event_partition_repository import (
+    ResearchEventPartitionRepository,
+    add_months,
+    parse_partition_name,
+    partition_name,
+)
+from app.services.research_event_retention_service import plan_partition_maintenance
+
+
+@pytest.mark.unit
+def test_partition_names_round_trip_and_reject_other_tables():
+    assert partition_name(date(2026, 1, 1)) == "research_events_p202601"
+    assert parse_partition_name("research_events_p202601_r") == (date(2026, 1, 1), True)
+    assert parse_partition_name("research_events_default") is None
+    assert parse_partition_name("research_events_p202601; drop table x") is None
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+@pytest.mark.unit
+def test_plan_creates_missing_months_and_compacts_only_fully_expired_raw_months():
+    existing = [
+        "research_events_default",
+        "research_events_p202607_r",  # already compacted
+        "research_events_p202608",
+        "research_events_p202609",  # ended 2026-10-01, inside the 30-day window
+        "research_events_p202610",
+    ]
+    plan = plan_partition_maintenance(
+        existing,
+        datetime(2026, 10, 18, tzinfo=timezone.utc),
+        months_ahead=2,
+        rollup_after_days=30,
+        retention_days=0,
+    )
+    assert plan.create == [date(2026, 11, 1), date(2026, 12, 1)]
+    assert plan.compact == [date(2026, 8, 1)]
+    assert plan.drop == []
+
+
+@pytest.mark.unit
+def test_plan_drops_months_past_retention_instead_of_compacting_them():
+    plan = plan_partition_maintenance(
+        ["research_events_p202601", "research_events_p202602_r", "research_events_p202605"],
+        datetime(2026, 10, 18, tzinfo=timezone.utc),
+        months_ahead=0,
+        rollup_after_days=30,
+        retention_days=200,
+    )
+    # Cutoff 2026-03-31: January and February ended before it.
+    assert plan.drop == ["research_events_p202601", "research_events_p202602_r"]
+    assert plan.compact == [date(2026, 5, 1)]
+    assert plan.create == [date(2026, 10, 1)]
+
+
+@pytest.mark.unit
+def test_model_is_range_partitioned_with_run_timeline_index():
+    table = CompanyResearchEvent.__table__
+    ddl = str(CreateTable(table).compile(dialect=postgresql.dialect()))
+    assert "PARTITION BY RANGE (created_at)" in ddl
+    assert {c.name for c in table.primary_key.columns} == {"id", "created_at"}
+    [index] = table.indexes
+    assert str(CreateIndex(index).compile(dialect=postgresql.dialect())).endswith(
+        "(tenant_id, company_research_run_id, created_at DESC)"
+    )
+
+
+class _DdlSession:
+    def __init__(self, default_has_rows):
+        self.default_has_rows = default_has_rows
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        sql = " ".join(str(statement).split())
+        self.statements.append(sql)
+        return SimpleNamespace(scalar=lambda: self.default_has_rows if sql.startswith("SELECT EXISTS") else None)
+
+
+@pytest.mark.unit
+def test_create_partition_moves_rows_stranded_in_the_default_partition():
+    session = _DdlSession(default_has_rows=True)
+    asyncio.run(ResearchEventPartitionRepository(session).create_partition(date(2026, 11, 1)))
+
+    check, detach, create, move, attach = session.statements
+    assert "FROM research_events_default" in check
+    assert detach == "ALTER TABLE research_events DETACH PARTITION research_events_default"
+    assert create.startswith("CREATE TABLE IF NOT EXISTS research_events_p202611 PARTITION OF research_events")
+    assert "DELETE FROM research_events_default" in move
+    assert "INSERT INTO research_events_p202611 SELECT * FROM moved" in move
+    assert attach == "ALTER TABLE research_events ATTACH PARTITION research_events_default DEFAULT"
+
+
+@pytest.mark.unit
+def test_create_partition_leaves_an_empty_default_attached():
+    session = _DdlSession(default_has_rows=False)
+    asyncio.run(ResearchEventPartitionRepository(session).create_partition(date(2026, 11, 1)))
+
+    assert len(session.statements) == 2
+    assert session.statements[1].startswith("CREATE TABLE IF NOT EXISTS research_events_p202611")
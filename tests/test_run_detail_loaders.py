@@ -0,0 +1,129 @@
+"""Run detail page loaders must issue a fixed number of queries regardless of run size."""
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.company_research_service import CompanyResearchService
+from app.ui.routes.company_research import _load_prospect_window
+
+
+class _Result:
+    def __init__(self, rows=None, scalar=None):
+        self._rows = rows or []
+        self._scalar = scalar
+
+    def scalar(self):
+        return self._scalar
+
+    def scalars(self):
+        return self
+
+    def unique(self):
+        return self
+
+    def all(self):
+        return list(self._rows)
+
+
+class _CountingSession:
+    """Minimal AsyncSession stand-in that records every statement executed."""
+
+    def __init__(self, prospects, metrics, evidence_rows):
+        self.prospects = prospects
+        self.metrics = metrics
+        self.evidence_rows = evidence_rows
+        self.statements = []
+
+    async def execute(self, stmt, *args, **kwargs):
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        self.statements.append(sql)
+        if "array_agg" in sql:
+            return _Result(self.evidence_rows)
+        if "DISTINCT ON" in sql:
+            return _Result(self.metrics)
+        if "count(company_prospects.id)" in sql:
+            return _Result(scalar=len(self.prospects))
+        if "FROM company_prospects" in sql:
+            return _Result(self.prospects)
+        raise AssertionError(f"unexpected query: {sql}")
+
+
+def _prospect():
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        name_raw="Acme",
+        name_normalized="acme",
+        website_url=None,
+        hq_city=None,
+        hq_country="AE",
+        sector=None,
+        description=None,
+        relevance_score=0.5,
+        evidence_score=0.5,
+        manual_priority=None,
+        is_pinned=False,
+        status="new",
+        review_status="new",
+        exec_search_enabled=False,
+        ai_rank=None,
+        ai_score=None,
+        evidence=[],
+    )
+
+
+def _metric(prospect_id, key, value):
+    return SimpleNamespace(
+        company_prospect_id=prospect_id,
+        metric_key=key,
+        value_type="number",
+        value_number=value,
+        value_currency="USD",
+        unit="",
+        value_text=None,
+        value_bool=None,
+        value_json=None,
+    )
+
+
+def _load(size):
+    prospects = [_prospect() for _ in range(size)]
+    metrics = [_metric(p.id, "total_assets", 2_500_000_000) for p in prospects]
+    evidence_rows = [
+        SimpleNamespace(company_prospect_id=p.id, evidence_count=3, list_sources=["B", "A"]) for p in prospects
+    ]
+    session = _CountingSession(prospects, metrics, evidence_rows)
+    service = CompanyResearchService(session)
+    rows, total = asyncio.run(
+        _load_prospect_window(service, str(uuid.uuid4()), uuid.uuid4(), order_by="manual", limit=size, offset=0)
+    )
+    return session, rows, total
+
+
+@pytest.mark.unit
+def test_prospect_window_query_count_is_constant():
+    small_session, small_rows, _ = _load(5)
+    large_session, large_rows, large_total = _load(500)
+
+    assert len(small_session.statements) == 4
+    assert len(large_session.statements) == len(small_session.statements)
+    assert large_total == 500
+    assert len(large_rows) == 500
+
+    row = large_rows[0]
+    assert row["evidence_count"] == 3
+    assert row["list_sources"] == "A, B"
+    assert row["metrics"] == {"total_assets": "USD 2.5B"}
+
+
+@pytest.mark.unit
+def test_latest_metrics_skip_rows_without_a_value_and_break_ties():
+    session, _, _ = _load(3)
+    sql = next(statement for statement in session.statements if "DISTINCT ON" in statement)
+
+    assert "company_metrics.value_number IS NOT NULL" in sql
+    assert "jsonb_typeof(company_metrics.value_json)" in sql
+    order_by = sql.split("ORDER BY", 1)[1]
+    assert "company_metrics.as_of_date DESC NULLS LAST, company_metrics.created_at DESC, company_metrics.id" in order_by
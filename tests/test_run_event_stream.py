@@ -0,0 +1,217 @@
+"""Run progress SSE stream: cursors, notification fan-out and catch-up/de-duplication."""
+import asyncio
+import json
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import run_event_stream
+from app.services.run_event_stream import RunEventBroker, event_cursor, parse_event_cursor, stream_run_events
+
+T0 = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+TENANT = str(uuid.uuid4())
+RUN = uuid.uuid4()
+
+
+def _event(seconds, event_type="fetch_started"):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        tenant_id=TENANT,
+        company_research_run_id=RUN,
+        event_type=event_type,
+        status="ok",
+        input_json=None,
+        output_json={"message": event_type},
+        error_message=None,
+        created_at=T0 + timedelta(seconds=seconds),
+        updated_at=T0,
+    )
+
+
+def _parse(messages):
+    parsed = []
+    for message in messages:
+        if message.startswith(":"):
+            continue
+        fields = dict(line.split(": ", 1) for line in message.strip().split("\n"))
+        parsed.append((fields["event"], json.loads(fields["data"])))
+    return parsed
+
+
+@pytest.mark.unit
+def test_event_cursor_round_trips_and_rejects_garbage():
+    event = _event(1)
+    assert parse_event_cursor(event_cursor(event)) == (event.created_at, str(event.id))
+    assert parse_event_cursor("not-a-cursor") is None
+    assert parse_event_cursor("2026-10-18T12:00:00+00:00|nope") is None
+
+
+@pytest.mark.unit
+def test_broker_wakes_only_subscribers_of_the_notified_run(monkeypatch):
+    async def _idle_listener(self):
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(RunEventBroker, "_listen", _idle_listener)
+    broker = RunEventBroker()
+
+    async def _run():
+        async with broker.subscribe(RUN) as mine, broker.subscribe(uuid.uuid4()) as other:
+            payload = json.dumps({"run_id": str(RUN)})
+            broker._on_notify(None, 1, "research_events", payload)
+            broker._on_notify(None, 1, "research_events", payload)  # coalesced
+            broker._on_notify(None, 1, "research_events", "garbage")
+            assert mine.qsize() == 1 and other.empty()
+        assert broker._task is None and not broker._subscribers
+
+    asyncio.run(_run())
+
+
+@pytest.mark.unit
+def test_stream_sends_backlog_then_new_events_once_and_ends_with_the_run(monkeypatch):
+    first, late_but_earlier = _event(1), _event(1.5)
+    step_done, completed = _event(2, "step_succeeded"), _event(3, "worker_completed")
+    db = SimpleNamespace(events=[first], run_status="running")
+
+    class _Repo:
+        def __init__(self, session):
+            pass
+
+        async def list_research_events_for_run(self, tenant_id, run_id, limit):
+            return sorted(db.events, key=lambda e: e.created_at, reverse=True)[:limit]
+
+        async def list_research_events_since(self, tenant_id, run_id, created_from, limit, after_id=None):
+            rows = sorted((e for e in db.events if e.created_at >= created_from), key=lambda e: e.created_at)
+            return rows[:limit]
+
+        async def list_steps(self, tenant_id, run_id):
+            return []
+
+        async def get_company_research_run(self, tenant_id, run_id):
+            return SimpleNamespace(status=db.run_status)
+
+    class _Broker:
+        def __init__(self):
+            self.queue = asyncio.Queue()
+
+        @asynccontextmanager
+        async def subscribe(self, run_id):
+            yield self.queue
+
+    @asynccontextmanager
+    async def _session():
+        yield None
+
+    monkeypatch.setattr(run_event_stream, "CompanyResearchRepository", _Repo)
+
+    async def _run():
+        broker = _Broker()
+        stream = stream_run_events(TENANT, RUN, broker=broker, session_factory=_session, keepalive_seconds=5)
+        messages = [await stream.__anext__(), await stream.__anext__()]  # backlog event + steps
+
+        # A later event committed first, then one created earlier by another worker.
+        db.events += [step_done, late_but_earlier]
+        broker.queue.put_nowait(True)
+        messages += [await stream.__anext__() for _ in range(3)]
+
+        db.events.append(completed)
+        db.run_status = "succeeded"
+        broker.queue.put_nowait(True)
+        messages += [message async for message in stream]
+        return messages
+
+    parsed = _parse(asyncio.run(_run()))
+    assert [kind for kind, _ in parsed] == ["research_event", "steps", "research_event", "step", "steps", "research_event", "end"]
+    sent_ids = [data["id"] for kind, data in parsed if kind in ("research_event", "step")]
+    assert sent_ids == [str(first.id), str(late_but_earlier.id), str(step_done.id), str(completed.id)]
+
+
+@pytest.mark.unit
+def test_stream_resumes_after_last_event_id_without_repeating(monkeypatch):
+    seen, missed = _event(1), _event(2)
+
+    class _Repo:
+        def __init__(self, session):
+            pass
+
+        async def list_research_events_since(self, tenant_id, run_id, created_from, limit, after_id=None):
+            return [e for e in (seen, missed) if e.created_at >= created_from]
+
+        async def list_steps(self, tenant_id, run_id):
+            return []
+
+        async def get_company_research_run(self, tenant_id, run_id):
+            return SimpleNamespace(status="failed")
+
+    class _Broker:
+        @asynccontextmanager
+        async def subscribe(self, run_id):
+            yield asyncio.Queue()
+
+    @asynccontextmanager
+    async def _session():
+        yield None
+
+    monkeypatch.setattr(run_event_stream, "CompanyResearchRepository", _Repo)
+
+    async def _run():
+        stream = stream_run_events(
+            TENANT, RUN, last_event_id=event_cursor(seen), broker=_Broker(), session_factory=_session
+        )
+        return [message async for message in stream]
+
+    parsed = _parse(asyncio.run(_run()))
+    assert [kind for kind, _ in parsed] == ["research_event", "steps", "end"]
+    assert parsed[0][1]["id"] == str(missed.id)
+
+
+@pytest.mark.unit
+def test_catch_up_pages_past_page_size_without_repeating_boundary_rows(monkeypatch):
+    seen = _event(0)
+    # Several events per timestamp, so page boundaries fall inside a created_at tie.
+    pending = sorted((_event(1 + i // 7) for i in range(1200)), key=lambda e: (e.created_at, e.id))
+    events = [seen] + pending
+    reads = []
+
+    class _Repo:
+        def __init__(self, session):
+            pass
+
+        async def list_research_events_since(self, tenant_id, run_id, created_from, limit, after_id=None):
+            reads.append(after_id)
+            if after_id is None:
+                rows = [e for e in events if e.created_at >= created_from]
+            else:
+                rows = [e for e in events if (e.created_at, e.id) > (created_from, after_id)]
+            return rows[:limit]
+
+        async def list_steps(self, tenant_id, run_id):
+            return []
+
+        async def get_company_research_run(self, tenant_id, run_id):
+            return SimpleNamespace(status="succeeded")
+
+    class _Broker:
+        @asynccontextmanager
+        async def subscribe(self, run_id):
+            yield asyncio.Queue()
+
+    @asynccontextmanager
+    async def _session():
+        yield None
+
+    monkeypatch.setattr(run_event_stream, "CompanyResearchRepository", _Repo)
+
+    async def _run():
+        stream = stream_run_events(
+            TENANT, RUN, last_event_id=event_cursor(seen), broker=_Broker(), session_factory=_session
+        )
+        return [message async for message in stream]
+
+    parsed = _parse(asyncio.run(_run()))
+    sent_ids = [data["id"] for kind, data in parsed if kind == "research_event"]
+    assert len(sent_ids) == len(set(sent_ids)) == len(pending)
+    assert sent_ids == [str(e.id) for e in pending]
+    assert len(reads) > 2
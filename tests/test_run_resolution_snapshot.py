@@ -0,0 +1,249 @@
+"""Stage 6 resolvers plan from one shared run snapshot and write in bulk."""
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services import company_research_service
+from app.services.canonical_company_service import CanonicalCompanyService, CanonicalCompanyState
+from app.services.canonical_people_service import CanonicalPeopleService, CanonicalPeopleState
+from app.services.company_research_service import CompanyResearchService
+from app.services.entity_resolution_service import EntityResolutionService, EntityResolutionState
+from app.services.run_resolution_snapshot import CompanyRow, ExecutiveRow, RunSnapshot, build_evidence_map
+
+T0 = datetime(2026, 10, 18, tzinfo=timezone.utc)
+TENANT = str(uuid.uuid4())
+RUN = uuid.uuid4()
+OTHER_RUN = uuid.uuid4()
+ACME = uuid.uuid4()
+
+
+def _exec(seconds, name, email=None, linkedin=None, company=ACME, doc=True, run=RUN):
+    return ExecutiveRow(
+        id=uuid.uuid4(),
+        company_research_run_id=run,
+        company_prospect_id=company,
+        name_raw=name,
+        name_normalized=name.lower(),
+        email=email,
+        linkedin_url=linkedin,
+        source_document_id=uuid.uuid4() if doc else None,
+        created_at=T0 + timedelta(seconds=seconds),
+    )
+
+
+def _company(seconds, name, website=None, country=None, run=RUN):
+    return CompanyRow(
+        id=uuid.uuid4(),
+        company_research_run_id=run,
+        name_raw=name,
+        name_normalized=name.lower(),
+        website_url=website,
+        hq_country=country,
+        created_at=T0 + timedelta(seconds=seconds),
+    )
+
+
+def _snapshot(executives=(), companies=(), company_evidence=()):
+    return RunSnapshot(
+        tenant_id=TENANT,
+        run_id=RUN,
+        executives=tuple(executives),
+        executive_evidence={},
+        companies=tuple(companies),
+        company_evidence=build_evidence_map(company_evidence),
+    )
+
+
+@pytest.mark.unit
+def test_entity_plan_merges_duplicates_into_the_oldest_executive():
+    first = _exec(1, "Ada Lovelace", email="ada@acme.test")
+    dup = _exec(2, "Ada L.", email=" ADA@acme.test")
+    alone = _exec(3, "Grace Hopper")
+    resolver = EntityResolutionService(db=None)
+
+    plan = resolver.plan(_snapshot([dup, first, alone]), EntityResolutionState(set(), {(first.id, dup.id)}))
+
+    [resolved] = plan.resolved.values()
+    [link] = plan.links.values()
+    assert resolved["canonical_entity_id"] == first.id
+    assert (link["canonical_entity_id"], link["duplicate_entity_id"]) == (first.id, dup.id)
+    assert link["resolved_hash"] == resolved["resolution_hash"]
+    assert plan.summary["resolved_groups"] == 1
+    assert plan.summary["merge_links_existing"] == 1 and plan.summary["merge_links_written"] == 0
+
+
+@pytest.mark.unit
+def test_people_plan_sees_people_and_links_planned_earlier_in_the_pass():
+    with_email = _exec(1, "Ada Lovelace", email="ada@acme.test", linkedin="https://linkedin.com/in/ada")
+    same_linkedin = _exec(2, "Ada Lovelace", linkedin="https://linkedin.com/in/ada")
+    by_name = _exec(3, "Grace Hopper")
+    same_name = _exec(4, "Grace Hopper")
+    no_evidence = _exec(5, "Alan Turing", doc=False)
+    executives = [with_email, same_linkedin, by_name, same_name, no_evidence]
+    state = CanonicalPeopleState(
+        peers=tuple(executives),
+        evidence={},
+        people_by_email={},
+        people_by_linkedin={},
+        links=(),
+    )
+
+    plan = CanonicalPeopleService(db=None).plan(_snapshot(executives), state)
+
+    assert len(plan.people) == 2  # Ada (email) and Grace (name + company)
+    links = plan.links
+    assert links[same_linkedin.id]["canonical_person_id"] == links[with_email.id]["canonical_person_id"]
+    assert links[same_name.id]["canonical_person_id"] == links[by_name.id]["canonical_person_id"]
+    assert no_evidence.id not in links
+    assert plan.summary["canonical_people_matched"] == 2
+    assert plan.summary["evidence_missing_skipped"] == 1
+    assert list(plan.emails) == ["ada@acme.test"]
+
+
+@pytest.mark.unit
+def test_company_plan_links_domain_peers_and_reuses_planned_companies():
+    existing = uuid.uuid4()
+    first = _company(1, "Acme", website="https://www.acme.test/about")
+    second = _company(2, "Acme Inc", website="acme.test")
+    peer = _company(0, "ACME", website="http://acme.test", run=OTHER_RUN)
+    local = _company(3, "Widgets", country="gb")
+    known = _company(4, "Gadgets", country="DE")
+    evidence = [(c.id, uuid.uuid4()) for c in (first, second, peer, local)]
+    state = CanonicalCompanyState(
+        companies_by_domain={},
+        companies_by_name_country={("gadgets", "DE"): existing},
+        link_entity_ids={peer.id},
+    )
+
+    plan = CanonicalCompanyService(db=None).plan(_snapshot(companies=[peer, first, second, local, known], company_evidence=evidence), state)
+
+    assert [c["primary_domain"] for c in plan.companies] == ["acme.test", None]
+    acme_id = plan.domains["acme.test"]["canonical_company_id"]
+    assert {plan.links[c.id]["canonical_company_id"] for c in (first, second, peer)} == {acme_id}
+    assert plan.links[local.id]["match_rule"] == "name_country"
+    assert known.id not in plan.links  # matched, but no evidence to link with
+    assert plan.summary["canonical_companies_matched"] == 2
+    assert plan.summary["companies_scanned"] == 4
+
+
+@pytest.mark.unit
+def test_steps_share_one_snapshot_and_plan_concurrently(monkeypatch):
+    loads = []
+
+    async def _load_run_snapshot(repo, tenant_id, run_id):
+        loads.append(run_id)
+        return _snapshot()
+
+    async def _state(self, snapshot):
+        return None
+
+    def _plan(name):
+        return lambda self, snapshot, state: name
+
+    monkeypatch.setattr(company_research_service, "load_run_snapshot", _load_run_snapshot)
+    for cls, name in (
+        (EntityResolutionService, "entities"),
+        (CanonicalPeopleService, "people"),
+        (CanonicalCompanyService, "companies"),
+    ):
+        monkeypatch.setattr(cls, "load_state", _state)
+        monkeypatch.setattr(cls, "plan", _plan(name))
+
+    service = CompanyResearchService(db=None)
+
+    async def _run():
+        return [
+            await service._take_resolution_plan(TENANT, RUN, step_key)
+            for step_key in ("entity_resolution", "canonical_people_resolution", "canonical_company_resolution")
+        ] + [await service._take_resolution_plan(TENANT, RUN, "canonical_people_resolution")]
+
+    assert asyncio.run(_run()) == ["entities", "people", "companies", "people"]
+    assert loads == [RUN, RUN]  # the retry after all plans were taken re-plans
+
+
+@pytest.mark.unit
+def test_plans_do_not_outlive_the_worker_pass_that_made_them(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.workers import company_research_worker
+
+    loads = []
+
+    async def _load_run_snapshot(repo, tenant_id, run_id):
+        loads.append(run_id)
+        return _snapshot()
+
+    async def _state(self, snapshot):
+        return None
+
+    def _plan(name):
+        return lambda self, snapshot, state: (name, len(loads))
+
+    monkeypatch.setattr(company_research_service, "load_run_snapshot", _load_run_snapshot)
+    for cls, name in (
+        (EntityResolutionService, "entities"),
+        (CanonicalPeopleService, "people"),
+        (CanonicalCompanyService, "companies"),
+    ):
+        monkeypatch.setattr(cls, "load_state", _state)
+        monkeypatch.setattr(cls, "plan", _plan(name))
+
+    async def _noop(*args, **kwargs):
+        return None
+
+    passes = [["entity_resolution", "canonical_people_resolution"], ["canonical_people_resolution", "canonical_company_resolution"]]
+    taken = []
+    failures = ["connection reset"]
+
+    class _Repo:
+        def __init__(self):
+            self.queue = []
+
+        async def claim_next_step(self, tenant_id, run_id):
+            return SimpleNamespace(id=uuid.uuid4(), step_key=self.queue.pop(0), attempt_count=1) if self.queue else None
+
+        async def list_steps(self, tenant_id, run_id):
+            return []
+
+        mark_step_succeeded = mark_step_failed = set_run_status = staticmethod(_noop)
+
+    service = CompanyResearchService(db=SimpleNamespace(commit=_noop, flush=_noop, rollback=_noop))
+    service.repo = _Repo()
+    for method in ("append_event", "ensure_plan_and_steps", "lock_plan_on_start", "mark_job_failed"):
+        monkeypatch.setattr(service, method, _noop)
+
+    async def _get_research_run(tenant_id, run_id):
+        return SimpleNamespace(status="running", started_at=T0)
+
+    async def _mark_job_running(job_id, worker_id):
+        return job
+
+    def _step(step_key):
+        async def _run(tenant_id, run_id):
+            if step_key == "canonical_people_resolution" and failures:
+                raise RuntimeError(failures.pop())  # fails before writing, like a dropped connection
+            taken.append(await service._take_resolution_plan(tenant_id, run_id, step_key))
+            return {}
+
+        return _run
+
+    monkeypatch.setattr(service, "get_research_run", _get_research_run)
+    monkeypatch.setattr(service, "mark_job_running", _mark_job_running)
+    monkeypatch.setattr(service, "run_entity_resolution_step", _step("entity_resolution"))
+    monkeypatch.setattr(service, "run_canonical_people_resolution_step", _step("canonical_people_resolution"))
+    monkeypatch.setattr(service, "run_canonical_company_resolution_step", _step("canonical_company_resolution"))
+    job = SimpleNamespace(id=uuid.uuid4(), tenant_id=TENANT, run_id=RUN, cancel_requested=False)
+
+    async def _run():
+        for steps in passes:
+            service.repo.queue = list(steps)
+            await company_research_worker._process_job(service, job, "w1")
+
+    asyncio.run(_run())
+
+    # The rerun of the failed step plans again instead of taking the first pass's plan;
+    # canonical_company_resolution then takes the plan made with it.
+    assert taken == [("entities", 1), ("people", 2), ("companies", 2)]
+    assert service._resolution_plans == {}
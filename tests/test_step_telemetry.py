@@ -0,0 +1,108 @@
+"""Per-step telemetry: SQL/HTTP/domain-wait capture and Prometheus rendering."""
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.telemetry import (
+    TelemetryTransport,
+    current_step_telemetry,
+    instrument_engine,
+    record_domain_wait,
+    render_step_metrics,
+    start_step_telemetry,
+)
+
+
+@pytest.mark.unit
+def test_sql_statements_are_counted_only_while_a_step_is_active():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    instrument_engine(engine)  # idempotent
+
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))  # no active step
+
+        telemetry = start_step_telemetry()
+        try:
+            conn.execute(text("create table t (x integer)"))
+            conn.execute(text("insert into t values (1), (2), (3)"))
+            conn.execute(text("select * from t")).all()
+        finally:
+            telemetry.stop()
+
+        conn.execute(text("select 2"))
+
+    snapshot = telemetry.snapshot()
+    assert current_step_telemetry() is None
+    assert snapshot["sql_count"] == 3
+    assert snapshot["sql_rows"] == 3
+    assert snapshot["sql_ms"] >= 0 and snapshot["wall_ms"] >= snapshot["sql_ms"]
+
+
+@pytest.mark.unit
+def test_http_transport_records_bytes_latency_and_domain_wait():
+    class _Body(httpx.AsyncByteStream):
+        def __init__(self, size):
+            self.size = size
+
+        async def __aiter__(self):
+            # Network-like body: delivered in chunks, not pre-read.
+            for _ in range(self.size // 25):
+                yield b"x" * 25
+
+    def _handler(request):
+        return httpx.Response(200, stream=_Body(100 if request.url.path == "/a" else 50))
+
+    async def _fetch(paths):
+        transport = TelemetryTransport(httpx.MockTransport(_handler))
+        async with httpx.AsyncClient(transport=transport) as client:
+            for path in paths:
+                async with client.stream("GET", f"http://fixture{path}") as response:
+                    await response.aread()
+
+    asyncio.run(_fetch(["/a"]))  # outside a step: nothing recorded anywhere
+
+    telemetry = start_step_telemetry()
+    try:
+        asyncio.run(_fetch(["/a", "/b", "/b"]))
+        record_domain_wait(12.5)
+        record_domain_wait(0)
+    finally:
+        telemetry.stop()
+
+    snapshot = telemetry.snapshot()
+    assert snapshot["http_count"] == 3
+    assert snapshot["http_bytes"] == 200
+    assert snapshot["http_errors"] == 0
+    assert snapshot["http_latency_p50_ms"] is not None
+    assert snapshot["http_latency_max_ms"] >= snapshot["http_latency_p95_ms"] >= snapshot["http_latency_p50_ms"]
+    assert snapshot["domain_wait_ms"] == 12.5
+
+
+@pytest.mark.unit
+def test_render_step_metrics_prometheus_text():
+    rows = [
+        {
+            "step_key": "fetch_url_sources",
+            "status": "succeeded",
+            "steps": 4,
+            "sum_wall_ms": 2500.0,
+            "sum_http_bytes": 123456789.0,
+            "max_http_latency_p95_ms": 340.0,
+        }
+    ]
+
+    body = render_step_metrics(rows)
+
+    labels = '{step_key="fetch_url_sources",status="succeeded"}'
+    assert f"research_steps{labels} 4" in body
+    assert f"research_step_wall_seconds{labels} 2.5" in body
+    assert f"research_step_http_bytes{labels} 123456789" in body
+    assert f"research_step_http_latency_p95_seconds_max{labels} 0.34" in body
+    assert f"research_step_sql_statements{labels} 0" in body
+    assert "# TYPE research_step_wall_seconds_max gauge" in body
+    assert "# TYPE research_step_wall_seconds gauge" in body
+    assert " counter" not in body and "_total" not in body
+    assert body.endswith("\n")
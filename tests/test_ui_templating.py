@@ -0,0 +1,41 @@
+"""UI routes share one Jinja environment whose compiled templates go to a bytecode cache."""
+import importlib
+import pkgutil
+
+import pytest
+
+import app.ui.routes
+from app.ui import templating
+
+
+@pytest.mark.unit
+def test_ui_route_modules_share_one_template_environment():
+    modules = [
+        importlib.import_module(f"app.ui.routes.{info.name}")
+        for info in pkgutil.iter_modules(app.ui.routes.__path__)
+    ]
+    rendering = [m for m in modules if hasattr(m, "templates")]
+    assert len(rendering) >= 15
+    assert {id(m.templates) for m in rendering} == {id(templating.templates)}
+
+
+@pytest.mark.unit
+def test_precompile_fills_the_bytecode_cache(tmp_path):
+    env = templating.build_template_environment(cache_dir=str(tmp_path / "jinja"))
+
+    count = templating.precompile_templates(env)
+
+    assert count > 0 and "login.html" in env.list_templates()
+    assert len(list((tmp_path / "jinja").iterdir())) == count
+    # A fresh environment on the same directory loads the cached bytecode.
+    fresh = templating.build_template_environment(cache_dir=str(tmp_path / "jinja"))
+    cache, hits = fresh.bytecode_cache, []
+    load_bytecode = cache.load_bytecode
+
+    def _spy(bucket):
+        load_bytecode(bucket)
+        hits.append(bucket.code is not None)
+
+    cache.load_bytecode = _spy
+    fresh.get_template("login.html")
+    assert hits == [True]